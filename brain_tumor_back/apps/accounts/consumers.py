@@ -1,14 +1,11 @@
-import os
+import logging
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
-from django.utils import timezone
 from channels.db import database_sync_to_async
-from django.contrib.auth import get_user_model
-import redis
 
-# Redis 클라이언트 객체 생성 (환경변수 우선)
-redis_host = os.environ.get('REDIS_HOST', '127.0.0.1')
-redis_port = int(os.environ.get('REDIS_PORT', 6379))
-redis_client = redis.Redis(host=redis_host, port=redis_port, db=0)
+from apps.accounts.services import presence_service
+from apps.accounts.services.permission_service import role_group_name, user_group_name
+
+logger = logging.getLogger(__name__)
 
 # 사용자 권한 변경 알림 Consumer
 class UserPermissionConsumer(AsyncJsonWebsocketConsumer):
@@ -19,15 +16,22 @@ class UserPermissionConsumer(AsyncJsonWebsocketConsumer):
             await self.close()
             return
         
-        self.group_name = f"user_{user.id}"
-        
+        # 사용자 그룹 + 역할 그룹 (역할 권한 변경은 역할 그룹으로 한 번에 전송)
+        self.group_names = [user_group_name(user.id)]
+        if user.role_id:
+            self.group_names.append(role_group_name(user.role_id))
+
+        for group_name in self.group_names:
+            await self.channel_layer.group_add(group_name, self.channel_name)
+
         await self.accept()
     
     async def disconnect(self, close_code):
-        await self.channel_layer.group_discard(
-            self.group_name,
-            self.channel_name,
-        )
+        for group_name in getattr(self, "group_names", []):
+            await self.channel_layer.group_discard(
+                group_name,
+                self.channel_name,
+            )
     
     async def permission_changed(self, event):
         await self.send_json({
@@ -35,6 +39,7 @@ class UserPermissionConsumer(AsyncJsonWebsocketConsumer):
         })
 
 # 사용자 접속 상태 관리 Consumer
+# - 온라인 상태 / last_seen 은 redis.asyncio 로 기록 (presence_service), DB 반영은 주기적 일괄 UPDATE
 class PresenceConsumer(AsyncJsonWebsocketConsumer):
     async def connect(self):
         user = self.scope["user"]
@@ -47,11 +52,8 @@ class PresenceConsumer(AsyncJsonWebsocketConsumer):
 
         await self.accept()
 
-        # 최초 접속 시 last_seen 기록
-        # await self.update_last_seen()
-
-        # Redis에 온라인 상태 기록
-        mark_user_online(user.id)
+        # Redis에 온라인 상태 + last_seen 기록
+        await self.touch()
 
         await self.channel_layer.group_add(
             "presence",
@@ -59,29 +61,32 @@ class PresenceConsumer(AsyncJsonWebsocketConsumer):
         )
 
     async def receive_json(self, content):
-        #  클라이언트에서 heartbeat 메시지를 보내면 last_seen 갱신
+        #  클라이언트에서 heartbeat 메시지를 보내면 TTL 연장 + last_seen 갱신
         if content.get("type") == "heartbeat":
-            mark_user_online(self.user.id)  # TTL 연장
-            await self.update_last_seen()
+            await self.touch()
+            if presence_service.should_flush():
+                await self.flush_last_seen()
 
     async def disconnect(self, close_code):
         user = getattr(self, "user", None)
-        # 연결 종료 시에도 기록
+        # 연결 종료 시에도 기록 (다른 탭이 열려 있을 수 있으므로 온라인 키는 TTL 만료에 맡김)
         if user and user.is_authenticated:
-            await self.update_last_seen()
+            await self.touch(online=False)
+        await self.channel_layer.group_discard("presence", self.channel_name)
+
+    async def touch(self, online=True):
+        try:
+            await presence_service.touch(self.user.id, online=online)
+        except Exception as e:
+            logger.warning(f"presence 기록 실패 (user={self.user.id}): {e}")
 
     @database_sync_to_async
-    def update_last_seen(self):
-        User = get_user_model()
-        user = getattr(self, "user", None)
-        if user and user.is_authenticated:
-            User.objects.filter(id=user.id).update(
-                last_seen=timezone.now()
-            )
-# Redis 헬퍼 함수들
-def mark_user_online(user_id):
-    redis_client.set(f"user:online:{user_id}", 1, ex=30)
+    def flush_last_seen(self):
+        try:
+            presence_service.flush_last_seen()
+        except Exception as e:
+            logger.warning(f"last_seen flush 실패: {e}")
 
-def is_user_online(user_id):
-    return redis_client.exists(f"user:online:{user_id}") == 1
 
+# Redis 헬퍼 함수들 (presence_service 사용)
+is_user_online = presence_service.is_user_online
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.accounts.services.presence_service import FLUSH_INTERVAL, flush_last_seen
+
+
+class Command(BaseCommand):
+    help = 'Write last_seen timestamps buffered in Redis (presence heartbeats) to the users table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='한 번 반영하고 종료')
+        parser.add_argument('--interval', type=float, default=FLUSH_INTERVAL, help='반영 주기 (초)')
+
+    def handle(self, *args, **options):
+        self.stdout.write("=" * 60)
+        self.stdout.write("Presence last_seen Flush")
+        self.stdout.write("=" * 60)
+
+        while True:
+            try:
+                count = flush_last_seen()
+                if count or options['once']:
+                    self.stdout.write(f"  {count} users updated")
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"  flush failed: {e}"))
+                if options['once']:
+                    raise
+
+            if options['once']:
+                break
+            time.sleep(options['interval'])
@@ -1,20 +1,92 @@
 # 권한 변경 시 이벤트 발행 => 권한 변경 로직 마지막에 이 함수 호출
 
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from ..models import UserRole, RolePermission
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+# 역할 단위 브로드캐스트 전송용 (요청 스레드에서 Redis 왕복을 하지 않도록)
+_broadcast_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="permission-broadcast")
+_stats_lock = threading.Lock()
+_broadcast_stats = {
+    "scheduled": 0,
+    "sent": 0,
+    "failed": 0,
+    "last_latency_ms": None,
+}
+
+
+def user_group_name(user_id):
+    return f"user_{user_id}"
+
+
+def role_group_name(role_id):
+    # UserPermissionConsumer / PermissionConsumer 가 connect 시 가입
+    return f"role_{role_id}"
+
 
 # 이벤트 발행 로직 (Channels를 통한 WebSocket 알림)
 def notify_permission_changed(user_id):
     channel_layer = get_channel_layer()
 
     async_to_sync(channel_layer.group_send)(
-        f"user_{user_id}",
+        user_group_name(user_id),
         {
             "type" : "permission_changed",
         }
     )
 
+
+def _count(key, latency_ms=None):
+    with _stats_lock:
+        _broadcast_stats[key] += 1
+        if latency_ms is not None:
+            _broadcast_stats["last_latency_ms"] = latency_ms
+
+
+def _send_role_broadcast(role_id, committed_at):
+    try:
+        channel_layer = get_channel_layer()
+        async_to_sync(channel_layer.group_send)(
+            role_group_name(role_id),
+            {
+                "type": "permission_changed",
+                "role_id": role_id,
+            }
+        )
+    except Exception as e:
+        _count("failed")
+        logger.warning(f"역할 권한 변경 알림 실패 (role={role_id}): {e}")
+        return
+    _count("sent", round((time.monotonic() - committed_at) * 1000, 1))
+
+
+def notify_role_permission_changed(role_id):
+    """
+    역할 권한 변경 알림 - 해당 역할 그룹에 한 번만 브로드캐스트
+
+    커밋 이후 백그라운드 스레드에서 전송 (롤백되면 보내지 않음, 요청은 대기하지 않음)
+    """
+    def dispatch():
+        _count("scheduled")
+        _broadcast_executor.submit(_send_role_broadcast, role_id, time.monotonic())
+
+    transaction.on_commit(dispatch)
+
+
+def permission_broadcast_stats():
+    """역할 브로드캐스트 전송 카운터 (시스템 모니터링용)"""
+    with _stats_lock:
+        return dict(_broadcast_stats)
+
+
 # 사용자 권한 조회 로직
 def get_user_permission(user):
     role_ids = UserRole.objects.filter(user = user).values_list("role_id", flat= True)
@@ -23,4 +95,4 @@ def get_user_permission(user):
     ).values_list("permission__code", flat=True)
 
     return list(permission)
-    
\ No newline at end of file
+    
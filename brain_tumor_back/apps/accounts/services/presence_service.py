@@ -0,0 +1,152 @@
+# 사용자 접속 상태(presence) / last_seen 관리
+#
+# - heartbeat 는 redis.asyncio 파이프라인 1회 (SETEX 온라인 키 + last_seen 해시 + flush 대상 집합)
+#   → ASGI 이벤트 루프를 막지 않고, users 테이블도 건드리지 않음
+# - last_seen 은 Redis 해시에 두고 PRESENCE_FLUSH_INTERVAL 마다 UPDATE 1회로 DB 반영
+#   (PresenceConsumer 가 주기적으로 호출, 또는 flush_last_seen 명령)
+# - 조회는 DB last_seen 과 Redis 값 중 최신값 사용 (아직 flush 안 된 heartbeat 포함)
+
+import logging
+import time
+from datetime import datetime, timezone as dt_timezone
+
+import redis
+import redis.asyncio as aioredis
+from django.conf import settings
+from django.db.models import Case, DateTimeField, Q, Value, When
+
+from ..models import User
+
+logger = logging.getLogger(__name__)
+
+REDIS_HOST = getattr(settings, "REDIS_HOST", "127.0.0.1")
+REDIS_PORT = getattr(settings, "REDIS_PORT", 6379)
+ONLINE_TTL = getattr(settings, "PRESENCE_ONLINE_TTL", 30)
+FLUSH_INTERVAL = getattr(settings, "PRESENCE_FLUSH_INTERVAL", 60)
+
+ONLINE_KEY = "user:online:{}"
+LAST_SEEN_KEY = "presence:last_seen"  # hash {user_id: epoch}
+DIRTY_KEY = "presence:dirty"          # set {user_id} - DB 에 아직 반영 안 된 사용자
+
+redis_client = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=0)
+_async_client = None
+_last_flush = 0.0
+
+
+def _get_async_client():
+    global _async_client
+    if _async_client is None:
+        _async_client = aioredis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=0)
+    return _async_client
+
+
+# =========================================================================
+# 기록 (WebSocket consumer)
+# =========================================================================
+
+async def touch(user_id, online=True):
+    """heartbeat / 접속 / 종료 시 호출 - Redis 파이프라인 1회"""
+    now = time.time()
+    pipe = _get_async_client().pipeline(transaction=False)
+    if online:
+        pipe.setex(ONLINE_KEY.format(user_id), ONLINE_TTL, 1)
+    pipe.hset(LAST_SEEN_KEY, str(user_id), now)
+    pipe.sadd(DIRTY_KEY, str(user_id))
+    await pipe.execute()
+
+
+def should_flush():
+    """프로세스별 flush 주기 확인 (여러 프로세스가 동시에 flush 해도 대상은 한 번만 가져감)"""
+    global _last_flush
+    now = time.monotonic()
+    if now - _last_flush < FLUSH_INTERVAL:
+        return False
+    _last_flush = now
+    return True
+
+
+def flush_last_seen():
+    """
+    Redis 의 last_seen 을 DB 에 반영 (UPDATE 1회)
+
+    Returns:
+        반영된 사용자 수
+    """
+    pipe = redis_client.pipeline(transaction=True)
+    pipe.smembers(DIRTY_KEY)
+    pipe.delete(DIRTY_KEY)
+    user_ids = [int(uid) for uid in pipe.execute()[0]]
+    if not user_ids:
+        return 0
+
+    try:
+        seen = _read_last_seen(user_ids)
+        if seen:
+            User.objects.filter(id__in=list(seen)).update(
+                last_seen=Case(
+                    *[When(id=uid, then=Value(ts)) for uid, ts in seen.items()],
+                    output_field=DateTimeField(),
+                )
+            )
+    except Exception:
+        # 다음 주기에 다시 시도
+        redis_client.sadd(DIRTY_KEY, *user_ids)
+        raise
+    return len(seen)
+
+
+# =========================================================================
+# 조회 (API)
+# =========================================================================
+
+def _read_last_seen(user_ids):
+    values = redis_client.hmget(LAST_SEEN_KEY, [str(uid) for uid in user_ids])
+    return {
+        uid: datetime.fromtimestamp(float(value), tz=dt_timezone.utc)
+        for uid, value in zip(user_ids, values)
+        if value is not None
+    }
+
+
+def last_seen_map(users):
+    """
+    사용자들의 최신 last_seen (DB 값과 flush 전 Redis 값 중 최신, Redis 조회 1회)
+
+    Returns:
+        {user_id: datetime | None}
+    """
+    users = list(users)
+    result = {user.id: user.last_seen for user in users}
+    if not users:
+        return result
+    try:
+        pending = _read_last_seen(list(result))
+    except Exception as e:
+        logger.warning(f"presence 조회 실패, DB last_seen 사용: {e}")
+        return result
+
+    for uid, ts in pending.items():
+        if result[uid] is None or ts > result[uid]:
+            result[uid] = ts
+    return result
+
+
+def count_active_since(threshold):
+    """threshold 이후 활동한 활성 사용자 수 (쿼리 1회 + Redis 조회 1회)"""
+    recent_ids = []
+    try:
+        cutoff = threshold.timestamp()
+        recent_ids = [
+            int(uid) for uid, value in redis_client.hgetall(LAST_SEEN_KEY).items()
+            if float(value) >= cutoff
+        ]
+    except Exception as e:
+        logger.warning(f"presence 조회 실패, DB last_seen 사용: {e}")
+
+    return User.objects.filter(is_active=True).filter(
+        Q(last_seen__gte=threshold) | Q(id__in=recent_ids)
+    ).count()
+
+
+def is_user_online(user_id):
+    return redis_client.exists(ONLINE_KEY.format(user_id)) == 1
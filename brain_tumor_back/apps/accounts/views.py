@@ -20,8 +20,10 @@ from datetime import timedelta
 from django.db.models import BooleanField, Case, When, Value
 from apps.common.pagination import UserPagination
 from .filters import UserFilter
+from .services.presence_service import last_seen_map
 
 ALLOWED_CREATE_ROLES = {"ADMIN", "SYSTEMMANAGER"}
+ONLINE_WINDOW_SECONDS = 60  # 마지막 활동 후 온라인으로 간주하는 시간
 # 1. 사용자 목록 조회 & 추가 API(관리자 전용 view)
 # 검색, 필터, 생성, 온라인 상태
 class UserListView(generics.ListCreateAPIView):
@@ -46,7 +48,7 @@ class UserListView(generics.ListCreateAPIView):
     def get_queryset(self):
         qs = User.objects.select_related("role")
 
-        online_threshold = timezone.now() - timedelta(seconds=60)
+        online_threshold = timezone.now() - timedelta(seconds=ONLINE_WINDOW_SECONDS)
 
         qs = qs.annotate(
             is_online=Case(
@@ -56,6 +58,17 @@ class UserListView(generics.ListCreateAPIView):
             )
         )
         return qs
+
+    def paginate_queryset(self, queryset):
+        # DB last_seen 은 주기적으로 flush 되므로 현재 페이지만 Redis heartbeat 로 보정
+        page = super().paginate_queryset(queryset)
+        if page is not None:
+            online_threshold = timezone.now() - timedelta(seconds=ONLINE_WINDOW_SECONDS)
+            seen_map = last_seen_map(page)
+            for user in page:
+                last_seen = seen_map.get(user.id)
+                user.is_online = bool(last_seen and last_seen >= online_threshold)
+        return page
     
     # 사용자 생성
     def get_serializer_class(self):
@@ -0,0 +1,43 @@
+"""
+AI 결과 후처리 백그라운드 워커
+
+콜백 응답을 막지 않도록 미리보기 생성 / GT SEG 수집 등을 프로세스 내 스레드 풀에서 실행
+- 같은 key (예: 'previews:<job_id>') 가 대기/실행 중이면 중복 요청 무시
+- 작업이 끝나면 DB 연결을 닫음 (스레드별 연결 누수 방지)
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings as django_settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(
+    max_workers=getattr(django_settings, 'AI_POSTPROCESS_WORKERS', 2),
+    thread_name_prefix='ai-postprocess',
+)
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+def _run(key: str, fn, args, kwargs):
+    try:
+        fn(*args, **kwargs)
+    except Exception as e:
+        logger.error(f'Background task {key} failed: {e}')
+    finally:
+        with _pending_lock:
+            _pending.discard(key)
+        close_old_connections()
+
+
+def submit_once(key: str, fn, *args, **kwargs) -> bool:
+    """fn(*args, **kwargs) 를 백그라운드에서 실행 (같은 key 가 대기 중이면 False)"""
+    with _pending_lock:
+        if key in _pending:
+            return False
+        _pending.add(key)
+    _executor.submit(_run, key, fn, args, kwargs)
+    return True
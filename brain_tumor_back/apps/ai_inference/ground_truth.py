@@ -0,0 +1,409 @@
+"""
+Ground Truth SEG 수집 (M1 예측 vs Orthanc SEG 비교용)
+
+MRI OCS 의 Orthanc SEG 시리즈를 한 번 받아 예측 크기로 리샘플링하고 비교 메트릭까지 계산해
+job 디렉토리에 저장 → 비교 화면은 저장된 결과만 읽음
+
+    CDSS_STORAGE/AI/<job_id>/gt_seg/
+        ground_truth.npy    # uint8 레이블, 예측 마스크와 같은 shape
+        meta.json           # 원본 SEG 정보, 라벨 매핑, GT 볼륨, 비교 메트릭, 캐시 키
+
+- SEG 시리즈는 Series Archive (ZIP) 1회 다운로드, 실패 시 Instance 병렬 다운로드
+- DICOM 디코딩은 스레드 풀에서 병렬 처리
+- 라벨 정규화는 np.unique(return_inverse=True) 로 한 번에 매핑
+- 캐시 키: SEG 시리즈 ID + LastUpdate + 예측 결과 버전 (어느 쪽이 바뀌어도 다시 수집)
+- 수집 실패 시 meta.json 에 실패 기록 (error) → SEG LastUpdate 가 바뀌거나 force=True 일 때만 다시 수집
+"""
+import json
+import logging
+import os
+import shutil
+import tempfile
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import requests
+from django.conf import settings as django_settings
+
+from .background import submit_once
+from .volumes import load_job_volumes
+
+logger = logging.getLogger(__name__)
+
+GT_DIRNAME = 'gt_seg'
+GT_FILENAME = 'ground_truth.npy'
+META_FILENAME = 'meta.json'
+GT_FORMAT = 1
+
+DOWNLOAD_WORKERS = 8
+CHUNK_SIZE = 1024 * 1024
+
+
+def _orthanc_url() -> str:
+    return django_settings.ORTHANC_BASE_URL.rstrip("/")
+
+
+def find_seg_series(ocs) -> Optional[str]:
+    """OCS worker_result 에서 SEG 시리즈의 Orthanc ID 찾기 (없으면 None)"""
+    worker_result = ocs.worker_result or {}
+    orthanc_info = worker_result.get('orthanc', {})
+
+    if not orthanc_info.get('orthanc_study_id'):
+        logger.info(f"OCS {ocs.id}: Orthanc study ID가 없습니다.")
+        return None
+
+    seg_series = next(
+        (s for s in orthanc_info.get('series', []) if s.get('series_type', '') == 'SEG'),
+        None
+    )
+    if not seg_series:
+        logger.info(f"OCS {ocs.id}: SEG 시리즈가 없습니다.")
+        return None
+
+    # orthanc_id 또는 orthanc_series_id 둘 다 지원
+    orthanc_series_id = seg_series.get('orthanc_id') or seg_series.get('orthanc_series_id')
+    if not orthanc_series_id:
+        logger.warning(f"OCS {ocs.id}: SEG 시리즈의 Orthanc ID가 없습니다. seg_series={seg_series}")
+    return orthanc_series_id
+
+
+# ============================================================
+# Orthanc fetch
+# ============================================================
+
+def _fetch_series_archive(session: requests.Session, series_id: str) -> List[bytes]:
+    """Series Archive ZIP 스트리밍 다운로드 후 DICOM 파일 추출"""
+    with tempfile.SpooledTemporaryFile(max_size=32 * 1024 * 1024) as spool:
+        with session.get(f"{_orthanc_url()}/series/{series_id}/archive", stream=True, timeout=60) as r:
+            r.raise_for_status()
+            for chunk in r.iter_content(CHUNK_SIZE):
+                spool.write(chunk)
+        spool.seek(0)
+        with zipfile.ZipFile(spool) as zf:
+            return [
+                zf.read(name) for name in zf.namelist()
+                if name.endswith('.dcm') or '.' not in name.split('/')[-1]
+            ]
+
+
+def _fetch_instances(session: requests.Session, instance_ids: List[str]) -> List[bytes]:
+    """Instance 병렬 다운로드 (Archive API 를 쓸 수 없을 때)"""
+    def fetch(inst_id):
+        r = session.get(f"{_orthanc_url()}/instances/{inst_id}/file", timeout=30)
+        r.raise_for_status()
+        return r.content
+
+    with ThreadPoolExecutor(max_workers=min(DOWNLOAD_WORKERS, max(1, len(instance_ids)))) as pool:
+        return list(pool.map(fetch, instance_ids))
+
+
+def _decode_seg_instances(dicom_bytes: List[bytes]) -> Optional[np.ndarray]:
+    """SEG 인스턴스 픽셀 데이터 → 3D 볼륨 (InstanceNumber 순으로 마지막 축에 스택)"""
+    import pydicom
+
+    def decode(content):
+        ds = pydicom.dcmread(BytesIO(content))
+        if 'PixelData' not in ds:
+            return None
+        return int(getattr(ds, 'InstanceNumber', 0) or 0), ds.pixel_array
+
+    with ThreadPoolExecutor(max_workers=min(DOWNLOAD_WORKERS, max(1, len(dicom_bytes)))) as pool:
+        decoded = [item for item in pool.map(decode, dicom_bytes) if item is not None]
+
+    if not decoded:
+        return None
+    decoded.sort(key=lambda item: item[0])
+    return np.stack([pixels for _, pixels in decoded], axis=-1)
+
+
+def normalize_labels(seg_volume: np.ndarray):
+    """
+    Orthanc SEG 의 스케일된 값을 순차 라벨로 변환 (0=배경, 32767→1, 65535→2 ...)
+
+    Returns:
+        (uint8 볼륨, {원래 값: 새 라벨}) - 이미 작은 정수 라벨이면 매핑 없음
+    """
+    unique_vals, inverse = np.unique(seg_volume, return_inverse=True)
+    if len(unique_vals) > 1 and unique_vals.max() > 10:
+        label_map = {int(v): i for i, v in enumerate(unique_vals)}
+        return inverse.reshape(seg_volume.shape).astype(np.uint8), label_map
+    return seg_volume.astype(np.uint8), {}
+
+
+def resample_nearest(mask: np.ndarray, shape) -> np.ndarray:
+    """
+    최근접 보간으로 shape 맞추기
+
+    scipy.ndimage.zoom(order=0) 과 같은 좌표 매핑 (출력 i → 입력 i * (src-1)/(dst-1), 0.5 는 올림)
+    마지막 좌표가 부동소수 오차로 src-1 을 살짝 넘는 경우 scipy 기본 mode='constant' 는 0 을 채우지만
+    여기서는 끝 인덱스로 고정 (= zoom(order=0, mode='nearest') 와 동일)
+    """
+    if tuple(mask.shape) == tuple(shape):
+        return mask
+    index = []
+    for axis, (src, dst) in enumerate(zip(mask.shape, shape)):
+        if dst > 1:
+            coords = np.arange(dst, dtype=np.float64) * ((src - 1) / (dst - 1))
+        else:
+            coords = np.zeros(1)
+        shape_ = [1] * len(shape)
+        shape_[axis] = dst
+        index.append(np.clip(np.floor(coords + 0.5), 0, src - 1).astype(np.intp).reshape(shape_))
+    return np.ascontiguousarray(mask[tuple(index)])
+
+
+# ============================================================
+# Metrics
+# ============================================================
+
+def _surface(mask: np.ndarray) -> np.ndarray:
+    from scipy.ndimage import binary_erosion
+    return mask & ~binary_erosion(mask)
+
+
+def hausdorff_95(pred: np.ndarray, gt: np.ndarray) -> Optional[float]:
+    """95% Hausdorff 거리 (voxel 단위, 어느 한쪽이 비어 있으면 None)"""
+    from scipy.ndimage import distance_transform_edt
+
+    if not pred.any() or not gt.any():
+        return None
+    pred_surface = _surface(pred)
+    gt_surface = _surface(gt)
+    dist_to_gt = distance_transform_edt(~gt_surface)[pred_surface]
+    dist_to_pred = distance_transform_edt(~pred_surface)[gt_surface]
+    return float(np.percentile(np.concatenate([dist_to_gt, dist_to_pred]), 95))
+
+
+def dice(pred: np.ndarray, gt: np.ndarray) -> float:
+    total = np.count_nonzero(pred) + np.count_nonzero(gt)
+    if total == 0:
+        return 1.0  # 둘 다 없으면 완벽한 일치
+    return 2.0 * np.count_nonzero(pred & gt) / total
+
+
+def compute_metrics(pred_mask: np.ndarray, gt_mask: np.ndarray) -> Dict:
+    """
+    예측 vs GT 비교 메트릭
+
+    - WT (모든 종양 영역) Dice / HD95
+    - 라벨별 Dice / HD95 (라벨 번호가 같은 영역끼리, 라벨 매핑이 불확실하므로 참고용)
+    """
+    pred_mask = np.asarray(pred_mask)
+    pred_tumor = pred_mask > 0
+    gt_tumor = gt_mask > 0
+
+    pred_labels = sorted(int(v) for v in np.unique(pred_mask) if v != 0)
+    gt_labels = sorted(int(v) for v in np.unique(gt_mask) if v != 0)
+
+    per_label = {}
+    for label in sorted(set(pred_labels) | set(gt_labels)):
+        p, g = pred_mask == label, gt_mask == label
+        per_label[str(label)] = {'dice': float(dice(p, g)), 'hd95': hausdorff_95(p, g)}
+
+    dice_wt = float(dice(pred_tumor, gt_tumor))
+    return {
+        'dice_wt': dice_wt,
+        'dice_tc': None,  # 라벨 매핑이 불확실하여 계산 생략
+        'dice_et': None,
+        'dice_mean': dice_wt,
+        'hd95_wt': hausdorff_95(pred_tumor, gt_tumor),
+        'per_label': per_label,
+        'pred_labels': pred_labels,
+        'gt_labels': gt_labels,
+    }
+
+
+def compute_gt_volumes(gt_mask: np.ndarray, voxel_volume_mm3: float = 1.0) -> Dict[str, float]:
+    """
+    GT 볼륨 (원본 SEG 크기 기준)
+
+    BraTS 라벨: 0=배경, 1=NCR, 2=ED, 4=ET (3은 사용안함)
+    WT = 1 + 2 + 4, TC = 1 + 4, ET = 4
+    """
+    counts = np.bincount(gt_mask.ravel(), minlength=5)
+    volumes = {
+        'et_volume': float(counts[4]) * voxel_volume_mm3,
+        'ncr_volume': float(counts[1]) * voxel_volume_mm3,
+        'ed_volume': float(counts[2]) * voxel_volume_mm3,
+    }
+    volumes['tc_volume'] = volumes['et_volume'] + volumes['ncr_volume']
+    volumes['wt_volume'] = volumes['tc_volume'] + volumes['ed_volume']
+    return volumes
+
+
+# ============================================================
+# Cache
+# ============================================================
+
+def gt_dir(job_id: str) -> Path:
+    return Path(django_settings.CDSS_AI_STORAGE) / job_id / GT_DIRNAME
+
+
+def _read_meta(job_id: str) -> Optional[dict]:
+    try:
+        with open(gt_dir(job_id) / META_FILENAME, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get('format') == GT_FORMAT else None
+
+
+def indexed_series_last_update(series_id: str) -> str:
+    """로컬 DICOM 인덱스의 SEG 시리즈 LastUpdate (인덱스에 없으면 '') - Orthanc 조회 없음"""
+    from apps.orthancproxy.models import DicomSeries
+
+    return DicomSeries.objects.filter(orthanc_id=series_id).values_list('last_update', flat=True).first() or ''
+
+
+def load_cached_ground_truth(
+    job_id: str,
+    series_id: str,
+    pred_version: str,
+    series_last_update: str = '',
+) -> Optional[dict]:
+    """
+    저장된 GT 반환 (series_id / 예측 버전이 같을 때만)
+
+    - 수집 성공: Orthanc 의 LastUpdate 는 확인하지 않음 - SEG 재업로드 시 ingest_ground_truth(force=True)
+    - 수집 실패 기록: {..., error, mask: None} 반환
+      series_last_update 가 주어지고 실패 당시 값과 다르면 None (SEG 가 바뀌었으므로 다시 수집)
+    """
+    meta = _read_meta(job_id)
+    if meta is None or meta.get('series_id') != series_id or meta.get('pred_version') != pred_version:
+        return None
+    if meta.get('error'):
+        recorded = meta.get('series_last_update')
+        if series_last_update and recorded and series_last_update != recorded:
+            return None
+        return dict(meta, mask=None)
+    try:
+        mask = np.load(gt_dir(job_id) / GT_FILENAME, mmap_mode='r', allow_pickle=False)
+    except (OSError, ValueError):
+        return None
+    return dict(meta, mask=mask)
+
+
+def _publish(job_id: str, meta: dict, mask: Optional[np.ndarray] = None) -> bool:
+    """gt_seg/ 를 tmp 디렉토리에 기록 후 rename 으로 교체 (실패 시 False)"""
+    out_dir = gt_dir(job_id)
+    tmp_dir = out_dir.parent / f'.{GT_DIRNAME}.tmp-{uuid.uuid4().hex[:8]}'
+    try:
+        tmp_dir.mkdir(parents=True)
+        if mask is not None:
+            np.save(tmp_dir / GT_FILENAME, mask)
+        with open(tmp_dir / META_FILENAME, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        if out_dir.exists():
+            shutil.rmtree(out_dir, ignore_errors=True)
+        os.rename(tmp_dir, out_dir)
+    except OSError as e:
+        logger.error(f"GT SEG 저장 실패 ({job_id}): {e}")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return False
+    return True
+
+
+def _record_failure(job_id: str, series_id: str, series_last_update: str, pred_version: str, error: str):
+    """수집 실패 기록 - 같은 SEG (LastUpdate) 로는 다시 다운로드/디코딩하지 않도록"""
+    logger.warning(f"GT SEG 수집 실패: job={job_id}, series={series_id}: {error}")
+    _publish(job_id, {
+        'format': GT_FORMAT,
+        'job_id': job_id,
+        'series_id': series_id,
+        'series_last_update': series_last_update,
+        'pred_version': pred_version,
+        'error': error,
+    })
+
+
+def ingest_ground_truth(inference, force: bool = False) -> Optional[dict]:
+    """
+    M1 추론의 GT SEG 수집 → 리샘플링 → 메트릭 계산 → 저장
+
+    Returns:
+        {mask, original_shape, label_map, gt_volumes, comparison_metrics, ...}
+        (MRI OCS / SEG 시리즈 / 예측 결과가 없거나 수집/저장 실패 시 None)
+    """
+    job_id = inference.job_id
+    if not inference.mri_ocs:
+        return None
+    series_id = find_seg_series(inference.mri_ocs)
+    if not series_id:
+        return None
+
+    job_volumes = load_job_volumes(job_id)
+    if job_volumes is None or 'prediction' not in job_volumes.arrays:
+        return None
+    pred_mask = job_volumes.arrays['prediction']
+    pred_version = job_volumes.version
+
+    cached = None if force else load_cached_ground_truth(job_id, series_id, pred_version)
+    if cached is not None and not cached.get('error'):
+        return cached
+
+    series_last_update = ''
+    try:
+        with requests.Session() as session:
+            r = session.get(f"{_orthanc_url()}/series/{series_id}", timeout=30)
+            r.raise_for_status()
+            series_info = r.json()
+            series_last_update = series_info.get('LastUpdate', '')
+
+            # 이전 실패 이후 SEG 가 바뀌지 않았으면 다시 받지 않음
+            if cached is not None and cached.get('series_last_update') == series_last_update:
+                logger.info(f"SEG 시리즈 {series_id}: 이전 수집 실패 이후 변경 없음, 건너뜀")
+                return None
+
+            instances = series_info.get('Instances', [])
+            if not instances:
+                raise ValueError('SEG 시리즈에 인스턴스가 없습니다.')
+            logger.info(f"SEG 시리즈 로드: {series_id}, 인스턴스 수: {len(instances)}")
+
+            try:
+                dicom_bytes = _fetch_series_archive(session, series_id)
+            except (requests.exceptions.RequestException, zipfile.BadZipFile) as e:
+                logger.warning(f"SEG archive 다운로드 실패, Instance 단위로 재시도: {e}")
+                dicom_bytes = _fetch_instances(session, instances)
+
+        seg_volume = _decode_seg_instances(dicom_bytes)
+        if seg_volume is None:
+            raise ValueError('SEG 시리즈에 픽셀 데이터가 없습니다.')
+    except Exception as e:
+        _record_failure(job_id, series_id, series_last_update, pred_version, f"{type(e).__name__}: {e}")
+        return None
+
+    gt_mask, label_map = normalize_labels(seg_volume)
+    logger.info(f"SEG 볼륨 로드 완료: shape={gt_mask.shape}, label_map={label_map}")
+
+    gt_resampled = resample_nearest(gt_mask, pred_mask.shape)
+    meta = {
+        'format': GT_FORMAT,
+        'job_id': job_id,
+        'series_id': series_id,
+        'series_last_update': series_last_update,
+        'pred_version': pred_version,
+        'original_shape': list(gt_mask.shape),
+        'label_map': {str(k): v for k, v in label_map.items()},
+        'gt_volumes': compute_gt_volumes(gt_mask),
+        'comparison_metrics': compute_metrics(pred_mask, gt_resampled),
+    }
+
+    if not _publish(job_id, meta, gt_resampled):
+        return None
+
+    logger.info(
+        f"GT SEG 수집 완료: job={job_id}, Dice WT={meta['comparison_metrics']['dice_wt']:.4f}"
+    )
+    return dict(meta, mask=gt_resampled)
+
+
+def schedule_ground_truth(inference, force: bool = True) -> bool:
+    """백그라운드 워커에 GT SEG 수집 요청 (SEG 시리즈가 없으면 False)"""
+    if not inference.mri_ocs or not find_seg_series(inference.mri_ocs):
+        return False
+    return submit_once(f'gt_seg:{inference.job_id}', ingest_ground_truth, inference, force=force)
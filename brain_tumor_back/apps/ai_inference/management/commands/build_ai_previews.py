@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+
+from apps.ai_inference.models import AIInference
+from apps.ai_inference.previews import build_job_previews, read_preview_manifest
+
+
+class Command(BaseCommand):
+    help = 'Backfill M1 thumbnail / key-slice previews for completed inferences'
+
+    def add_arguments(self, parser):
+        parser.add_argument('job_ids', nargs='*', help='생성할 job_id (생략 시 완료된 M1 전체)')
+        parser.add_argument('--force', action='store_true', help='이미 생성된 미리보기도 다시 생성')
+        parser.add_argument('--dry-run', action='store_true', help='생성 대상만 출력')
+
+    def handle(self, *args, **options):
+        self.stdout.write("=" * 60)
+        self.stdout.write("M1 Preview Backfill")
+        self.stdout.write("=" * 60)
+
+        queryset = AIInference.objects.filter(
+            model_type=AIInference.ModelType.M1,
+            status=AIInference.Status.COMPLETED,
+        )
+        if options['job_ids']:
+            queryset = queryset.filter(job_id__in=options['job_ids'])
+
+        built = skipped = failed = 0
+        for job_id in queryset.order_by('-completed_at').values_list('job_id', flat=True).iterator():
+            if not options['force'] and read_preview_manifest(job_id) is not None:
+                skipped += 1
+                continue
+
+            if options['dry_run']:
+                self.stdout.write(f"  {job_id}: needs previews")
+                continue
+
+            try:
+                manifest = build_job_previews(job_id, force=options['force'])
+            except Exception as e:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f"  {job_id}: FAILED - {e}"))
+                continue
+
+            if manifest is None:
+                failed += 1
+                self.stdout.write(self.style.WARNING(f"  {job_id}: no segmentation result"))
+                continue
+
+            built += 1
+            self.stdout.write(self.style.SUCCESS(
+                f"  {job_id}: {', '.join(manifest['previews'].keys())}"
+            ))
+
+        self.stdout.write(f"\nBuilt: {built}, Existing: {skipped}, Failed: {failed}")
@@ -0,0 +1,57 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.ai_inference.volumes import SEG_FILENAME, store_is_current, transcode_job_store
+
+
+class Command(BaseCommand):
+    help = 'Convert existing M1 result NPZ files in CDSS_STORAGE/AI to the memory-mapped .npy store'
+
+    def add_arguments(self, parser):
+        parser.add_argument('job_ids', nargs='*', help='변환할 job_id (생략 시 전체)')
+        parser.add_argument('--force', action='store_true', help='최신 저장소가 있어도 다시 변환')
+        parser.add_argument('--dry-run', action='store_true', help='변환 대상만 출력')
+
+    def handle(self, *args, **options):
+        storage = Path(settings.CDSS_AI_STORAGE)
+        self.stdout.write("=" * 60)
+        self.stdout.write(f"M1 Result Store Transcode ({storage})")
+        self.stdout.write("=" * 60)
+
+        if options['job_ids']:
+            job_dirs = [storage / job_id for job_id in options['job_ids']]
+        elif storage.exists():
+            job_dirs = sorted(p for p in storage.iterdir() if p.is_dir())
+        else:
+            job_dirs = []
+
+        converted = skipped = failed = 0
+        for job_dir in job_dirs:
+            if not (job_dir / SEG_FILENAME).exists():
+                continue
+
+            job_id = job_dir.name
+            if not options['force'] and store_is_current(job_id):
+                skipped += 1
+                self.stdout.write(f"  {job_id}: up to date")
+                continue
+
+            if options['dry_run']:
+                self.stdout.write(f"  {job_id}: needs transcode")
+                continue
+
+            try:
+                manifest = transcode_job_store(job_id, force=options['force'])
+            except Exception as e:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f"  {job_id}: FAILED - {e}"))
+                continue
+
+            converted += 1
+            self.stdout.write(self.style.SUCCESS(
+                f"  {job_id}: {', '.join(manifest['arrays'].keys())}"
+            ))
+
+        self.stdout.write(f"\nConverted: {converted}, Up to date: {skipped}, Failed: {failed}")
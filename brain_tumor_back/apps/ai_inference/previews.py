@@ -0,0 +1,241 @@
+"""
+M1 결과 미리보기 이미지 (썸네일 + key slice)
+
+modAI M1 Celery 워커가 추론 직후 렌더링해 콜백 파일로 함께 전송
+(m1_previews.json + m1_preview_<name>.png, 렌더링 규칙은 modAI utils/previews.py 와 동일) → 콜백에서 previews/ 로 옮기고 manifest 작성 (렌더링 없음)
+
+    CDSS_STORAGE/AI/<job_id>/previews/
+        manifest.json       # {format, previews: {name: {file, hash, axis, index}}}
+        thumbnail.png       # T1CE 중간 axial 슬라이스 + 세그멘테이션 오버레이 (기존 썸네일)
+        axial.png / coronal.png / sagittal.png   # 종양 면적이 가장 큰 슬라이스
+
+- 응답은 파일 그대로 전송 (ETag = 내용 해시), URL 에 ?v=<hash> 를 붙이면 장기 캐시
+- 콜백에 미리보기가 없으면 (이전 modAI / 렌더링 실패) 백그라운드 스레드에서 생성
+- 이전 결과는 첫 요청에서 생성, 일괄 생성은 build_ai_previews 명령
+"""
+import hashlib
+import io
+import json
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from django.conf import settings as django_settings
+
+from .background import submit_once
+from .volumes import AXES, MRI_CHANNELS, load_job_volumes
+
+logger = logging.getLogger(__name__)
+
+PREVIEW_DIRNAME = 'previews'
+MANIFEST_FILENAME = 'manifest.json'
+UPLOADED_PREVIEWS_FILENAME = 'm1_previews.json'  # modAI 가 콜백으로 보낸 미리보기 목록
+# 렌더링 규칙 버전 - 바뀌면 이전 미리보기는 다시 생성 (2: ET 레이블 3)
+PREVIEW_FORMAT = 2
+PREVIEW_NAMES = ('thumbnail',) + tuple(AXES.keys())
+
+# M1 마스크 레이블: 1=NCR/NET (빨강), 2=ED (노랑), 3=ET (초록) - BraTS 4 는 전처리에서 3 으로 변환됨
+OVERLAY_COLORS = {
+    1: [255, 100, 100],
+    2: [255, 255, 100],
+    3: [100, 255, 100],
+}
+OVERLAY_ALPHA = 0.5
+
+
+def render_overlay(mri_slice: np.ndarray, seg_slice: np.ndarray) -> bytes:
+    """MRI 슬라이스에 세그멘테이션 마스크를 오버레이한 PNG 이미지 생성"""
+    from PIL import Image
+
+    mri_slice = np.asarray(mri_slice, dtype=np.float32)
+    seg_slice = np.asarray(seg_slice)
+
+    # MRI 정규화 (0-255)
+    lo, hi = float(mri_slice.min()), float(mri_slice.max())
+    if hi > lo:
+        mri_norm = ((mri_slice - lo) / (hi - lo) * 255).astype(np.uint8)
+    else:
+        mri_norm = np.zeros(mri_slice.shape, dtype=np.uint8)
+
+    # 그레이스케일 → RGB
+    rgb = np.stack([mri_norm] * 3, axis=-1)
+
+    for label, color in OVERLAY_COLORS.items():
+        mask = seg_slice == label
+        if np.any(mask):
+            rgb[mask] = (rgb[mask] * (1 - OVERLAY_ALPHA) + np.array(color) * OVERLAY_ALPHA).astype(np.uint8)
+
+    # 이미지 회전 (상하 반전하여 정상 방향으로)
+    rgb = np.flipud(rgb)
+
+    img = Image.fromarray(np.ascontiguousarray(rgb))
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def _take(volume: np.ndarray, axis: int, index: int) -> np.ndarray:
+    return np.asarray(np.take(volume, index, axis=axis))
+
+
+def _key_slice(seg_mask: np.ndarray, axis: int) -> int:
+    """종양 voxel 이 가장 많은 슬라이스 (종양이 없으면 중간)"""
+    other_axes = tuple(a for a in range(seg_mask.ndim) if a != axis)
+    counts = np.count_nonzero(seg_mask, axis=other_axes)
+    if counts.max() == 0:
+        return seg_mask.shape[axis] // 2
+    return int(np.argmax(counts))
+
+
+def preview_dir(job_id: str) -> Path:
+    return Path(django_settings.CDSS_AI_STORAGE) / job_id / PREVIEW_DIRNAME
+
+
+def read_preview_manifest(job_id: str) -> Optional[dict]:
+    """생성된 미리보기 manifest (없거나 이전 렌더링 규칙이면 None)"""
+    try:
+        with open(preview_dir(job_id) / MANIFEST_FILENAME, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get('format') == PREVIEW_FORMAT else None
+
+
+def build_job_previews(job_id: str, force: bool = False) -> Optional[dict]:
+    """
+    썸네일 + key slice 미리보기 생성
+
+    Returns:
+        manifest (세그멘테이션 결과가 없으면 None)
+    """
+    if not force:
+        manifest = read_preview_manifest(job_id)
+        if manifest is not None:
+            return manifest
+
+    job_volumes = load_job_volumes(job_id)
+    if job_volumes is None or 'prediction' not in job_volumes.arrays:
+        return None
+
+    arrays = job_volumes.arrays
+    seg_mask = arrays['prediction']
+    mri_data = None
+    for key in ('t1ce',) + MRI_CHANNELS:
+        if key in arrays:
+            mri_data = arrays[key]
+            break
+
+    def overlay(axis: int, index: int) -> bytes:
+        seg_slice = _take(seg_mask, axis, index)
+        mri_slice = _take(mri_data, axis, index) if mri_data is not None else np.zeros(seg_slice.shape)
+        return render_overlay(mri_slice, seg_slice)
+
+    images = {}
+    axial = AXES['axial']
+    images['thumbnail'] = (axial, seg_mask.shape[axial] // 2)
+    seg_full = np.asarray(seg_mask)
+    for axis_name, axis in AXES.items():
+        images[axis_name] = (axis, _key_slice(seg_full, axis))
+
+    out_dir = preview_dir(job_id)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {'format': PREVIEW_FORMAT, 'job_id': job_id, 'version': job_volumes.version, 'previews': {}}
+    for name, (axis, index) in images.items():
+        content = overlay(axis, index)
+        filename = f'{name}.png'
+        tmp_path = out_dir / f'.{filename}.{uuid.uuid4().hex[:8]}'
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, out_dir / filename)
+        manifest['previews'][name] = {
+            'file': filename,
+            'hash': hashlib.sha256(content).hexdigest()[:16],
+            'axis': next(k for k, v in AXES.items() if v == axis),
+            'index': index,
+            'size': len(content),
+        }
+
+    _write_manifest(out_dir, manifest)
+    logger.info(f'Previews built for job {job_id}: {list(manifest["previews"].keys())}')
+    return manifest
+
+
+def _write_manifest(out_dir: Path, manifest: dict):
+    tmp_path = out_dir / f'.{MANIFEST_FILENAME}.{uuid.uuid4().hex[:8]}'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, out_dir / MANIFEST_FILENAME)
+
+
+def install_job_previews(job_id: str) -> Optional[dict]:
+    """
+    modAI 워커가 렌더링해 콜백으로 보낸 미리보기를 previews/ 로 이동 + manifest 작성
+
+    Returns:
+        manifest (콜백에 미리보기가 없거나 일부 누락이면 None → build_job_previews 로 생성)
+    """
+    job_dir = Path(django_settings.CDSS_AI_STORAGE) / job_id
+    try:
+        with open(job_dir / UPLOADED_PREVIEWS_FILENAME, 'r', encoding='utf-8') as f:
+            uploaded = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if uploaded.get('format') != PREVIEW_FORMAT:
+        return None  # 다른 렌더링 규칙의 modAI - 여기서 다시 생성
+    uploaded = uploaded.get('previews') or {}
+
+    sources = {}
+    for name in PREVIEW_NAMES:
+        info = uploaded.get(name)
+        source = job_dir / Path(info['file']).name if info else None
+        if source is None or not source.exists():
+            return None
+        sources[name] = source
+
+    job_volumes = load_job_volumes(job_id)
+    out_dir = preview_dir(job_id)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {
+        'format': PREVIEW_FORMAT,
+        'job_id': job_id,
+        'version': job_volumes.version if job_volumes is not None else None,
+        'previews': {},
+    }
+    for name in PREVIEW_NAMES:
+        info = uploaded[name]
+        with open(sources[name], 'rb') as f:
+            content = f.read()
+        filename = f'{name}.png'
+        os.replace(sources[name], out_dir / filename)
+        manifest['previews'][name] = {
+            'file': filename,
+            'hash': hashlib.sha256(content).hexdigest()[:16],
+            'axis': info['axis'],
+            'index': int(info['index']),
+            'size': len(content),
+        }
+
+    _write_manifest(out_dir, manifest)
+    os.remove(job_dir / UPLOADED_PREVIEWS_FILENAME)
+    logger.info(f'Previews installed for job {job_id}: {list(manifest["previews"].keys())}')
+    return manifest
+
+
+def schedule_job_previews(job_id: str, force: bool = True) -> bool:
+    """백그라운드 워커에 미리보기 생성 요청 (같은 job 이 대기 중이면 무시)"""
+    return submit_once(f'previews:{job_id}', build_job_previews, job_id, force=force)
+
+
+def preview_url(job_id: str, name: str = 'thumbnail', manifest: Optional[dict] = None) -> str:
+    """미리보기 URL (생성돼 있으면 ?v=<hash> 포함 → 브라우저 장기 캐시)"""
+    url = f'/api/ai/inferences/{job_id}/thumbnail/'
+    params = []
+    if name != 'thumbnail':
+        params.append(f'view={name}')
+    info = ((manifest or {}).get('previews') or {}).get(name)
+    if info:
+        params.append(f'v={info["hash"]}')
+    return url + ('?' + '&'.join(params) if params else '')
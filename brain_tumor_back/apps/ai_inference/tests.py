@@ -0,0 +1,89 @@
+import io
+import tempfile
+
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+
+from .ground_truth import _record_failure, load_cached_ground_truth, resample_nearest
+from .previews import _key_slice, render_overlay
+
+
+class ResampleNearestTest(SimpleTestCase):
+    """GT SEG 리샘플링 테스트 (scipy.ndimage.zoom(order=0) 과 같은 매핑인지)"""
+
+    def _assert_matches_zoom(self, mask, shape):
+        from scipy.ndimage import zoom
+
+        factors = [dst / src for src, dst in zip(mask.shape, shape)]
+        expected = zoom(mask, factors, order=0, mode='nearest')
+        self.assertEqual(expected.shape, tuple(shape))
+        np.testing.assert_array_equal(resample_nearest(mask, shape), expected)
+
+    def test_non_integer_ratios(self):
+        rng = np.random.default_rng(0)
+        for src, dst in [(3, 5), (4, 7), (5, 3), (7, 4), (8, 26), (22, 20), (30, 8), (155, 128)]:
+            with self.subTest(src=src, dst=dst):
+                mask = rng.integers(0, 5, size=(src, 2)).astype(np.uint8)
+                self._assert_matches_zoom(mask, (dst, 2))
+
+    def test_3d_volume(self):
+        mask = np.random.default_rng(1).integers(0, 5, size=(6, 9, 5)).astype(np.uint8)
+        self._assert_matches_zoom(mask, (10, 7, 12))
+
+    def test_same_shape_returns_input(self):
+        mask = np.zeros((4, 4, 4), dtype=np.uint8)
+        self.assertIs(resample_nearest(mask, (4, 4, 4)), mask)
+
+
+class GroundTruthFailureMarkerTest(SimpleTestCase):
+    """GT SEG 수집 실패 기록 (같은 SEG 로는 다시 수집하지 않음)"""
+
+    def setUp(self):
+        self.storage = tempfile.TemporaryDirectory()
+        self.addCleanup(self.storage.cleanup)
+        settings_override = override_settings(CDSS_AI_STORAGE=self.storage.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        _record_failure('job1', 'seg1', 'LU1', 'v1', 'ValueError: 픽셀 데이터 없음')
+
+    def test_failure_is_returned_without_mask(self):
+        cached = load_cached_ground_truth('job1', 'seg1', 'v1')
+        self.assertEqual(cached['error'], 'ValueError: 픽셀 데이터 없음')
+        self.assertIsNone(cached['mask'])
+
+    def test_same_last_update_keeps_failure(self):
+        self.assertIsNotNone(load_cached_ground_truth('job1', 'seg1', 'v1', 'LU1'))
+
+    def test_changed_seg_or_prediction_retries(self):
+        self.assertIsNone(load_cached_ground_truth('job1', 'seg1', 'v1', 'LU2'))
+        self.assertIsNone(load_cached_ground_truth('job1', 'seg1', 'v2'))
+        self.assertIsNone(load_cached_ground_truth('job1', 'seg2', 'v1'))
+
+
+class PreviewRenderTest(SimpleTestCase):
+    """
+    미리보기 렌더링 규칙 고정
+
+    modAI test_previews.py 와 같은 입력/기대값 - 콜백으로 받은 미리보기와 이 fallback 이 같은 이미지여야 함
+    """
+
+    MRI = [[0, 0.5, 1], [1, 0.5, 0]]
+    SEG = [[0, 1, 2], [3, 4, 0]]
+    # 상하 반전, 1=NCR 빨강 / 2=ED 노랑 / 3=ET 초록, 4 는 M1 마스크에 없음 (칠하지 않음)
+    EXPECTED = [
+        [[177, 255, 177], [127, 127, 127], [0, 0, 0]],
+        [[0, 0, 0], [191, 113, 113], [255, 255, 177]],
+    ]
+
+    def test_overlay_pixels(self):
+        from PIL import Image
+
+        png = render_overlay(np.array(self.MRI), np.array(self.SEG))
+        np.testing.assert_array_equal(np.asarray(Image.open(io.BytesIO(png))), self.EXPECTED)
+
+    def test_key_slice(self):
+        seg = np.zeros((4, 5, 6), dtype=np.uint8)
+        seg[1, :3, 2] = 3
+        seg[1:3, 4, 4] = 1
+        self.assertEqual([_key_slice(seg, axis) for axis in range(3)], [1, 4, 2])
+        self.assertEqual(_key_slice(np.zeros((4, 5, 6)), 2), 3)
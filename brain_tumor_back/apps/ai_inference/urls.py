@@ -13,6 +13,8 @@ from .views import (
     AIInferenceFilesListView,
     AIInferenceSegmentationView,
     AIInferenceSegmentationCompareView,
+    AIInferenceVolumeMetaView,
+    AIInferenceVolumeDataView,
     AIInferenceReviewView,
     AIInferenceM1ThumbnailView,
     MGGeneExpressionView,
@@ -57,6 +59,10 @@ urlpatterns = [
     path('inferences/<str:job_id>/segmentation/', AIInferenceSegmentationView.as_view(), name='inference-segmentation'),
     path('inferences/<str:job_id>/segmentation/compare/', AIInferenceSegmentationCompareView.as_view(), name='inference-segmentation-compare'),
 
+    # Volume slices (native dtype binary)
+    path('inferences/<str:job_id>/volumes/', AIInferenceVolumeMetaView.as_view(), name='inference-volumes'),
+    path('inferences/<str:job_id>/volumes/<str:name>/', AIInferenceVolumeDataView.as_view(), name='inference-volume-data'),
+
     # Thumbnail (M1)
     path('inferences/<str:job_id>/thumbnail/', AIInferenceM1ThumbnailView.as_view(), name='inference-thumbnail'),
 
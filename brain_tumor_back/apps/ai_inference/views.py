@@ -5,7 +5,7 @@ import os
 import mimetypes
 from pathlib import Path
 from django.utils import timezone
-from django.http import FileResponse, Http404
+from django.http import FileResponse, Http404, HttpResponse
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -365,7 +365,8 @@ class InferenceCallbackView(APIView):
     FastAPI 콜백 수신
 
     POST /api/ai/callback/
-    - FastAPI에서 추론 결과와 파일 내용을 함께 전송
+    - multipart/form-data: payload(JSON) 필드 + files 파트 (스트리밍, SHA-256 검증)
+    - application/json: 파일 내용을 base64로 포함 (이전 버전 호환)
     - Django에서 CDSS_STORAGE/AI/<job_id>/에 파일 저장
 
     Note: AllowAny - FastAPI 내부 서버 콜백용 (로컬 네트워크)
@@ -430,14 +431,24 @@ class InferenceCallbackView(APIView):
                 {'detail': '허용되지 않은 IP입니다.'},
                 status=status.HTTP_403_FORBIDDEN
             )
-        import base64
-        import numpy as np
+        # multipart/form-data (파일 스트리밍) 또는 JSON (base64 내장, 이전 버전 호환)
+        is_multipart = request.content_type.startswith('multipart/')
+        if is_multipart:
+            try:
+                payload = json.loads(request.data.get('payload') or '{}')
+            except (TypeError, ValueError):
+                return Response(
+                    {'detail': 'payload JSON이 올바르지 않습니다.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        else:
+            payload = request.data
 
-        job_id = request.data.get('job_id')
-        cb_status = request.data.get('status')
-        result_data = request.data.get('result_data', {})
-        error_message = request.data.get('error_message')
-        files_data = request.data.get('files', {})  # 파일 내용 (base64 인코딩)
+        job_id = payload.get('job_id')
+        cb_status = payload.get('status')
+        result_data = payload.get('result_data') or {}
+        error_message = payload.get('error_message')
+        files_data = payload.get('files', {})  # multipart: manifest, JSON: 파일 내용 (base64 인코딩)
 
         if not job_id:
             return Response(
@@ -454,14 +465,45 @@ class InferenceCallbackView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
 
+        # 중복 콜백 (modAI outbox 재전송) - 이미 반영된 결과면 그대로 성공 응답
+        idempotency_key = payload.get('idempotency_key')
+        if idempotency_key and self._is_duplicate_callback(inference, idempotency_key, cb_status):
+            logger.info(f'Duplicate callback ignored: job_id={job_id}, key={idempotency_key}')
+            return Response({'status': 'ok', 'duplicate': True})
+
         # 상태 업데이트
         if cb_status == 'completed':
             # 파일 저장
-            if files_data:
+            if is_multipart:
+                try:
+                    saved_files = self._save_uploaded_files(
+                        job_id, request.FILES.getlist('files'), files_data
+                    )
+                except ValueError as e:
+                    # 무결성 검증 실패 - modAI에서 재전송하도록 4xx 반환 (상태 변경 없음)
+                    logger.error(f'Callback file integrity check failed for job {job_id}: {e}')
+                    return Response(
+                        {'detail': str(e)},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                result_data['saved_files'] = saved_files
+                logger.info(f'Files saved for job {job_id}: {list(saved_files.keys())}')
+            elif files_data:
                 saved_files = self._save_files(job_id, files_data)
                 result_data['saved_files'] = saved_files
                 logger.info(f'Files saved for job {job_id}: {list(saved_files.keys())}')
 
+            # M1 결과 NPZ → 비압축 .npy 저장소 (뷰어 요청마다 압축 해제하지 않도록)
+            # 썸네일 / key slice 미리보기는 modAI 워커가 렌더링해 보낸 파일을 설치
+            # (콜백에 없으면 백그라운드에서 생성)
+            if inference.model_type == AIInference.ModelType.M1:
+                self._build_result_store(job_id)
+                from .ground_truth import schedule_ground_truth
+                self._install_previews(job_id)
+                schedule_ground_truth(inference)
+
+            if idempotency_key:
+                result_data['callback_key'] = idempotency_key
             inference.status = AIInference.Status.COMPLETED
             inference.result_data = result_data
             inference.completed_at = timezone.now()
@@ -479,6 +521,40 @@ class InferenceCallbackView(APIView):
 
         return Response({'status': 'ok'})
 
+    @staticmethod
+    def _is_duplicate_callback(inference, idempotency_key: str, cb_status: str) -> bool:
+        """이미 처리된 콜백인지 확인 (idempotency_key = "<job_id>:<status>")"""
+        if cb_status == 'completed':
+            return (
+                inference.status == AIInference.Status.COMPLETED
+                and (inference.result_data or {}).get('callback_key') == idempotency_key
+            )
+        return inference.status == AIInference.Status.FAILED
+
+    @staticmethod
+    def _build_result_store(job_id: str):
+        """M1 결과 저장소 변환 (실패해도 콜백은 성공 - 첫 조회 시 다시 시도)"""
+        from .volumes import transcode_job_store
+
+        try:
+            manifest = transcode_job_store(job_id, force=True)
+            if manifest:
+                logger.info(f'Result store built for job {job_id}: {list(manifest["arrays"].keys())}')
+        except Exception as e:
+            logger.error(f'Result store build failed for job {job_id}: {e}')
+
+    @staticmethod
+    def _install_previews(job_id: str):
+        """콜백으로 받은 미리보기 설치 (없거나 실패하면 백그라운드 생성으로 대체)"""
+        from .previews import install_job_previews, schedule_job_previews
+
+        try:
+            if install_job_previews(job_id) is not None:
+                return
+        except Exception as e:
+            logger.error(f'Preview install failed for job {job_id}: {e}')
+        schedule_job_previews(job_id)
+
     def _save_files(self, job_id: str, files_data: dict) -> dict:
         """
         FastAPI에서 받은 파일 내용을 CDSS_STORAGE에 저장
@@ -542,6 +618,76 @@ class InferenceCallbackView(APIView):
 
         return saved_files
 
+    def _save_uploaded_files(self, job_id: str, uploaded_files: list, manifest: dict) -> dict:
+        """
+        multipart로 받은 파일을 chunk 단위로 CDSS_STORAGE에 저장
+
+        - manifest 에 없는 파일은 검증할 수 없으므로 저장하지 않음 (경고 로그)
+        - 파일별로 .part 임시 파일에 기록하며 SHA-256 계산
+        - manifest의 sha256/size와 일치하는 경우에만 최종 파일명으로 교체
+        - manifest에 있는데 도착하지 않은 파일이 있으면 실패
+
+        Args:
+            job_id: 작업 ID
+            uploaded_files: request.FILES.getlist('files')
+            manifest: {filename: {type, size, sha256}}
+
+        Returns:
+            저장된 파일명 목록
+
+        Raises:
+            ValueError: 무결성 검증 실패
+        """
+        import hashlib
+
+        output_dir = self.STORAGE_BASE / job_id
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        saved_files = {'job_id': job_id}
+        received = set()
+        part_paths = []
+
+        try:
+            for uploaded in uploaded_files:
+                filename = Path(uploaded.name).name
+                expected = manifest.get(filename)
+                if not expected:
+                    logger.warning(f'  Skipped {filename}: manifest 에 없는 파일 (무결성 검증 불가)')
+                    continue
+                part_path = output_dir / f'{filename}.part'
+                part_paths.append(part_path)
+
+                digest = hashlib.sha256()
+                size = 0
+                with open(part_path, 'wb') as f:
+                    for chunk in uploaded.chunks():
+                        digest.update(chunk)
+                        size += len(chunk)
+                        f.write(chunk)
+
+                if digest.hexdigest() != expected.get('sha256'):
+                    raise ValueError(f'SHA-256 불일치: {filename}')
+                if expected.get('size') is not None and size != int(expected['size']):
+                    raise ValueError(f'파일 크기 불일치: {filename} ({size} != {expected["size"]})')
+
+                os.replace(part_path, output_dir / filename)
+                received.add(filename)
+
+                # 파일명에서 확장자 제거한 키 생성
+                key = filename.rsplit('.', 1)[0] if '.' in filename else filename
+                saved_files[key] = filename
+                logger.info(f'  Saved: {filename} ({size} bytes)')
+
+            missing = set(manifest.keys()) - received
+            if missing:
+                raise ValueError(f'누락된 파일: {sorted(missing)}')
+        finally:
+            for part_path in part_paths:
+                if part_path.exists():
+                    part_path.unlink()
+
+        return saved_files
+
     def _send_websocket_notification(self, inference):
         """WebSocket으로 결과 알림"""
         try:
@@ -885,61 +1031,38 @@ class AIInferenceSegmentationView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        result_dir = self.STORAGE_BASE / job_id
-        seg_file = result_dir / "m1_segmentation.npz"
-        mri_file = result_dir / "m1_preprocessed_mri.npz"
-
-        if not seg_file.exists():
-            return Response(
-                {'detail': '세그멘테이션 파일을 찾을 수 없습니다.'},
-                status=status.HTTP_404_NOT_FOUND
-            )
+        from .volumes import load_job_volumes
 
         try:
-            # 세그멘테이션 NPZ 파일 로드
-            seg_data = np.load(seg_file, allow_pickle=True)
-
-            # 세그멘테이션 마스크 (mask 또는 segmentation_mask 키 사용)
-            if 'mask' in seg_data:
-                seg_mask = seg_data['mask']  # (128, 128, 128)
-            elif 'segmentation_mask' in seg_data:
-                seg_mask = seg_data['segmentation_mask']
-            else:
-                logger.error(f"세그멘테이션 키를 찾을 수 없습니다. 가능한 키: {list(seg_data.keys())}")
+            # 결과 저장소 (m1_store/*.npy, memory-mapped)
+            job_volumes = load_job_volumes(job_id)
+            if job_volumes is None:
+                return Response(
+                    {'detail': '세그멘테이션 파일을 찾을 수 없습니다.'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            arrays = job_volumes.arrays
+
+            # 세그멘테이션 마스크
+            if 'prediction' not in arrays:
+                logger.error(f"세그멘테이션 키를 찾을 수 없습니다. 가능한 키: {list(arrays.keys())}")
                 raise KeyError("세그멘테이션 데이터를 찾을 수 없습니다.")
+            seg_mask = arrays['prediction']  # (128, 128, 128)
 
             # 볼륨 정보
-            volumes = {}
-            for key in ['wt_volume', 'tc_volume', 'et_volume', 'ncr_volume', 'ed_volume']:
-                if key in seg_data:
-                    vol_val = seg_data[key]
-                    volumes[key] = float(vol_val.item()) if hasattr(vol_val, 'item') else float(vol_val)
+            volumes = job_volumes.metadata()['tumor_volumes']
 
-            # 전처리된 MRI NPZ 파일 로드 (4채널: T1, T1CE, T2, FLAIR)
+            # 전처리된 MRI (4채널: T1, T1CE, T2, FLAIR)
             mri_channels = {}
-            mri_data = None
+            for ch_name in ['t1', 't1ce', 't2', 'flair']:
+                if ch_name in arrays:
+                    mri_channels[ch_name] = self._encode_array(arrays[ch_name], use_binary)
 
-            if mri_file.exists():
-                mri_npz = np.load(mri_file, allow_pickle=True)
-                logger.info(f'Preprocessed MRI file found: {list(mri_npz.keys())}')
-
-                # 4채널 MRI 데이터 로드
-                for ch_name in ['t1', 't1ce', 't2', 'flair']:
-                    if ch_name in mri_npz:
-                        mri_channels[ch_name] = self._encode_array(mri_npz[ch_name], use_binary)
-
-                # 기본 표시용 MRI는 T1CE 채널 사용
-                if 't1ce' in mri_npz:
-                    mri_data = mri_npz['t1ce']
-                elif 't1' in mri_npz:
-                    mri_data = mri_npz['t1']
-
-                logger.info(f'MRI channels loaded: {list(mri_channels.keys())}')
-            else:
-                # 이전 버전 호환: segmentation.npz에서 MRI 찾기
-                if 'mri' in seg_data:
-                    mri_data = seg_data['mri']
-                    logger.info(f'MRI data found in segmentation NPZ (legacy)')
+            # 기본 표시용 MRI는 T1CE 채널 사용 (이전 결과: segmentation.npz의 mri)
+            mri_data = arrays.get('t1ce')
+            if mri_data is None:
+                mri_data = arrays.get('t1')
+            logger.info(f'MRI channels loaded: {list(mri_channels.keys())}')
 
             # 응답 데이터 구성
             response_data = {
@@ -964,17 +1087,13 @@ class AIInferenceSegmentationView(APIView):
                 response_data['mri_channels'] = mri_channels
 
             # Ground Truth 데이터 (있는 경우)
-            if 'ground_truth' in seg_data:
-                gt_mask = seg_data['ground_truth']
+            if 'ground_truth' in arrays:
+                gt_mask = arrays['ground_truth']
                 response_data['groundTruth'] = self._encode_array(gt_mask, use_binary)
                 response_data['has_ground_truth'] = True
 
                 # GT 볼륨 정보 추가
-                gt_volumes = {}
-                for key in ['gt_wt_volume', 'gt_tc_volume', 'gt_et_volume', 'gt_ncr_volume', 'gt_ed_volume']:
-                    if key in seg_data:
-                        vol_val = seg_data[key]
-                        gt_volumes[key] = float(vol_val.item()) if hasattr(vol_val, 'item') else float(vol_val)
+                gt_volumes = job_volumes.metadata()['gt_volumes']
                 if gt_volumes:
                     response_data['gt_volumes'] = gt_volumes
 
@@ -998,6 +1117,180 @@ class AIInferenceSegmentationView(APIView):
             )
 
 
+class AIInferenceVolumeMetaView(APIView):
+    """
+    M1 결과 볼륨 메타데이터 (SegMRIViewer 슬라이스 로딩용)
+
+    GET /api/ai/inferences/<job_id>/volumes/
+
+    Returns:
+        - shape: 볼륨 크기 [X, Y, Z]
+        - axes: {'sagittal': 0, 'coronal': 1, 'axial': 2}
+        - volumes: {name: {dtype, shape, nbytes}} (prediction, ground_truth, t1, t1ce, t2, flair)
+        - tumor_volumes / gt_volumes: 종양 볼륨 정보
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id):
+        from .volumes import load_job_volumes
+
+        if not AIInference.objects.filter(job_id=job_id).exists():
+            return Response(
+                {'detail': '추론 결과를 찾을 수 없습니다.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        volumes = load_job_volumes(job_id)
+        if volumes is None:
+            return Response(
+                {'detail': '세그멘테이션 파일을 찾을 수 없습니다.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        data = volumes.metadata()
+        data['slice_url'] = f'/api/ai/inferences/{job_id}/volumes/{{name}}/'
+
+        response = Response(data)
+        response['ETag'] = volumes.etag('meta')
+        response['Cache-Control'] = 'private, max-age=0, must-revalidate'
+        return response
+
+
+class AIInferenceVolumeDataView(APIView):
+    """
+    M1 결과 볼륨 바이너리 (원래 dtype, application/octet-stream)
+
+    GET /api/ai/inferences/<job_id>/volumes/<name>/                          전체 볼륨 (Range 지원)
+    GET /api/ai/inferences/<job_id>/volumes/<name>/?axis=axial&index=64      슬라이스 1장
+    GET /api/ai/inferences/<job_id>/volumes/<name>/?axis=axial&start=60&stop=70  슬라이스 범위
+
+    name: prediction | ground_truth | t1 | t1ce | t2 | flair
+
+    응답 헤더:
+        X-Volume-Dtype: uint8 | float16 ...
+        X-Volume-Shape: 응답 배열 shape (슬라이스 요청은 슬라이스 축이 첫 번째, 예: 1,128,128)
+        X-Volume-Axis / X-Slice-Start / X-Slice-Stop: 슬라이스 요청인 경우
+        ETag: 결과 파일 버전 기준 (If-None-Match → 304)
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id, name):
+        from .volumes import load_job_volumes, extract_slices, AXES
+
+        if not AIInference.objects.filter(job_id=job_id).exists():
+            return Response(
+                {'detail': '추론 결과를 찾을 수 없습니다.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        volumes = load_job_volumes(job_id)
+        if volumes is None or name not in volumes.arrays:
+            return Response(
+                {'detail': f'볼륨을 찾을 수 없습니다: {name}'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        volume = volumes.arrays[name]
+
+        axis_name = request.query_params.get('axis')
+        if axis_name is not None:
+            if axis_name not in AXES:
+                return Response(
+                    {'detail': f'axis는 {list(AXES.keys())} 중 하나여야 합니다.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            axis = AXES[axis_name]
+            try:
+                if 'index' in request.query_params:
+                    start = int(request.query_params['index'])
+                    stop = start + 1
+                else:
+                    start = int(request.query_params.get('start', 0))
+                    stop = int(request.query_params.get('stop', volume.shape[axis]))
+            except ValueError:
+                return Response(
+                    {'detail': 'index/start/stop은 정수여야 합니다.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if not (0 <= start < stop <= volume.shape[axis]):
+                return Response(
+                    {'detail': f'슬라이스 범위 오류: [{start}, {stop}) / {volume.shape[axis]}'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            etag = volumes.etag(name, axis_name, start, stop)
+        else:
+            axis = None
+            start = stop = None
+            etag = volumes.etag(name)
+
+        if etag in self._if_none_match(request):
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+            response['ETag'] = etag
+            return response
+
+        if axis is None:
+            array = volume
+        else:
+            array = extract_slices(volume, axis, start, stop)
+        payload = memoryview(array).cast('B') if array.flags.c_contiguous else array.tobytes()
+        total = len(payload)
+
+        # Range 요청 (전체 볼륨만: 뷰어에서 분할/이어받기)
+        range_header = request.META.get('HTTP_RANGE')
+        response_status = status.HTTP_200_OK
+        content_range = None
+        if range_header and axis is None:
+            byte_range = self._parse_range(range_header, total)
+            if byte_range is None:
+                response = HttpResponse(status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+                response['Content-Range'] = f'bytes */{total}'
+                return response
+            first, last = byte_range
+            payload = payload[first:last + 1]
+            response_status = status.HTTP_206_PARTIAL_CONTENT
+            content_range = f'bytes {first}-{last}/{total}'
+
+        response = HttpResponse(bytes(payload), content_type='application/octet-stream', status=response_status)
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, max-age=86400'
+        response['Accept-Ranges'] = 'bytes'
+        response['X-Volume-Dtype'] = str(array.dtype)
+        response['X-Volume-Shape'] = ','.join(str(n) for n in array.shape)
+        if content_range:
+            response['Content-Range'] = content_range
+        if axis is not None:
+            response['X-Volume-Axis'] = axis_name
+            response['X-Slice-Start'] = str(start)
+            response['X-Slice-Stop'] = str(stop)
+        return response
+
+    @staticmethod
+    def _if_none_match(request) -> list:
+        header = request.META.get('HTTP_IF_NONE_MATCH', '')
+        return [tag.strip() for tag in header.split(',') if tag.strip()]
+
+    @staticmethod
+    def _parse_range(header: str, total: int):
+        """'bytes=a-b' / 'bytes=a-' / 'bytes=-n' (단일 범위만) → (first, last) 또는 None"""
+        if not header.startswith('bytes=') or ',' in header:
+            return None
+        first_str, _, last_str = header[len('bytes='):].strip().partition('-')
+        try:
+            if first_str == '':
+                length = int(last_str)
+                if length <= 0:
+                    return None
+                first, last = max(0, total - length), total - 1
+            else:
+                first = int(first_str)
+                last = int(last_str) if last_str else total - 1
+        except ValueError:
+            return None
+        last = min(last, total - 1)
+        if first > last or first >= total:
+            return None
+        return first, last
+
+
 class MGGeneExpressionView(APIView):
     """
     MG Gene Expression 분석 데이터 조회
@@ -1314,7 +1607,7 @@ class MMInferenceView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            # m1_encoder_features.npz 읽기
+            # m1_encoder_features 읽기 (m1_store/encoder_features.npy)
             features_path = self.STORAGE_AI / m1_inference.job_id / 'm1_encoder_features.npz'
             if not features_path.exists():
                 return Response(
@@ -1323,8 +1616,14 @@ class MMInferenceView(APIView):
                 )
 
             try:
-                npz_data = np.load(str(features_path))
-                mri_features = npz_data['features'].tolist()  # m1_service.py에서 'features' 키로 저장됨
+                from .volumes import load_job_volumes
+
+                job_volumes = load_job_volumes(m1_inference.job_id)
+                if job_volumes is not None and job_volumes.features is not None:
+                    mri_features = np.asarray(job_volumes.features).tolist()
+                else:
+                    with np.load(str(features_path)) as npz_data:
+                        mri_features = npz_data['features'].tolist()  # m1_service.py에서 'features' 키로 저장됨
                 logger.info(f'[MM] Loaded MRI features: {len(mri_features)}-dim from {features_path}')
             except Exception as e:
                 return Response(
@@ -1712,7 +2011,12 @@ class AIInferenceSegmentationCompareView(APIView):
         - shape: 볼륨 크기
         - prediction_volumes: 예측 볼륨 정보
         - gt_volumes: GT 볼륨 정보 (있는 경우)
-        - comparison_metrics: 비교 메트릭 (Dice Score 등)
+        - comparison_metrics: 비교 메트릭 (Dice Score, HD95 등)
+
+    GT 는 콜백 시 백그라운드에서 수집/리샘플링되어 gt_seg/ 에 저장됨 (ground_truth.py)
+    저장된 GT 가 없으면 백그라운드 수집을 요청하고 202 (orthanc_seg_status='processing') 응답
+    → 클라이언트는 잠시 후 다시 요청
+    수집에 실패했으면 orthanc_seg_status='error' + orthanc_seg_error (SEG 가 바뀌기 전까지 다시 수집하지 않음)
     """
     permission_classes = [IsAuthenticated]
 
@@ -1725,140 +2029,6 @@ class AIInferenceSegmentationCompareView(APIView):
         arr_f32 = arr.astype(np.float32)
         return base64.b64encode(arr_f32.tobytes()).decode('ascii')
 
-    def _calculate_dice_score(self, pred, gt, label):
-        """
-        특정 라벨에 대한 Dice Score 계산
-        Dice = 2 * |P ∩ G| / (|P| + |G|)
-        """
-        import numpy as np
-        pred_mask = (pred == label)
-        gt_mask = (gt == label)
-
-        intersection = np.sum(pred_mask & gt_mask)
-        pred_sum = np.sum(pred_mask)
-        gt_sum = np.sum(gt_mask)
-
-        if pred_sum + gt_sum == 0:
-            return 1.0  # 둘 다 없으면 완벽한 일치
-        return 2.0 * intersection / (pred_sum + gt_sum)
-
-    def _calculate_volume(self, mask, label, voxel_volume_mm3=1.0):
-        """특정 라벨의 볼륨 계산 (mm³)"""
-        import numpy as np
-        return float(np.sum(mask == label)) * voxel_volume_mm3
-
-    def _load_orthanc_seg(self, ocs):
-        """
-        OCS의 worker_result에서 Orthanc SEG 시리즈를 찾아 로드
-
-        Returns:
-            - numpy array (3D) 또는 None
-        """
-        import numpy as np
-        import requests
-
-        # settings.py의 ORTHANC_BASE_URL 사용 (Docker Orthanc 연결)
-        ORTHANC_URL = django_settings.ORTHANC_BASE_URL.rstrip("/")
-
-        worker_result = ocs.worker_result or {}
-        orthanc_info = worker_result.get('orthanc', {})
-        orthanc_study_id = orthanc_info.get('orthanc_study_id')
-        series_list = orthanc_info.get('series', [])
-
-        if not orthanc_study_id:
-            logger.info(f"OCS {ocs.id}: Orthanc study ID가 없습니다.")
-            return None
-
-        # SEG 시리즈 찾기
-        seg_series = None
-        for series in series_list:
-            series_type = series.get('series_type', '')
-            if series_type == 'SEG':
-                seg_series = series
-                break
-
-        if not seg_series:
-            logger.info(f"OCS {ocs.id}: SEG 시리즈가 없습니다.")
-            return None
-
-        # orthanc_id 또는 orthanc_series_id 둘 다 지원
-        orthanc_series_id = seg_series.get('orthanc_id') or seg_series.get('orthanc_series_id')
-        if not orthanc_series_id:
-            logger.warning(f"OCS {ocs.id}: SEG 시리즈의 Orthanc ID가 없습니다. seg_series={seg_series}")
-            return None
-
-        try:
-            # Orthanc에서 SEG 시리즈의 모든 인스턴스 가져오기
-            series_info = requests.get(
-                f"{ORTHANC_URL}/series/{orthanc_series_id}",
-                timeout=30
-            ).json()
-
-            instances = series_info.get('Instances', [])
-            if not instances:
-                logger.warning(f"SEG 시리즈 {orthanc_series_id}: 인스턴스가 없습니다.")
-                return None
-
-            logger.info(f"SEG 시리즈 로드: {orthanc_series_id}, 인스턴스 수: {len(instances)}")
-
-            # 각 인스턴스에서 픽셀 데이터 추출하여 3D 볼륨 구성
-            # SEG DICOM은 특수한 형식이므로 pydicom으로 처리
-            try:
-                import pydicom
-                from io import BytesIO
-
-                slices = []
-                for inst_id in instances:
-                    # DICOM 파일 다운로드
-                    dicom_resp = requests.get(
-                        f"{ORTHANC_URL}/instances/{inst_id}/file",
-                        timeout=30
-                    )
-                    dicom_resp.raise_for_status()
-
-                    # pydicom으로 파싱
-                    ds = pydicom.dcmread(BytesIO(dicom_resp.content))
-
-                    # 픽셀 데이터 추출
-                    if hasattr(ds, 'pixel_array'):
-                        pixel_data = ds.pixel_array
-                        slices.append(pixel_data)
-
-                if not slices:
-                    logger.warning(f"SEG 시리즈 {orthanc_series_id}: 픽셀 데이터가 없습니다.")
-                    return None
-
-                # 3D 볼륨으로 스택
-                seg_volume = np.stack(slices, axis=-1)
-                logger.info(f"SEG 볼륨 로드 완료: shape={seg_volume.shape}, unique={np.unique(seg_volume)}")
-
-                # 라벨 정규화: Orthanc SEG의 스케일된 값을 BraTS 라벨로 변환
-                # 원본: 0=배경, 32767=라벨1, 65535=라벨2 등
-                # 타겟: 0=배경, 1=NCR, 2=ED, 3=ET (또는 4=ET for BraTS)
-                unique_vals = np.unique(seg_volume)
-                if len(unique_vals) > 1 and unique_vals.max() > 10:
-                    # 스케일된 값 → 순차적 라벨로 매핑
-                    sorted_vals = sorted(unique_vals)
-                    label_map = {v: i for i, v in enumerate(sorted_vals)}
-                    logger.info(f"라벨 매핑: {label_map}")
-
-                    # 매핑 적용
-                    normalized = np.zeros_like(seg_volume, dtype=np.uint8)
-                    for old_val, new_val in label_map.items():
-                        normalized[seg_volume == old_val] = new_val
-                    seg_volume = normalized
-                    logger.info(f"라벨 정규화 완료: unique={np.unique(seg_volume)}")
-
-                return seg_volume
-
-            except ImportError:
-                logger.error("pydicom이 설치되지 않았습니다.")
-                return None
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Orthanc SEG 로드 실패: {e}")
-            return None
-
     def get(self, request, job_id):
         import numpy as np
         import time
@@ -1881,103 +2051,57 @@ class AIInferenceSegmentationCompareView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # 2. M1 예측 세그멘테이션 로드
-        result_dir = self.STORAGE_BASE / job_id
-        seg_file = result_dir / "m1_segmentation.npz"
+        # 2. M1 예측 세그멘테이션 로드 (m1_store, memory-mapped)
+        from .ground_truth import (
+            find_seg_series, indexed_series_last_update, load_cached_ground_truth, schedule_ground_truth,
+        )
+        from .volumes import load_job_volumes
 
-        if not seg_file.exists():
+        job_volumes = load_job_volumes(job_id)
+        if job_volumes is None:
             return Response(
                 {'detail': '세그멘테이션 파일을 찾을 수 없습니다.'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
         try:
-            seg_data = np.load(seg_file, allow_pickle=True)
-
             # 예측 마스크
-            if 'mask' in seg_data:
-                pred_mask = seg_data['mask']
-            elif 'segmentation_mask' in seg_data:
-                pred_mask = seg_data['segmentation_mask']
-            else:
+            if 'prediction' not in job_volumes.arrays:
                 raise KeyError("세그멘테이션 데이터를 찾을 수 없습니다.")
+            pred_mask = job_volumes.arrays['prediction']
 
             # 예측 볼륨 정보
-            pred_volumes = {}
-            for key in ['wt_volume', 'tc_volume', 'et_volume', 'ncr_volume', 'ed_volume']:
-                if key in seg_data:
-                    vol_val = seg_data[key]
-                    pred_volumes[key] = float(vol_val.item()) if hasattr(vol_val, 'item') else float(vol_val)
+            pred_volumes = job_volumes.metadata()['tumor_volumes']
 
             # 3. Orthanc SEG (Ground Truth) 로드 시도
             gt_mask = None
             gt_volumes = {}
             comparison_metrics = {}
             orthanc_seg_status = 'not_found'
+            orthanc_seg_error = None
 
             if inference.mri_ocs:
-                gt_mask = self._load_orthanc_seg(inference.mri_ocs)
-
-                if gt_mask is not None:
+                # 콜백 시 수집된 GT (gt_seg/) - 없으면 백그라운드 수집 요청 (같은 job 은 한 번만 실행)
+                # 수집 실패 기록이 있으면 SEG 가 바뀌기 전까지 (인덱스 LastUpdate) 다시 요청하지 않음
+                series_id = find_seg_series(inference.mri_ocs)
+                ground_truth = None
+                if series_id:
+                    ground_truth = load_cached_ground_truth(
+                        job_id, series_id, job_volumes.version, indexed_series_last_update(series_id)
+                    )
+                    if ground_truth is None:
+                        schedule_ground_truth(inference, force=False)
+                        orthanc_seg_status = 'processing'
+
+                if ground_truth is not None and ground_truth.get('error'):
+                    orthanc_seg_status = 'error'
+                    orthanc_seg_error = ground_truth['error']
+                elif ground_truth is not None:
                     orthanc_seg_status = 'loaded'
-
-                    # GT 볼륨 계산
-                    # BraTS 라벨: 0=배경, 1=NCR, 2=ED, 4=ET (3은 사용안함)
-                    # WT = 1 + 2 + 4, TC = 1 + 4, ET = 4
-                    gt_volumes = {
-                        'et_volume': self._calculate_volume(gt_mask, 4),
-                        'ncr_volume': self._calculate_volume(gt_mask, 1),
-                        'ed_volume': self._calculate_volume(gt_mask, 2),
-                    }
-                    gt_volumes['tc_volume'] = gt_volumes['et_volume'] + gt_volumes['ncr_volume']
-                    gt_volumes['wt_volume'] = gt_volumes['tc_volume'] + gt_volumes['ed_volume']
-
-                    # GT를 Prediction 크기에 맞게 리샘플링 (프론트엔드 표시용)
-                    try:
-                        from scipy.ndimage import zoom
-                        if pred_mask.shape != gt_mask.shape:
-                            zoom_factors = [p / g for p, g in zip(pred_mask.shape, gt_mask.shape)]
-                            gt_resampled = zoom(gt_mask.astype(np.float32), zoom_factors, order=0).astype(np.uint8)
-                            logger.info(f"GT 마스크 리샘플링: {gt_mask.shape} -> {gt_resampled.shape}")
-                        else:
-                            gt_resampled = gt_mask
-                    except Exception as e:
-                        logger.error(f"GT 리샘플링 실패: {e}")
-                        gt_resampled = gt_mask
-
-                    # 비교 메트릭 계산
-                    try:
-                        # M1 Prediction 라벨: 0=배경, 1=NCR, 2=ED, 3=ET
-                        # GT 라벨 (정규화 후): 0=배경, 1=?, 2=?
-                        # 모든 종양 영역으로 단순 비교
-                        pred_tumor = (pred_mask > 0).astype(int)
-                        gt_tumor = (gt_resampled > 0).astype(int)
-
-                        # Whole Tumor Dice (모든 종양 영역)
-                        intersection = np.sum(pred_tumor & gt_tumor)
-                        dice_wt = 2.0 * intersection / (np.sum(pred_tumor) + np.sum(gt_tumor)) if (np.sum(pred_tumor) + np.sum(gt_tumor)) > 0 else 1.0
-
-                        # 개별 라벨 Dice (라벨이 일치하는 경우만)
-                        pred_unique = set(np.unique(pred_mask)) - {0}
-                        gt_unique = set(np.unique(gt_resampled)) - {0}
-
-                        comparison_metrics = {
-                            'dice_wt': float(dice_wt),
-                            'dice_tc': None,  # 라벨 매핑이 불확실하여 계산 생략
-                            'dice_et': None,
-                            'pred_labels': list(pred_unique),
-                            'gt_labels': list(gt_unique),
-                        }
-                        comparison_metrics['dice_mean'] = comparison_metrics['dice_wt']
-
-                        logger.info(f"Dice Score 계산 완료: WT={dice_wt:.4f}")
-
-                    except Exception as e:
-                        logger.error(f"비교 메트릭 계산 실패: {e}")
-                        comparison_metrics = {'error': str(e)}
-
-                    # 리샘플링된 GT 저장 (프론트엔드 전송용)
-                    gt_mask = gt_resampled
+                    # 예측 크기로 리샘플링된 GT (프론트엔드 표시용)
+                    gt_mask = ground_truth['mask']
+                    gt_volumes = ground_truth['gt_volumes']
+                    comparison_metrics = ground_truth['comparison_metrics']
             else:
                 orthanc_seg_status = 'no_ocs'
 
@@ -1989,13 +2113,14 @@ class AIInferenceSegmentationCompareView(APIView):
                 'encoding': 'base64',
                 'dtype': 'float32',
 
-                # 예측 데이터
-                'prediction': self._encode_array(pred_mask),
+                # 예측 데이터 (GT 수집 중이면 생략 - 다시 요청할 때 받음)
+                'prediction': None if orthanc_seg_status == 'processing' else self._encode_array(pred_mask),
                 'prediction_volumes': pred_volumes,
 
                 # Ground Truth 데이터
                 'has_ground_truth': gt_mask is not None,
                 'orthanc_seg_status': orthanc_seg_status,
+                'orthanc_seg_error': orthanc_seg_error,
             }
 
             if gt_mask is not None:
@@ -2011,6 +2136,8 @@ class AIInferenceSegmentationCompareView(APIView):
             elapsed = time.time() - start_time
             logger.info(f'SEG 비교 데이터 준비 완료: {elapsed:.2f}s, has_gt={response_data["has_ground_truth"]}')
 
+            if orthanc_seg_status == 'processing':
+                return Response(response_data, status=status.HTTP_202_ACCEPTED)
             return Response(response_data)
 
         except Exception as e:
@@ -2083,132 +2210,75 @@ class AIInferenceM1ThumbnailView(APIView):
     M1 추론 결과 썸네일 (MRI + 세그멘테이션 오버레이)
 
     GET /api/ai/inferences/<job_id>/thumbnail/
+    GET /api/ai/inferences/<job_id>/thumbnail/?view=axial|coronal|sagittal   (종양 key slice)
+    GET /api/ai/inferences/<job_id>/thumbnail/?v=<hash>                      (장기 캐시)
 
     Returns:
-        - PNG 이미지: T1CE MRI 중간 슬라이스에 세그멘테이션 마스크 오버레이
+        - PNG 이미지: T1CE MRI 슬라이스에 세그멘테이션 마스크 오버레이
+        - 콜백 시 미리 생성된 previews/*.png 를 그대로 전송 (없으면 1회 생성)
     """
     permission_classes = [AllowAny]
 
-    STORAGE_BASE = CDSS_STORAGE_AI
-
     def get(self, request, job_id):
-        import numpy as np
-        from PIL import Image
-        import io
-        from django.http import HttpResponse
-
-        try:
-            inference = AIInference.objects.get(job_id=job_id)
-        except AIInference.DoesNotExist:
-            return Response(
-                {'detail': '추론 결과를 찾을 수 없습니다.'},
-                status=status.HTTP_404_NOT_FOUND
-            )
+        from .previews import PREVIEW_NAMES, build_job_previews, preview_dir, read_preview_manifest
 
-        # M1 모델만 지원
-        if inference.model_type != AIInference.ModelType.M1:
+        name = request.query_params.get('view', 'thumbnail')
+        if name not in PREVIEW_NAMES:
             return Response(
-                {'detail': 'M1 모델만 썸네일을 지원합니다.'},
+                {'detail': f'view는 {list(PREVIEW_NAMES)} 중 하나여야 합니다.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        result_dir = self.STORAGE_BASE / job_id
-        seg_file = result_dir / "m1_segmentation.npz"
-        mri_file = result_dir / "m1_preprocessed_mri.npz"
-
-        if not seg_file.exists():
-            return Response(
-                {'detail': '세그멘테이션 파일을 찾을 수 없습니다.'},
-                status=status.HTTP_404_NOT_FOUND
-            )
-
-        try:
-            # 세그멘테이션 마스크 로드
-            seg_data = np.load(seg_file, allow_pickle=True)
-            if 'mask' in seg_data:
-                seg_mask = seg_data['mask']
-            elif 'segmentation_mask' in seg_data:
-                seg_mask = seg_data['segmentation_mask']
-            else:
-                raise KeyError("세그멘테이션 데이터를 찾을 수 없습니다.")
-
-            # MRI 데이터 로드
-            mri_data = None
-            if mri_file.exists():
-                mri_npz = np.load(mri_file, allow_pickle=True)
-                # T1CE 채널 우선, 없으면 다른 채널 사용
-                for key in ['t1ce', 't1c', 'T1CE', 'T1C', 't1', 'T1']:
-                    if key in mri_npz:
-                        mri_data = mri_npz[key]
-                        break
-                if mri_data is None and len(mri_npz.files) > 0:
-                    mri_data = mri_npz[mri_npz.files[0]]
-
-            # MRI 없으면 세그멘테이션에서 MRI 찾기 (legacy)
-            if mri_data is None and 'mri' in seg_data:
-                mri_data = seg_data['mri']
-
-            # 중간 슬라이스 선택
-            mid_slice = seg_mask.shape[2] // 2
-            seg_slice = seg_mask[:, :, mid_slice]
-
-            if mri_data is not None:
-                mri_slice = mri_data[:, :, mid_slice]
-            else:
-                # MRI 없으면 빈 배경 사용
-                mri_slice = np.zeros_like(seg_slice)
-
-            # 오버레이 이미지 생성
-            img_bytes = self._create_overlay(mri_slice, seg_slice)
-
-            return HttpResponse(img_bytes, content_type='image/png')
+        manifest = read_preview_manifest(job_id)
+        if manifest is None:
+            try:
+                inference = AIInference.objects.get(job_id=job_id)
+            except AIInference.DoesNotExist:
+                return Response(
+                    {'detail': '추론 결과를 찾을 수 없습니다.'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
 
-        except Exception as e:
-            logger.error(f'M1 썸네일 생성 실패: {str(e)}')
-            import traceback
-            traceback.print_exc()
-            return Response(
-                {'detail': f'썸네일 생성에 실패했습니다: {str(e)}'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+            # M1 모델만 지원
+            if inference.model_type != AIInference.ModelType.M1:
+                return Response(
+                    {'detail': 'M1 모델만 썸네일을 지원합니다.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
 
-    def _create_overlay(self, mri_slice, seg_slice):
-        """MRI 슬라이스에 세그멘테이션 마스크를 오버레이한 PNG 이미지 생성"""
-        import numpy as np
-        from PIL import Image
-        import io
+            # 이전 결과: 미리보기 생성 (이후 요청은 파일 전송만)
+            try:
+                manifest = build_job_previews(job_id)
+            except Exception as e:
+                logger.error(f'M1 썸네일 생성 실패: {str(e)}')
+                return Response(
+                    {'detail': f'썸네일 생성에 실패했습니다: {str(e)}'},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                )
+            if manifest is None:
+                return Response(
+                    {'detail': '세그멘테이션 파일을 찾을 수 없습니다.'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
 
-        # MRI 정규화 (0-255)
-        if mri_slice.max() > mri_slice.min():
-            mri_norm = ((mri_slice - mri_slice.min()) / (mri_slice.max() - mri_slice.min()) * 255).astype(np.uint8)
+        info = manifest['previews'][name]
+        etag = f'"{info["hash"]}"'
+        if etag in [tag.strip() for tag in request.META.get('HTTP_IF_NONE_MATCH', '').split(',')]:
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
         else:
-            mri_norm = np.zeros_like(mri_slice, dtype=np.uint8)
-
-        # 그레이스케일 → RGB
-        rgb = np.stack([mri_norm] * 3, axis=-1)
-
-        # 세그멘테이션 마스크 컬러 오버레이
-        # BraTS 레이블: 1=NCR/NET (빨강), 2=ED (노랑), 4=ET (초록)
-        colors = {
-            1: [255, 100, 100],   # NCR/NET: 빨강
-            2: [255, 255, 100],   # ED: 노랑
-            4: [100, 255, 100],   # ET: 초록
-        }
-        alpha = 0.5
-
-        for label, color in colors.items():
-            mask = seg_slice == label
-            if np.any(mask):
-                rgb[mask] = (rgb[mask] * (1-alpha) + np.array(color) * alpha).astype(np.uint8)
-
-        # 이미지 회전 (상하 반전하여 정상 방향으로)
-        rgb = np.flipud(rgb)
-
-        # PNG 인코딩
-        img = Image.fromarray(rgb)
-        buffer = io.BytesIO()
-        img.save(buffer, format='PNG')
-        return buffer.getvalue()
+            try:
+                with open(preview_dir(job_id) / info['file'], 'rb') as f:
+                    response = HttpResponse(f.read(), content_type='image/png')
+            except OSError:
+                raise Http404('썸네일 파일을 찾을 수 없습니다.')
+
+        response['ETag'] = etag
+        if request.query_params.get('v') == info['hash']:
+            # 내용 해시가 URL 에 포함된 경우 - 내용이 바뀌면 URL 도 바뀜
+            response['Cache-Control'] = 'public, max-age=31536000, immutable'
+        else:
+            response['Cache-Control'] = 'public, max-age=0, must-revalidate'
+        return response
 
 
 class PatientAIInferenceListView(APIView):
@@ -0,0 +1,341 @@
+"""
+M1 결과 볼륨 로더 (SegMRIViewer 슬라이스 API용)
+
+m1_segmentation.npz / m1_preprocessed_mri.npz / m1_encoder_features.npz 를
+콜백 수신 시 job 디렉토리의 비압축 .npy 저장소(m1_store/)로 변환해 두고
+np.load(mmap_mode='r') 로 열어 요청에 필요한 페이지만 읽음
+
+    CDSS_STORAGE/AI/<job_id>/m1_store/
+        manifest.json       # 배열 dtype/shape, 종양 볼륨, 원본 NPZ 시그니처
+        prediction.npy      # uint8 레이블
+        ground_truth.npy    # uint8 레이블 (있는 경우)
+        t1.npy, t1ce.npy, t2.npy, flair.npy   # 전처리 MRI (float16)
+        encoder_features.npy                  # MM 입력용 encoder features
+
+- 저장소가 없거나 원본 NPZ 가 바뀌었으면 첫 요청에서 변환 (기존 결과는 transcode_m1_results 명령)
+- 변환할 수 없으면 (읽기 전용 등) NPZ 를 메모리로 로드하는 이전 방식 사용
+- 열린 배열은 manifest 시그니처 기준 프로세스 LRU 캐시에 보관
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from django.conf import settings as django_settings
+
+logger = logging.getLogger(__name__)
+
+SEG_FILENAME = 'm1_segmentation.npz'
+MRI_FILENAME = 'm1_preprocessed_mri.npz'
+FEATURES_FILENAME = 'm1_encoder_features.npz'
+STORE_DIRNAME = 'm1_store'
+MANIFEST_FILENAME = 'manifest.json'
+STORE_FORMAT = 1
+
+MRI_CHANNELS = ('t1', 't1ce', 't2', 'flair')
+LABEL_VOLUMES = ('prediction', 'ground_truth')
+VOLUME_NAMES = LABEL_VOLUMES + MRI_CHANNELS
+
+# 축 이름 → 배열 축 (볼륨 shape [X, Y, Z])
+AXES = {'sagittal': 0, 'coronal': 1, 'axial': 2}
+
+TUMOR_VOLUME_KEYS = ('wt_volume', 'tc_volume', 'et_volume', 'ncr_volume', 'ed_volume')
+GT_VOLUME_KEYS = ('gt_wt_volume', 'gt_tc_volume', 'gt_et_volume', 'gt_ncr_volume', 'gt_ed_volume')
+
+
+class JobVolumes:
+    """job 하나의 볼륨 배열 + 메타데이터"""
+
+    def __init__(
+        self,
+        job_id: str,
+        arrays: Dict[str, np.ndarray],
+        scalars: Dict[str, float],
+        version: str,
+        features: Optional[np.ndarray] = None,
+    ):
+        self.job_id = job_id
+        self.arrays = arrays
+        self.scalars = scalars
+        # 파일 mtime/size 기반 버전 (ETag 용)
+        self.version = version
+        self.features = features
+
+    @property
+    def shape(self):
+        for name in VOLUME_NAMES:
+            if name in self.arrays:
+                return list(self.arrays[name].shape)
+        return []
+
+    def metadata(self) -> dict:
+        """슬라이스 요청 전에 필요한 정보 (shape, dtype, 종양 볼륨)"""
+        return {
+            'job_id': self.job_id,
+            'shape': self.shape,
+            'axes': AXES,
+            'volumes': {
+                name: {
+                    'dtype': str(arr.dtype),
+                    'shape': list(arr.shape),
+                    'nbytes': int(arr.nbytes),
+                }
+                for name, arr in self.arrays.items()
+            },
+            'tumor_volumes': {k: self.scalars[k] for k in TUMOR_VOLUME_KEYS if k in self.scalars},
+            'gt_volumes': {k: self.scalars[k] for k in GT_VOLUME_KEYS if k in self.scalars},
+            'has_ground_truth': 'ground_truth' in self.arrays,
+            'version': self.version,
+        }
+
+    def etag(self, *parts) -> str:
+        raw = '|'.join(str(p) for p in (self.job_id, self.version) + parts)
+        return '"' + hashlib.md5(raw.encode('utf-8')).hexdigest() + '"'
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _scalar(value) -> float:
+    return float(value.item()) if hasattr(value, 'item') else float(value)
+
+
+def _read_npz_arrays(seg_file: Path, mri_file: Path, features_file: Path):
+    """원본 NPZ 에서 (arrays, scalars, features) 읽기 (압축 해제)"""
+    arrays: Dict[str, np.ndarray] = {}
+    scalars: Dict[str, float] = {}
+    features = None
+
+    with np.load(seg_file, allow_pickle=False) as seg_data:
+        if 'mask' in seg_data:
+            arrays['prediction'] = seg_data['mask']
+        elif 'segmentation_mask' in seg_data:
+            arrays['prediction'] = seg_data['segmentation_mask']
+        if 'ground_truth' in seg_data:
+            arrays['ground_truth'] = seg_data['ground_truth']
+        # 이전 버전 호환: segmentation.npz 에 MRI 포함
+        if 'mri' in seg_data:
+            arrays['t1ce'] = seg_data['mri']
+        for key in TUMOR_VOLUME_KEYS + GT_VOLUME_KEYS:
+            if key in seg_data:
+                scalars[key] = _scalar(seg_data[key])
+
+    if mri_file.exists():
+        with np.load(mri_file, allow_pickle=False) as mri_npz:
+            for ch_name in MRI_CHANNELS:
+                if ch_name in mri_npz:
+                    arrays[ch_name] = mri_npz[ch_name]
+
+    if features_file.exists():
+        with np.load(features_file, allow_pickle=False) as features_npz:
+            if 'features' in features_npz:
+                features = features_npz['features']
+
+    # 레이블은 정수형으로 (이전 결과 중 float 로 저장된 경우)
+    for name in LABEL_VOLUMES:
+        if name in arrays and arrays[name].dtype.kind == 'f':
+            arrays[name] = np.rint(arrays[name]).astype(np.uint8)
+
+    return arrays, scalars, features
+
+
+def _source_signatures(result_dir: Path) -> Dict[str, Optional[list]]:
+    """원본 NPZ (mtime_ns, size) - 저장소가 최신인지 판단"""
+    signatures = {}
+    for filename in (SEG_FILENAME, MRI_FILENAME, FEATURES_FILENAME):
+        sig = _file_signature(result_dir / filename)
+        signatures[filename] = list(sig) if sig else None
+    return signatures
+
+
+def _read_manifest(store_dir: Path) -> Optional[dict]:
+    try:
+        with open(store_dir / MANIFEST_FILENAME, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('format') != STORE_FORMAT:
+        return None
+    return manifest
+
+
+def store_is_current(job_id: str) -> bool:
+    """m1_store/ 가 현재 원본 NPZ 로부터 만들어졌는지"""
+    result_dir = Path(django_settings.CDSS_AI_STORAGE) / job_id
+    manifest = _read_manifest(result_dir / STORE_DIRNAME)
+    return manifest is not None and manifest.get('sources') == _source_signatures(result_dir)
+
+
+def transcode_job_store(job_id: str, force: bool = False) -> Optional[dict]:
+    """
+    job 의 M1 NPZ 결과를 비압축 .npy 저장소로 변환
+
+    tmp 디렉토리에 기록한 뒤 rename 으로 교체하므로 읽는 쪽은 항상 완성된 저장소만 봄
+
+    Args:
+        job_id: 작업 ID
+        force: 최신 저장소가 있어도 다시 변환
+
+    Returns:
+        manifest (세그멘테이션 NPZ 가 없으면 None)
+    """
+    result_dir = Path(django_settings.CDSS_AI_STORAGE) / job_id
+    seg_file = result_dir / SEG_FILENAME
+    if not seg_file.exists():
+        return None
+
+    store_dir = result_dir / STORE_DIRNAME
+    sources = _source_signatures(result_dir)
+    if not force:
+        manifest = _read_manifest(store_dir)
+        if manifest is not None and manifest.get('sources') == sources:
+            return manifest
+
+    arrays, scalars, features = _read_npz_arrays(
+        seg_file, result_dir / MRI_FILENAME, result_dir / FEATURES_FILENAME
+    )
+    if features is not None:
+        arrays = dict(arrays, encoder_features=features)
+
+    tmp_dir = result_dir / f'.{STORE_DIRNAME}.tmp-{uuid.uuid4().hex[:8]}'
+    try:
+        tmp_dir.mkdir(parents=True)
+        manifest = {
+            'format': STORE_FORMAT,
+            'job_id': job_id,
+            'sources': sources,
+            'arrays': {},
+            'scalars': scalars,
+        }
+        for name, arr in arrays.items():
+            arr = np.ascontiguousarray(arr)
+            np.save(tmp_dir / f'{name}.npy', arr)
+            manifest['arrays'][name] = {
+                'file': f'{name}.npy',
+                'dtype': str(arr.dtype),
+                'shape': list(arr.shape),
+            }
+        with open(tmp_dir / MANIFEST_FILENAME, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        # 기존 저장소 교체
+        old_dir = None
+        if store_dir.exists():
+            old_dir = result_dir / f'.{STORE_DIRNAME}.old-{uuid.uuid4().hex[:8]}'
+            os.rename(store_dir, old_dir)
+        os.rename(tmp_dir, store_dir)
+        if old_dir is not None:
+            shutil.rmtree(old_dir, ignore_errors=True)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    logger.info(f'M1 store written for job {job_id}: {list(manifest["arrays"].keys())}')
+    return manifest
+
+
+def _open_job_store(job_id: str, store_dir: Path, manifest: dict, version: str) -> JobVolumes:
+    """저장소 .npy 를 memory-map 으로 열기 (읽기 전용)"""
+    arrays: Dict[str, np.ndarray] = {}
+    features = None
+    for name, info in manifest['arrays'].items():
+        arr = np.load(store_dir / info['file'], mmap_mode='r', allow_pickle=False)
+        if name == 'encoder_features':
+            features = arr
+        elif name in VOLUME_NAMES:
+            arrays[name] = arr
+    return JobVolumes(job_id, arrays, manifest.get('scalars', {}), version, features=features)
+
+
+class _VolumeCache:
+    """(job_id, 파일 시그니처) → JobVolumes LRU"""
+
+    def __init__(self, max_jobs: int):
+        self.max_jobs = max_jobs
+        self._items: "OrderedDict[Tuple, JobVolumes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+            return item
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_jobs:
+                self._items.popitem(last=False)
+
+
+_cache = _VolumeCache(max_jobs=getattr(django_settings, 'AI_VOLUME_CACHE_JOBS', 8))
+
+
+def load_job_volumes(job_id: str) -> Optional[JobVolumes]:
+    """
+    job 결과 볼륨 로드 (세그멘테이션 파일이 없으면 None)
+
+    m1_store/ 가 최신이면 memory-map 으로 열고, 없거나 오래됐으면 변환 후 연다.
+    원본 NPZ 가 바뀌면 (mtime/size) 캐시와 저장소가 자동으로 무효화됨
+    """
+    result_dir = Path(django_settings.CDSS_AI_STORAGE) / job_id
+    store_dir = result_dir / STORE_DIRNAME
+
+    sources = _source_signatures(result_dir)
+    seg_sig = sources[SEG_FILENAME]
+    if seg_sig is None:
+        return None
+
+    key = (job_id,) + tuple(tuple(sig) if sig else None for sig in sources.values())
+    volumes = _cache.get(key)
+    if volumes is not None:
+        return volumes
+
+    version = '-'.join(
+        f'{sig[0]}-{sig[1]}' if sig else '0-0' for sig in sources.values()
+    )
+
+    manifest = _read_manifest(store_dir)
+    if manifest is None or manifest.get('sources') != sources:
+        try:
+            manifest = transcode_job_store(job_id)
+        except (OSError, ValueError) as e:
+            logger.warning(f'M1 store transcode failed for job {job_id}, using NPZ: {e}')
+            manifest = None
+
+    if manifest is not None:
+        volumes = _open_job_store(job_id, store_dir, manifest, version)
+    else:
+        arrays, scalars, features = _read_npz_arrays(
+            result_dir / SEG_FILENAME, result_dir / MRI_FILENAME, result_dir / FEATURES_FILENAME
+        )
+        volumes = JobVolumes(job_id, arrays, scalars, version, features=features)
+
+    _cache.put(key, volumes)
+    logger.info(f'Volumes opened for job {job_id}: {list(volumes.arrays.keys())} (store={manifest is not None})')
+    return volumes
+
+
+def extract_slices(volume: np.ndarray, axis: int, start: int, stop: int) -> np.ndarray:
+    """
+    axis 방향 [start, stop) 슬라이스 추출 → (n, a, b) C-contiguous (슬라이스 축이 첫 번째)
+
+    남은 두 축은 원래 순서 유지 (axial: [X, Y], coronal: [X, Z], sagittal: [Y, Z])
+    """
+    index = [slice(None)] * volume.ndim
+    index[axis] = slice(start, stop)
+    return np.ascontiguousarray(np.moveaxis(volume[tuple(index)], axis, 0))
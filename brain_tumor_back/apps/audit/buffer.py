@@ -0,0 +1,238 @@
+"""
+AccessLog 버퍼링 writer
+
+요청 스레드는 AccessLog 객체를 메모리 버퍼에 넣기만 하고 (INSERT 없음),
+백그라운드 flusher 스레드가 모아서 bulk_create + 일별 집계(rollup) 갱신.
+
+- 배치: ACCESS_LOG_BATCH_SIZE 건이 쌓이거나 ACCESS_LOG_FLUSH_INTERVAL 초가 지나면 flush
+- back-pressure: 버퍼가 ACCESS_LOG_BUFFER_SIZE 에 도달하면 새 로그는 버리고 dropped 카운트 증가
+- DB 연결 오류 (OperationalError / InterfaceError): 배치를 버퍼 앞에 되돌려 다음 주기에 재시도
+- 그 외 오류 (데이터 오류 등): 한 건씩 다시 저장하고 실패한 로그만 버림 (rejected)
+  → 잘못된 로그 1건이 버퍼 전체를 막지 않도록, 저장 전에 길이 제한/JSON 변환도 적용
+- 종료: atexit 에서 남은 로그를 모두 flush
+- ACCESS_LOG_BUFFERED=False 면 기존처럼 요청마다 바로 저장
+
+stats() 는 시스템 모니터링 API 에서 사용.
+"""
+import atexit
+import json
+import logging
+import threading
+import time
+from collections import deque
+from typing import List
+
+from django.conf import settings
+from django.db import InterfaceError, OperationalError, close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+BUFFERED = getattr(settings, 'ACCESS_LOG_BUFFERED', True)
+BUFFER_SIZE = getattr(settings, 'ACCESS_LOG_BUFFER_SIZE', 10000)
+BATCH_SIZE = getattr(settings, 'ACCESS_LOG_BATCH_SIZE', 500)
+FLUSH_INTERVAL = getattr(settings, 'ACCESS_LOG_FLUSH_INTERVAL', 1.0)
+
+# 재시도해도 다시 성공할 수 있는 오류 (DB 연결/일시 장애)
+RETRYABLE_ERRORS = (OperationalError, InterfaceError)
+
+
+def sanitize_access_log(log):
+    """CharField 길이 제한, request_params 는 JSON 으로 저장 가능한 값으로 변환 (UploadedFile 등)"""
+    for field in log._meta.concrete_fields:
+        max_length = getattr(field, 'max_length', None)
+        value = getattr(log, field.attname)
+        if max_length and isinstance(value, str) and len(value) > max_length:
+            setattr(log, field.attname, value[:max_length])
+
+    if log.request_params is not None:
+        try:
+            log.request_params = json.loads(json.dumps(log.request_params, default=str))
+        except (TypeError, ValueError):
+            log.request_params = None
+    return log
+
+
+class AccessLogBuffer:
+    """프로세스 내 AccessLog 버퍼 + flusher 스레드"""
+
+    def __init__(self, capacity: int = BUFFER_SIZE, batch_size: int = BATCH_SIZE,
+                 flush_interval: float = FLUSH_INTERVAL):
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._stopped = False
+
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed_batches = 0
+        self.rejected = 0
+        self._last_drop_warning = 0.0
+
+    def enqueue(self, log) -> bool:
+        """
+        로그 1건 추가 (요청 스레드, DB 접근 없음)
+
+        Returns:
+            False 면 버퍼가 가득 차서 버려짐
+        """
+        with self._lock:
+            if len(self._queue) >= self.capacity:
+                self.dropped += 1
+                self._warn_dropped()
+                return False
+            self._queue.append(log)
+            self.enqueued += 1
+            pending = len(self._queue)
+
+        self._ensure_thread()
+        if pending >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def _warn_dropped(self):
+        now = time.monotonic()
+        if now - self._last_drop_warning >= 10:
+            self._last_drop_warning = now
+            logger.warning(f"AccessLog 버퍼 가득 참 ({self.capacity}건), 누적 유실 {self.dropped}건")
+
+    def _ensure_thread(self):
+        if self._thread is not None or self._stopped:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='access-log-flusher', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stopped:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+    def _take_batch(self) -> List:
+        with self._lock:
+            count = min(self.batch_size, len(self._queue))
+            return [self._queue.popleft() for _ in range(count)]
+
+    def _requeue(self, batch: List):
+        """실패한 배치를 앞에 되돌림 (순서 유지, 자리가 없으면 오래된 것부터 버림)"""
+        with self._lock:
+            room = self.capacity - len(self._queue)
+            keep = batch[len(batch) - room:] if room < len(batch) else batch
+            self.dropped += len(batch) - len(keep)
+            self._queue.extendleft(reversed(keep))
+
+    def flush(self, drain: bool = False) -> int:
+        """
+        버퍼 내용을 DB 에 저장
+
+        Args:
+            drain: True 면 실패해도 재시도하지 않고 끝까지 비움 (종료 시)
+        Returns:
+            저장된 건수
+        """
+        from .models import AccessLog
+        from .rollup import record_access_logs
+
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = self._take_batch()
+                if not batch:
+                    break
+                for log in batch:
+                    sanitize_access_log(log)
+                remaining = []
+                try:
+                    with transaction.atomic():
+                        AccessLog.objects.bulk_create(batch)
+                    saved = batch
+                except RETRYABLE_ERRORS as e:
+                    self.failed_batches += 1
+                    logger.error(f"AccessLog 배치 저장 실패 ({len(batch)}건): {e}")
+                    saved, remaining = [], batch
+                except Exception as e:
+                    self.failed_batches += 1
+                    logger.error(f"AccessLog 배치 저장 실패, 한 건씩 재시도 ({len(batch)}건): {e}")
+                    saved, remaining = self._save_rows(batch)
+
+                if saved:
+                    record_access_logs(saved)
+                    written += len(saved)
+                    self.written += len(saved)
+                if remaining:
+                    if drain:
+                        self.dropped += len(remaining)
+                        continue
+                    self._requeue(remaining)
+                    break
+        return written
+
+    def _save_rows(self, batch: List):
+        """
+        한 건씩 저장, 실패한 로그는 버림
+
+        Returns:
+            (저장된 로그, DB 연결 오류로 저장하지 못한 나머지 로그)
+        """
+        saved = []
+        for index, log in enumerate(batch):
+            try:
+                with transaction.atomic():
+                    log.save(force_insert=True)
+                saved.append(log)
+            except RETRYABLE_ERRORS as e:
+                logger.error(f"AccessLog 저장 실패 (DB 연결): {e}")
+                return saved, batch[index:]
+            except Exception as e:
+                self.rejected += 1
+                logger.error(f"AccessLog 저장 불가, 버림 ({log.request_method} {(log.request_path or '')[:100]}): {e}")
+        return saved, []
+
+    def shutdown(self):
+        """종료 시 남은 로그 저장"""
+        self._stopped = True
+        self._wakeup.set()
+        try:
+            self.flush(drain=True)
+        finally:
+            close_old_connections()
+
+    def stats(self) -> dict:
+        with self._lock:
+            pending = len(self._queue)
+        return {
+            'pending': pending,
+            'capacity': self.capacity,
+            'enqueued': self.enqueued,
+            'written': self.written,
+            'dropped': self.dropped,
+            'failed_batches': self.failed_batches,
+            'rejected': self.rejected,
+        }
+
+
+access_log_buffer = AccessLogBuffer()
+atexit.register(access_log_buffer.shutdown)
+
+
+def write_access_log(log):
+    """AccessLog 기록 (버퍼링 또는 즉시 저장)"""
+    if BUFFERED:
+        access_log_buffer.enqueue(log)
+        return
+
+    from .rollup import record_access_logs
+    sanitize_access_log(log)
+    log.save()
+    record_access_logs([log])
@@ -0,0 +1,49 @@
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.audit.rollup import rebuild, rebuild_all
+
+
+class Command(BaseCommand):
+    help = 'Recompute AuditDailyCounter rows from AuditLog / AccessLog (run daily: --interval 86400 or cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7, help='어제부터 며칠 전까지 재계산 (기본 7)')
+        parser.add_argument('--include-today', action='store_true', help='오늘 카운터도 재계산')
+        parser.add_argument('--date-from', type=date.fromisoformat, help='시작 날짜 (YYYY-MM-DD)')
+        parser.add_argument('--date-to', type=date.fromisoformat, help='종료 날짜 (YYYY-MM-DD)')
+        parser.add_argument('--all', action='store_true', help='원본 로그 전체 기간 재계산')
+        parser.add_argument('--interval', type=float, help='지정하면 종료하지 않고 이 간격(초)마다 반복 실행')
+
+    def handle(self, *args, **options):
+        self.stdout.write("=" * 60)
+        self.stdout.write("Audit Daily Counter Compaction")
+        self.stdout.write("=" * 60)
+
+        while True:
+            try:
+                self._compact(options)
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"  compaction failed: {e}"))
+                if not options['interval']:
+                    raise
+
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+
+    def _compact(self, options):
+        if options['all']:
+            count = rebuild_all()
+            self.stdout.write(self.style.SUCCESS(f"  all dates: {count} counter rows written"))
+            return
+
+        today = timezone.localdate()
+        date_to = options['date_to'] or (today if options['include_today'] else today - timedelta(days=1))
+        date_from = options['date_from'] or (date_to - timedelta(days=options['days'] - 1))
+
+        count = rebuild(date_from, date_to)
+        self.stdout.write(self.style.SUCCESS(f"  {date_from} ~ {date_to}: {count} counter rows written"))
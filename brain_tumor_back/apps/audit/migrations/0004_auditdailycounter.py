@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:23
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+from django.db.models.functions import TruncDate
+
+
+def backfill_counters(apps, schema_editor):
+    """기존 AuditLog / AccessLog 전체를 일별 카운터로 집계"""
+    AuditLog = apps.get_model('audit', 'AuditLog')
+    AccessLog = apps.get_model('audit', 'AccessLog')
+    AuditDailyCounter = apps.get_model('audit', 'AuditDailyCounter')
+
+    sources = (
+        ('AUDIT', AuditLog, 'user__role__name', None),
+        ('ACCESS', AccessLog, 'user_role', 'result'),
+    )
+    counters = []
+    for source, model, role_field, result_field in sources:
+        group_fields = ['day', 'action', role_field] + ([result_field] if result_field else [])
+        rows = (
+            model.objects.annotate(day=TruncDate('created_at'))
+            .order_by()
+            .values(*group_fields)
+            .annotate(count=Count('id'), latest=Max('created_at'))
+        )
+        for row in rows:
+            counters.append(AuditDailyCounter(
+                date=row['day'],
+                source=source,
+                action=row['action'],
+                user_role=row[role_field] or '',
+                result=(row[result_field] or '') if result_field else '',
+                count=row['count'],
+                latest_at=row['latest'],
+            ))
+    AuditDailyCounter.objects.bulk_create(counters, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0003_rename_access_log_created_7f8c3e_idx_access_log_created_dbd172_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditDailyCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('source', models.CharField(choices=[('AUDIT', '인증 감사 로그'), ('ACCESS', '접근 감사 로그')], max_length=10)),
+                ('action', models.CharField(max_length=30)),
+                ('user_role', models.CharField(blank=True, default='', max_length=50)),
+                ('result', models.CharField(blank=True, default='', max_length=10)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('latest_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'audit_daily_counter',
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['source', 'date'], name='audit_daily_source_552fb1_idx')],
+                'constraints': [models.UniqueConstraint(fields=('date', 'source', 'action', 'user_role', 'result'), name='audit_daily_counter_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from apps.accounts.models import User
 
 
@@ -76,8 +77,8 @@ class AccessLog(models.Model):
     fail_reason = models.TextField(null=True, blank=True)
     response_status = models.IntegerField(null=True, blank=True)  # HTTP 상태 코드
 
-    # 시간
-    created_at = models.DateTimeField(auto_now_add=True)
+    # 시간 (요청 시점, 버퍼링 저장이므로 auto_now_add 대신 기록 시 지정)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     duration_ms = models.IntegerField(null=True, blank=True)  # 처리 시간(ms)
 
     class Meta:
@@ -93,3 +94,41 @@ class AccessLog(models.Model):
 
     def __str__(self):
         return f"{self.action} - {self.user} - {self.request_path}"
+
+
+class AuditDailyCounter(models.Model):
+    """
+    감사/접근 로그 일별 집계 (날짜 × 출처 × action × 역할 × 결과)
+
+    로그 기록 시 증분 갱신 (rollup.py), compact_audit_counters 명령으로 원본 로그에서 재계산.
+    모니터링/요약 API 는 원본 로그 대신 이 테이블을 조회.
+    """
+
+    SOURCE_CHOICES = (
+        ("AUDIT", "인증 감사 로그"),  # AuditLog
+        ("ACCESS", "접근 감사 로그"),  # AccessLog
+    )
+
+    date = models.DateField()  # 로컬(TIME_ZONE) 기준 날짜
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES)
+    action = models.CharField(max_length=30)
+    user_role = models.CharField(max_length=50, blank=True, default='')  # 역할명 스냅샷 (없으면 '')
+    result = models.CharField(max_length=10, blank=True, default='')  # AccessLog 결과 (AuditLog 는 '')
+    count = models.PositiveIntegerField(default=0)
+    latest_at = models.DateTimeField(null=True, blank=True)  # 마지막 기록 시각
+
+    class Meta:
+        db_table = 'audit_daily_counter'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'source', 'action', 'user_role', 'result'],
+                name='audit_daily_counter_unique',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['source', 'date']),
+        ]
+        ordering = ['-date']
+
+    def __str__(self):
+        return f"{self.date} {self.source} {self.action} {self.user_role} {self.result}: {self.count}"
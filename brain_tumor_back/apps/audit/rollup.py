@@ -0,0 +1,174 @@
+"""
+감사/접근 로그 일별 집계 (AuditDailyCounter)
+
+- 증분: 로그를 기록할 때 (날짜, action, 역할, 결과) 카운터 +n (UPDATE ... SET count = count + n)
+- 재계산: compact_audit_counters 명령이 원본 로그를 GROUP BY 해서 지정한 날짜의 카운터를 교체
+  (증분 갱신 실패/로그 삭제로 생긴 차이 보정, 기본은 어제까지 → 오늘 증분과 경합하지 않음)
+  docker-compose 의 django-audit-compact 서비스가 --interval 로 하루 한 번 실행
+- 더미 데이터 스크립트는 로그를 직접 만들므로 끝에서 rebuild_all() 호출
+- 조회: 모니터링/요약 API 는 원본 로그 대신 카운터 합계 사용
+
+날짜는 TIME_ZONE 기준 (created_at__date 필터와 동일).
+"""
+import logging
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import AccessLog, AuditDailyCounter, AuditLog
+
+logger = logging.getLogger(__name__)
+
+KEY_FIELDS = ('date', 'source', 'action', 'user_role', 'result')
+
+# (created_at, action, user_role, result)
+Row = Tuple[object, str, Optional[str], Optional[str]]
+
+
+def _local_date(dt):
+    return timezone.localdate(dt) if timezone.is_aware(dt) else dt.date()
+
+
+def _bump(lookup: dict, count: int, latest_at):
+    updated = AuditDailyCounter.objects.filter(**lookup).update(
+        count=F('count') + count, latest_at=latest_at
+    )
+    if updated:
+        return
+    try:
+        with transaction.atomic():
+            AuditDailyCounter.objects.create(**lookup, count=count, latest_at=latest_at)
+    except IntegrityError:
+        # 다른 요청이 먼저 행을 만든 경우
+        AuditDailyCounter.objects.filter(**lookup).update(
+            count=F('count') + count, latest_at=latest_at
+        )
+
+
+def increment(source: str, rows: Iterable[Row]):
+    """로그 행들을 (날짜, action, 역할, 결과) 별로 묶어 카운터 증가"""
+    buckets: Dict[tuple, list] = {}
+    for created_at, action, user_role, result in rows:
+        key = (_local_date(created_at), source, action, user_role or '', result or '')
+        bucket = buckets.setdefault(key, [0, created_at])
+        bucket[0] += 1
+        bucket[1] = max(bucket[1], created_at)
+
+    for key, (count, latest_at) in buckets.items():
+        _bump(dict(zip(KEY_FIELDS, key)), count, latest_at)
+
+
+def record_audit_log(log: AuditLog):
+    """AuditLog 1건 반영 (실패해도 로그 기록은 유지, compact 로 보정)"""
+    try:
+        role = log.user.role.name if log.user and log.user.role else ''
+        increment('AUDIT', [(log.created_at, log.action, role, '')])
+    except Exception as e:
+        logger.error(f"AuditDailyCounter 갱신 실패: {e}")
+
+
+def record_access_logs(logs: Iterable[AccessLog]):
+    """AccessLog 여러 건 반영"""
+    try:
+        increment('ACCESS', [(log.created_at, log.action, log.user_role, log.result) for log in logs])
+    except Exception as e:
+        logger.error(f"AuditDailyCounter 갱신 실패: {e}")
+
+
+def rebuild(date_from, date_to) -> int:
+    """
+    date_from ~ date_to (포함) 카운터를 원본 로그에서 다시 계산
+
+    Returns:
+        생성된 카운터 행 수
+    """
+    sources = (
+        ('AUDIT', AuditLog.objects.all(), 'user__role__name', None),
+        ('ACCESS', AccessLog.objects.all(), 'user_role', 'result'),
+    )
+    counters = []
+    for source, queryset, role_field, result_field in sources:
+        group_fields = ['day', 'action', role_field] + ([result_field] if result_field else [])
+        rows = (
+            queryset.filter(created_at__date__gte=date_from, created_at__date__lte=date_to)
+            .annotate(day=TruncDate('created_at'))
+            .order_by()
+            .values(*group_fields)
+            .annotate(count=Count('id'), latest=Max('created_at'))
+        )
+        for row in rows:
+            counters.append(AuditDailyCounter(
+                date=row['day'],
+                source=source,
+                action=row['action'],
+                user_role=row[role_field] or '',
+                result=(row[result_field] or '') if result_field else '',
+                count=row['count'],
+                latest_at=row['latest'],
+            ))
+
+    with transaction.atomic():
+        AuditDailyCounter.objects.filter(date__gte=date_from, date__lte=date_to).delete()
+        AuditDailyCounter.objects.bulk_create(counters, batch_size=500)
+    return len(counters)
+
+
+def rebuild_all() -> int:
+    """
+    원본 로그 전체 기간 카운터 재계산
+
+    더미 데이터 생성처럼 증분 갱신을 거치지 않고 로그를 직접 만든 경우 사용.
+    """
+    first_dates = [
+        _local_date(created_at)
+        for created_at in (
+            queryset.order_by('created_at').values_list('created_at', flat=True).first()
+            for queryset in (AuditLog.objects.all(), AccessLog.objects.all())
+        )
+        if created_at
+    ]
+    if not first_dates:
+        AuditDailyCounter.objects.all().delete()
+        return 0
+    return rebuild(min(first_dates), timezone.localdate())
+
+
+def action_counts(source: str, date_from, date_to=None, actions=None) -> Dict[str, int]:
+    """기간 내 action 별 합계"""
+    queryset = AuditDailyCounter.objects.filter(
+        source=source, date__gte=date_from, date__lte=date_to or date_from
+    )
+    if actions:
+        queryset = queryset.filter(action__in=actions)
+    return dict(
+        queryset.order_by().values('action').annotate(total=Sum('count')).values_list('action', 'total')
+    )
+
+
+def access_summary(user_role=None, action=None, result=None, date_from=None, date_to=None) -> dict:
+    """AccessLogSummaryView 응답 (역할/action/결과/기간 필터)"""
+    queryset = AuditDailyCounter.objects.filter(source='ACCESS')
+    if user_role:
+        queryset = queryset.filter(user_role__icontains=user_role)
+    if action:
+        queryset = queryset.filter(action=action)
+    if result:
+        queryset = queryset.filter(result=result)
+    if date_from:
+        queryset = queryset.filter(date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(date__lte=date_to)
+
+    stats = queryset.aggregate(
+        total=Sum('count'),
+        latest=Max('latest_at'),
+        failed=Sum('count', filter=Q(result='FAIL')),
+    )
+    return {
+        'total_count': stats['total'] or 0,
+        'latest_access': stats['latest'],
+        'fail_count': stats['failed'] or 0,
+    }
@@ -1,10 +1,13 @@
 from .models import AuditLog
+from .rollup import record_audit_log
 
 # Audit Log 기록 유틸
 def create_audit_log(request, action, user=None):
-    AuditLog.objects.create(
+    log = AuditLog.objects.create(
         user = user,
         action = action,
         ip_address = request.META.get("REMOTE_ADDR"),
         user_agent = request.META.get("HTTP_USER_AGENT", ""),
-    )
\ No newline at end of file
+    )
+    # 일별 집계 증분 갱신
+    record_audit_log(log)
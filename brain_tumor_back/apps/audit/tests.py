@@ -1,3 +1,157 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from apps.accounts.models import Role, User
+from .models import AccessLog, AuditDailyCounter
+from .rollup import access_summary, action_counts, rebuild, rebuild_all, record_access_logs
+from .services import create_audit_log
+
+
+class AuditDailyCounterTest(TestCase):
+    """감사 로그 일별 집계 테스트"""
+
+    def setUp(self):
+        self.role = Role.objects.create(code='DOCTOR', name='의사')
+        self.user = User.objects.create_user(login_id='doctor_audit', password='testpass123', role=self.role)
+        self.request = RequestFactory().get('/')
+
+    def _access_log(self, action='VIEW', result='SUCCESS'):
+        return AccessLog.objects.create(
+            user=self.user,
+            user_role=self.role.name,
+            request_method='GET',
+            request_path='/api/patients/',
+            action=action,
+            result=result,
+        )
+
+    def test_login_counts_incremented(self):
+        """로그인 감사 로그 기록 시 카운터 증가"""
+        create_audit_log(self.request, 'LOGIN_SUCCESS', self.user)
+        create_audit_log(self.request, 'LOGIN_SUCCESS', self.user)
+        create_audit_log(self.request, 'LOGIN_FAIL')
+
+        counts = action_counts('AUDIT', timezone.localdate())
+        self.assertEqual(counts, {'LOGIN_SUCCESS': 2, 'LOGIN_FAIL': 1})
+
+    def test_access_summary_matches_rebuild(self):
+        """증분 카운터와 원본 재계산 결과 일치"""
+        logs = [self._access_log(), self._access_log(), self._access_log('DELETE', 'FAIL')]
+        record_access_logs(logs)
+
+        summary = access_summary()
+        self.assertEqual(summary['total_count'], 3)
+        self.assertEqual(summary['fail_count'], 1)
+        self.assertEqual(access_summary(action='DELETE')['total_count'], 1)
+
+        incremental = set(AuditDailyCounter.objects.values_list('date', 'source', 'action', 'user_role', 'result', 'count'))
+        today = timezone.localdate()
+        rebuild(today - timedelta(days=1), today)
+        rebuilt = set(AuditDailyCounter.objects.values_list('date', 'source', 'action', 'user_role', 'result', 'count'))
+        self.assertEqual(incremental, rebuilt)
+
+    def test_rebuild_all_covers_directly_created_logs(self):
+        """증분 갱신 없이 만든 로그 (더미 데이터) 도 전체 재계산으로 반영"""
+        log = self._access_log()
+        AccessLog.objects.filter(pk=log.pk).update(created_at=timezone.now() - timedelta(days=10))
+        self._access_log('DELETE', 'FAIL')
+        self.assertEqual(access_summary()['total_count'], 0)
+
+        rebuild_all()
+        summary = access_summary()
+        self.assertEqual(summary['total_count'], 2)
+        self.assertEqual(summary['fail_count'], 1)
+
+
+class AccessLogBufferTest(TestCase):
+    """AccessLog 버퍼링 writer 테스트"""
+
+    def setUp(self):
+        self.role = Role.objects.create(code='NURSE', name='간호사')
+        self.user = User.objects.create_user(login_id='nurse_audit', password='testpass123', role=self.role)
+
+    def _log(self):
+        return AccessLog(
+            user=self.user,
+            user_role=self.role.name,
+            request_method='GET',
+            request_path='/api/patients/',
+            action='VIEW',
+            created_at=timezone.now() - timedelta(seconds=5),
+        )
+
+    def test_flush_writes_batch_and_counters(self):
+        """flush 시 bulk_create + 일별 카운터 갱신, 기록 시각 유지"""
+        from .buffer import AccessLogBuffer
+
+        buffer = AccessLogBuffer(capacity=10, batch_size=2, flush_interval=60)
+        logs = [self._log() for _ in range(3)]
+        for log in logs:
+            buffer._queue.append(log)
+
+        self.assertEqual(buffer.flush(), 3)
+        self.assertEqual(AccessLog.objects.count(), 3)
+        self.assertEqual(access_summary()['total_count'], 3)
+        self.assertEqual(
+            AccessLog.objects.order_by('created_at').first().created_at,
+            min(log.created_at for log in logs),
+        )
+
+    def test_drop_when_full(self):
+        """버퍼가 가득 차면 새 로그는 버리고 dropped 증가"""
+        from .buffer import AccessLogBuffer
+
+        buffer = AccessLogBuffer(capacity=2, batch_size=100, flush_interval=60)
+        buffer._stopped = True  # flusher 스레드 시작 안 함
+        results = [buffer.enqueue(self._log()) for _ in range(3)]
+
+        self.assertEqual(results, [True, True, False])
+        self.assertEqual(buffer.stats()['dropped'], 1)
+        self.assertEqual(buffer.stats()['pending'], 2)
+
+    def test_bad_row_dropped_without_blocking_batch(self):
+        """데이터 오류는 한 건씩 재시도해서 실패한 로그만 버림"""
+        from .buffer import AccessLogBuffer
+
+        buffer = AccessLogBuffer(capacity=10, batch_size=10, flush_interval=60)
+        bad = self._log()
+        bad.action = None  # NOT NULL 위반
+        for log in [self._log(), bad, self._log()]:
+            buffer._queue.append(log)
+
+        self.assertEqual(buffer.flush(), 2)
+        self.assertEqual(AccessLog.objects.count(), 2)
+        self.assertEqual(buffer.stats()['rejected'], 1)
+        self.assertEqual(buffer.stats()['pending'], 0)
+
+    def test_connection_error_requeues_batch(self):
+        """DB 연결 오류는 배치를 버퍼에 되돌림"""
+        from unittest import mock
+        from django.db import OperationalError
+        from .buffer import AccessLogBuffer
+
+        buffer = AccessLogBuffer(capacity=10, batch_size=10, flush_interval=60)
+        buffer._queue.extend([self._log(), self._log()])
+
+        with mock.patch.object(AccessLog.objects, 'bulk_create', side_effect=OperationalError('gone away')):
+            self.assertEqual(buffer.flush(), 0)
+        self.assertEqual(buffer.stats()['pending'], 2)
+
+        self.assertEqual(buffer.flush(), 2)
+
+    def test_sanitize_long_path_and_uploaded_file(self):
+        """긴 경로는 잘라내고, 업로드 파일 파라미터는 JSON 으로 저장 가능한 값으로 변환"""
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from .buffer import sanitize_access_log
+
+        log = self._log()
+        log.request_path = '/api/' + 'x' * 600
+        log.request_params = {'file': SimpleUploadedFile('scan.dcm', b'data'), 'page': 1}
+        sanitize_access_log(log)
+        log.save()
+
+        self.assertEqual(len(log.request_path), 500)
+        self.assertEqual(log.request_params['file'], 'scan.dcm')
+        self.assertEqual(log.request_params['page'], 1)
@@ -5,9 +5,10 @@ from rest_framework.views import APIView
 from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
 from django_filters import FilterSet, CharFilter, ChoiceFilter, DateFilter
-from django.db.models import Count, Max
+from django.db.models import Count, Max, Q
 
 from .models import AuditLog, AccessLog
+from .rollup import access_summary
 from .serializers import AuditLogSerializer, AccessLogSerializer, AccessLogDetailSerializer
 
 
@@ -101,9 +102,6 @@ class AccessLogSummaryView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        # 필터 조건 적용
-        queryset = AccessLog.objects.all()
-
         # 필터 파라미터 처리
         user_login_id = request.query_params.get('user_login_id')
         user_role = request.query_params.get('user_role')
@@ -113,6 +111,18 @@ class AccessLogSummaryView(APIView):
         date_from = request.query_params.get('date_from')
         date_to = request.query_params.get('date_to')
 
+        # 역할/action/결과/기간 필터만 있으면 일별 집계 테이블에서 조회
+        if not user_login_id and not ip_address:
+            return Response(access_summary(
+                user_role=user_role,
+                action=action,
+                result=result,
+                date_from=date_from,
+                date_to=date_to,
+            ))
+
+        # 사용자/IP 검색은 집계 차원이 아니므로 원본 로그 조회
+        queryset = AccessLog.objects.all()
         if user_login_id:
             queryset = queryset.filter(user__login_id__icontains=user_login_id)
         if user_role:
@@ -128,13 +138,11 @@ class AccessLogSummaryView(APIView):
         if date_to:
             queryset = queryset.filter(created_at__date__lte=date_to)
 
-        # 집계
-        total_count = queryset.count()
-        latest_access = queryset.aggregate(latest=Max('created_at'))['latest']
-        fail_count = queryset.filter(result='FAIL').count()
+        # 집계 (조건부 집계 1회)
+        stats = queryset.aggregate(
+            total_count=Count('id'),
+            latest_access=Max('created_at'),
+            fail_count=Count('id', filter=Q(result='FAIL')),
+        )
 
-        return Response({
-            'total_count': total_count,
-            'latest_access': latest_access,
-            'fail_count': fail_count,
-        })
+        return Response(stats)
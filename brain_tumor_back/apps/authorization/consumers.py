@@ -1,12 +1,23 @@
 import json
 from channels.generic.websocket import AsyncWebsocketConsumer
 
+from apps.accounts.services.permission_service import role_group_name
+
 class PermissionConsumer(AsyncWebsocketConsumer):
     async def connect(self):
+        # ?token= 으로 인증된 경우 역할 그룹에 가입 (역할 메뉴 변경 시 알림 수신)
+        self.group_name = None
+        user = self.scope.get("user")
+        if user and user.is_authenticated and user.role_id:
+            self.group_name = role_group_name(user.role_id)
+            await self.channel_layer.group_add(self.group_name, self.channel_name)
+
         await self.accept()
         print("🔥 WebSocket connected")
 
     async def disconnect(self, close_code):
+        if getattr(self, "group_name", None):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
         print("❌ WebSocket disconnected")
 
     async def receive(self, text_data):
@@ -15,4 +26,10 @@ class PermissionConsumer(AsyncWebsocketConsumer):
         await self.send(text_data=json.dumps({
             "type": "PERMISSION_CHANGED",
             "message": "권한이 변경되었습니다."
-        }))
\ No newline at end of file
+        }))
+
+    async def permission_changed(self, event):
+        await self.send(text_data=json.dumps({
+            "type": "PERMISSION_CHANGED",
+            "message": "권한이 변경되었습니다."
+        }))
@@ -11,7 +11,6 @@ from django.db.models import F
 from apps.accounts.models.role_permission_history import RolePermissionHistory
 from apps.audit.services import create_audit_log
 from apps.menus.models import MenuPermission
-from apps.accounts.models import RolePermission
 
 class RoleSerializer(serializers.ModelSerializer):
     class Meta:
@@ -141,39 +140,10 @@ class MeSerializer(serializers.ModelSerializer):
         if not obj.role:
             return []
 
-        from apps.menus.models import Menu
+        from apps.menus.services import get_role_menu_closure
 
-        # 1. RolePermission에 직접 등록된 메뉴 ID 조회
-        direct_menu_ids = set(
-            RolePermission.objects
-            .filter(role=obj.role)
-            .values_list("permission_id", flat=True)
-        )
-
-        # 2. 직접 등록된 메뉴 + 그 자식 메뉴까지 모두 포함
-        all_menu_ids = set(direct_menu_ids)
-
-        def add_children(parent_ids):
-            if not parent_ids:
-                return
-            child_ids = set(
-                Menu.objects.filter(parent_id__in=parent_ids, is_active=True)
-                .values_list("id", flat=True)
-            )
-            new_ids = child_ids - all_menu_ids
-            all_menu_ids.update(new_ids)
-            add_children(new_ids)  # 재귀적으로 자식의 자식도 포함
-
-        add_children(direct_menu_ids)
-
-        # 3. path가 있는 메뉴의 code만 반환 (실제 페이지)
-        return list(
-            Menu.objects.filter(
-                id__in=all_menu_ids,
-                is_active=True,
-                path__isnull=False
-            ).values_list("code", flat=True)
-        )
+        # 직접 등록된 메뉴 + 자식 메뉴 중 path가 있는 메뉴의 code (역할별 closure 캐시)
+        return list(get_role_menu_closure(obj.role)["permission_codes"])
 # class MeSerializer(serializers.ModelSerializer) :
 #     permissions = serializers.SerializerMethodField()
 #     role = RoleSerializer(read_only=True)  # Role 전체 객체 직렬화
@@ -1,3 +1,4 @@
+from django.db import transaction
 from django.db.models import Q
 from rest_framework.decorators import action
 from rest_framework.views import APIView
@@ -240,7 +241,8 @@ class RoleViewSet(ModelViewSet): # - ModelViewSet을 상속하면 기본적으
     # 역할별 메뉴 수정
     @action(detail=True, methods=["put"], url_path="menus")
     def update_menus(self, request, pk=None):
-        from apps.accounts.services.permission_service import notify_permission_changed
+        from apps.accounts.services.permission_service import notify_role_permission_changed
+        from apps.menus.services import invalidate_menu_closure
 
         role = self.get_object()
 
@@ -301,14 +303,11 @@ class RoleViewSet(ModelViewSet): # - ModelViewSet을 상속하면 기본적으
             )
             for menu in valid_menus
         ])
+        # bulk_create 는 시그널이 없으므로 메뉴 closure 캐시 직접 무효화
+        transaction.on_commit(invalidate_menu_closure)
 
-        # 해당 역할을 가진 모든 사용자에게 권한 변경 알림
-        users_with_role = User.objects.filter(role=role)
-        for user in users_with_role:
-            try:
-                notify_permission_changed(user.id)
-            except Exception:
-                pass  # WebSocket 연결이 없는 사용자는 무시
+        # 해당 역할 그룹에 권한 변경 알림 (커밋 후 1회 브로드캐스트)
+        notify_role_permission_changed(role.id)
 
         return Response({
             "saved_permission_ids": list(
@@ -21,8 +21,13 @@ from drf_spectacular.utils import extend_schema, OpenApiResponse
 from apps.accounts.models import User
 from apps.patients.models import Patient
 from apps.ocs.models import OCS
+from apps.ocs.stats import get_external_upload_stats, get_status_overview
 from apps.encounters.models import Encounter
-from apps.audit.models import AuditLog
+from apps.audit.buffer import access_log_buffer
+from apps.accounts.services.permission_service import permission_broadcast_stats
+from apps.accounts.services.presence_service import count_active_since
+from apps.ocs.notifications import ocs_notification_dispatcher
+from apps.audit.rollup import action_counts
 from apps.common.permission import IsAdmin, IsExternalOrAdmin, IsDoctorOrAdmin
 
 logger = logging.getLogger(__name__)
@@ -86,7 +91,7 @@ class AdminDashboardStatsView(APIView):
             month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
             week_ago = now - timedelta(days=7)
 
-            # 사용자 통계
+            # 사용자 통계 (역할별 GROUP BY 합계 = 전체)
             users = User.objects.filter(is_active=True)
             user_by_role = dict(
                 users.values('role__code')
@@ -94,38 +99,21 @@ class AdminDashboardStatsView(APIView):
                 .values_list('role__code', 'count')
             )
 
-            # 환자 통계
-            patients = Patient.objects.filter(is_deleted=False)
-
-            # OCS 통계
-            ocs_all = OCS.objects.filter(is_deleted=False)
-            ocs_by_status = dict(
-                ocs_all.values('ocs_status')
-                .annotate(count=Count('id'))
-                .values_list('ocs_status', 'count')
+            # 환자 통계 (조건부 집계 1회)
+            patient_stats = Patient.objects.filter(is_deleted=False).aggregate(
+                total=Count('id'),
+                new_this_month=Count('id', filter=Q(created_at__gte=month_start)),
             )
 
             return Response({
                 'users': {
-                    'total': users.count(),
+                    'total': sum(user_by_role.values()),
                     'by_role': user_by_role,
                     'recent_logins': users.filter(last_login__gte=week_ago).count(),
                 },
-                'patients': {
-                    'total': patients.count(),
-                    'new_this_month': patients.filter(created_at__gte=month_start).count(),
-                },
-                'ocs': {
-                    'total': ocs_all.count(),
-                    'by_status': ocs_by_status,
-                    'pending_count': ocs_all.filter(
-                        ocs_status__in=[
-                            OCS.OcsStatus.ORDERED,
-                            OCS.OcsStatus.ACCEPTED,
-                            OCS.OcsStatus.IN_PROGRESS
-                        ]
-                    ).count(),
-                },
+                'patients': patient_stats,
+                # OCS 통계 (상태별 GROUP BY 1회, 짧은 TTL 캐시)
+                'ocs': get_status_overview(),
             })
         except Exception as e:
             logger.error(f"Admin dashboard stats error: {str(e)}")
@@ -170,26 +158,12 @@ class ExternalDashboardStatsView(APIView):
             # attachments.external_source.institution.code가 자기 login_id와 일치하는 것만
             # ADMIN/SYSTEMMANAGER는 모든 외부 OCS 조회 가능
             if user.role and user.role.code == 'EXTERNAL':
-                user_filter = Q(attachments__external_source__institution__code=user.login_id)
+                institution_code = user.login_id
+                user_filter = Q(attachments__external_source__institution__code=institution_code)
             else:
+                institution_code = None
                 user_filter = Q()  # 관리자는 필터 없음
 
-            # 외부 LIS 업로드
-            lis_external = OCS.objects.filter(
-                external_filter,
-                user_filter,
-                job_role='LIS',
-                is_deleted=False
-            )
-
-            # 외부 RIS 업로드
-            ris_external = OCS.objects.filter(
-                external_filter,
-                user_filter,
-                job_role='RIS',
-                is_deleted=False
-            )
-
             # 최근 업로드
             recent = OCS.objects.filter(
                 external_filter,
@@ -197,28 +171,9 @@ class ExternalDashboardStatsView(APIView):
                 is_deleted=False
             ).select_related('patient').order_by('-created_at')[:10]
 
-            # 모든 상태별 카운트 반환
-            def get_status_counts(queryset):
-                return {
-                    'ordered': queryset.filter(ocs_status=OCS.OcsStatus.ORDERED).count(),
-                    'accepted': queryset.filter(ocs_status=OCS.OcsStatus.ACCEPTED).count(),
-                    'in_progress': queryset.filter(ocs_status=OCS.OcsStatus.IN_PROGRESS).count(),
-                    'result_ready': queryset.filter(ocs_status=OCS.OcsStatus.RESULT_READY).count(),
-                    'confirmed': queryset.filter(ocs_status=OCS.OcsStatus.CONFIRMED).count(),
-                    'cancelled': queryset.filter(ocs_status=OCS.OcsStatus.CANCELLED).count(),
-                }
-
             return Response({
-                'lis_uploads': {
-                    **get_status_counts(lis_external),
-                    'total': lis_external.count(),
-                    'total_this_week': lis_external.filter(created_at__gte=week_ago).count(),
-                },
-                'ris_uploads': {
-                    **get_status_counts(ris_external),
-                    'total': ris_external.count(),
-                    'total_this_week': ris_external.filter(created_at__gte=week_ago).count(),
-                },
+                # LIS / RIS 상태별 카운트 (GROUP BY 1회, 짧은 TTL 캐시)
+                **get_external_upload_stats(external_filter, institution_code, week_ago),
                 'recent_uploads': [
                     {
                         'id': o.id,
@@ -323,7 +278,6 @@ class SystemMonitorView(APIView):
     def get(self, request):
         try:
             now = timezone.now()
-            today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
 
             # 1. 서버 상태 (Health Check)
             server_status = "healthy"
@@ -364,27 +318,18 @@ class SystemMonitorView(APIView):
 
             # 3. 활성 세션 수 (최근 30분 이내 last_seen이 있는 사용자)
             session_threshold = now - timedelta(minutes=30)
-            active_sessions = User.objects.filter(
-                is_active=True,
-                last_seen__gte=session_threshold
-            ).count()
-
-            # 4. 금일 로그인 통계 (AuditLog 기반)
-            today_login_success = AuditLog.objects.filter(
-                action='LOGIN_SUCCESS',
-                created_at__gte=today_start
-            ).count()
-
-            today_login_fail = AuditLog.objects.filter(
-                action='LOGIN_FAIL',
-                created_at__gte=today_start
-            ).count()
+            active_sessions = count_active_since(session_threshold)
+
+            # 4. 금일 로그인 통계 (AuditLog 일별 집계 테이블 기반)
+            login_counts = action_counts(
+                'AUDIT', timezone.localdate(now),
+                actions=['LOGIN_SUCCESS', 'LOGIN_FAIL', 'LOGIN_LOCKED'],
+            )
+            today_login_success = login_counts.get('LOGIN_SUCCESS', 0)
+            today_login_fail = login_counts.get('LOGIN_FAIL', 0)
 
             # 5. 오류 발생 건수 (금일 로그인 실패 + 잠금)
-            today_login_locked = AuditLog.objects.filter(
-                action='LOGIN_LOCKED',
-                created_at__gte=today_start
-            ).count()
+            today_login_locked = login_counts.get('LOGIN_LOCKED', 0)
 
             error_count = today_login_fail + today_login_locked
 
@@ -430,6 +375,10 @@ class SystemMonitorView(APIView):
                     'login_fail': today_login_fail,
                     'login_locked': today_login_locked,
                 },
+                # 접근 로그 버퍼 / 역할 권한 알림 / OCS 알림 전송 상태 (이 프로세스 기준)
+                'access_log': access_log_buffer.stats(),
+                'permission_broadcast': permission_broadcast_stats(),
+                'ocs_notifications': ocs_notification_dispatcher.stats(),
                 'acknowledged_alerts': acknowledged_alerts,
                 'timestamp': now.isoformat(),
             })
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class MenusConfig(AppConfig):
+    name = "apps.menus"
+
+    def ready(self):
+        from . import signals  # noqa: F401
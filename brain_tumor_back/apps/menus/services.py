@@ -1,53 +1,152 @@
+import logging
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+
 from .models import Menu, MenuPermission
+from .utils import build_menu_tree
 from apps.accounts.services.permission_service import get_user_permission
 from apps.accounts.models import RolePermission
 
-# 특정 유저가 접근 가능한 메뉴를 반환하는 함수.
-def get_user_menus(user):
-    role = user.role
+logger = logging.getLogger(__name__)
+
+# 역할별 메뉴 closure 캐시
+# - 역할의 직접 권한 메뉴 + 자식(상세 페이지 등) + 부모(사이드바 트리)를 한 번에 계산해 보관
+#   menu_ids: 접근 가능한 활성 메뉴 ID, permission_codes: MeSerializer.permissions, tree: 사이드바 트리
+# - Redis(버전 키 포함) + 프로세스 메모리에 캐시, 메뉴/라벨/역할 권한 변경 시 버전 증가 (signals.py)
+# - 정상 상태에서는 /me, 메뉴 API 모두 메뉴 쿼리 없이 응답 (버전 확인용 Redis GET 1회)
+CACHE_TTL = getattr(settings, "MENU_CLOSURE_CACHE_TTL", 3600)
+CACHE_VERSION_KEY = "menu_closure:version"
+
+_local_cache = {}  # role_id -> (version, closure)
+_local_lock = threading.Lock()
+
+
+def _empty_closure():
+    return {"menu_ids": [], "permission_codes": [], "tree": []}
 
-    # 1. RolePermission에 직접 등록된 메뉴 ID 조회
+
+def _build_closure(role_id):
     direct_menu_ids = set(
         RolePermission.objects
-        .filter(role=role)
+        .filter(role_id=role_id)
         .values_list("permission_id", flat=True)
     )
+    if not direct_menu_ids:
+        return _empty_closure()
 
-    # 2. 직접 등록된 메뉴 + 그 자식 메뉴까지 모두 포함 (상세 페이지 등)
-    all_menu_ids = set(direct_menu_ids)
+    # 메뉴 테이블은 작으므로 전체를 한 번에 읽고 메모리에서 탐색
+    menus = {menu.id: menu for menu in Menu.objects.prefetch_related("labels")}
+    children = {}
+    for menu in menus.values():
+        if menu.parent_id and menu.is_active:
+            children.setdefault(menu.parent_id, []).append(menu.id)
 
-    def add_children(parent_ids):
-        if not parent_ids:
-            return
-        child_ids = set(
-            Menu.objects.filter(parent_id__in=parent_ids, is_active=True)
-            .values_list("id", flat=True)
-        )
-        new_ids = child_ids - all_menu_ids
-        all_menu_ids.update(new_ids)
-        add_children(new_ids)  # 재귀적으로 자식의 자식도 포함
+    # 1. 직접 등록된 메뉴 + 활성 자식 메뉴 (재귀)
+    page_ids = set(direct_menu_ids)
+    stack = list(direct_menu_ids)
+    while stack:
+        for child_id in children.get(stack.pop(), ()):
+            if child_id not in page_ids:
+                page_ids.add(child_id)
+                stack.append(child_id)
 
-    add_children(direct_menu_ids)
+    # 2. 부모 메뉴까지 포함 (사이드바 트리 구성용)
+    all_menu_ids = set(page_ids)
+    for menu_id in page_ids:
+        menu = menus.get(menu_id)
+        while menu is not None and menu.parent_id and menu.parent_id not in all_menu_ids:
+            all_menu_ids.add(menu.parent_id)
+            menu = menus.get(menu.parent_id)
 
-    # 3. 부모 메뉴까지 재귀적으로 포함 (사이드바 트리 구성용)
-    def add_parents(menu_ids):
-        parent_ids = set(
-            Menu.objects.filter(id__in=menu_ids, parent__isnull=False)
-            .values_list("parent_id", flat=True)
-        )
-        new_parents = parent_ids - all_menu_ids
-        if new_parents:
-            all_menu_ids.update(new_parents)
-            add_parents(new_parents)
+    # 3. 활성 메뉴만 (breadcrumb_only 포함 - 사이드바 표시 여부는 프론트에서 결정)
+    accessible = sorted(
+        (menus[i] for i in all_menu_ids if i in menus and menus[i].is_active),
+        key=lambda m: (m.order, m.id),
+    )
+    return {
+        "menu_ids": [menu.id for menu in accessible],
+        # path 가 있는 메뉴만 (실제 페이지), 부모 메뉴는 제외
+        "permission_codes": [
+            menu.code for menu in accessible
+            if menu.id in page_ids and menu.path is not None
+        ],
+        "tree": build_menu_tree(accessible),
+    }
 
-    add_parents(all_menu_ids.copy())
 
-    # 4. 메뉴 조회 (breadcrumb_only 포함 - 라우팅/권한 체크용)
+def _cache_version():
+    version = cache.get(CACHE_VERSION_KEY)
+    if version is None:
+        cache.add(CACHE_VERSION_KEY, 1, timeout=None)
+        version = cache.get(CACHE_VERSION_KEY, 1)
+    return version
+
+
+def get_role_menu_closure(role):
+    """
+    역할의 메뉴 closure (읽기 전용 - 캐시 객체를 그대로 반환하므로 수정 금지)
+
+    Returns:
+        {"menu_ids": [...], "permission_codes": [...], "tree": [...]}
+    """
+    if role is None:
+        return _empty_closure()
+    role_id = role.pk
+
+    try:
+        version = _cache_version()
+    except Exception as e:
+        logger.warning(f"Menu closure cache unavailable: {e}")
+        return _build_closure(role_id)
+
+    local = _local_cache.get(role_id)
+    if local is not None and local[0] == version:
+        return local[1]
+
+    key = f"menu_closure:{version}:{role_id}"
+    closure = None
+    try:
+        closure = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Menu closure cache get failed: {e}")
+
+    if closure is None:
+        closure = _build_closure(role_id)
+        try:
+            cache.set(key, closure, CACHE_TTL)
+        except Exception as e:
+            logger.warning(f"Menu closure cache set failed: {e}")
+
+    with _local_lock:
+        _local_cache[role_id] = (version, closure)
+    return closure
+
+
+def invalidate_menu_closure():
+    """메뉴/라벨/역할 권한 변경 시 호출 - 버전을 올려 모든 역할의 closure 무효화"""
+    with _local_lock:
+        _local_cache.clear()
+    try:
+        cache.incr(CACHE_VERSION_KEY)
+    except ValueError:
+        # 버전 키가 없으면 (캐시 재시작) 이전 키와 겹치지 않도록 큰 값으로 시작
+        cache.add(CACHE_VERSION_KEY, 2, timeout=None)
+    except Exception as e:
+        logger.warning(f"Menu closure cache invalidate failed: {e}")
+
+
+# 특정 유저가 접근 가능한 메뉴를 반환하는 함수.
+def get_user_menus(user):
+    menu_ids = get_role_menu_closure(user.role)["menu_ids"]
+
+    # breadcrumb_only 포함 - 라우팅/권한 체크용
     # 사이드바 표시 여부는 프론트엔드에서 breadcrumbOnly 필드로 결정
     menus = (
         Menu.objects.filter(
             is_active=True,
-            id__in=all_menu_ids,
+            id__in=menu_ids,
         )
         .select_related("parent")
         .prefetch_related("children", "labels")
@@ -55,6 +154,11 @@ def get_user_menus(user):
     )
     return menus
 
+
+# 특정 유저의 사이드바 메뉴 트리 (캐시된 closure 사용)
+def get_user_menu_tree(user):
+    return get_role_menu_closure(user.role)["tree"]
+
 # 주어진 권한 코드로 접근 가능한 메뉴를 반환하는 함수.
 def get_accessible_menus(permission_codes: list[str]):
     """
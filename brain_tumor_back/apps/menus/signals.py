@@ -0,0 +1,25 @@
+"""
+메뉴 구성 / 역할 권한 변경 시 역할별 메뉴 closure 캐시 무효화
+
+메뉴는 관리자 화면, fixture, register_*_menu 명령 등 여러 경로로 바뀌므로 모델 시그널에서 처리.
+커밋 이후에 무효화해야 다른 요청이 커밋 전 값으로 캐시를 다시 채우지 않음.
+(RoleViewSet.update_menus 의 bulk_create 는 시그널이 없어 뷰에서 직접 무효화)
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.accounts.models import RolePermission
+
+from .models import Menu, MenuLabel
+from .services import invalidate_menu_closure
+
+
+@receiver(post_save, sender=Menu)
+@receiver(post_delete, sender=Menu)
+@receiver(post_save, sender=MenuLabel)
+@receiver(post_delete, sender=MenuLabel)
+@receiver(post_save, sender=RolePermission)
+@receiver(post_delete, sender=RolePermission)
+def invalidate_menu_cache(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_menu_closure)
@@ -5,3 +5,6 @@ class OcsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.ocs"
     verbose_name = "OCS (Order Communication System)"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -133,6 +133,18 @@ class OCSConsumer(AsyncWebsocketConsumer):
             'timestamp': event['timestamp'],
         }))
 
+    async def ocs_batch(self, event):
+        """묶음 알림 (notifications.OCSNotificationDispatcher) - 개별 알림으로 풀어서 전달"""
+        handlers = {
+            'ocs_status_changed': self.ocs_status_changed,
+            'ocs_created': self.ocs_created,
+            'ocs_cancelled': self.ocs_cancelled,
+        }
+        for item in event['events']:
+            handler = handlers.get(item.get('type'))
+            if handler:
+                await handler(item)
+
     # =========================================================================
     # 헬퍼 메서드
     # =========================================================================
@@ -6,20 +6,272 @@ OCS 알림 서비스
 - ocs_ris: 모든 RIS 관련 알림 (RIS 작업자, 관리자가 구독)
 - ocs_lis: 모든 LIS 관련 알림 (LIS 작업자, 관리자가 구독)
 - ocs_doctor_{id}: 특정 의사가 처방한 오더 알림
+
+전송 방식 (OCSNotificationDispatcher):
+- notify_* 는 이벤트만 만들어 transaction.on_commit 에 등록 (롤백되면 전송 안 함, 요청은 Redis 를 기다리지 않음)
+- 커밋된 이벤트는 백그라운드 스레드가 OCS_NOTIFY_COALESCE_WINDOW 동안 모아서 그룹별로 전송
+  같은 그룹 이벤트가 여러 건이면 'ocs_batch' 메시지 1건으로 묶음 (OCSConsumer 가 풀어서 전달)
+- 환자 이름이 OCS 인스턴스에 로드되어 있지 않으면 전송 시 배치 단위로 한 번에 조회
+- stats(): 커밋 → 전송 지연, 전송/실패/유실 카운터 (시스템 모니터링 API)
 """
+import asyncio
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import close_old_connections, transaction
 from django.utils import timezone
 
+logger = logging.getLogger(__name__)
+
+COALESCE_WINDOW = getattr(settings, 'OCS_NOTIFY_COALESCE_WINDOW', 0.05)
+MAX_BATCH = getattr(settings, 'OCS_NOTIFY_MAX_BATCH', 100)
+QUEUE_SIZE = getattr(settings, 'OCS_NOTIFY_QUEUE_SIZE', 10000)
+
 
 def _debug_send(group_name, event_type, message):
     """디버깅용 로그 출력"""
     print(f"📤 [OCS 알림] group={group_name}, type={event_type}, msg={message[:50]}...")
 
 
+class _Notification:
+    __slots__ = ('groups', 'event', 'patient_id', 'render', 'committed_at')
+
+    def __init__(self, groups, event, patient_id, render):
+        self.groups = groups
+        self.event = event
+        self.patient_id = patient_id
+        self.render = render
+        self.committed_at = None
+
+
+class OCSNotificationDispatcher:
+    """커밋 후 OCS 알림을 모아서 전송하는 백그라운드 dispatcher"""
+
+    def __init__(self, coalesce_window: float = COALESCE_WINDOW, max_batch: int = MAX_BATCH,
+                 capacity: int = QUEUE_SIZE):
+        self.coalesce_window = coalesce_window
+        self.max_batch = max_batch
+        self.capacity = capacity
+
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._stopped = False
+
+        self.published = 0
+        self.messages_sent = 0
+        self.events_delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self._latency_last = None
+        self._latency_max = 0.0
+        self._latency_total = 0.0
+
+    def publish(self, groups, event, patient_id=None, render=None):
+        """
+        커밋 후 전송할 알림 등록 (요청 스레드, Redis 접근 없음)
+
+        Args:
+            groups: 전송할 그룹 이름 목록
+            event: 그룹 메시지 (render 가 있으면 전송 전에 환자 이름으로 완성)
+            patient_id / render: 환자 이름 지연 조회용 - render(event, patient_name)
+        """
+        if not groups:
+            return
+        notification = _Notification(groups, event, patient_id, render)
+        transaction.on_commit(lambda: self._enqueue(notification))
+
+    def _enqueue(self, notification):
+        notification.committed_at = time.monotonic()
+        with self._lock:
+            if len(self._queue) >= self.capacity:
+                self.dropped += 1
+                logger.warning(f"OCS 알림 큐 가득 참 ({self.capacity}건), 누적 유실 {self.dropped}건")
+                return
+            self._queue.append(notification)
+            self.published += 1
+
+        self._ensure_thread()
+        self._wakeup.set()
+
+    def _ensure_thread(self):
+        if self._thread is not None or self._stopped:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='ocs-notify', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stopped:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            # 연속으로 들어오는 이벤트 (일괄 상태 변경 등) 를 모아서 전송
+            time.sleep(self.coalesce_window)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"OCS 알림 전송 실패: {e}")
+            finally:
+                close_old_connections()
+
+    def _take_all(self):
+        with self._lock:
+            items = list(self._queue)
+            self._queue.clear()
+        return items
+
+    def _resolve_patient_names(self, items):
+        """환자 이름이 없는 알림을 한 번의 쿼리로 완성"""
+        from apps.patients.models import Patient
+
+        pending = [item for item in items if item.render is not None]
+        if not pending:
+            return
+        names = {}
+        try:
+            names = dict(
+                Patient.objects.filter(id__in={item.patient_id for item in pending})
+                .values_list('id', 'name')
+            )
+        except Exception as e:
+            logger.warning(f"OCS 알림 환자 이름 조회 실패: {e}")
+        for item in pending:
+            item.render(item.event, names.get(item.patient_id, ''))
+            item.render = None
+
+    def _build_messages(self, items):
+        """그룹별 메시지 목록 [(group, message, [items])] - 여러 건이면 ocs_batch 로 묶음"""
+        by_group = {}
+        for item in items:
+            for group in item.groups:
+                by_group.setdefault(group, []).append(item)
+
+        messages = []
+        for group, group_items in by_group.items():
+            for start in range(0, len(group_items), self.max_batch):
+                chunk = group_items[start:start + self.max_batch]
+                if len(chunk) == 1:
+                    message = chunk[0].event
+                else:
+                    message = {'type': 'ocs_batch', 'events': [item.event for item in chunk]}
+                messages.append((group, message, chunk))
+        return messages
+
+    async def _send_all(self, channel_layer, messages):
+        return await asyncio.gather(
+            *[channel_layer.group_send(group, message) for group, message, _ in messages],
+            return_exceptions=True,
+        )
+
+    def flush(self) -> int:
+        """
+        대기 중인 알림 전송
+
+        Returns:
+            전송된 그룹 메시지 수
+        """
+        with self._flush_lock:
+            items = self._take_all()
+            if not items:
+                return 0
+
+            channel_layer = get_channel_layer()
+            if not channel_layer:
+                return 0
+
+            self._resolve_patient_names(items)
+            messages = self._build_messages(items)
+            for group, message, _ in messages:
+                _debug_send(group, message['type'], message.get('message', f"{len(message.get('events', []))}건"))
+
+            try:
+                results = async_to_sync(self._send_all)(channel_layer, messages)
+            except Exception as e:
+                results = [e] * len(messages)
+
+            now = time.monotonic()
+            sent = 0
+            for (group, _, chunk), result in zip(messages, results):
+                if isinstance(result, Exception):
+                    self.failed += 1
+                    logger.warning(f"OCS 알림 전송 실패 (group={group}, {len(chunk)}건): {result}")
+                    continue
+                sent += 1
+                self.events_delivered += len(chunk)
+                for item in chunk:
+                    self._record_latency((now - item.committed_at) * 1000)
+            self.messages_sent += sent
+            return sent
+
+    def _record_latency(self, latency_ms):
+        self._latency_last = latency_ms
+        self._latency_max = max(self._latency_max, latency_ms)
+        self._latency_total += latency_ms
+
+    def shutdown(self):
+        """종료 시 남은 알림 전송"""
+        self._stopped = True
+        self._wakeup.set()
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"OCS 알림 전송 실패: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            pending = len(self._queue)
+        delivered = self.events_delivered
+        return {
+            'pending': pending,
+            'published': self.published,
+            'messages_sent': self.messages_sent,
+            'events_delivered': delivered,
+            'failed': self.failed,
+            'dropped': self.dropped,
+            'latency_ms': {
+                'last': round(self._latency_last, 1) if self._latency_last is not None else None,
+                'avg': round(self._latency_total / delivered, 1) if delivered else None,
+                'max': round(self._latency_max, 1),
+            },
+        }
+
+
+ocs_notification_dispatcher = OCSNotificationDispatcher()
+atexit.register(ocs_notification_dispatcher.shutdown)
+
+
+def _target_groups(ocs, include_doctor=True):
+    """역할별 그룹 (RIS/LIS 작업자 + 관리자) + 처방 의사 그룹"""
+    groups = []
+    job_role_lower = ocs.job_role.lower() if ocs.job_role else ''
+    if job_role_lower in ['ris', 'lis']:
+        groups.append(f"ocs_{job_role_lower}")
+    if include_doctor and ocs.doctor_id:
+        groups.append(f"ocs_doctor_{ocs.doctor_id}")
+    return groups
+
+
+def _publish(ocs, groups, event, render):
+    """환자 이름이 로드되어 있으면 바로 완성, 아니면 전송 시 일괄 조회"""
+    if ocs._meta.get_field('patient').is_cached(ocs):
+        render(event, ocs.patient.name)
+        ocs_notification_dispatcher.publish(groups, event)
+    else:
+        ocs_notification_dispatcher.publish(groups, event, patient_id=ocs.patient_id, render=render)
+
+
 def notify_ocs_status_changed(ocs, from_status, to_status, actor):
     """
-    OCS 상태 변경 알림 전송
+    OCS 상태 변경 알림 (커밋 후 전송)
 
     Args:
         ocs: OCS 인스턴스
@@ -27,22 +279,19 @@ def notify_ocs_status_changed(ocs, from_status, to_status, actor):
         to_status: 변경된 상태
         actor: 상태 변경을 수행한 사용자
     """
-    channel_layer = get_channel_layer()
-    if not channel_layer:
-        return
-
-    timestamp = timezone.now().isoformat()
-
-    # 상태별 메시지
-    status_messages = {
-        'ACCEPTED': f'{ocs.patient.name}님의 {ocs.job_type} 오더가 접수되었습니다.',
-        'IN_PROGRESS': f'{ocs.patient.name}님의 {ocs.job_type} 작업이 시작되었습니다.',
-        'RESULT_READY': f'{ocs.patient.name}님의 {ocs.job_type} 결과가 제출되었습니다.',
-        'CONFIRMED': f'{ocs.patient.name}님의 {ocs.job_type} 결과가 확정되었습니다.',
-        'CANCELLED': f'{ocs.patient.name}님의 {ocs.job_type} 오더가 취소되었습니다.',
-    }
+    job_type = ocs.job_type
 
-    message = status_messages.get(to_status, f'OCS 상태가 {to_status}(으)로 변경되었습니다.')
+    def render(event, patient_name):
+        # 상태별 메시지
+        status_messages = {
+            'ACCEPTED': f'{patient_name}님의 {job_type} 오더가 접수되었습니다.',
+            'IN_PROGRESS': f'{patient_name}님의 {job_type} 작업이 시작되었습니다.',
+            'RESULT_READY': f'{patient_name}님의 {job_type} 결과가 제출되었습니다.',
+            'CONFIRMED': f'{patient_name}님의 {job_type} 결과가 확정되었습니다.',
+            'CANCELLED': f'{patient_name}님의 {job_type} 오더가 취소되었습니다.',
+        }
+        event['patient_name'] = patient_name
+        event['message'] = status_messages.get(to_status, f'OCS 상태가 {to_status}(으)로 변경되었습니다.')
 
     event_data = {
         'type': 'ocs_status_changed',
@@ -51,81 +300,56 @@ def notify_ocs_status_changed(ocs, from_status, to_status, actor):
         'from_status': from_status,
         'to_status': to_status,
         'job_role': ocs.job_role,
-        'patient_name': ocs.patient.name,
         'actor_name': actor.name if actor else 'System',
-        'message': message,
-        'timestamp': timestamp,
+        'timestamp': timezone.now().isoformat(),
     }
-
-    # 역할별 그룹에 알림 (RIS/LIS 작업자 + 관리자가 구독)
-    job_role_lower = ocs.job_role.lower() if ocs.job_role else ''
-    if job_role_lower in ['ris', 'lis']:
-        group_name = f"ocs_{job_role_lower}"
-        _debug_send(group_name, 'ocs_status_changed', message)
-        async_to_sync(channel_layer.group_send)(group_name, event_data)
-
-    # 처방 의사에게 알림 (의사 전용 그룹)
-    if ocs.doctor_id:
-        group_name = f"ocs_doctor_{ocs.doctor_id}"
-        _debug_send(group_name, 'ocs_status_changed', message)
-        async_to_sync(channel_layer.group_send)(group_name, event_data)
+    _publish(ocs, _target_groups(ocs), event_data, render)
 
 
 def notify_ocs_created(ocs, doctor):
     """
-    새 OCS 생성 알림 전송
+    새 OCS 생성 알림 (커밋 후 전송, RIS/LIS 그룹)
 
     Args:
         ocs: OCS 인스턴스
         doctor: 오더를 생성한 의사
     """
-    channel_layer = get_channel_layer()
-    if not channel_layer:
-        return
-
-    timestamp = timezone.now().isoformat()
+    job_type = ocs.job_type
     priority_label = {'urgent': '긴급', 'normal': '일반', 'scheduled': '예약'}.get(ocs.priority, ocs.priority)
 
-    message = f'새 {ocs.job_type} 오더가 생성되었습니다. (환자: {ocs.patient.name}, 우선순위: {priority_label})'
+    def render(event, patient_name):
+        event['patient_name'] = patient_name
+        event['message'] = f'새 {job_type} 오더가 생성되었습니다. (환자: {patient_name}, 우선순위: {priority_label})'
 
     event_data = {
         'type': 'ocs_created',
         'ocs_id': ocs.ocs_id,
         'ocs_pk': ocs.id,
         'job_role': ocs.job_role,
-        'job_type': ocs.job_type,
+        'job_type': job_type,
         'priority': ocs.priority,
-        'patient_name': ocs.patient.name,
         'doctor_name': doctor.name if doctor else 'Unknown',
-        'message': message,
-        'timestamp': timestamp,
+        'timestamp': timezone.now().isoformat(),
     }
-
-    # 역할별 그룹에 알림 (RIS/LIS 작업자 + 관리자가 구독)
-    job_role_lower = ocs.job_role.lower() if ocs.job_role else ''
-    if job_role_lower in ['ris', 'lis']:
-        group_name = f"ocs_{job_role_lower}"
-        _debug_send(group_name, 'ocs_created', message)
-        async_to_sync(channel_layer.group_send)(group_name, event_data)
+    _publish(ocs, _target_groups(ocs, include_doctor=False), event_data, render)
 
 
 def notify_ocs_cancelled(ocs, actor, reason=''):
     """
-    OCS 취소 알림 전송
+    OCS 취소 알림 (커밋 후 전송)
 
     Args:
         ocs: OCS 인스턴스
         actor: 취소를 수행한 사용자
         reason: 취소 사유
     """
-    channel_layer = get_channel_layer()
-    if not channel_layer:
-        return
+    job_type = ocs.job_type
 
-    timestamp = timezone.now().isoformat()
-    message = f'{ocs.patient.name}님의 {ocs.job_type} 오더가 취소되었습니다.'
-    if reason:
-        message += f' (사유: {reason})'
+    def render(event, patient_name):
+        message = f'{patient_name}님의 {job_type} 오더가 취소되었습니다.'
+        if reason:
+            message += f' (사유: {reason})'
+        event['message'] = message
 
     event_data = {
         'type': 'ocs_cancelled',
@@ -133,19 +357,6 @@ def notify_ocs_cancelled(ocs, actor, reason=''):
         'ocs_pk': ocs.id,
         'reason': reason,
         'actor_name': actor.name if actor else 'System',
-        'message': message,
-        'timestamp': timestamp,
+        'timestamp': timezone.now().isoformat(),
     }
-
-    # 역할별 그룹에 알림 (RIS/LIS 작업자 + 관리자가 구독)
-    job_role_lower = ocs.job_role.lower() if ocs.job_role else ''
-    if job_role_lower in ['ris', 'lis']:
-        group_name = f"ocs_{job_role_lower}"
-        _debug_send(group_name, 'ocs_cancelled', message)
-        async_to_sync(channel_layer.group_send)(group_name, event_data)
-
-    # 처방 의사에게 알림 (의사 전용 그룹)
-    if ocs.doctor_id:
-        group_name = f"ocs_doctor_{ocs.doctor_id}"
-        _debug_send(group_name, 'ocs_cancelled', message)
-        async_to_sync(channel_layer.group_send)(group_name, event_data)
+    _publish(ocs, _target_groups(ocs), event_data, render)
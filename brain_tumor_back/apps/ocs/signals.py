@@ -0,0 +1,18 @@
+"""
+OCS 변경 시 상태 집계 캐시 무효화
+
+상태 변경 경로가 OCS 뷰, imaging, 외부 업로드 등 여러 곳이라 모델 시그널에서 한 번에 처리.
+커밋 이후에 무효화해야 다른 요청이 커밋 전 값으로 캐시를 다시 채우지 않음.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import OCS
+from .stats import invalidate_stats
+
+
+@receiver(post_save, sender=OCS)
+@receiver(post_delete, sender=OCS)
+def invalidate_ocs_stats(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_stats)
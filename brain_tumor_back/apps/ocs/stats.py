@@ -0,0 +1,177 @@
+"""
+OCS 상태 집계 서비스 (대시보드 / 처리 현황 공용)
+
+- 상태별 카운트는 테이블당 한 번의 GROUP BY 쿼리
+  OCS.values('job_role', 'ocs_status').annotate(Count, 조건부 Count)
+- 결과는 짧은 TTL 로 캐시 (OCS_STATS_CACHE_TTL, 기본 15초)
+- OCS 저장/삭제 시 캐시 버전 증가 → 이전 결과는 즉시 무효 (signals.py)
+
+캐시 서버(Redis) 장애 시에는 캐시 없이 DB 에서 바로 집계.
+"""
+import logging
+from typing import Callable, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .models import OCS
+
+logger = logging.getLogger(__name__)
+
+CACHE_TTL = getattr(settings, 'OCS_STATS_CACHE_TTL', 15)
+CACHE_VERSION_KEY = 'ocs_stats:version'
+
+# ocs_status → 응답 키
+STATUS_KEYS = {
+    OCS.OcsStatus.ORDERED: 'ordered',
+    OCS.OcsStatus.ACCEPTED: 'accepted',
+    OCS.OcsStatus.IN_PROGRESS: 'in_progress',
+    OCS.OcsStatus.RESULT_READY: 'result_ready',
+    OCS.OcsStatus.CONFIRMED: 'confirmed',
+    OCS.OcsStatus.CANCELLED: 'cancelled',
+}
+PENDING_STATUSES = (OCS.OcsStatus.ORDERED, OCS.OcsStatus.ACCEPTED, OCS.OcsStatus.IN_PROGRESS)
+
+
+def _empty_counts() -> Dict[str, int]:
+    counts = {key: 0 for key in STATUS_KEYS.values()}
+    counts.update({'total': 0, 'since': 0})
+    return counts
+
+
+def status_counts_by_role(queryset, since=None) -> Dict[str, Dict[str, int]]:
+    """
+    job_role 별 상태 카운트 (쿼리 1회)
+
+    Returns:
+        {job_role: {'ordered', 'accepted', 'in_progress', 'result_ready',
+                    'confirmed', 'cancelled', 'total', 'since'}}
+        since 가 주어지면 'since' = created_at >= since 인 건수
+    """
+    annotations = {'count': Count('id')}
+    if since is not None:
+        annotations['recent'] = Count('id', filter=Q(created_at__gte=since))
+
+    result: Dict[str, Dict[str, int]] = {}
+    rows = queryset.order_by().values('job_role', 'ocs_status').annotate(**annotations)
+    for row in rows:
+        counts = result.setdefault(row['job_role'], _empty_counts())
+        key = STATUS_KEYS.get(row['ocs_status'])
+        if key:
+            counts[key] += row['count']
+        counts['total'] += row['count']
+        counts['since'] += row.get('recent', 0)
+    return result
+
+
+def role_counts(by_role: Dict[str, Dict[str, int]], job_role: str) -> Dict[str, int]:
+    return by_role.get(job_role) or _empty_counts()
+
+
+def _cache_version() -> int:
+    version = cache.get(CACHE_VERSION_KEY)
+    if version is None:
+        cache.add(CACHE_VERSION_KEY, 1, timeout=None)
+        version = cache.get(CACHE_VERSION_KEY, 1)
+    return version
+
+
+def cached_stats(name: str, builder: Callable[[], dict]) -> dict:
+    """
+    짧은 TTL 캐시 (name 에 날짜/범위 등 결과를 구분하는 값을 포함해야 함)
+    """
+    try:
+        key = f'ocs_stats:{_cache_version()}:{name}'
+        data = cache.get(key)
+        if data is not None:
+            return data
+    except Exception as e:
+        logger.warning(f"OCS stats cache unavailable: {e}")
+        return builder()
+
+    data = builder()
+    try:
+        cache.set(key, data, CACHE_TTL)
+    except Exception as e:
+        logger.warning(f"OCS stats cache set failed: {e}")
+    return data
+
+
+def invalidate_stats():
+    """OCS 상태 변경 시 호출 - 캐시 버전을 올려 모든 집계 결과 무효화"""
+    try:
+        cache.incr(CACHE_VERSION_KEY)
+    except ValueError:
+        # 버전 키가 없으면 (만료/캐시 재시작) 새로 시작 → 이전 키와 겹치지 않도록 큰 값 사용
+        cache.add(CACHE_VERSION_KEY, 2, timeout=None)
+    except Exception as e:
+        logger.warning(f"OCS stats cache invalidate failed: {e}")
+
+
+def get_process_status(today_start) -> dict:
+    """OCSProcessStatusView 응답 (RIS / LIS / 통합)"""
+    def build():
+        by_role = status_counts_by_role(
+            OCS.objects.filter(is_deleted=False, job_role__in=['RIS', 'LIS']),
+            since=today_start,
+        )
+        stats = {}
+        for job_role in ('RIS', 'LIS'):
+            counts = role_counts(by_role, job_role)
+            stats[job_role.lower()] = {
+                **{key: counts[key] for key in STATUS_KEYS.values()},
+                'total_today': counts['since'],
+            }
+
+        ris, lis = stats['ris'], stats['lis']
+        combined = {f'total_{key}': ris[key] + lis[key] for key in STATUS_KEYS.values()}
+        combined['total_today'] = ris['total_today'] + lis['total_today']
+        return {'ris': ris, 'lis': lis, 'combined': combined}
+
+    return cached_stats(f'process:{today_start.date().isoformat()}', build)
+
+
+def get_status_overview() -> dict:
+    """관리자 대시보드 OCS 통계 (total / by_status / pending_count)"""
+    def build():
+        by_status = dict(
+            OCS.objects.filter(is_deleted=False).order_by()
+            .values('ocs_status')
+            .annotate(count=Count('id'))
+            .values_list('ocs_status', 'count')
+        )
+        return {
+            'total': sum(by_status.values()),
+            'by_status': by_status,
+            'pending_count': sum(by_status.get(s, 0) for s in PENDING_STATUSES),
+        }
+
+    return cached_stats('overview', build)
+
+
+def get_external_upload_stats(external_filter: Q, institution_code: Optional[str], week_ago) -> dict:
+    """
+    외부기관 업로드 상태 카운트 (LIS / RIS)
+
+    institution_code 가 있으면 해당 기관 OCS 만 (EXTERNAL 역할), None 이면 전체 (관리자)
+    """
+    def build():
+        queryset = OCS.objects.filter(external_filter, is_deleted=False, job_role__in=['LIS', 'RIS'])
+        if institution_code is not None:
+            queryset = queryset.filter(attachments__external_source__institution__code=institution_code)
+        by_role = status_counts_by_role(queryset, since=week_ago)
+
+        result = {}
+        for job_role in ('LIS', 'RIS'):
+            counts = role_counts(by_role, job_role)
+            result[f'{job_role.lower()}_uploads'] = {
+                **{key: counts[key] for key in STATUS_KEYS.values()},
+                'total': counts['total'],
+                'total_this_week': counts['since'],
+            }
+        return result
+
+    # week_ago 는 요청마다 바뀌므로 날짜 단위로 캐시 (TTL 이 짧아 오차는 무시 가능)
+    scope = institution_code if institution_code is not None else '*'
+    return cached_stats(f'external:{scope}:{week_ago.date().isoformat()}', build)
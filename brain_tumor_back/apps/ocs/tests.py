@@ -1,4 +1,4 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
@@ -340,3 +340,165 @@ class OCSAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         for ocs in response.data['results']:
             self.assertEqual(ocs['ocs_status'], 'ORDERED')
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class OCSStatsServiceTest(TestCase):
+    """OCS 상태 집계 서비스 테스트"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+        self.doctor_role = Role.objects.create(code='DOCTOR', name='의사')
+        self.doctor = User.objects.create_user(
+            login_id='doctor_stats',
+            password='testpass123',
+            role=self.doctor_role
+        )
+        self.patient = Patient.objects.create(
+            name='테스트환자',
+            birth_date='1990-01-01',
+            gender='M',
+            phone='010-1234-5678',
+            ssn='9001011234567'
+        )
+
+    def _create(self, job_role, ocs_status=OCS.OcsStatus.ORDERED):
+        return OCS.objects.create(
+            patient=self.patient,
+            doctor=self.doctor,
+            job_role=job_role,
+            job_type='MRI',
+            ocs_status=ocs_status,
+        )
+
+    def test_process_status_single_query(self):
+        """RIS/LIS 상태별 카운트를 한 번의 쿼리로 집계"""
+        from django.utils import timezone
+        from .stats import get_process_status
+
+        self._create('RIS')
+        self._create('RIS', OCS.OcsStatus.CONFIRMED)
+        self._create('LIS', OCS.OcsStatus.IN_PROGRESS)
+        today_start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+        with self.assertNumQueries(1):
+            stats = get_process_status(today_start)
+
+        self.assertEqual(stats['ris']['ordered'], 1)
+        self.assertEqual(stats['ris']['confirmed'], 1)
+        self.assertEqual(stats['lis']['in_progress'], 1)
+        self.assertEqual(stats['combined']['total_today'], 3)
+
+    def test_cache_invalidated_on_status_change(self):
+        """상태 변경 커밋 시 캐시된 집계 무효화"""
+        from django.utils import timezone
+        from .stats import get_process_status
+
+        ocs = self._create('RIS')
+        today_start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        get_process_status(today_start)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_process_status(today_start)['ris']['ordered'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ocs.ocs_status = OCS.OcsStatus.ACCEPTED
+            ocs.save()
+
+        stats = get_process_status(today_start)
+        self.assertEqual(stats['ris']['ordered'], 0)
+        self.assertEqual(stats['ris']['accepted'], 1)
+
+
+class _RecordingChannelLayer:
+    def __init__(self):
+        self.sent = []
+
+    async def group_send(self, group, message):
+        self.sent.append((group, message))
+
+
+class OCSNotificationDispatcherTest(TestCase):
+    """OCS 알림 dispatcher 테스트 (커밋 후 전송 / 묶음 / 환자 이름 일괄 조회)"""
+
+    def setUp(self):
+        from unittest import mock
+        from .notifications import OCSNotificationDispatcher
+
+        self.doctor_role = Role.objects.create(code='DOCTOR', name='의사')
+        self.doctor = User.objects.create_user(
+            login_id='doctor_notify',
+            password='testpass123',
+            role=self.doctor_role
+        )
+        self.patient = Patient.objects.create(
+            name='테스트환자',
+            birth_date='1990-01-01',
+            gender='M',
+            phone='010-1234-5678',
+            ssn='9001011234567'
+        )
+        self.ocs = OCS.objects.create(
+            patient=self.patient,
+            doctor=self.doctor,
+            job_role='RIS',
+            job_type='MRI',
+        )
+
+        self.layer = _RecordingChannelLayer()
+        self.dispatcher = OCSNotificationDispatcher(coalesce_window=0)
+        patches = [
+            mock.patch('apps.ocs.notifications.ocs_notification_dispatcher', self.dispatcher),
+            mock.patch('apps.ocs.notifications.get_channel_layer', return_value=self.layer),
+            # 백그라운드 스레드 대신 테스트에서 직접 flush
+            mock.patch.object(self.dispatcher, '_ensure_thread'),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_sent_only_after_commit(self):
+        """커밋 전에는 큐에 넣지 않음"""
+        from .notifications import notify_ocs_status_changed
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            notify_ocs_status_changed(self.ocs, 'ORDERED', 'ACCEPTED', self.doctor)
+        self.assertEqual(self.dispatcher.stats()['pending'], 0)
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.dispatcher.flush(), 2)
+        groups = sorted(group for group, _ in self.layer.sent)
+        self.assertEqual(groups, ['ocs_doctor_%d' % self.doctor.id, 'ocs_ris'])
+        message = self.layer.sent[0][1]
+        self.assertEqual(message['type'], 'ocs_status_changed')
+        self.assertIn('테스트환자', message['message'])
+
+    def test_burst_coalesced_per_group(self):
+        """연속 이벤트는 그룹별 ocs_batch 1건으로 묶고, 환자 이름은 한 번에 조회"""
+        from .notifications import notify_ocs_created, notify_ocs_status_changed
+
+        ocs = OCS.objects.get(pk=self.ocs.pk)  # patient 미로드
+        with self.captureOnCommitCallbacks(execute=True):
+            notify_ocs_created(ocs, self.doctor)
+            notify_ocs_status_changed(ocs, 'ORDERED', 'ACCEPTED', self.doctor)
+            notify_ocs_status_changed(ocs, 'ACCEPTED', 'IN_PROGRESS', self.doctor)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.dispatcher.flush(), 2)
+
+        sent = dict(self.layer.sent)
+        self.assertEqual(sent['ocs_ris']['type'], 'ocs_batch')
+        self.assertEqual(
+            [event['type'] for event in sent['ocs_ris']['events']],
+            ['ocs_created', 'ocs_status_changed', 'ocs_status_changed'],
+        )
+        self.assertEqual(len(sent['ocs_doctor_%d' % self.doctor.id]['events']), 2)
+        self.assertTrue(all(event['patient_name'] == '테스트환자' for event in sent['ocs_ris']['events']))
+
+        stats = self.dispatcher.stats()
+        self.assertEqual(stats['events_delivered'], 5)
+        self.assertEqual(stats['messages_sent'], 2)
+        self.assertIsNotNone(stats['latency_ms']['last'])
@@ -29,6 +29,7 @@ from .serializers import (
     OCSHistorySerializer,
 )
 from .notifications import notify_ocs_status_changed, notify_ocs_created, notify_ocs_cancelled
+from .stats import get_process_status
 
 
 # =============================================================================
@@ -1223,11 +1224,16 @@ class UserLoginStatusView(APIView):
 
     def _get_role_status(self, users, active_threshold, now):
         """권한별 사용자 상태 계산"""
+        from apps.accounts.services.presence_service import last_seen_map
+
         user_list = []
         online_count = 0
+        # DB last_seen + 아직 flush 안 된 Redis heartbeat (일괄 조회)
+        seen_map = last_seen_map(users)
 
         for user in users:
-            is_online = user.last_seen and user.last_seen >= active_threshold
+            last_seen = seen_map.get(user.id)
+            is_online = bool(last_seen and last_seen >= active_threshold)
             if is_online:
                 online_count += 1
 
@@ -1235,9 +1241,9 @@ class UserLoginStatusView(APIView):
             last_activity = None
             last_activity_text = '접속 기록 없음'
 
-            if user.last_seen:
-                last_activity = user.last_seen.isoformat()
-                diff = now - user.last_seen
+            if last_seen:
+                last_activity = last_seen.isoformat()
+                diff = now - last_seen
 
                 if diff.total_seconds() < 60:
                     last_activity_text = '방금'
@@ -1301,33 +1307,8 @@ class OCSProcessStatusView(APIView):
             now = timezone.now()
             today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
 
-            # 공통 필터: 삭제되지 않은 OCS
-            base_qs = OCS.objects.filter(is_deleted=False)
-
-            # RIS 통계
-            ris_qs = base_qs.filter(job_role='RIS')
-            ris_stats = self._get_job_stats(ris_qs, today_start)
-
-            # LIS 통계
-            lis_qs = base_qs.filter(job_role='LIS')
-            lis_stats = self._get_job_stats(lis_qs, today_start)
-
-            # 통합 통계
-            combined = {
-                'total_ordered': ris_stats['ordered'] + lis_stats['ordered'],
-                'total_accepted': ris_stats['accepted'] + lis_stats['accepted'],
-                'total_in_progress': ris_stats['in_progress'] + lis_stats['in_progress'],
-                'total_result_ready': ris_stats['result_ready'] + lis_stats['result_ready'],
-                'total_confirmed': ris_stats['confirmed'] + lis_stats['confirmed'],
-                'total_cancelled': ris_stats['cancelled'] + lis_stats['cancelled'],
-                'total_today': ris_stats['total_today'] + lis_stats['total_today'],
-            }
-
-            return Response({
-                'ris': ris_stats,
-                'lis': lis_stats,
-                'combined': combined,
-            })
+            # RIS / LIS 상태별 카운트 (GROUP BY 1회, 짧은 TTL 캐시)
+            return Response(get_process_status(today_start))
 
         except Exception as e:
             logger.error(f"OCS process status error: {str(e)}")
@@ -1336,29 +1317,6 @@ class OCSProcessStatusView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-    def _get_job_stats(self, queryset, today_start):
-        """job_role별 통계 계산 - 모든 상태별 카운트"""
-        # 개별 상태별 카운트
-        ordered = queryset.filter(ocs_status=OCS.OcsStatus.ORDERED).count()
-        accepted = queryset.filter(ocs_status=OCS.OcsStatus.ACCEPTED).count()
-        in_progress = queryset.filter(ocs_status=OCS.OcsStatus.IN_PROGRESS).count()
-        result_ready = queryset.filter(ocs_status=OCS.OcsStatus.RESULT_READY).count()
-        confirmed = queryset.filter(ocs_status=OCS.OcsStatus.CONFIRMED).count()
-        cancelled = queryset.filter(ocs_status=OCS.OcsStatus.CANCELLED).count()
-
-        # 오늘 생성된 OCS 수
-        total_today = queryset.filter(created_at__gte=today_start).count()
-
-        return {
-            'ordered': ordered,
-            'accepted': accepted,
-            'in_progress': in_progress,
-            'result_ready': result_ready,
-            'confirmed': confirmed,
-            'cancelled': cancelled,
-            'total_today': total_today,
-        }
-
 
 class ExternalPatientOCSCreateView(APIView):
     """
@@ -0,0 +1,51 @@
+"""
+DICOM 업로드 진행률 WebSocket Consumer
+
+ws/orthanc-upload/<upload_id>/ 로 연결하면 해당 업로드 그룹 (orthanc_upload_<upload_id>) 구독
+- progress: 단계 (upload / index) 와 처리 개수
+- completed: upload_patient 응답과 같은 결과 (async 업로드의 최종 결과)
+"""
+import json
+from channels.generic.websocket import AsyncWebsocketConsumer
+
+
+def upload_group_name(upload_id: str) -> str:
+    return f'orthanc_upload_{upload_id}'
+
+
+class OrthancUploadConsumer(AsyncWebsocketConsumer):
+    """업로드 1건의 진행률 구독"""
+
+    async def connect(self):
+        self.user = self.scope.get('user')
+        if not self.user or not self.user.is_authenticated:
+            await self.close()
+            return
+
+        self.group_name = upload_group_name(self.scope['url_route']['kwargs']['upload_id'])
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, close_code):
+        if hasattr(self, 'group_name'):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def orthanc_upload_progress(self, event):
+        """진행률 전송"""
+        await self.send(text_data=json.dumps({
+            'type': 'ORTHANC_UPLOAD_PROGRESS',
+            'upload_id': event.get('upload_id'),
+            'phase': event.get('phase'),
+            'done': event.get('done'),
+            'failed': event.get('failed'),
+            'total': event.get('total'),
+        }))
+
+    async def orthanc_upload_completed(self, event):
+        """최종 결과 전송"""
+        await self.send(text_data=json.dumps({
+            'type': 'ORTHANC_UPLOAD_COMPLETED',
+            'upload_id': event.get('upload_id'),
+            'result': event.get('result'),
+            'error': event.get('error'),
+        }))
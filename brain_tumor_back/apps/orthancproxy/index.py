@@ -0,0 +1,275 @@
+"""
+Orthanc → 로컬 DICOM 인덱스 동기화
+
+Orthanc /changes 피드를 OrthancSyncState.last_seq 부터 읽어 DicomStudy / DicomSeries / DicomInstance 갱신
+- NewSeries: 시리즈 행만 미완료(is_stable=False) 로 등록 → 조회 API 는 Orthanc 로 직접 조회
+- StableSeries: 시리즈 단위로 인스턴스까지 다시 인덱싱 (instances-tags 1회 + bulk_create)
+- NewStudy / StableStudy: Study 정보 갱신
+- Deleted: 해당 레벨 행 삭제
+- 커서는 배치마다 인덱스 변경과 같은 트랜잭션에서 저장 → 중단 후 재시작해도 누락 없음
+- 리소스별로 savepoint 를 두어 한 시리즈의 오류가 배치 전체를 막지 않음 (로그 후 건너뜀)
+  Orthanc 연결 오류만 배치를 다시 시도 (커서 유지)
+
+NewInstance 는 시리즈가 안정화(StableSeries)될 때 한꺼번에 반영됨.
+orthancproxy 업로드 API 는 업로드 직후 해당 시리즈를 바로 인덱싱함 (Orthanc IsStable 값 그대로 기록).
+"""
+import logging
+from typing import Dict, Iterable, Optional, Set
+
+import requests
+from django.db import transaction
+from django.utils import timezone
+
+from . import preview_cache
+from .models import DicomInstance, DicomSeries, DicomStudy, OrthancSyncState
+from .views import _find, _get, _instance_meta, _parse_series_type, _series_instance_tags
+
+logger = logging.getLogger(__name__)
+
+STUDY_CHANGES = {"NewStudy", "StableStudy"}
+
+# Orthanc 자체에 연결할 수 없는 경우 - 건너뛰지 않고 배치 전체를 다음에 다시 시도
+CONNECTION_ERRORS = (requests.ConnectionError, requests.Timeout)
+
+
+def _is_not_found(error) -> bool:
+    return getattr(getattr(error, "response", None), "status_code", None) == 404
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def index_study(study_id: str, study: Optional[dict] = None) -> DicomStudy:
+    """Study 정보 upsert (study 객체가 없으면 Orthanc 에서 조회)"""
+    study = study or _get(f"/studies/{study_id}")
+    tags = study.get("MainDicomTags", {}) or {}
+    patient_tags = study.get("PatientMainDicomTags", {}) or {}
+    obj, _ = DicomStudy.objects.update_or_create(
+        orthanc_id=study_id,
+        defaults={
+            "study_uid": tags.get("StudyInstanceUID", ""),
+            "patient_orthanc_id": study.get("ParentPatient", ""),
+            "patient_id": patient_tags.get("PatientID", ""),
+            "patient_name": patient_tags.get("PatientName", ""),
+            "study_date": tags.get("StudyDate", ""),
+            "description": tags.get("StudyDescription", ""),
+            "last_update": study.get("LastUpdate", ""),
+        },
+    )
+    return obj
+
+
+def index_series(series_id: str, series: Optional[dict] = None,
+                 with_instances: bool = True) -> Optional[DicomSeries]:
+    """
+    시리즈와 하위 인스턴스 전체 다시 인덱싱
+
+    Args:
+        with_instances: False 면 시리즈 행만 미완료(is_stable=False) 로 갱신 (NewSeries)
+    Returns:
+        DicomSeries (Orthanc 에서 이미 삭제됐으면 None)
+    """
+    try:
+        series = series or _get(f"/series/{series_id}")
+        tags_by_id = _series_instance_tags(series_id) if with_instances else None
+    except Exception as e:
+        if _is_not_found(e):
+            DicomSeries.objects.filter(orthanc_id=series_id).delete()
+            return None
+        raise
+
+    tags = series.get("MainDicomTags", {}) or {}
+    series_desc = tags.get("SeriesDescription", "")
+    defaults = {
+        "series_uid": tags.get("SeriesInstanceUID", ""),
+        "series_number": str(tags.get("SeriesNumber", "")),
+        "description": series_desc,
+        "series_type": _parse_series_type(series_desc),
+        "modality": tags.get("Modality", ""),
+        "last_update": series.get("LastUpdate", ""),
+    }
+
+    if tags_by_id is None:
+        with transaction.atomic():
+            defaults["study"] = index_study(series["ParentStudy"])
+            defaults["instances_count"] = len(series.get("Instances", []))
+            defaults["is_stable"] = False
+            obj, _ = DicomSeries.objects.update_or_create(orthanc_id=series_id, defaults=defaults)
+        return obj
+
+    instances = []
+    for inst_id, inst_tags in tags_by_id.items():
+        meta = _instance_meta(inst_id, inst_tags)
+        instances.append(DicomInstance(
+            orthanc_id=inst_id,
+            sop_instance_uid=meta["sopInstanceUID"],
+            instance_number=meta["instanceNumberInt"],
+            slice_location=_to_float(meta["sliceLocation"]),
+            image_position_patient=meta["imagePositionPatient"][:100],
+            pixel_spacing=meta["pixelSpacing"][:64],
+            meta=meta,
+        ))
+
+    with transaction.atomic():
+        defaults["study"] = index_study(series["ParentStudy"])
+        defaults["instances_count"] = len(instances)
+        defaults["is_stable"] = bool(series.get("IsStable", False))
+        obj, _ = DicomSeries.objects.update_or_create(orthanc_id=series_id, defaults=defaults)
+        DicomInstance.objects.filter(series=obj).delete()
+        # 다른 시리즈로 옮겨진 인스턴스 (재업로드) 정리
+        DicomInstance.objects.filter(orthanc_id__in=list(tags_by_id.keys())).delete()
+        for instance in instances:
+            instance.series = obj
+        DicomInstance.objects.bulk_create(instances, batch_size=500)
+
+    return obj
+
+
+def _delete_resource(resource_type: str, resource_id: str):
+    # 인덱스에 남아 있는 하위 인스턴스의 미리보기 캐시도 함께 제거
+    instance_filter = {
+        "Patient": {"series__study__patient_orthanc_id": resource_id},
+        "Study": {"series__study__orthanc_id": resource_id},
+        "Series": {"series__orthanc_id": resource_id},
+    }.get(resource_type)
+    if instance_filter is not None:
+        preview_cache.evict(DicomInstance.objects.filter(**instance_filter).values_list("orthanc_id", flat=True))
+    elif resource_type == "Instance":
+        preview_cache.evict([resource_id])
+
+    if resource_type == "Patient":
+        DicomStudy.objects.filter(patient_orthanc_id=resource_id).delete()
+    elif resource_type == "Study":
+        DicomStudy.objects.filter(orthanc_id=resource_id).delete()
+    elif resource_type == "Series":
+        DicomSeries.objects.filter(orthanc_id=resource_id).delete()
+    elif resource_type == "Instance":
+        instance = DicomInstance.objects.filter(orthanc_id=resource_id).select_related("series").first()
+        if instance is not None:
+            series = instance.series
+            instance.delete()
+            series.instances_count = series.instances.count()
+            series.save(update_fields=["instances_count", "synced_at"])
+
+
+def _index_isolated(label: str, resource_id: str, func, *args, **kwargs) -> bool:
+    """
+    리소스 하나를 savepoint 안에서 인덱싱 (실패하면 로그 후 건너뜀)
+
+    Orthanc 연결 오류는 다시 발생시켜 배치 전체를 재시도하게 함
+    """
+    try:
+        with transaction.atomic():
+            func(resource_id, *args, **kwargs)
+        return True
+    except CONNECTION_ERRORS:
+        raise
+    except Exception as e:
+        logger.warning("%s failed %s: %s", label, resource_id, e)
+        return False
+
+
+def _index_study_or_delete(study_id: str):
+    try:
+        index_study(study_id)
+    except Exception as e:
+        if not _is_not_found(e):
+            raise
+        DicomStudy.objects.filter(orthanc_id=study_id).delete()
+
+
+def apply_changes(changes: Iterable[dict]) -> Dict[str, int]:
+    """/changes 배치 반영 (같은 리소스는 한 번만 다시 인덱싱)"""
+    new_series: Set[str] = set()
+    stable_series: Set[str] = set()
+    dirty_studies: Set[str] = set()
+    deleted = 0
+    failed = 0
+
+    for change in changes:
+        change_type = change.get("ChangeType")
+        resource_id = change.get("ID")
+        if change_type == "Deleted":
+            _delete_resource(change.get("ResourceType"), resource_id)
+            new_series.discard(resource_id)
+            stable_series.discard(resource_id)
+            dirty_studies.discard(resource_id)
+            deleted += 1
+        elif change_type == "NewSeries":
+            new_series.add(resource_id)
+        elif change_type == "StableSeries":
+            stable_series.add(resource_id)
+        elif change_type in STUDY_CHANGES:
+            dirty_studies.add(resource_id)
+
+    # 같은 배치에 StableSeries 가 있으면 전체 인덱싱만
+    for series_id in new_series - stable_series:
+        failed += not _index_isolated("index_series", series_id, index_series, with_instances=False)
+    for series_id in stable_series:
+        failed += not _index_isolated("index_series", series_id, index_series)
+    for study_id in dirty_studies:
+        failed += not _index_isolated("index_study", study_id, _index_study_or_delete)
+
+    return {
+        "series": len(new_series | stable_series),
+        "studies": len(dirty_studies),
+        "deleted": deleted,
+        "failed": failed,
+    }
+
+
+def sync_changes(batch_size: int = 500) -> Dict[str, int]:
+    """
+    마지막 커서 이후의 /changes 를 모두 반영
+
+    Returns:
+        {'series', 'studies', 'deleted', 'failed', 'last_seq'}
+    """
+    state, _ = OrthancSyncState.objects.get_or_create(key=OrthancSyncState.CHANGES_KEY)
+    totals = {"series": 0, "studies": 0, "deleted": 0, "failed": 0}
+
+    while True:
+        page = _get(f"/changes?since={state.last_seq}&limit={batch_size}")
+        with transaction.atomic():
+            counts = apply_changes(page.get("Changes", []))
+            state.last_seq = page.get("Last", state.last_seq)
+            state.synced_at = timezone.now()
+            state.save(update_fields=["last_seq", "synced_at"])
+        for key, value in counts.items():
+            totals[key] += value
+        if page.get("Done", True):
+            break
+
+    totals["last_seq"] = state.last_seq
+    return totals
+
+
+def rebuild_index() -> Dict[str, int]:
+    """
+    전체 재인덱싱 (최초 실행 / 커서 유실 시)
+
+    스캔 전에 /changes 의 마지막 Seq 를 잡아 두므로 스캔 중 변경은 다음 sync_changes 에서 반영
+    """
+    last_seq = _get("/changes?last").get("Last", 0)
+
+    seen = set()
+    for series in _find("Series"):
+        series_id = series.get("ID")
+        try:
+            index_series(series_id, series)
+            seen.add(series_id)
+        except Exception as e:
+            logger.warning("index_series failed %s: %s", series_id, e)
+
+    DicomSeries.objects.exclude(orthanc_id__in=seen).delete()
+    DicomStudy.objects.filter(series__isnull=True).delete()
+
+    state, _ = OrthancSyncState.objects.get_or_create(key=OrthancSyncState.CHANGES_KEY)
+    state.last_seq = last_seq
+    state.synced_at = timezone.now()
+    state.save(update_fields=["last_seq", "synced_at"])
+    return {"series": len(seen), "last_seq": last_seq}
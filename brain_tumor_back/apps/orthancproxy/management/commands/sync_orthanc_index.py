@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.orthancproxy.index import rebuild_index, sync_changes
+from apps.orthancproxy.models import OrthancSyncState
+
+
+class Command(BaseCommand):
+    help = 'Mirror Orthanc study/series/instance metadata into the local DICOM index by following /changes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='한 번 동기화하고 종료')
+        parser.add_argument('--interval', type=float, default=5.0, help='폴링 간격 (초)')
+        parser.add_argument('--batch-size', type=int, default=500, help='/changes 한 번에 읽을 개수')
+        parser.add_argument('--rebuild', action='store_true', help='전체 재인덱싱 후 커서 초기화')
+
+    def handle(self, *args, **options):
+        self.stdout.write("=" * 60)
+        self.stdout.write("Orthanc DICOM Index Sync")
+        self.stdout.write("=" * 60)
+
+        has_state = OrthancSyncState.objects.filter(
+            key=OrthancSyncState.CHANGES_KEY, synced_at__isnull=False
+        ).exists()
+        if options['rebuild'] or not has_state:
+            result = rebuild_index()
+            self.stdout.write(self.style.SUCCESS(
+                f"  Rebuilt: {result['series']} series (cursor={result['last_seq']})"
+            ))
+
+        while True:
+            try:
+                result = sync_changes(batch_size=options['batch_size'])
+                if result['series'] or result['studies'] or result['deleted']:
+                    self.stdout.write(
+                        f"  seq={result['last_seq']} series={result['series']} "
+                        f"studies={result['studies']} deleted={result['deleted']} failed={result['failed']}"
+                    )
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"  sync failed: {e}"))
+                if options['once']:
+                    raise
+
+            if options['once']:
+                break
+            time.sleep(options['interval'])
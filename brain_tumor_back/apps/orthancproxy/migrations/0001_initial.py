@@ -0,0 +1,97 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DicomStudy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('orthanc_id', models.CharField(max_length=64, unique=True, verbose_name='Orthanc Study ID')),
+                ('study_uid', models.CharField(db_index=True, max_length=200, verbose_name='Study Instance UID')),
+                ('patient_orthanc_id', models.CharField(db_index=True, max_length=64, verbose_name='Orthanc Patient ID')),
+                ('patient_id', models.CharField(blank=True, db_index=True, default='', max_length=100, verbose_name='Patient ID')),
+                ('patient_name', models.CharField(blank=True, default='', max_length=200, verbose_name='Patient Name')),
+                ('study_date', models.CharField(blank=True, default='', max_length=16, verbose_name='Study Date')),
+                ('description', models.CharField(blank=True, default='', max_length=200, verbose_name='Study Description')),
+                ('last_update', models.CharField(blank=True, default='', max_length=32, verbose_name='Orthanc LastUpdate')),
+                ('synced_at', models.DateTimeField(auto_now=True, verbose_name='동기화 일시')),
+            ],
+            options={
+                'verbose_name': 'DICOM Study (인덱스)',
+                'verbose_name_plural': 'DICOM Study 목록 (인덱스)',
+                'db_table': 'orthanc_dicom_studies',
+                'ordering': ['study_date', 'orthanc_id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='OrthancSyncState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=32, unique=True, verbose_name='키')),
+                ('last_seq', models.BigIntegerField(default=0, verbose_name='마지막 Seq')),
+                ('synced_at', models.DateTimeField(blank=True, null=True, verbose_name='마지막 동기화 일시')),
+            ],
+            options={
+                'verbose_name': 'Orthanc 동기화 상태',
+                'verbose_name_plural': 'Orthanc 동기화 상태',
+                'db_table': 'orthanc_sync_state',
+            },
+        ),
+        migrations.CreateModel(
+            name='DicomSeries',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('orthanc_id', models.CharField(max_length=64, unique=True, verbose_name='Orthanc Series ID')),
+                ('series_uid', models.CharField(db_index=True, max_length=200, verbose_name='Series Instance UID')),
+                ('series_number', models.CharField(blank=True, default='', max_length=16, verbose_name='Series Number')),
+                ('description', models.CharField(blank=True, default='', max_length=200, verbose_name='Series Description')),
+                ('series_type', models.CharField(choices=[('T1', 'T1'), ('T1C', 'T1 Contrast'), ('T2', 'T2'), ('FLAIR', 'FLAIR'), ('DWI', 'DWI'), ('SWI', 'SWI'), ('SEG', 'Segmentation'), ('OTHER', 'Other')], default='OTHER', max_length=10, verbose_name='시퀀스 타입')),
+                ('modality', models.CharField(blank=True, default='', max_length=16, verbose_name='Modality')),
+                ('instances_count', models.IntegerField(default=0, verbose_name='인스턴스 수')),
+                ('last_update', models.CharField(blank=True, default='', max_length=32, verbose_name='Orthanc LastUpdate')),
+                ('synced_at', models.DateTimeField(auto_now=True, verbose_name='동기화 일시')),
+                ('study', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='series', to='orthancproxy.dicomstudy', verbose_name='Study')),
+            ],
+            options={
+                'verbose_name': 'DICOM Series (인덱스)',
+                'verbose_name_plural': 'DICOM Series 목록 (인덱스)',
+                'db_table': 'orthanc_dicom_series',
+                'ordering': ['series_number', 'orthanc_id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DicomInstance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('orthanc_id', models.CharField(max_length=64, unique=True, verbose_name='Orthanc Instance ID')),
+                ('sop_instance_uid', models.CharField(blank=True, default='', max_length=200, verbose_name='SOP Instance UID')),
+                ('instance_number', models.IntegerField(blank=True, null=True, verbose_name='Instance Number')),
+                ('slice_location', models.FloatField(blank=True, null=True, verbose_name='Slice Location')),
+                ('image_position_patient', models.CharField(blank=True, default='', max_length=100, verbose_name='Image Position (Patient)')),
+                ('pixel_spacing', models.CharField(blank=True, default='', max_length=64, verbose_name='Pixel Spacing')),
+                ('meta', models.JSONField(default=dict, verbose_name='list_instances 응답 항목')),
+                ('series', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='instances', to='orthancproxy.dicomseries', verbose_name='Series')),
+            ],
+            options={
+                'verbose_name': 'DICOM Instance (인덱스)',
+                'verbose_name_plural': 'DICOM Instance 목록 (인덱스)',
+                'db_table': 'orthanc_dicom_instances',
+                'ordering': ['instance_number', 'orthanc_id'],
+                'indexes': [models.Index(fields=['series', 'instance_number'], name='orthanc_dic_series__964a91_idx'), models.Index(fields=['series', 'slice_location'], name='orthanc_dic_series__29c414_idx')],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='dicomseries',
+            index=models.Index(fields=['study', 'series_type'], name='orthanc_dic_study_i_1326cc_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orthancproxy', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dicomseries',
+            name='is_stable',
+            field=models.BooleanField(default=False, verbose_name='안정화 여부'),
+        ),
+    ]
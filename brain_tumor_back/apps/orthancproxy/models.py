@@ -0,0 +1,148 @@
+from django.db import models
+
+
+class DicomStudy(models.Model):
+    """
+    Orthanc Study 로컬 인덱스
+
+    Orthanc /changes 피드를 따라가는 동기화 poller (sync_orthanc_index) 가 관리.
+    orthancproxy 목록 API 는 이 테이블을 조회하고, 인덱스에 없으면 Orthanc 를 직접 조회.
+    """
+    orthanc_id = models.CharField(max_length=64, unique=True, verbose_name='Orthanc Study ID')
+    study_uid = models.CharField(max_length=200, db_index=True, verbose_name='Study Instance UID')
+    patient_orthanc_id = models.CharField(max_length=64, db_index=True, verbose_name='Orthanc Patient ID')
+    patient_id = models.CharField(max_length=100, blank=True, default='', db_index=True, verbose_name='Patient ID')
+    patient_name = models.CharField(max_length=200, blank=True, default='', verbose_name='Patient Name')
+    study_date = models.CharField(max_length=16, blank=True, default='', verbose_name='Study Date')
+    description = models.CharField(max_length=200, blank=True, default='', verbose_name='Study Description')
+    last_update = models.CharField(max_length=32, blank=True, default='', verbose_name='Orthanc LastUpdate')
+    synced_at = models.DateTimeField(auto_now=True, verbose_name='동기화 일시')
+
+    class Meta:
+        db_table = 'orthanc_dicom_studies'
+        ordering = ['study_date', 'orthanc_id']
+        verbose_name = 'DICOM Study (인덱스)'
+        verbose_name_plural = 'DICOM Study 목록 (인덱스)'
+
+    def __str__(self):
+        return f"{self.patient_id} - {self.study_date} {self.description}"
+
+    def as_meta(self) -> dict:
+        """list_studies 항목 (series_total annotate 가 없으면 COUNT 쿼리)"""
+        series_count = getattr(self, 'series_total', None)
+        return {
+            "orthancId": self.orthanc_id,
+            "studyInstanceUID": self.study_uid,
+            "description": self.description,
+            "studyDate": self.study_date,
+            "seriesCount": series_count if series_count is not None else self.series.count(),
+        }
+
+
+class DicomSeries(models.Model):
+    """Orthanc Series 로컬 인덱스 (series_type 은 동기화 시 SeriesDescription 으로 분류)"""
+
+    SERIES_TYPE_CHOICES = [
+        ('T1', 'T1'),
+        ('T1C', 'T1 Contrast'),
+        ('T2', 'T2'),
+        ('FLAIR', 'FLAIR'),
+        ('DWI', 'DWI'),
+        ('SWI', 'SWI'),
+        ('SEG', 'Segmentation'),
+        ('OTHER', 'Other'),
+    ]
+
+    orthanc_id = models.CharField(max_length=64, unique=True, verbose_name='Orthanc Series ID')
+    study = models.ForeignKey(
+        DicomStudy,
+        on_delete=models.CASCADE,
+        related_name='series',
+        verbose_name='Study'
+    )
+    series_uid = models.CharField(max_length=200, db_index=True, verbose_name='Series Instance UID')
+    series_number = models.CharField(max_length=16, blank=True, default='', verbose_name='Series Number')
+    description = models.CharField(max_length=200, blank=True, default='', verbose_name='Series Description')
+    series_type = models.CharField(max_length=10, choices=SERIES_TYPE_CHOICES, default='OTHER', verbose_name='시퀀스 타입')
+    modality = models.CharField(max_length=16, blank=True, default='', verbose_name='Modality')
+    instances_count = models.IntegerField(default=0, verbose_name='인스턴스 수')
+    # Orthanc IsStable (StableSeries 이후 True) - False 면 업로드 중일 수 있어 인스턴스는 Orthanc 직접 조회
+    is_stable = models.BooleanField(default=False, verbose_name='안정화 여부')
+    last_update = models.CharField(max_length=32, blank=True, default='', verbose_name='Orthanc LastUpdate')
+    synced_at = models.DateTimeField(auto_now=True, verbose_name='동기화 일시')
+
+    class Meta:
+        db_table = 'orthanc_dicom_series'
+        ordering = ['series_number', 'orthanc_id']
+        indexes = [
+            models.Index(fields=['study', 'series_type']),
+        ]
+        verbose_name = 'DICOM Series (인덱스)'
+        verbose_name_plural = 'DICOM Series 목록 (인덱스)'
+
+    def __str__(self):
+        return f"{self.series_type} - {self.description}"
+
+    def as_meta(self) -> dict:
+        """list_series 항목"""
+        return {
+            "orthancId": self.orthanc_id,
+            "seriesInstanceUID": self.series_uid,
+            "seriesNumber": self.series_number,
+            "description": self.description,
+            "seriesType": self.series_type,
+            "modality": self.modality,
+            "instancesCount": self.instances_count,
+        }
+
+
+class DicomInstance(models.Model):
+    """
+    Orthanc Instance 로컬 인덱스
+
+    슬라이스 정렬/선택에 쓰는 태그는 컬럼으로, list_instances 응답 전체는 meta 에 보관
+    """
+    orthanc_id = models.CharField(max_length=64, unique=True, verbose_name='Orthanc Instance ID')
+    series = models.ForeignKey(
+        DicomSeries,
+        on_delete=models.CASCADE,
+        related_name='instances',
+        verbose_name='Series'
+    )
+    sop_instance_uid = models.CharField(max_length=200, blank=True, default='', verbose_name='SOP Instance UID')
+    instance_number = models.IntegerField(null=True, blank=True, verbose_name='Instance Number')
+    slice_location = models.FloatField(null=True, blank=True, verbose_name='Slice Location')
+    image_position_patient = models.CharField(max_length=100, blank=True, default='', verbose_name='Image Position (Patient)')
+    pixel_spacing = models.CharField(max_length=64, blank=True, default='', verbose_name='Pixel Spacing')
+    meta = models.JSONField(default=dict, verbose_name='list_instances 응답 항목')
+
+    class Meta:
+        db_table = 'orthanc_dicom_instances'
+        ordering = ['instance_number', 'orthanc_id']
+        indexes = [
+            models.Index(fields=['series', 'instance_number']),
+            models.Index(fields=['series', 'slice_location']),
+        ]
+        verbose_name = 'DICOM Instance (인덱스)'
+        verbose_name_plural = 'DICOM Instance 목록 (인덱스)'
+
+    def __str__(self):
+        return f"{self.series_id} #{self.instance_number}"
+
+
+class OrthancSyncState(models.Model):
+    """Orthanc /changes 동기화 커서 (마지막으로 처리한 Seq)"""
+
+    CHANGES_KEY = 'changes'
+
+    key = models.CharField(max_length=32, unique=True, verbose_name='키')
+    last_seq = models.BigIntegerField(default=0, verbose_name='마지막 Seq')
+    synced_at = models.DateTimeField(null=True, blank=True, verbose_name='마지막 동기화 일시')
+
+    class Meta:
+        db_table = 'orthanc_sync_state'
+        verbose_name = 'Orthanc 동기화 상태'
+        verbose_name_plural = 'Orthanc 동기화 상태'
+
+    def __str__(self):
+        return f"{self.key}: {self.last_seq}"
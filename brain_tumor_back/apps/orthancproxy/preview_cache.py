@@ -0,0 +1,130 @@
+"""
+Orthanc 렌더링 미리보기 (PNG) 로컬 LRU 디스크 캐시
+
+    CDSS_STORAGE/orthanc_previews/<instance_id[:2]>/<instance_id>.png
+
+- Orthanc Instance ID 는 DICOM UID 로부터 결정되므로 같은 ID 의 미리보기는 바뀌지 않음
+  → 만료 없이 보관, proxy 삭제 API 로 지운 인스턴스만 제거 (evict)
+- 조회 시 mtime 갱신, 전체 크기가 ORTHANC_PREVIEW_CACHE_MAX_BYTES 를 넘으면 오래된 파일부터 삭제
+- 캐시 미스는 upstream 스트림을 그대로 전달하면서 임시 파일에 기록, 끝까지 받은 경우에만 캐시에 반영
+"""
+import logging
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path(getattr(
+    settings, "ORTHANC_PREVIEW_CACHE_DIR", Path(settings.CDSS_STORAGE_ROOT) / "orthanc_previews"
+))
+MAX_BYTES = getattr(settings, "ORTHANC_PREVIEW_CACHE_MAX_BYTES", 256 * 1024 * 1024)
+
+_lock = threading.Lock()
+# 프로세스가 알고 있는 캐시 크기 (None 이면 다음 기록 시 디렉토리 스캔)
+_total_bytes: Optional[int] = None
+
+
+def _path(instance_id: str) -> Path:
+    return CACHE_DIR / instance_id[:2] / f"{instance_id}.png"
+
+
+def get(instance_id: str) -> Optional[Path]:
+    """캐시된 미리보기 경로 (없으면 None), 조회 시 LRU 순서 갱신"""
+    path = _path(instance_id)
+    try:
+        os.utime(path)
+    except OSError:
+        return None
+    return path
+
+
+def etag_for(path: Path) -> str:
+    """mtime 은 LRU 순서로 쓰이므로 제외 (같은 instance_id 의 미리보기는 내용이 같음)"""
+    return f'"{path.stem}-{path.stat().st_size:x}"'
+
+
+def _scan() -> list:
+    entries = []
+    if CACHE_DIR.exists():
+        for sub in CACHE_DIR.iterdir():
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub):
+                if entry.is_file() and entry.name.endswith(".png"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+    return entries
+
+
+def _evict_over_limit(added: int):
+    global _total_bytes
+    with _lock:
+        if _total_bytes is not None:
+            _total_bytes += added
+            if _total_bytes <= MAX_BYTES:
+                return
+
+        entries = _scan()
+        total = sum(size for _, size, _ in entries)
+        if total > MAX_BYTES:
+            # 90% 까지 줄여서 매 기록마다 스캔하지 않도록
+            target = int(MAX_BYTES * 0.9)
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+        _total_bytes = total
+
+
+def tee(instance_id: str, chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """upstream 청크를 그대로 전달하면서 캐시에 기록 (중간에 끊기면 버림)"""
+    path = _path(instance_id)
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}")
+    written = 0
+    completed = False
+    f = None
+    try:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            f = open(tmp_path, "wb")
+        except OSError as e:
+            logger.warning("preview cache write disabled for %s: %s", instance_id, e)
+
+        for chunk in chunks:
+            if f is not None:
+                f.write(chunk)
+                written += len(chunk)
+            yield chunk
+        completed = True
+    finally:
+        if f is not None:
+            f.close()
+            if completed and written:
+                os.replace(tmp_path, path)
+                _evict_over_limit(written)
+            else:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+
+def evict(instance_ids: Iterable[str]):
+    """삭제된 인스턴스 미리보기 제거"""
+    global _total_bytes
+    for instance_id in instance_ids:
+        try:
+            os.remove(_path(instance_id))
+        except OSError:
+            continue
+        with _lock:
+            _total_bytes = None
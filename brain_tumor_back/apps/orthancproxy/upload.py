@@ -0,0 +1,348 @@
+"""
+DICOM 폴더 업로드 파이프라인 (upload_patient)
+
+1. spool: 요청 파일을 디스크로 복사 (CDSS_STORAGE/orthanc_uploads/<서버 생성 uuid>/), 시리즈 UID/번호는 요청 순서대로 미리 부여
+   - upload_id 는 클라이언트가 보낼 수 있으므로 진행률 그룹에만 사용 (같은 id 재전송이 서로의 파일을 덮어쓰지 않도록)
+2. upload: 워커 풀에서 태그 재작성 (Patient/Study/Series 통합) + Orthanc 전송
+   - parallel (기본): 인스턴스별 POST /instances, 동시 전송 수 = ORTHANC_UPLOAD_WORKERS
+   - zip: 재작성한 파일을 ZIP 하나로 묶어 POST /instances 한 번
+3. index: 업로드된 시리즈를 로컬 인덱스에 반영 + 시리즈 썸네일을 미리보기 캐시에 미리 기록
+
+진행률은 Channels 그룹 orthanc_upload_<upload_id> 로 전송 (ws/orthanc-upload/<upload_id>/).
+async 업로드는 202 로 바로 응답하고 최종 결과도 같은 그룹으로 전송.
+"""
+import io
+import logging
+import shutil
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pydicom
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import close_old_connections
+from pydicom.uid import generate_uid
+
+from .consumers import upload_group_name
+from .views import ORTHANC, _get, _index_uploaded_series, _post_instance, _session, _warm_series_thumbnails, dlog
+
+logger = logging.getLogger(__name__)
+
+SPOOL_ROOT = Path(getattr(
+    settings, "ORTHANC_UPLOAD_SPOOL_DIR", Path(settings.CDSS_STORAGE_ROOT) / "orthanc_uploads"
+))
+# 동시에 재작성/전송하는 인스턴스 수 (= 메모리에 올라가는 파일 수 상한)
+UPLOAD_WORKERS = getattr(settings, "ORTHANC_UPLOAD_WORKERS", 4)
+# parallel | zip
+UPLOAD_MODE = getattr(settings, "ORTHANC_UPLOAD_MODE", "parallel")
+ZIP_UPLOAD_TIMEOUT = getattr(settings, "ORTHANC_ZIP_UPLOAD_TIMEOUT", 600)
+PROGRESS_INTERVAL = 0.5  # 초
+
+_upload_executor = ThreadPoolExecutor(max_workers=UPLOAD_WORKERS, thread_name_prefix="orthanc-upload")
+# async 업로드 작업 (작업 하나가 위 워커 풀을 사용)
+_job_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="orthanc-upload-job")
+
+
+def to_ascii_safe(text, default="Unknown"):
+    """
+    한글/특수문자를 제거하고 ASCII만 반환
+
+    PatientName, StudyDescription에 한글이 있으면 Orthanc에서 "??"로 표시됨
+    """
+    if not text:
+        return default
+    result = ''.join(c if ord(c) < 128 else '' for c in str(text)).strip()
+    return result if result else default
+
+
+class UploadItem:
+    """스풀된 파일 1개"""
+
+    def __init__(self, index: int, name: str, path: Path, series_path: str):
+        self.index = index  # 1부터 (InstanceNumber 기본값)
+        self.name = name
+        self.path = path
+        self.series_path = series_path
+
+
+class UploadJob:
+    """upload_patient 요청 1건 (태그 재작성 값 + 스풀 파일 목록)"""
+
+    def __init__(
+        self,
+        patient_id: str,
+        patient_name: str,
+        study_description: str,
+        study_uid: str,
+        ocs_id=None,
+        upload_id: Optional[str] = None,
+    ):
+        self.upload_id = upload_id or uuid.uuid4().hex
+        self.patient_id = patient_id
+        self.study_uid = study_uid
+        self.study_id = str(uuid.uuid4())
+        self.ocs_id = ocs_id
+        # study_description 비어있으면 기존 기본값 사용
+        self.study_description = study_description or "AutoUploaded Study"
+        self.safe_patient_name = to_ascii_safe(patient_name, patient_id or "Unknown")
+        self.safe_study_desc = to_ascii_safe(self.study_description, "AutoUploaded Study")
+
+        now = datetime.now()
+        self.def_date = now.strftime("%Y%m%d")
+        self.def_time = now.strftime("%H%M%S")
+
+        # 요청마다 새 디렉토리 (upload_id 는 진행률 그룹 이름으로만 사용)
+        self.spool_dir = SPOOL_ROOT / uuid.uuid4().hex
+        self.items: List[UploadItem] = []
+        self.series_uid_map: Dict[str, str] = {}
+        self.series_num_map: Dict[str, int] = {}
+
+    def spool(self, files, series_paths):
+        """업로드 파일을 디스크로 복사 (요청이 끝나도 백그라운드에서 읽을 수 있도록)"""
+        self.spool_dir.mkdir(parents=True)
+        for idx, (f, sp) in enumerate(zip(files, series_paths), start=1):
+            # Series (폴더명 기준 그룹, 처음 나온 순서대로 번호)
+            if sp not in self.series_uid_map:
+                self.series_uid_map[sp] = generate_uid()
+                self.series_num_map[sp] = len(self.series_num_map) + 1
+
+            path = self.spool_dir / f"{idx:06d}.dcm"
+            with open(path, "wb") as out:
+                for chunk in f.chunks():
+                    out.write(chunk)
+            self.items.append(UploadItem(idx, getattr(f, "name", f"index-{idx}"), path, sp))
+
+    def rewrite(self, item: UploadItem) -> bytes:
+        """Patient / Study / Series 태그 재작성 후 DICOM bytes"""
+        ds = pydicom.dcmread(str(item.path), force=True)
+
+        # Patient
+        ds.PatientID = self.patient_id
+        ds.PatientName = self.safe_patient_name  # ASCII만 사용
+
+        # Study (통합)
+        ds.StudyInstanceUID = self.study_uid
+        ds.StudyID = self.study_id
+        ds.StudyDescription = self.safe_study_desc
+
+        # Study date/time 기본
+        if not getattr(ds, "StudyDate", None):
+            ds.StudyDate = self.def_date
+        if not getattr(ds, "StudyTime", None):
+            ds.StudyTime = self.def_time
+
+        # Series
+        ds.SeriesInstanceUID = self.series_uid_map[item.series_path]
+        ds.SeriesNumber = self.series_num_map[item.series_path]
+        ds.SeriesDescription = item.series_path
+
+        # InstanceNumber (없으면 부여)
+        if not getattr(ds, "InstanceNumber", None):
+            ds.InstanceNumber = item.index
+
+        bio = io.BytesIO()
+        ds.save_as(bio)
+        return bio.getvalue()
+
+    def cleanup(self):
+        shutil.rmtree(self.spool_dir, ignore_errors=True)
+
+
+class _Progress:
+    """진행률 WebSocket 전송 (PROGRESS_INTERVAL 마다 한 번, 단계 전환/완료 시 즉시)"""
+
+    def __init__(self, upload_id: str, total: int):
+        self.upload_id = upload_id
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+        self._last_sent = 0.0
+        self._channel_layer = get_channel_layer()
+
+    def _send(self, event: dict):
+        if self._channel_layer is None:
+            return
+        try:
+            async_to_sync(self._channel_layer.group_send)(upload_group_name(self.upload_id), event)
+        except Exception as e:
+            logger.warning("upload progress send failed %s: %s", self.upload_id, e)
+
+    def phase(self, phase: str):
+        self._last_sent = time.monotonic()
+        self._send({
+            "type": "orthanc_upload_progress",
+            "upload_id": self.upload_id,
+            "phase": phase,
+            "done": self.done,
+            "failed": self.failed,
+            "total": self.total,
+        })
+
+    def step(self, ok: bool, count: int = 1):
+        with self._lock:
+            if ok:
+                self.done += count
+            else:
+                self.failed += count
+            now = time.monotonic()
+            finished = self.done + self.failed >= self.total
+            if not finished and now - self._last_sent < PROGRESS_INTERVAL:
+                return
+        self.phase("upload")
+
+    def completed(self, result: Optional[dict] = None, error: Optional[str] = None):
+        self._send({
+            "type": "orthanc_upload_completed",
+            "upload_id": self.upload_id,
+            "result": result,
+            "error": error,
+        })
+
+
+def _upload_parallel(job: UploadJob, progress: _Progress, uploaded_series: set, errors: List[str]) -> int:
+    """인스턴스별 POST (워커 수만큼 동시 전송)"""
+    def task(item: UploadItem):
+        return _post_instance(job.rewrite(item))
+
+    uploaded = 0
+    futures = {_upload_executor.submit(task, item): item for item in job.items}
+    for future in as_completed(futures):
+        item = futures[future]
+        try:
+            resp = future.result()
+            if isinstance(resp, dict) and resp.get("ParentSeries"):
+                uploaded_series.add(resp["ParentSeries"])
+            uploaded += 1
+            progress.step(True)
+        except Exception as e:
+            logger.warning("upload failed %s: %s", item.name, e)
+            errors.append(item.name)
+            progress.step(False)
+    return uploaded
+
+
+def _upload_zip(job: UploadJob, progress: _Progress, uploaded_series: set, errors: List[str]) -> int:
+    """재작성한 파일을 ZIP 하나로 묶어 POST /instances 한 번"""
+    zip_path = job.spool_dir / "upload.zip"
+    added = 0
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_STORED) as zf:
+        futures = {_upload_executor.submit(job.rewrite, item): item for item in job.items}
+        for future in as_completed(futures):
+            item = futures[future]
+            try:
+                zf.writestr(f"{item.index:06d}.dcm", future.result())
+                added += 1
+            except Exception as e:
+                logger.warning("rewrite failed %s: %s", item.name, e)
+                errors.append(item.name)
+                progress.step(False)
+
+    if not added:
+        return 0
+
+    with open(zip_path, "rb") as f:
+        r = _session().post(
+            f"{ORTHANC}/instances",
+            data=f,
+            headers={"Content-Type": "application/zip"},
+            timeout=ZIP_UPLOAD_TIMEOUT,
+        )
+    r.raise_for_status()
+    results = r.json()
+    if isinstance(results, dict):
+        results = [results]
+
+    uploaded = 0
+    for resp in results:
+        if resp.get("ParentSeries"):
+            uploaded_series.add(resp["ParentSeries"])
+        uploaded += 1
+    progress.step(True, uploaded)
+    if uploaded < added:
+        errors.append(f"{added - uploaded} files rejected by Orthanc")
+    return uploaded
+
+
+def run_upload(job: UploadJob) -> dict:
+    """
+    태그 재작성 + Orthanc 전송 + 인덱스 반영 + 썸네일 캐시 기록
+
+    Returns:
+        upload_patient 응답 데이터
+    """
+    progress = _Progress(job.upload_id, len(job.items))
+    uploaded_series = set()
+    errors: List[str] = []
+    started = time.monotonic()
+
+    try:
+        progress.phase("upload")
+        if UPLOAD_MODE == "zip":
+            try:
+                uploaded = _upload_zip(job, progress, uploaded_series, errors)
+            except Exception as e:
+                logger.warning("zip upload failed %s: %s", job.upload_id, e)
+                uploaded = 0
+                errors.append(f"zip upload failed: {e}")
+        else:
+            uploaded = _upload_parallel(job, progress, uploaded_series, errors)
+
+        # Orthanc Internal Study ID 조회 (첫 번째 시리즈에서 ParentStudy 가져오기)
+        orthanc_study_id = None
+        if uploaded_series:
+            progress.phase("index")
+            try:
+                series_info = _get(f"/series/{next(iter(uploaded_series))}")
+                orthanc_study_id = series_info.get("ParentStudy")
+            except Exception as e:
+                logger.warning("Failed to get ParentStudy: %s", e)
+            _index_uploaded_series(uploaded_series)
+            # 썸네일은 응답을 기다리게 하지 않도록 작업 풀에서 기록 (Orthanc 태그만 사용, DB 미사용)
+            _job_executor.submit(_warm_series_thumbnails, list(uploaded_series))
+    finally:
+        job.cleanup()
+
+    logger.info(
+        "upload %s: %d/%d files, %d series in %.1fs (%s)",
+        job.upload_id, uploaded, len(job.items), len(uploaded_series),
+        time.monotonic() - started, UPLOAD_MODE,
+    )
+
+    result = {
+        "uploadId": job.upload_id,
+        "patientId": job.patient_id,
+        "studyUid": job.study_uid,
+        "studyId": job.study_id,  # DICOM StudyID (UUID)
+        "orthancStudyId": orthanc_study_id,  # Orthanc Internal Study ID
+        "studyDescription": job.study_description,
+        "ocsId": job.ocs_id if job.ocs_id else None,  # OCS 연동 정보
+        "uploaded": uploaded,
+        "failedFiles": errors,
+        "orthancSeriesIds": list(uploaded_series),
+    }
+    progress.completed(result)
+    return result
+
+
+def _run_in_background(job: UploadJob):
+    try:
+        result = run_upload(job)
+        dlog("upload_patient async result", result)
+    except Exception as e:
+        logger.exception("async upload failed %s", job.upload_id)
+        _Progress(job.upload_id, len(job.items)).completed(error=str(e))
+    finally:
+        close_old_connections()
+
+
+def submit_upload(job: UploadJob):
+    """async 업로드: 백그라운드 스레드에서 run_upload"""
+    _job_executor.submit(_run_in_background, job)
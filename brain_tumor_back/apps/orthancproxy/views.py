@@ -3,23 +3,26 @@ from django.shortcuts import render
 # Create your views here.
 # (예) orthancproxy/views.py  또는 현재 올리신 views.py 파일에 그대로 복붙
 
-import io
 import logging
-from typing import List
-import uuid
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 import json
+import re
 from pprint import pformat
 
-import pydicom
 from pydicom.uid import generate_uid
 import requests
 from django.conf import settings
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
+from django.db.models import Count, Max
+
+from . import preview_cache
+from .models import DicomInstance, DicomSeries, DicomStudy, OrthancSyncState
 
 logger = logging.getLogger(__name__)
 
@@ -55,24 +58,175 @@ def dlog(label: str, payload):
 
 ORTHANC = settings.ORTHANC_BASE_URL.rstrip("/")
 
+# Orthanc 동시 요청 수 (bulk API 가 없는 조회의 fan-out, 연결 풀 크기)
+ORTHANC_PROXY_WORKERS = getattr(settings, "ORTHANC_PROXY_WORKERS", 8)
+
+_session_local = threading.local()
+_fanout_executor = ThreadPoolExecutor(max_workers=ORTHANC_PROXY_WORKERS, thread_name_prefix="orthanc-proxy")
+
+
+def _session() -> requests.Session:
+    """
+    스레드별 keep-alive Session (요청마다 새 TCP 연결을 맺지 않도록)
+    """
+    session = getattr(_session_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=4, pool_maxsize=ORTHANC_PROXY_WORKERS
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _session_local.session = session
+    return session
+
 
 def _get(path: str):
     url = f"{ORTHANC}{path}"
-    r = requests.get(url, timeout=10)
+    r = _session().get(url, timeout=10)
+    r.raise_for_status()
+    return r.json()
+
+
+def _post_json(path: str, payload: dict):
+    url = f"{ORTHANC}{path}"
+    r = _session().post(url, json=payload, timeout=30)
     r.raise_for_status()
     return r.json()
 
 
 def _delete(path: str):
     url = f"{ORTHANC}{path}"
-    r = requests.delete(url, timeout=10)
+    r = _session().delete(url, timeout=10)
     r.raise_for_status()
     return r.json() if r.text else {}
 
 
+def _fan_out(fn, items: List[str]) -> Dict[str, object]:
+    """
+    items 각각에 fn 을 동시에 실행 → {item: 결과} (실패한 항목은 예외 객체)
+    """
+    results = {}
+    futures = {item: _fanout_executor.submit(fn, item) for item in items}
+    for item, future in futures.items():
+        try:
+            results[item] = future.result()
+        except Exception as e:
+            results[item] = e
+    return results
+
+
+def _find(level: str, query: dict = None) -> List[dict]:
+    """Orthanc /tools/find (Expand) - 한 번의 요청으로 MainDicomTags 포함 목록 조회"""
+    return _post_json("/tools/find", {"Level": level, "Query": query or {}, "Expand": True})
+
+
+def _series_instance_tags(series_id: str) -> Dict[str, dict]:
+    """
+    시리즈 전체 인스턴스의 simplified tags → {instance_id: tags}
+
+    /series/{id}/instances-tags 한 번으로 조회, 지원하지 않는 Orthanc 에서는
+    /instances/{id}/simplified-tags 를 동시에 요청
+    """
+    try:
+        return _get(f"/series/{series_id}/instances-tags?simplify")
+    except requests.exceptions.HTTPError as e:
+        logger.info("instances-tags unavailable for %s (%s), falling back to fan-out", series_id, e)
+
+    ids: List[str] = _get(f"/series/{series_id}").get("Instances", [])
+    fetched = _fan_out(lambda inst_id: _get(f"/instances/{inst_id}/simplified-tags"), ids)
+    tags_by_id = {}
+    for inst_id, tags in fetched.items():
+        if isinstance(tags, Exception):
+            logger.warning("instance read failed %s: %s", inst_id, tags)
+            continue
+        tags_by_id[inst_id] = tags
+    return tags_by_id
+
+
+STREAM_CHUNK_SIZE = 64 * 1024
+# 브라우저 → Orthanc 로 전달하는 조건부/부분 요청 헤더, Orthanc → 브라우저로 돌려주는 응답 헤더
+FORWARD_REQUEST_HEADERS = {
+    "HTTP_RANGE": "Range",
+    "HTTP_IF_NONE_MATCH": "If-None-Match",
+    "HTTP_IF_MODIFIED_SINCE": "If-Modified-Since",
+}
+FORWARD_RESPONSE_HEADERS = ("ETag", "Last-Modified", "Content-Length", "Content-Range", "Accept-Ranges")
+PREVIEW_CACHE_CONTROL = "private, max-age=3600"
+
+
+def _open_stream(path: str, request=None, timeout: int = 20) -> requests.Response:
+    """
+    Orthanc 응답을 본문을 읽지 않은 채로 열기 (stream=True)
+
+    - 압축 해제로 Content-Length 가 어긋나지 않도록 identity 인코딩 요청
+    - 304 / 206 / 416 은 그대로 전달, 그 외 4xx/5xx 는 HTTPError
+    """
+    headers = {"Accept-Encoding": "identity"}
+    if request is not None:
+        for meta_key, header in FORWARD_REQUEST_HEADERS.items():
+            value = request.META.get(meta_key)
+            if value:
+                headers[header] = value
+    r = _session().get(f"{ORTHANC}{path}", headers=headers, stream=True, timeout=timeout)
+    if r.status_code >= 400 and r.status_code != 416:
+        r.close()
+        r.raise_for_status()
+    return r
+
+
+def _iter_upstream(r: requests.Response):
+    """청크 단위 전달, 끝나거나 클라이언트가 끊으면 연결을 풀에 반환"""
+    try:
+        yield from r.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+    finally:
+        r.close()
+
+
+def _proxy_response(r: requests.Response, body, content_type: str):
+    if r.status_code == 304:
+        r.close()
+        response = HttpResponse(status=304)
+    else:
+        response = StreamingHttpResponse(
+            body, status=r.status_code, content_type=r.headers.get("Content-Type", content_type)
+        )
+    for header in FORWARD_RESPONSE_HEADERS:
+        if header in r.headers and not (r.status_code == 304 and header == "Content-Length"):
+            response[header] = r.headers[header]
+    return response
+
+
+def _stream_upstream(request, path: str, content_type: str, timeout: int = 20):
+    """Orthanc 파일을 메모리에 올리지 않고 그대로 스트리밍 (ETag/Range 전달)"""
+    r = _open_stream(path, request, timeout)
+    return _proxy_response(r, _iter_upstream(r), content_type)
+
+
+def _preview_response(request, instance_id: str):
+    """
+    인스턴스 미리보기 PNG (로컬 LRU 디스크 캐시 → 없으면 Orthanc 스트림을 전달하며 캐시에 기록)
+    """
+    cached = preview_cache.get(instance_id)
+    if cached is not None:
+        etag = preview_cache.etag_for(cached)
+        if etag in [tag.strip() for tag in request.META.get("HTTP_IF_NONE_MATCH", "").split(",")]:
+            response = HttpResponse(status=304)
+        else:
+            response = FileResponse(open(cached, "rb"), content_type="image/png")
+        response["ETag"] = etag
+        response["Cache-Control"] = PREVIEW_CACHE_CONTROL
+        return response
+
+    r = _open_stream(f"/instances/{instance_id}/preview", timeout=10)
+    response = _proxy_response(r, preview_cache.tee(instance_id, _iter_upstream(r)), "image/png")
+    response["Cache-Control"] = PREVIEW_CACHE_CONTROL
+    return response
+
+
 def _post_instance(dicom_bytes: bytes):
     url = f"{ORTHANC}/instances"
-    r = requests.post(
+    r = _session().post(
         url,
         data=dicom_bytes,
         headers={"Content-Type": "application/dicom"},
@@ -160,6 +314,111 @@ def _parse_series_type(series_description: str) -> str:
     return "OTHER"
 
 
+def _study_meta(study: dict) -> dict:
+    """Orthanc Study 객체 → list_studies 항목"""
+    tags = study.get("MainDicomTags", {}) or {}
+    return {
+        "orthancId": study.get("ID", ""),
+        "studyInstanceUID": tags.get("StudyInstanceUID", ""),
+        "description": tags.get("StudyDescription", ""),
+        "studyDate": tags.get("StudyDate", ""),
+        "seriesCount": len(study.get("Series", [])),
+    }
+
+
+def _series_meta(series: dict) -> dict:
+    """Orthanc Series 객체 → list_series 항목"""
+    tags = series.get("MainDicomTags", {}) or {}
+    series_desc = tags.get("SeriesDescription", "")
+    return {
+        "orthancId": series.get("ID", ""),
+        "seriesInstanceUID": tags.get("SeriesInstanceUID", ""),
+        "seriesNumber": tags.get("SeriesNumber", ""),
+        "description": series_desc,
+        "seriesType": _parse_series_type(series_desc),  # T1, T2, T1C, FLAIR, OTHER
+        "modality": tags.get("Modality", ""),
+        "instancesCount": len(series.get("Instances", [])),
+    }
+
+
+def _instance_meta(inst_id: str, tags: dict) -> dict:
+    """simplified tags → list_instances 항목"""
+    num = _normalize_tag_value(tags.get("InstanceNumber"))
+    try:
+        num_int = int(num)
+    except Exception:
+        num_int = None
+
+    return {
+        "orthancId": inst_id,
+        "instanceNumber": num,
+        "instanceNumberInt": num_int,
+        "sopInstanceUID": _normalize_tag_value(tags.get("SOPInstanceUID")),
+        "rows": _normalize_tag_value(tags.get("Rows")),
+        "columns": _normalize_tag_value(tags.get("Columns")),
+        "pixelSpacing": _normalize_tag_value(tags.get("PixelSpacing")),
+        "sliceThickness": _normalize_tag_value(tags.get("SliceThickness")),
+        "sliceLocation": _normalize_tag_value(tags.get("SliceLocation")),
+        "imagePositionPatient": _normalize_tag_value(tags.get("ImagePositionPatient")),
+        "patientId": _normalize_tag_value(tags.get("PatientID")),
+        "patientName": _normalize_tag_value(tags.get("PatientName")),
+        "studyInstanceUID": _normalize_tag_value(tags.get("StudyInstanceUID")),
+        "seriesInstanceUID": _normalize_tag_value(tags.get("SeriesInstanceUID")),
+        "seriesNumber": _normalize_tag_value(tags.get("SeriesNumber")),
+    }
+
+
+def _use_index(request) -> bool:
+    """
+    로컬 DICOM 인덱스 (DicomStudy/Series/Instance) 로 조회할지 여부
+
+    - ORTHANC_INDEX_ENABLED 설정 + 동기화 poller 가 한 번 이상 실행된 경우
+    - ?live=1 이면 Orthanc 직접 조회
+    """
+    if request.query_params.get("live") in ("1", "true"):
+        return False
+    if not getattr(settings, "ORTHANC_INDEX_ENABLED", True):
+        return False
+    return OrthancSyncState.objects.filter(key=OrthancSyncState.CHANGES_KEY, synced_at__isnull=False).exists()
+
+
+def _indexed_series_metas(study_id: str):
+    """
+    인덱스의 Study 하위 시리즈 목록
+
+    안정화되지 않은 시리즈가 있으면 인스턴스 수가 바뀌는 중이므로 None (Orthanc 직접 조회)
+    """
+    series_list = list(DicomSeries.objects.filter(study__orthanc_id=study_id))
+    if not series_list or not all(series.is_stable for series in series_list):
+        return None
+    return [series.as_meta() for series in series_list]
+
+
+def _index_uploaded_series(series_ids):
+    """
+    업로드 직후 시리즈를 인덱스에 바로 반영 (poller 대기 없이 목록에 노출)
+
+    Orthanc IsStable 이 False 인 동안은 조회 API 가 Orthanc 로 직접 조회함
+    """
+    if not getattr(settings, "ORTHANC_INDEX_ENABLED", True):
+        return
+    from .index import index_series
+    for series_id in series_ids:
+        try:
+            index_series(series_id)
+        except Exception as e:
+            logger.warning("index_series after upload failed %s: %s", series_id, e)
+
+
+def _drop_from_index(resource_type: str, resource_id: str):
+    """삭제 API 호출 시 인덱스에서도 즉시 제거 (poller 의 Deleted 변경과 동일 처리)"""
+    from .index import _delete_resource
+    try:
+        _delete_resource(resource_type, resource_id)
+    except Exception as e:
+        logger.warning("index delete failed %s %s: %s", resource_type, resource_id, e)
+
+
 def _auto_cleanup_if_empty(patient_id=None, study_id=None):
     try:
         if study_id:
@@ -167,6 +426,7 @@ def _auto_cleanup_if_empty(patient_id=None, study_id=None):
             if not study.get("Series", []):
                 logger.info(f"Auto-clean: deleting empty study {study_id}")
                 _delete(f"/studies/{study_id}")
+                _drop_from_index("Study", study_id)
                 study_id = None
 
         if patient_id:
@@ -174,6 +434,7 @@ def _auto_cleanup_if_empty(patient_id=None, study_id=None):
             if not patient.get("Studies", []):
                 logger.info(f"Auto-clean: deleting empty patient {patient_id}")
                 _delete(f"/patients/{patient_id}")
+                _drop_from_index("Patient", patient_id)
 
     except Exception as e:
         logger.warning("auto-cleanup skipped: %s", e)
@@ -183,23 +444,41 @@ def _auto_cleanup_if_empty(patient_id=None, study_id=None):
 @permission_classes([AllowAny])
 def list_patients(request):
     try:
-        ids: List[str] = _get("/patients")
+        if _use_index(request):
+            # 로컬 인덱스: Study 를 환자별로 집계
+            rows = (
+                DicomStudy.objects.values("patient_orthanc_id")
+                .annotate(
+                    patient_id=Max("patient_id"),
+                    patient_name=Max("patient_name"),
+                    studies_count=Count("id"),
+                )
+            )
+            result = [
+                {
+                    "orthancId": row["patient_orthanc_id"],
+                    "patientId": row["patient_id"],
+                    "patientName": row["patient_name"],
+                    "studiesCount": row["studies_count"],
+                }
+                for row in rows
+            ]
+            result.sort(key=lambda x: (x["patientId"], x["orthancId"]))
+            return Response(result)
+
+        # /tools/find (Expand) 한 번으로 전체 환자 + MainDicomTags 조회
         result = []
 
-        for pid in ids:
-            try:
-                detail = _get(f"/patients/{pid}")
-                tags = detail.get("MainDicomTags", {}) or {}
-                result.append(
-                    {
-                        "orthancId": pid,
-                        "patientId": tags.get("PatientID", ""),
-                        "patientName": tags.get("PatientName", ""),
-                        "studiesCount": len(detail.get("Studies", [])),
-                    }
-                )
-            except Exception as e:
-                logger.warning("patient read failed %s: %s", pid, e)
+        for detail in _find("Patient"):
+            tags = detail.get("MainDicomTags", {}) or {}
+            result.append(
+                {
+                    "orthancId": detail.get("ID", ""),
+                    "patientId": tags.get("PatientID", ""),
+                    "patientName": tags.get("PatientName", ""),
+                    "studiesCount": len(detail.get("Studies", [])),
+                }
+            )
 
         result.sort(key=lambda x: (x["patientId"], x["orthancId"]))
         dlog("list_patients result", {"count": len(result), "items": result})
@@ -222,25 +501,18 @@ def list_studies(request):
         return Response(data, status=400)
 
     try:
-        p = _get(f"/patients/{pid}")
-        study_ids: List[str] = p.get("Studies", [])
-        result = []
-
-        for sid in study_ids:
-            try:
-                s = _get(f"/studies/{sid}")
-                tags = s.get("MainDicomTags", {}) or {}
-                result.append(
-                    {
-                        "orthancId": sid,
-                        "studyInstanceUID": tags.get("StudyInstanceUID", ""),
-                        "description": tags.get("StudyDescription", ""),
-                        "studyDate": tags.get("StudyDate", ""),
-                        "seriesCount": len(s.get("Series", [])),
-                    }
-                )
-            except Exception as e:
-                logger.warning("study read failed %s: %s", sid, e)
+        indexed = None
+        if _use_index(request):
+            indexed = [
+                study.as_meta()
+                for study in DicomStudy.objects.filter(patient_orthanc_id=pid).annotate(series_total=Count("series"))
+            ]
+
+        if indexed:
+            result = indexed
+        else:
+            # /patients/{id}/studies: 하위 Study 정보를 한 번에 반환
+            result = [_study_meta(s) for s in _get(f"/patients/{pid}/studies")]
 
         result.sort(key=lambda x: (x["studyDate"], x["orthancId"]))
         dlog("list_studies result", {"count": len(result), "items": result})
@@ -263,28 +535,15 @@ def list_series(request):
         return Response(data, status=400)
 
     try:
-        s = _get(f"/studies/{sid}")
-        series_ids: List[str] = s.get("Series", [])
-        result = []
+        indexed = None
+        if _use_index(request):
+            indexed = _indexed_series_metas(sid)
 
-        for ser_id in series_ids:
-            try:
-                ser = _get(f"/series/{ser_id}")
-                tags = ser.get("MainDicomTags", {}) or {}
-                series_desc = tags.get("SeriesDescription", "")
-                result.append(
-                    {
-                        "orthancId": ser_id,
-                        "seriesInstanceUID": tags.get("SeriesInstanceUID", ""),
-                        "seriesNumber": tags.get("SeriesNumber", ""),
-                        "description": series_desc,
-                        "seriesType": _parse_series_type(series_desc),  # T1, T2, T1C, FLAIR, OTHER
-                        "modality": tags.get("Modality", ""),
-                        "instancesCount": len(ser.get("Instances", [])),
-                    }
-                )
-            except Exception as e:
-                logger.warning("series read failed %s: %s", ser_id, e)
+        if indexed:
+            result = indexed
+        else:
+            # /studies/{id}/series: 하위 Series 정보를 한 번에 반환
+            result = [_series_meta(ser) for ser in _get(f"/studies/{sid}/series")]
 
         result.sort(key=lambda x: (str(x["seriesNumber"]), x["orthancId"]))
         dlog("list_series result", {"count": len(result), "items": result})
@@ -307,58 +566,34 @@ def list_instances(request):
         return Response(data, status=400)
 
     try:
-        ser = _get(f"/series/{sid}")
-        ids: List[str] = ser.get("Instances", [])
-        logger.info("list_instances called: series_id=%s, instances=%d", sid, len(ids))
-
-        result = []
+        result = None
+        if _use_index(request):
+            # 로컬 인덱스: (series, instance_number) 인덱스 순서 그대로
+            indexed = DicomSeries.objects.filter(orthanc_id=sid).first()
+            # 업로드 중 (StableSeries 전) 인 시리즈는 인덱스가 불완전할 수 있으므로 Orthanc 직접 조회
+            if indexed is not None and indexed.is_stable and indexed.instances_count:
+                result = list(
+                    DicomInstance.objects.filter(series=indexed)
+                    .order_by("instance_number", "orthanc_id")
+                    .values_list("meta", flat=True)
+                )
 
-        for idx, inst_id in enumerate(ids, start=1):
-            try:
-                tags = _get(f"/instances/{inst_id}/simplified-tags")
-                if idx <= 3:
-                    dlog(f"simplified-tags for {inst_id}", tags)
+        if not result:
+            # 시리즈 전체 인스턴스 태그를 한 번에 조회 (인스턴스별 요청 X)
+            tags_by_id = _series_instance_tags(sid)
+            logger.info("list_instances called: series_id=%s, instances=%d", sid, len(tags_by_id))
 
-                num = _normalize_tag_value(tags.get("InstanceNumber"))
+            result = []
+            for idx, (inst_id, tags) in enumerate(tags_by_id.items(), start=1):
                 try:
-                    num_int = int(num)
-                except Exception:
-                    num_int = None
-
-                sop = _normalize_tag_value(tags.get("SOPInstanceUID"))
-
-                rows = _normalize_tag_value(tags.get("Rows"))
-                cols = _normalize_tag_value(tags.get("Columns"))
-                pixel_spacing = _normalize_tag_value(tags.get("PixelSpacing"))
-                slice_thickness = _normalize_tag_value(tags.get("SliceThickness"))
-                slice_location = _normalize_tag_value(tags.get("SliceLocation"))
-                image_position_patient = _normalize_tag_value(tags.get("ImagePositionPatient"))
-
-                meta = {
-                    "orthancId": inst_id,
-                    "instanceNumber": num,
-                    "instanceNumberInt": num_int,
-                    "sopInstanceUID": sop,
-                    "rows": rows,
-                    "columns": cols,
-                    "pixelSpacing": pixel_spacing,
-                    "sliceThickness": slice_thickness,
-                    "sliceLocation": slice_location,
-                    "imagePositionPatient": image_position_patient,
-                    "patientId": _normalize_tag_value(tags.get("PatientID")),
-                    "patientName": _normalize_tag_value(tags.get("PatientName")),
-                    "studyInstanceUID": _normalize_tag_value(tags.get("StudyInstanceUID")),
-                    "seriesInstanceUID": _normalize_tag_value(tags.get("SeriesInstanceUID")),
-                    "seriesNumber": _normalize_tag_value(tags.get("SeriesNumber")),
-                }
-
-                if idx <= 3:
-                    dlog(f"built meta for {inst_id}", meta)
-
-                result.append(meta)
-
-            except Exception as e:
-                logger.warning("instance read failed %s: %s", inst_id, e)
+                    if idx <= 3:
+                        dlog(f"simplified-tags for {inst_id}", tags)
+                    meta = _instance_meta(inst_id, tags)
+                    if idx <= 3:
+                        dlog(f"built meta for {inst_id}", meta)
+                    result.append(meta)
+                except Exception as e:
+                    logger.warning("instance read failed %s: %s", inst_id, e)
 
         result.sort(key=lambda x: (x["instanceNumberInt"] or 0))
         dlog("list_instances result", {"count": len(result), "first": result[0] if result else None})
@@ -375,10 +610,18 @@ def list_instances(request):
 @permission_classes([AllowAny])
 def get_instance_file(request, instance_id: str):
     try:
-        r = requests.get(f"{ORTHANC}/instances/{instance_id}/file", timeout=20)
-        r.raise_for_status()
-        dlog("get_instance_file info", {"instance_id": instance_id, "content_length": len(r.content)})
-        return HttpResponse(r.content, content_type="application/dicom")
+        response = _stream_upstream(request, f"/instances/{instance_id}/file", "application/dicom")
+        dlog("get_instance_file info", {
+            "instance_id": instance_id,
+            "status": response.status_code,
+            "content_length": response.get("Content-Length"),
+        })
+        return response
+    except requests.exceptions.HTTPError as e:
+        if e.response is not None and e.response.status_code == 404:
+            return Response({"detail": "Instance not found"}, status=404)
+        logger.exception("get_instance_file error")
+        return Response({"detail": str(e)}, status=502)
     except Exception as e:
         logger.exception("get_instance_file error")
         data = {"detail": str(e)}
@@ -391,6 +634,9 @@ def get_instance_file(request, instance_id: str):
 #    - OCS 연동: study_instance_uid, ocs_id 파라미터 지원
 #    - StudyInstanceUID 형식: 1.2.410.200001.{ocs_id}.{timestamp}
 # -------------------------------------------------------------
+UPLOAD_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
 @api_view(["POST"])
 def upload_patient(request):
     patient_id = request.data.get("patient_id") or request.data.get("patientId")
@@ -441,6 +687,13 @@ def upload_patient(request):
         dlog("upload_patient bad_request", data)
         return Response(data, status=400)
 
+    # 진행률 구독용 upload_id (프론트에서 미리 만들어 ws/orthanc-upload/<upload_id>/ 에 연결 가능)
+    upload_id = (request.data.get("upload_id") or request.data.get("uploadId") or "").strip()
+    if upload_id and not UPLOAD_ID_RE.match(upload_id):
+        data = {"detail": "invalid upload_id"}
+        dlog("upload_patient bad_request", data)
+        return Response(data, status=400)
+
     # StudyInstanceUID: 프론트에서 전달받거나, 없으면 자동 생성
     # 형식: 1.2.410.200001.{ocs_id}.{timestamp} 또는 pydicom generate_uid()
     if study_instance_uid:
@@ -448,110 +701,37 @@ def upload_patient(request):
     else:
         study_uid = generate_uid()
 
-    study_id = str(uuid.uuid4())
+    from .upload import UploadJob, run_upload, submit_upload
 
-    series_uid_map = {}
-    series_num_map = {}
-    next_num = 1
-
-    uploaded_series = set()
-    uploaded = 0
-    errors = []
-
-    now = datetime.now()
-    def_date = now.strftime("%Y%m%d")
-    def_time = now.strftime("%H%M%S")
-
-    # ✅ 한글 인코딩 문제 방지: ASCII 문자만 사용
-    # PatientName, StudyDescription에 한글이 있으면 Orthanc에서 "??"로 표시됨
-    def to_ascii_safe(text, default="Unknown"):
-        """한글/특수문자를 제거하고 ASCII만 반환"""
-        if not text:
-            return default
-        # ASCII 문자만 유지
-        result = ''.join(c if ord(c) < 128 else '' for c in str(text)).strip()
-        return result if result else default
-
-    # study_description 비어있으면 기존 기본값 사용
-    final_study_desc = study_description if study_description else "AutoUploaded Study"
-
-    # ASCII로 변환 (한글 제거)
-    safe_patient_name = to_ascii_safe(patient_name, patient_id or "Unknown")
-    safe_study_desc = to_ascii_safe(final_study_desc, "AutoUploaded Study")
-
-    for idx, (f, sp) in enumerate(zip(files, series_paths), start=1):
-        try:
-            ds = pydicom.dcmread(f, force=True)
-
-            # Patient
-            ds.PatientID = patient_id
-            ds.PatientName = safe_patient_name  # ASCII만 사용
-
-            # Study (통합)
-            ds.StudyInstanceUID = study_uid
-            ds.StudyID = study_id
-
-            # ✅ StudyDescription도 ASCII만 사용
-            ds.StudyDescription = safe_study_desc
-
-            # Study date/time 기본
-            if not getattr(ds, "StudyDate", None):
-                ds.StudyDate = def_date
-            if not getattr(ds, "StudyTime", None):
-                ds.StudyTime = def_time
-
-            # Series (폴더명 기준 그룹)
-            if sp not in series_uid_map:
-                series_uid_map[sp] = generate_uid()
-                series_num_map[sp] = next_num
-                next_num += 1
-
-            ds.SeriesInstanceUID = series_uid_map[sp]
-            ds.SeriesNumber = series_num_map[sp]
-            ds.SeriesDescription = sp
-
-            # InstanceNumber (없으면 부여)
-            if not getattr(ds, "InstanceNumber", None):
-                ds.InstanceNumber = idx
-
-            bio = io.BytesIO()
-            ds.save_as(bio)
-            bio.seek(0)
-
-            resp = _post_instance(bio.getvalue())
-            if isinstance(resp, dict):
-                ps = resp.get("ParentSeries")
-                if ps:
-                    uploaded_series.add(ps)
-
-            uploaded += 1
-
-        except Exception as e:
-            logger.warning("upload failed %s: %s", getattr(f, "name", "?"), e)
-            errors.append(getattr(f, "name", f"index-{idx}"))
+    job = UploadJob(
+        patient_id=patient_id,
+        patient_name=patient_name,
+        study_description=study_description,
+        study_uid=study_uid,
+        ocs_id=ocs_id,
+        upload_id=upload_id or None,
+    )
+    try:
+        job.spool(files, series_paths)
+    except Exception as e:
+        job.cleanup()
+        logger.exception("upload_patient spool error")
+        return Response({"detail": str(e)}, status=500)
 
-    # Orthanc Internal Study ID 조회 (첫 번째 시리즈에서 ParentStudy 가져오기)
-    orthanc_study_id = None
-    if uploaded_series:
-        try:
-            first_series_id = list(uploaded_series)[0]
-            series_info = _get(f"/series/{first_series_id}")
-            orthanc_study_id = series_info.get("ParentStudy")
-        except Exception as e:
-            logger.warning("Failed to get ParentStudy: %s", e)
-
-    resp_data = {
-        "patientId": patient_id,
-        "studyUid": study_uid,
-        "studyId": study_id,  # DICOM StudyID (UUID)
-        "orthancStudyId": orthanc_study_id,  # Orthanc Internal Study ID (NEW)
-        "studyDescription": final_study_desc,
-        "ocsId": ocs_id if ocs_id else None,  # OCS 연동 정보
-        "uploaded": uploaded,
-        "failedFiles": errors,
-        "orthancSeriesIds": list(uploaded_series),
-    }
+    # async=1: 파일만 받아 두고 바로 응답, 결과는 WebSocket 으로 전달
+    if str(request.data.get("async", "")).lower() in ("1", "true"):
+        submit_upload(job)
+        resp_data = {
+            "uploadId": job.upload_id,
+            "status": "accepted",
+            "total": len(job.items),
+            "studyUid": job.study_uid,
+            "studyId": job.study_id,
+        }
+        dlog("upload_patient accepted", resp_data)
+        return Response(resp_data, status=202)
 
+    resp_data = run_upload(job)
     dlog("upload_patient result", resp_data)
     return Response(resp_data, status=201)
 
@@ -565,11 +745,13 @@ def delete_instance(request, instance_id: str):
         patient_id = meta.get("ParentPatient")
 
         _delete(f"/instances/{instance_id}")
+        _drop_from_index("Instance", instance_id)
 
         try:
             series = _get(f"/series/{series_id}")
             if not series.get("Instances", []):
                 _delete(f"/series/{series_id}")
+                _drop_from_index("Series", series_id)
                 _auto_cleanup_if_empty(patient_id, study_id)
         except Exception:
             pass
@@ -593,6 +775,7 @@ def delete_series(request, series_id: str):
         patient_id = ser.get("ParentPatient")
 
         _delete(f"/series/{series_id}")
+        _drop_from_index("Series", series_id)
         _auto_cleanup_if_empty(patient_id, study_id)
 
         data = {"deleted": True, "series_id": series_id}
@@ -613,6 +796,7 @@ def delete_study(request, study_id: str):
         patient_id = stu.get("ParentPatient")
 
         _delete(f"/studies/{study_id}")
+        _drop_from_index("Study", study_id)
         _auto_cleanup_if_empty(patient_id)
 
         data = {"deleted": True, "study_id": study_id}
@@ -630,6 +814,7 @@ def delete_study(request, study_id: str):
 def delete_patient(request, patient_id: str):
     try:
         _delete(f"/patients/{patient_id}")
+        _drop_from_index("Patient", patient_id)
         data = {"deleted": True, "patient_id": patient_id}
         dlog("delete_patient result", data)
         return Response(data)
@@ -645,6 +830,86 @@ def delete_patient(request, patient_id: str):
 #    - Series의 중간 슬라이스 이미지를 PNG로 반환
 #    - 4개 채널 (T1, T1CE, T2, FLAIR) 썸네일 지원
 # -------------------------------------------------------------
+def _middle_instance_id(series_id: str, use_index: bool) -> Optional[str]:
+    """
+    시리즈 썸네일용 중간 슬라이스 인스턴스 (인스턴스가 없으면 None)
+
+    슬라이스 위치(SliceLocation 또는 InstanceNumber)를 기준으로 정렬하여 일관된 중간 슬라이스 선택
+    """
+    # 인덱스가 있으면 DB 에서 슬라이스 위치 조회, 없으면 시리즈 전체 인스턴스 태그 (한 번에 조회)
+    tags_by_id = None
+    if use_index:
+        rows = DicomInstance.objects.filter(series__orthanc_id=series_id, series__is_stable=True).values_list(
+            "orthanc_id", "slice_location", "instance_number"
+        )
+        tags_by_id = {
+            inst_id: {"SliceLocation": slice_loc, "InstanceNumber": inst_num}
+            for inst_id, slice_loc, inst_num in rows
+        }
+    if not tags_by_id:
+        tags_by_id = _series_instance_tags(series_id)
+
+    if not tags_by_id:
+        return None
+
+    # 각 인스턴스의 슬라이스 위치 정보 수집
+    instance_positions = []
+    for inst_id, tags in tags_by_id.items():
+        try:
+            # SliceLocation이 가장 정확, 없으면 InstanceNumber 사용
+            slice_loc = tags.get("SliceLocation")
+            instance_num = tags.get("InstanceNumber")
+
+            # 정렬 기준 값 결정
+            if slice_loc is not None:
+                try:
+                    position = float(slice_loc)
+                except (ValueError, TypeError):
+                    position = None
+            else:
+                position = None
+
+            # SliceLocation이 없으면 InstanceNumber 사용
+            if position is None and instance_num is not None:
+                try:
+                    position = float(instance_num)
+                except (ValueError, TypeError):
+                    position = None
+
+            instance_positions.append({
+                "id": inst_id,
+                "position": position if position is not None else 0
+            })
+        except Exception as e:
+            # 개별 인스턴스 조회 실패 시 기본값 사용
+            logger.warning(f"Failed to get tags for instance {inst_id}: {e}")
+            instance_positions.append({"id": inst_id, "position": 0})
+
+    # 슬라이스 위치로 정렬
+    instance_positions.sort(key=lambda x: x["position"])
+
+    # 정렬된 목록에서 중간 슬라이스 선택
+    return instance_positions[len(instance_positions) // 2]["id"]
+
+
+def _warm_series_thumbnails(series_ids):
+    """
+    업로드 직후 시리즈 썸네일 (중간 슬라이스 미리보기) 을 미리 캐시에 기록
+
+    업로드 백그라운드 작업에서 호출 → RIS/OCS 목록의 첫 썸네일 요청이 Orthanc 렌더링을 기다리지 않음
+    """
+    for series_id in series_ids:
+        try:
+            instance_id = _middle_instance_id(series_id, use_index=False)
+            if instance_id is None or preview_cache.get(instance_id) is not None:
+                continue
+            r = _open_stream(f"/instances/{instance_id}/preview", timeout=10)
+            for _ in preview_cache.tee(instance_id, _iter_upstream(r)):
+                pass
+        except Exception as e:
+            logger.warning("thumbnail warm-up after upload failed %s: %s", series_id, e)
+
+
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def get_series_thumbnail(request, series_id: str):
@@ -655,62 +920,12 @@ def get_series_thumbnail(request, series_id: str):
     슬라이스 위치(SliceLocation 또는 InstanceNumber)를 기준으로 정렬하여 일관된 중간 슬라이스 선택
     """
     try:
-        # 시리즈 정보 조회
-        series_info = _get(f"/series/{series_id}")
-        instances = series_info.get("Instances", [])
-
-        if not instances:
+        middle_instance_id = _middle_instance_id(series_id, use_index=_use_index(request))
+        if middle_instance_id is None:
             return Response({"detail": "No instances in series"}, status=404)
 
-        # 각 인스턴스의 슬라이스 위치 정보 수집
-        instance_positions = []
-        for inst_id in instances:
-            try:
-                # Orthanc simplified-tags에서 슬라이스 정보 가져오기
-                tags = _get(f"/instances/{inst_id}/simplified-tags")
-
-                # SliceLocation이 가장 정확, 없으면 InstanceNumber 사용
-                slice_loc = tags.get("SliceLocation")
-                instance_num = tags.get("InstanceNumber")
-
-                # 정렬 기준 값 결정
-                if slice_loc is not None:
-                    try:
-                        position = float(slice_loc)
-                    except (ValueError, TypeError):
-                        position = None
-                else:
-                    position = None
-
-                # SliceLocation이 없으면 InstanceNumber 사용
-                if position is None and instance_num is not None:
-                    try:
-                        position = float(instance_num)
-                    except (ValueError, TypeError):
-                        position = None
-
-                instance_positions.append({
-                    "id": inst_id,
-                    "position": position if position is not None else 0
-                })
-            except Exception as e:
-                # 개별 인스턴스 조회 실패 시 기본값 사용
-                logger.warning(f"Failed to get tags for instance {inst_id}: {e}")
-                instance_positions.append({"id": inst_id, "position": 0})
-
-        # 슬라이스 위치로 정렬
-        instance_positions.sort(key=lambda x: x["position"])
-
-        # 정렬된 목록에서 중간 슬라이스 선택
-        middle_idx = len(instance_positions) // 2
-        middle_instance_id = instance_positions[middle_idx]["id"]
-
-        # Orthanc의 preview 기능 사용 (PNG 반환)
-        preview_url = f"{ORTHANC}/instances/{middle_instance_id}/preview"
-        r = requests.get(preview_url, timeout=10)
-        r.raise_for_status()
-
-        return HttpResponse(r.content, content_type="image/png")
+        # Orthanc의 preview 기능 사용 (PNG 반환, 로컬 캐시 경유)
+        return _preview_response(request, middle_instance_id)
 
     except requests.exceptions.HTTPError as e:
         if e.response.status_code == 404:
@@ -730,34 +945,26 @@ def get_study_thumbnails(request, study_id: str):
     MRI 4채널 (T1, T1CE, T2, FLAIR)에 대한 썸네일 URL 목록 제공
     """
     try:
-        study_info = _get(f"/studies/{study_id}")
-        series_ids = study_info.get("Series", [])
+        series_metas = None
+        if _use_index(request):
+            series_metas = _indexed_series_metas(study_id)
+        if not series_metas:
+            # /studies/{id}/series: 하위 Series 정보를 한 번에 반환
+            series_metas = [_series_meta(ser) for ser in _get(f"/studies/{study_id}/series")]
 
         thumbnails = []
-        for ser_id in series_ids:
-            try:
-                ser = _get(f"/series/{ser_id}")
-                tags = ser.get("MainDicomTags", {}) or {}
-                series_desc = tags.get("SeriesDescription", "")
-                series_type = _parse_series_type(series_desc)
-
-                # SEG는 썸네일에서 제외 (마스크 이미지)
-                if series_type == "SEG":
-                    continue
-
-                instances = ser.get("Instances", [])
-                if not instances:
-                    continue
-
-                thumbnails.append({
-                    "series_id": ser_id,
-                    "series_type": series_type,
-                    "description": series_desc,
-                    "instances_count": len(instances),
-                    "thumbnail_url": f"/api/orthanc/series/{ser_id}/thumbnail/",
-                })
-            except Exception as e:
-                logger.warning("series thumbnail failed %s: %s", ser_id, e)
+        for ser in series_metas:
+            # SEG는 썸네일에서 제외 (마스크 이미지)
+            if ser["seriesType"] == "SEG" or not ser["instancesCount"]:
+                continue
+
+            thumbnails.append({
+                "series_id": ser["orthancId"],
+                "series_type": ser["seriesType"],
+                "description": ser["description"],
+                "instances_count": ser["instancesCount"],
+                "thumbnail_url": f"/api/orthanc/series/{ser['orthancId']}/thumbnail/",
+            })
 
         # 채널 순서 정렬: T1 -> T1C -> T2 -> FLAIR -> OTHER
         channel_order = {"T1": 0, "T1C": 1, "T2": 2, "FLAIR": 3, "DWI": 4, "SWI": 5, "OTHER": 6}
@@ -781,11 +988,7 @@ def get_instance_preview(request, instance_id: str):
     특정 인스턴스의 미리보기 이미지 반환 (PNG)
     """
     try:
-        preview_url = f"{ORTHANC}/instances/{instance_id}/preview"
-        r = requests.get(preview_url, timeout=10)
-        r.raise_for_status()
-
-        return HttpResponse(r.content, content_type="image/png")
+        return _preview_response(request, instance_id)
 
     except requests.exceptions.HTTPError as e:
         if e.response.status_code == 404:
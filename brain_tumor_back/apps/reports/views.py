@@ -18,6 +18,7 @@ from .serializers import (
 from apps.common.permission import IsDoctorOrAdmin
 from apps.ocs.models import OCS
 from apps.ai_inference.models import AIInference
+from apps.ai_inference.previews import preview_url, read_preview_manifest
 
 logger = logging.getLogger(__name__)
 
@@ -498,13 +499,21 @@ class UnifiedReportDashboardView(APIView):
 
         if ai.model_type == AIInference.ModelType.M1:
             # M1: MRI 채널 + 세그멘테이션 오버레이 썸네일
+            # 콜백 시 생성된 미리보기 manifest 로 내용 해시가 포함된 URL 구성 (브라우저 장기 캐시)
+            preview_manifest = read_preview_manifest(ai.job_id)
             thumbnail_data = {
                 'type': 'segmentation_overlay',
                 'job_id': ai.job_id,
-                'overlay_url': f'/api/ai/inferences/{ai.job_id}/thumbnail/',
+                'overlay_url': preview_url(ai.job_id, 'thumbnail', preview_manifest),
                 'icon': 'brain',
                 'color': '#ef4444',
             }
+            if preview_manifest:
+                thumbnail_data['previews'] = {
+                    name: preview_url(ai.job_id, name, preview_manifest)
+                    for name in preview_manifest.get('previews', {})
+                    if name != 'thumbnail'
+                }
 
             # mri_ocs가 있으면 원본 MRI 채널 정보도 포함
             if ai.mri_ocs:
@@ -76,4 +76,36 @@ CHANNEL_LAYERS = {
             "hosts" : [(REDIS_HOST, REDIS_PORT)],
         }
     }
-}
\ No newline at end of file
+}
+
+# 캐시 (Redis DB 1, 채널 레이어는 DB 0 사용)
+# - 대시보드 집계 등 짧은 TTL 캐시용
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": f"redis://{REDIS_HOST}:{REDIS_PORT}/1",
+        "KEY_PREFIX": "cdss",
+        "TIMEOUT": 300,
+    }
+}
+
+# OCS 상태 집계 캐시 TTL (초)
+OCS_STATS_CACHE_TTL = int(os.environ.get('OCS_STATS_CACHE_TTL', 15))
+
+# OCS WebSocket 알림 (커밋 후 백그라운드 전송) - apps/ocs/notifications.py
+OCS_NOTIFY_COALESCE_WINDOW = 0.05   # 연속 이벤트를 모으는 시간 (초)
+OCS_NOTIFY_MAX_BATCH = 100          # 그룹 메시지 1건에 묶는 최대 이벤트 수
+OCS_NOTIFY_QUEUE_SIZE = 10000       # 최대 대기 건수 (초과 시 유실 카운트)
+
+# 역할별 메뉴 closure 캐시 TTL (초) - 변경 시에는 버전 증가로 즉시 무효화
+MENU_CLOSURE_CACHE_TTL = int(os.environ.get('MENU_CLOSURE_CACHE_TTL', 3600))
+
+# 접속 상태(presence) - apps/accounts/services/presence_service.py
+PRESENCE_ONLINE_TTL = 30            # 온라인 키 TTL (초, heartbeat 로 연장)
+PRESENCE_FLUSH_INTERVAL = 60        # Redis last_seen → DB 반영 주기 (초)
+
+# 접근 로그(AccessLog) 버퍼링 저장 - apps/audit/buffer.py
+ACCESS_LOG_BUFFERED = os.environ.get('ACCESS_LOG_BUFFERED', 'True').lower() in ('true', '1', 'yes')
+ACCESS_LOG_BUFFER_SIZE = 10000      # 최대 대기 건수 (초과 시 유실 카운트)
+ACCESS_LOG_BATCH_SIZE = 500         # bulk_create 배치 크기
+ACCESS_LOG_FLUSH_INTERVAL = 1.0     # flush 주기 (초)
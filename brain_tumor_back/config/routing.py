@@ -4,6 +4,7 @@ from apps.accounts.consumers import UserPermissionConsumer, PresenceConsumer
 from apps.authorization.consumers import PermissionConsumer
 from apps.ocs.consumers import OCSConsumer
 from apps.ai_inference.consumers import AIInferenceConsumer
+from apps.orthancproxy.consumers import OrthancUploadConsumer
 
 websocket_urlpatterns = [
     path("ws/permissions/", PermissionConsumer.as_asgi()),
@@ -11,4 +12,5 @@ websocket_urlpatterns = [
     path("ws/presence/", PresenceConsumer.as_asgi()),
     path("ws/ocs/", OCSConsumer.as_asgi()),
     path("ws/ai-inference/", AIInferenceConsumer.as_asgi()),
+    path("ws/orthanc-upload/<str:upload_id>/", OrthancUploadConsumer.as_asgi()),
 ]
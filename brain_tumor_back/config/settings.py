@@ -186,6 +186,16 @@ CORS_ALLOW_HEADERS = list(default_headers) + [
 ]
 # 쿠키를 포함한 cross-origin 요청
 CORS_ALLOW_CREDENTIALS = True
+# 볼륨 슬라이스 API 응답 헤더 (프론트에서 읽어야 함)
+CORS_EXPOSE_HEADERS = [
+    "ETag",
+    "Content-Range",
+    "X-Volume-Dtype",
+    "X-Volume-Shape",
+    "X-Volume-Axis",
+    "X-Slice-Start",
+    "X-Slice-Stop",
+]
 
 
 # Swagger 설정
@@ -234,6 +244,8 @@ DEFAULT_FROM_EMAIL = f"BrainTumor System <{EMAIL_HOST_USER}>"
 
 # Docker로 띄운 Orthanc (docker-compose에서 8042:8042 라고 가정)
 ORTHANC_BASE_URL = os.getenv("ORTHANC_URL", "http://localhost:8042")
+# 로컬 DICOM 인덱스 사용 여부 (manage.py sync_orthanc_index 로 /changes 동기화)
+ORTHANC_INDEX_ENABLED = os.getenv("ORTHANC_INDEX_ENABLED", "true").lower() in ("1", "true", "yes")
 DATA_UPLOAD_MAX_NUMBER_FILES = None
 ORTHANC_DEBUG_LOG = True
 
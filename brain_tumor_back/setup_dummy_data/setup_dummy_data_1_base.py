@@ -616,6 +616,10 @@ def setup_audit_logs():
             created_count += 1
 
     print(f"[OK] 감사 로그 {created_count}건 생성 (전체: {AuditLog.objects.count()}건)")
+
+    # 일별 집계 카운터 재계산 (직접 생성한 로그는 증분 갱신을 거치지 않음)
+    from apps.audit.rollup import rebuild_all
+    print(f"  일별 집계 카운터 재계산: {rebuild_all()}행")
     return True
 
 
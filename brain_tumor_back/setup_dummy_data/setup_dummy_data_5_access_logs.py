@@ -220,6 +220,10 @@ def create_access_logs(target_count=200, reset=False, force=False):
     print(f"  - 성공: {success_count}건")
     print(f"  - 실패: {fail_count}건")
 
+    # 일별 집계 카운터 재계산 (직접 생성한 로그는 증분 갱신을 거치지 않음)
+    from apps.audit.rollup import rebuild_all
+    print(f"  일별 집계 카운터 재계산: {rebuild_all()}행")
+
     return True
 
 
@@ -4,6 +4,7 @@ import json
 import re
 from django.utils.deprecation import MiddlewareMixin
 from django.conf import settings
+from django.utils import timezone
 
 logger = logging.getLogger('access')
 
@@ -133,7 +134,8 @@ class AccessLogMiddleware(MiddlewareMixin):
         return response
 
     def _save_access_log(self, request, response, duration_ms):
-        """AccessLog DB에 저장"""
+        """AccessLog 기록 (버퍼에 넣고 백그라운드에서 일괄 저장)"""
+        from apps.audit.buffer import write_access_log
         from apps.audit.models import AccessLog
 
         path = request.get_full_path()
@@ -175,7 +177,7 @@ class AccessLogMiddleware(MiddlewareMixin):
         except:
             pass
 
-        AccessLog.objects.create(
+        write_access_log(AccessLog(
             user=request.user,
             user_role=request.user.role.name if request.user.role else None,
             request_method=request.method,
@@ -189,4 +191,5 @@ class AccessLogMiddleware(MiddlewareMixin):
             fail_reason=fail_reason,
             response_status=response.status_code,
             duration_ms=duration_ms,
-        )
+            created_at=timezone.now(),
+        ))
@@ -1,4 +1,5 @@
 // Type declarations for orthancApi.js
+import type { UploadProgress } from '../socket/uploadSocket';
 
 export interface UploadPatientParams {
   patientId: string;
@@ -8,6 +9,7 @@ export interface UploadPatientParams {
   ocsId?: number;
   files: File[];
   seriesPaths: string[];
+  onProgress?: (progress: UploadProgress) => void;
 }
 
 export interface UploadResult {
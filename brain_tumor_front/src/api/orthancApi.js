@@ -1,6 +1,7 @@
 // src/api/orthancApi.js
 import { http } from "./http";
 import { EP } from "./endpoints";
+import { connectUploadProgressSocket, waitForOpen } from "../socket/uploadSocket";
 
 export async function uploadPatientFolder({
   patientId,
@@ -10,6 +11,7 @@ export async function uploadPatientFolder({
   ocsId,
   files,
   seriesPaths,
+  onProgress,
 }) {
   const fd = new FormData();
 
@@ -22,12 +24,57 @@ export async function uploadPatientFolder({
   for (const f of files) fd.append("files", f);
   for (const sp of seriesPaths) fd.append("series_path", sp);
 
-  // ✅ 올바른 endpoint 키 사용
-  const res = await http.post(EP.orthanc.uploadPatient, fd, {
-    headers: { "Content-Type": "multipart/form-data" },
+  // 진행률/결과 구독 (서버가 같은 upload_id 그룹으로 진행률과 최종 결과 전송)
+  const uploadId = newUploadId();
+  fd.append("upload_id", uploadId);
+
+  let settle = null;
+  const completed = new Promise((resolve, reject) => {
+    settle = { resolve, reject };
+  });
+  completed.catch(() => {});  // 동기 업로드로 처리한 경우 미처리 rejection 방지
+  const ws = connectUploadProgressSocket(uploadId, (progress) => onProgress?.(progress), (result, error) => {
+    if (error) settle.reject(new Error(error));
+    else settle.resolve(result);
   });
+  ws.addEventListener("close", () => {
+    settle.reject(new Error("업로드 진행률 연결이 끊어졌습니다. 잠시 후 목록을 새로고침하세요."));
+  });
+  await waitForOpen(ws);
 
-  return res.data;
+  try {
+    // 소켓 연결 실패 시 결과를 받을 수 없으므로 기존 동기 업로드로 처리
+    if (ws.readyState !== WebSocket.OPEN) {
+      const res = await http.post(EP.orthanc.uploadPatient, fd, {
+        headers: { "Content-Type": "multipart/form-data" },
+      });
+      return res.data;
+    }
+
+    // async=1: 서버는 파일만 받아 두고 바로 202 응답, 결과는 completed 이벤트로 수신
+    fd.append("async", "1");
+    const res = await http.post(EP.orthanc.uploadPatient, fd, {
+      headers: { "Content-Type": "multipart/form-data" },
+    });
+    if (res.status !== 202) return res.data;
+    return await completed;
+  } finally {
+    ws.close();
+  }
+}
+
+// 업로드 ID (crypto.randomUUID 는 보안 컨텍스트(HTTPS/localhost)에서만 제공됨)
+function newUploadId() {
+  if (typeof crypto !== "undefined" && typeof crypto.randomUUID === "function") {
+    return crypto.randomUUID().replace(/-/g, "");
+  }
+  const bytes = new Uint8Array(16);
+  if (typeof crypto !== "undefined" && typeof crypto.getRandomValues === "function") {
+    crypto.getRandomValues(bytes);
+  } else {
+    for (let i = 0; i < bytes.length; i++) bytes[i] = Math.floor(Math.random() * 256);
+  }
+  return Array.from(bytes, (b) => b.toString(16).padStart(2, "0")).join("");
 }
 
 export async function getPatients() {
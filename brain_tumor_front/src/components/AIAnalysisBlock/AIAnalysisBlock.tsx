@@ -7,8 +7,9 @@
  */
 import { useState, useEffect, useRef, useMemo } from 'react'
 import { api } from '@/services/api'
+import { aiApi, type VolumeName } from '@/services/ai.api'
 import { useAIInference } from '@/context/AIInferenceContext'
-import SegMRIViewer, { type SegmentationData } from '@/components/ai/SegMRIViewer/SegMRIViewer'
+import SegMRIViewer, { createLazyVolume, type SegmentationData } from '@/components/ai/SegMRIViewer'
 import GeneVisualization, { type GeneExpressionData } from '@/components/ai/GeneVisualization/GeneVisualization'
 import MGResultViewer, { type MGResult } from '@/components/ai/MGResultViewer/MGResultViewer'
 import MMResultViewer, { type MMResult } from '@/components/ai/MMResultViewer/MMResultViewer'
@@ -264,107 +265,37 @@ function M1Panel({ isResearch: _isResearch }: PanelProps) {
     setSegData(null)
 
     try {
-      // enc=binary로 base64 인코딩된 데이터 요청 (더 효율적)
-      const res = await api.get(`/ai/inferences/${jobId}/segmentation/`, {
-        params: { enc: 'binary' }
+      // 볼륨 메타데이터만 먼저 받고, 슬라이스는 뷰어가 보여줄 때 구간 단위로 요청
+      // (채널은 뷰어에서 선택될 때 처음 요청됨)
+      const meta = await aiApi.getVolumeMeta(jobId)
+      const shape = meta.shape as [number, number, number]
+      console.log('[M1Panel] Volume meta loaded:', {
+        shape,
+        volumes: Object.keys(meta.volumes),
       })
 
-      const data = res.data
-      console.log('[M1Panel] Segmentation data loaded:', {
-        shape: data.shape,
-        encoding: data.encoding,
-        hasMri: !!data.mri,
-        hasPrediction: !!data.prediction
-      })
-
-      // base64 디코딩하여 3D 배열로 변환 (Django API는 모든 데이터를 float32로 인코딩)
-      const decodeBase64ToArray = (b64: string, shape: number[], roundToInt = false): number[][][] => {
-        const binary = atob(b64)
-        const bytes = new Uint8Array(binary.length)
-        for (let i = 0; i < binary.length; i++) {
-          bytes[i] = binary.charCodeAt(i)
-        }
-
-        // Django API는 모든 배열을 float32로 인코딩함
-        const flatArray = new Float32Array(bytes.buffer)
-
-        // 3D 배열로 변환 [X][Y][Z]
-        const [X, Y, Z] = shape
-        const result: number[][][] = []
-        for (let x = 0; x < X; x++) {
-          const plane: number[][] = []
-          for (let y = 0; y < Y; y++) {
-            const row: number[] = []
-            for (let z = 0; z < Z; z++) {
-              let val = flatArray[x * Y * Z + y * Z + z]
-              // 세그멘테이션 마스크는 정수 레이블(0,1,2,3)이므로 반올림
-              if (roundToInt) val = Math.round(val)
-              row.push(val)
-            }
-            plane.push(row)
-          }
-          result.push(plane)
-        }
-        return result
-      }
-
-      // MRI 데이터 (float32)
-      let mriVolume: number[][][] = []
-      if (data.mri && data.encoding === 'base64') {
-        mriVolume = decodeBase64ToArray(data.mri, data.shape, false)
-      } else if (data.mri && Array.isArray(data.mri)) {
-        mriVolume = data.mri
-      }
+      // 슬라이스가 도착하면 뷰어 다시 그리기 (볼륨 객체는 그대로 유지)
+      const refresh = () => setSegData((prev) => (prev && prev.shape === shape ? { ...prev } : prev))
+      const lazyVolume = (name: VolumeName) =>
+        meta.volumes[name] ? createLazyVolume(jobId, name, shape, refresh) : null
 
-      // Prediction 데이터 (float32로 인코딩된 정수 레이블 -> 정수로 변환)
-      let predVolume: number[][][] = []
-      if (data.prediction && data.encoding === 'base64') {
-        predVolume = decodeBase64ToArray(data.prediction, data.shape, true)
-      } else if (data.prediction && Array.isArray(data.prediction)) {
-        predVolume = data.prediction
+      const mri_channels: NonNullable<SegmentationData['mri_channels']> = {}
+      for (const ch of ['t1', 't1ce', 't2', 'flair'] as const) {
+        const volume = lazyVolume(ch)
+        if (volume) mri_channels[ch] = volume
       }
 
-      // 디버그: prediction 데이터의 고유 값 확인
-      const uniqueLabels = new Set<number>()
-      if (predVolume.length > 0) {
-        const midX = Math.floor(predVolume.length / 2)
-        for (let y = 0; y < predVolume[midX].length; y++) {
-          for (let z = 0; z < predVolume[midX][y].length; z++) {
-            uniqueLabels.add(predVolume[midX][y][z])
-          }
-        }
-      }
-      console.log('[M1Panel] Prediction unique labels in middle slice:', Array.from(uniqueLabels))
-
-      // SegmentationData 구성
       const segmentationData: SegmentationData = {
-        mri: mriVolume,
+        mri: mri_channels.t1ce || [],
         groundTruth: [], // GT는 없음 (추론 결과만)
-        prediction: predVolume,
-        shape: data.shape as [number, number, number],
+        prediction: lazyVolume('prediction') || [],
+        shape,
+        mri_channels,
       }
-
-      // MRI 채널 데이터가 있으면 추가 (MRI는 float 값이므로 roundToInt=false)
-      if (data.mri_channels) {
-        segmentationData.mri_channels = {}
-        for (const ch of ['t1', 't1ce', 't2', 'flair']) {
-          if (data.mri_channels[ch]) {
-            if (data.encoding === 'base64') {
-              segmentationData.mri_channels[ch as keyof typeof segmentationData.mri_channels] =
-                decodeBase64ToArray(data.mri_channels[ch], data.shape, false)
-            } else {
-              segmentationData.mri_channels[ch as keyof typeof segmentationData.mri_channels] =
-                data.mri_channels[ch]
-            }
-          }
-        }
-      }
-
       setSegData(segmentationData)
       console.log('[M1Panel] SegmentationData ready:', {
-        mriShape: segmentationData.mri.length,
-        predShape: segmentationData.prediction.length,
-        hasChannels: !!segmentationData.mri_channels
+        shape,
+        channels: Object.keys(mri_channels),
       })
     } catch (err: any) {
       console.error('[M1Panel] Failed to load segmentation:', err)
@@ -178,6 +178,12 @@ export default function UploadSection({ onUploaded, ocsInfo, existingStudy, onSt
         ocsId: ocsInfo?.ocsId,
         files: selectedFiles,
         seriesPaths,
+        onProgress: ({ phase, done, failed, total }) => {
+          const text = phase === "index"
+            ? "업로드 완료, 목록 반영 중..."
+            : `업로드 중... (${done + failed}/${total})`;
+          setUploadStatus({ type: "info", text });
+        },
       });
 
       setUploadStatus({ type: "success", text: "업로드 완료" });
@@ -11,6 +11,7 @@
  */
 
 import React, { useState, useEffect, useRef, useCallback, lazy, Suspense } from 'react'
+import { isLazyVolume, type LazyVolume } from './lazyVolume'
 import './SegMRIViewer.css'
 
 // 3D 뷰어 동적 로딩 (Three.js 번들 분리)
@@ -28,18 +29,21 @@ export interface SliceMapping {
 /** MRI 채널 타입 */
 export type MRIChannel = 't1' | 't1ce' | 't2' | 'flair'
 
+/** 볼륨 데이터: 전체 3D 배열 [X][Y][Z] 또는 슬라이스 지연 로딩 볼륨 */
+export type VolumeData = number[][][] | LazyVolume
+
 /** 세그멘테이션 데이터 */
 export interface SegmentationData {
-  mri: number[][][]           // 3D MRI 볼륨 [X][Y][Z] (기본: T1CE)
+  mri: VolumeData             // 3D MRI 볼륨 [X][Y][Z] (기본: T1CE)
   groundTruth: number[][][]   // 3D GT 레이블 볼륨
-  prediction: number[][][]    // 3D 예측 레이블 볼륨
+  prediction: VolumeData      // 3D 예측 레이블 볼륨
   shape: [number, number, number]  // [X, Y, Z] 크기
   sliceMapping?: SliceMapping      // 원본 슬라이스 매핑 (선택)
   mri_channels?: {            // 4채널 MRI 데이터 (선택)
-    t1?: number[][][]
-    t1ce?: number[][][]
-    t2?: number[][][]
-    flair?: number[][][]
+    t1?: VolumeData
+    t1ce?: VolumeData
+    t2?: VolumeData
+    flair?: VolumeData
   }
 }
 
@@ -159,6 +163,9 @@ const SegMRIViewer: React.FC<SegMRIViewerProps> = ({
   const [compareGT, setCompareGT] = useState<number[][][] | null>(null)
   const [compareDiceScores, setCompareDiceScores] = useState<DiceScores | undefined>()
 
+  // 3D 뷰어용 전체 볼륨 (지연 로딩 볼륨은 3D 레이아웃을 열 때만 전체 요청)
+  const [volume3D, setVolume3D] = useState<{ seg: number[][][]; mri?: number[][][] } | null>(null)
+
   // ============== Helper Functions ==============
 
   const isLabelVisible = (label: number): boolean => {
@@ -179,8 +186,9 @@ const SegMRIViewer: React.FC<SegMRIViewerProps> = ({
     return channels
   }, [data.mri_channels])
 
-  /** 3D 볼륨에서 2D 슬라이스 추출 */
-  const getSlice = useCallback((volume: number[][][], sliceIdx: number, mode: ViewMode): number[][] | null => {
+  /** 3D 볼륨에서 2D 슬라이스 추출 (지연 로딩 볼륨은 로드된 슬라이스, 없으면 요청 후 null) */
+  const getSlice = useCallback((volume: VolumeData, sliceIdx: number, mode: ViewMode): number[][] | null => {
+    if (isLazyVolume(volume)) return volume.getSlice(mode, sliceIdx)
     if (!volume || volume.length === 0) return null
 
     const [X, Y, Z] = [volume.length, volume[0]?.length || 0, volume[0]?.[0]?.length || 0]
@@ -299,7 +307,7 @@ const SegMRIViewer: React.FC<SegMRIViewerProps> = ({
   }, [isPlaying, getMaxSlices])
 
   /** 특정 채널의 MRI 볼륨 가져오기 */
-  const getMriVolumeByChannel = useCallback((channel: MRIChannel): number[][][] | null => {
+  const getMriVolumeByChannel = useCallback((channel: MRIChannel): VolumeData | null => {
     if (data.mri_channels) {
       const channelData = data.mri_channels[channel]
       if (channelData) return channelData
@@ -483,6 +491,28 @@ const SegMRIViewer: React.FC<SegMRIViewerProps> = ({
     })
   }, [viewers, renderCanvas, viewerLayout])
 
+  /** 3D 레이아웃: 전체 prediction / 첫 번째 뷰어 채널 MRI 준비 */
+  useEffect(() => {
+    if (viewerLayout !== '3d') return
+    const mriVolume = getMriVolumeByChannel(viewers[0] || 't1ce')
+    if (!isLazyVolume(data.prediction) && !isLazyVolume(mriVolume)) {
+      setVolume3D({ seg: data.prediction, mri: (mriVolume as number[][][] | null) || undefined })
+      return
+    }
+    let cancelled = false
+    setVolume3D(null)
+    const toFull = (volume: VolumeData | null) =>
+      isLazyVolume(volume) ? volume.loadFull() : Promise.resolve(volume || undefined)
+    Promise.all([toFull(data.prediction), toFull(mriVolume)])
+      .then(([seg, mri]) => {
+        if (!cancelled && seg) setVolume3D({ seg, mri })
+      })
+      .catch((err) => console.error('[SegMRIViewer] 3D 볼륨 로드 실패:', err))
+    return () => {
+      cancelled = true
+    }
+  }, [viewerLayout, data.prediction, getMriVolumeByChannel, viewers])
+
   /** Orthogonal 뷰 렌더링 */
   useEffect(() => {
     if (viewerLayout !== 'orthogonal') return
@@ -871,19 +901,26 @@ const SegMRIViewer: React.FC<SegMRIViewerProps> = ({
                   <span>3D 뷰어 로딩 중...</span>
                 </div>
               }>
-                <Volume3DViewer
-                  segmentationVolume={data.prediction}
-                  mriVolume={getMriVolumeByChannel(viewers[0] || 't1ce') || undefined}
-                  shape={data.shape}
-                  width={Math.min(500, maxCanvasSize + 50)}
-                  height={Math.min(450, maxCanvasSize)}
-                  showLabels={{
-                    ncr: showNCR,
-                    ed: showED,
-                    et: showET,
-                  }}
-                  opacity={segOpacity}
-                />
+                {volume3D ? (
+                  <Volume3DViewer
+                    segmentationVolume={volume3D.seg}
+                    mriVolume={volume3D.mri}
+                    shape={data.shape}
+                    width={Math.min(500, maxCanvasSize + 50)}
+                    height={Math.min(450, maxCanvasSize)}
+                    showLabels={{
+                      ncr: showNCR,
+                      ed: showED,
+                      et: showET,
+                    }}
+                    opacity={segOpacity}
+                  />
+                ) : (
+                  <div className="volume-3d-viewer__loading">
+                    <div className="spinner"></div>
+                    <span>3D 볼륨 로딩 중...</span>
+                  </div>
+                )}
               </Suspense>
             </div>
           )}
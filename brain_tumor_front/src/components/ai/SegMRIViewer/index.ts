@@ -1,9 +1,11 @@
 export { default } from './SegMRIViewer'
 export {
   type SegmentationData,
+  type VolumeData,
   type DiceScores,
   type ViewMode,
   type DisplayMode,
   type SegMRIViewerProps,
   type CompareResult,
 } from './SegMRIViewer'
+export { createLazyVolume, isLazyVolume, type LazyVolume } from './lazyVolume'
@@ -0,0 +1,107 @@
+/**
+ * 슬라이스 단위 지연 로딩 볼륨 (M1 결과 바이너리 API)
+ * - 화면에 보이는 슬라이스가 속한 구간 (SLICE_CHUNK 장) 만 getVolumeSlices 로 요청
+ * - 받은 슬라이스는 뷰어 방향으로 변환해 캐시, 도착하면 onLoad 호출 (뷰어 다시 그리기)
+ * - 전체 볼륨은 3D 뷰어처럼 꼭 필요할 때만 loadFull()
+ */
+import { aiApi, volumeTo3D, type VolumeName } from '@/services/ai.api'
+
+type SliceAxis = 'axial' | 'sagittal' | 'coronal'
+
+/** 한 번에 요청하는 슬라이스 수 (스크롤 시 다음 구간을 이어서 요청) */
+const SLICE_CHUNK = 8
+
+/** [X, Y, Z] 중 슬라이스 축 */
+const AXIS_INDEX: Record<SliceAxis, number> = { sagittal: 0, coronal: 1, axial: 2 }
+
+export interface LazyVolume {
+  lazy: true
+  name: VolumeName
+  shape: [number, number, number]
+  /** 로드된 슬라이스 반환, 없으면 해당 구간 요청 후 null */
+  getSlice: (mode: SliceAxis, index: number) => number[][] | null
+  /** 전체 볼륨 [X][Y][Z] (한 번만 요청) */
+  loadFull: () => Promise<number[][][]>
+}
+
+export const isLazyVolume = (volume: unknown): volume is LazyVolume =>
+  !!volume && (volume as LazyVolume).lazy === true
+
+/**
+ * 서버 슬라이스 [a][b] (슬라이스 축 제외, 원래 축 순서) → 뷰어 표시 방향 [row][col]
+ * SegMRIViewer 의 getSlice 와 같은 방향 (axial: y 뒤집기, sagittal/coronal: z 뒤집기)
+ */
+const orientSlice = (
+  data: ArrayLike<number>,
+  offset: number,
+  a: number,
+  b: number,
+  mode: SliceAxis
+): number[][] => {
+  const rows: number[][] = new Array(b)
+  for (let r = 0; r < b; r++) {
+    const row: number[] = new Array(a)
+    for (let c = 0; c < a; c++) {
+      // axial: [X][Y] → (y, x) / sagittal: [Y][Z] → (z, y) / coronal: [X][Z] → (z, x)
+      const col = mode === 'sagittal' ? a - 1 - c : c
+      row[c] = data[offset + col * b + (b - 1 - r)] || 0
+    }
+    rows[r] = row
+  }
+  return rows
+}
+
+export function createLazyVolume(
+  jobId: string,
+  name: VolumeName,
+  shape: [number, number, number],
+  onLoad: () => void
+): LazyVolume {
+  const slices = new Map<string, number[][]>()  // `${mode}:${index}`
+  const pending = new Set<string>()              // `${mode}:${chunk}`
+  let full: Promise<number[][][]> | null = null
+
+  const fetchChunk = (mode: SliceAxis, chunk: number) => {
+    const key = `${mode}:${chunk}`
+    if (pending.has(key)) return
+    pending.add(key)
+
+    const start = chunk * SLICE_CHUNK
+    const stop = Math.min(start + SLICE_CHUNK, shape[AXIS_INDEX[mode]])
+    aiApi
+      .getVolumeSlices(jobId, name, mode, start, stop)
+      .then((volume) => {
+        const [n, a, b] = volume.shape
+        for (let i = 0; i < n; i++) {
+          slices.set(`${mode}:${start + i}`, orientSlice(volume.data, i * a * b, a, b, mode))
+        }
+        onLoad()
+      })
+      .catch((err) => {
+        console.error(`[LazyVolume] ${name} ${mode} ${start}-${stop} 로드 실패:`, err)
+        pending.delete(key)  // 다음 렌더링에서 다시 요청
+      })
+  }
+
+  return {
+    lazy: true,
+    name,
+    shape,
+    getSlice: (mode, index) => {
+      if (index < 0 || index >= shape[AXIS_INDEX[mode]]) return null
+      const slice = slices.get(`${mode}:${index}`)
+      if (slice) return slice
+      fetchChunk(mode, Math.floor(index / SLICE_CHUNK))
+      return null
+    },
+    loadFull: () => {
+      if (!full) {
+        full = aiApi.getVolume(jobId, name).then((volume) => volumeTo3D(volume.data, volume.shape))
+        full.catch(() => {
+          full = null
+        })
+      }
+      return full
+    },
+  }
+}
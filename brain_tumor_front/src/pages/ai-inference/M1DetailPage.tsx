@@ -208,13 +208,20 @@ export default function M1DetailPage() {
     if (!jobId) return null
 
     try {
-      const data = await aiApi.getSegmentationCompareData(jobId)
+      // GT 가 아직 수집 중이면 (202, processing) 잠시 후 다시 요청
+      let data = await aiApi.getSegmentationCompareData(jobId)
+      for (let retry = 0; data.orthanc_seg_status === 'processing' && retry < 30; retry++) {
+        await new Promise((resolve) => setTimeout(resolve, 2000))
+        data = await aiApi.getSegmentationCompareData(jobId)
+      }
 
       if (!data.has_ground_truth || data.orthanc_seg_status !== 'loaded') {
         alert(
           data.orthanc_seg_status === 'no_ocs'
             ? 'OCS 연결 정보가 없어 GT 비교를 할 수 없습니다.'
-            : 'Ground Truth SEG 데이터를 찾을 수 없습니다.'
+            : data.orthanc_seg_status === 'error'
+              ? `Ground Truth SEG 를 불러오지 못했습니다: ${data.orthanc_seg_error}`
+              : 'Ground Truth SEG 데이터를 찾을 수 없습니다.'
         )
         return null
       }
@@ -442,6 +442,91 @@ export const ocsApi = {
 };
 
 // AI Inference API
+// =============================================================================
+// M1 결과 볼륨 (바이너리 API: /ai/inferences/<job_id>/volumes/)
+// =============================================================================
+
+export type VolumeName = 'prediction' | 'ground_truth' | 't1' | 't1ce' | 't2' | 'flair';
+export type VolumeAxis = 'sagittal' | 'coronal' | 'axial';
+
+export interface VolumeMeta {
+  job_id: string;
+  shape: [number, number, number];
+  axes: Record<VolumeAxis, number>;
+  volumes: Partial<Record<VolumeName, { dtype: string; shape: number[]; nbytes: number }>>;
+  tumor_volumes: Record<string, number>;
+  gt_volumes: Record<string, number>;
+  has_ground_truth: boolean;
+  version: string;
+}
+
+export interface VolumeSlices {
+  data: Float32Array | Uint8Array;
+  shape: number[];  // 슬라이스 요청: [n, a, b] (슬라이스 축이 첫 번째)
+  dtype: string;
+}
+
+// IEEE 754 half → float32 (MRI 채널은 float16으로 저장됨)
+const float16ToFloat32 = (src: Uint16Array): Float32Array => {
+  const out = new Float32Array(src.length);
+  for (let i = 0; i < src.length; i++) {
+    const h = src[i];
+    const sign = h & 0x8000 ? -1 : 1;
+    const exp = (h >> 10) & 0x1f;
+    const frac = h & 0x03ff;
+    if (exp === 0) {
+      out[i] = sign * frac * 2 ** -24;
+    } else if (exp === 0x1f) {
+      out[i] = frac ? NaN : sign * Infinity;
+    } else {
+      out[i] = sign * (1 + frac / 1024) * 2 ** (exp - 15);
+    }
+  }
+  return out;
+};
+
+// ArrayBuffer → TypedArray (X-Volume-Dtype 기준)
+export const decodeVolumeBuffer = (buffer: ArrayBuffer, dtype: string): Float32Array | Uint8Array => {
+  switch (dtype) {
+    case 'uint8':
+      return new Uint8Array(buffer);
+    case 'float16':
+      return float16ToFloat32(new Uint16Array(buffer));
+    case 'float32':
+      return new Float32Array(buffer);
+    case 'float64':
+      return Float32Array.from(new Float64Array(buffer));
+    case 'int16':
+      return Float32Array.from(new Int16Array(buffer));
+    default:
+      throw new Error(`지원하지 않는 볼륨 dtype: ${dtype}`);
+  }
+};
+
+// flat [X*Y*Z] → number[][][] [X][Y][Z] (SegMRIViewer 입력 형식)
+export const volumeTo3D = (flat: ArrayLike<number>, shape: number[]): number[][][] => {
+  const [X, Y, Z] = shape;
+  const result: number[][][] = new Array(X);
+  for (let x = 0; x < X; x++) {
+    const plane: number[][] = new Array(Y);
+    for (let y = 0; y < Y; y++) {
+      const offset = (x * Y + y) * Z;
+      plane[y] = Array.from({ length: Z }, (_, z) => flat[offset + z]);
+    }
+    result[x] = plane;
+  }
+  return result;
+};
+
+const parseVolumeResponse = (response: { data: ArrayBuffer; headers: any }): VolumeSlices => {
+  const dtype = response.headers['x-volume-dtype'] || 'float32';
+  const shape = String(response.headers['x-volume-shape'] || '')
+    .split(',')
+    .filter(Boolean)
+    .map(Number);
+  return { data: decodeVolumeBuffer(response.data, dtype), shape, dtype };
+};
+
 export const aiApi = {
   // M1 추론 요청
   requestM1Inference: async (ocsId: number, mode: 'manual' | 'auto' = 'manual') => {
@@ -574,6 +659,35 @@ export const aiApi = {
     return data;
   },
 
+  // 결과 볼륨 메타데이터 (shape, dtype, 종양 볼륨)
+  getVolumeMeta: async (jobId: string): Promise<VolumeMeta> => {
+    const response = await api.get(`/ai/inferences/${jobId}/volumes/`);
+    return response.data;
+  },
+
+  // 전체 볼륨 (원래 dtype 바이너리, [X, Y, Z])
+  getVolume: async (jobId: string, name: VolumeName): Promise<VolumeSlices> => {
+    const response = await api.get(`/ai/inferences/${jobId}/volumes/${name}/`, {
+      responseType: 'arraybuffer',
+    });
+    return parseVolumeResponse(response);
+  },
+
+  // 슬라이스 범위 [start, stop) (슬라이스 축이 첫 번째인 [n, a, b])
+  getVolumeSlices: async (
+    jobId: string,
+    name: VolumeName,
+    axis: VolumeAxis,
+    start: number,
+    stop: number = start + 1
+  ): Promise<VolumeSlices> => {
+    const response = await api.get(`/ai/inferences/${jobId}/volumes/${name}/`, {
+      params: { axis, start, stop },
+      responseType: 'arraybuffer',
+    });
+    return parseVolumeResponse(response);
+  },
+
   // 추론 결과 삭제 (job_id로)
   deleteInference: async (jobId: string) => {
     const response = await api.delete(`/ai/inferences/${jobId}/`);
@@ -672,7 +786,8 @@ export interface SegmentationCompareData {
 
   // Ground Truth 데이터
   has_ground_truth: boolean;
-  orthanc_seg_status: 'loaded' | 'not_found' | 'no_ocs';
+  orthanc_seg_status: 'loaded' | 'not_found' | 'no_ocs' | 'processing' | 'error';
+  orthanc_seg_error?: string | null;
   ground_truth: number[][][] | null;
   ground_truth_shape?: [number, number, number];
   gt_volumes: {
@@ -44,6 +44,7 @@ export interface ReportThumbnail {
   channels?: ChannelThumbnail[];
   // 세그멘테이션 오버레이 관련 (M1 추론)
   overlay_url?: string;
+  previews?: Partial<Record<'axial' | 'coronal' | 'sagittal', string>>;  // 종양 key slice 미리보기
 }
 
 export interface UnifiedReportResponse {
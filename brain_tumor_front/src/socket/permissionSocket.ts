@@ -1,7 +1,10 @@
 // WebSocket 연결 - 권한 변경 이벤트 수신
 export function connectPermissionSocket(onChanged: () => void) {
   const wsBaseUrl = import.meta.env.VITE_WS_URL || 'ws://localhost:8000/ws';
-  const ws = new WebSocket(`${wsBaseUrl}/permissions/`);
+  // 토큰이 있으면 역할 그룹에 가입 → 역할 메뉴 변경 시 알림 수신
+  const token = localStorage.getItem('accessToken');
+  const query = token ? `?token=${token}` : '';
+  const ws = new WebSocket(`${wsBaseUrl}/permissions/${query}`);
 
   ws.onmessage = (e) => {
     const data = JSON.parse(e.data);
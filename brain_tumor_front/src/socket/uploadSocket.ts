@@ -0,0 +1,42 @@
+// WebSocket 연결 - DICOM 업로드 진행률 수신 (ws/orthanc-upload/<uploadId>/)
+export interface UploadProgress {
+  phase: 'upload' | 'index';
+  done: number;
+  failed: number;
+  total: number;
+}
+
+export function connectUploadProgressSocket(
+  uploadId: string,
+  onProgress: (progress: UploadProgress) => void,
+  onCompleted?: (result: unknown, error: string | null) => void,
+) {
+  const wsBaseUrl = import.meta.env.VITE_WS_URL || 'ws://localhost:8000/ws';
+  const token = localStorage.getItem('accessToken');
+  const ws = new WebSocket(`${wsBaseUrl}/orthanc-upload/${uploadId}/?token=${token}`);
+
+  ws.onmessage = (e) => {
+    const data = JSON.parse(e.data);
+    if (data.type === 'ORTHANC_UPLOAD_PROGRESS') {
+      onProgress({ phase: data.phase, done: data.done, failed: data.failed, total: data.total });
+    } else if (data.type === 'ORTHANC_UPLOAD_COMPLETED') {
+      onCompleted?.(data.result, data.error);
+    }
+  };
+
+  return ws;
+}
+
+// 업로드 요청 전에 구독이 끝나도록 연결 대기 (실패해도 업로드는 진행)
+export function waitForOpen(ws: WebSocket, timeoutMs = 1500): Promise<void> {
+  return new Promise((resolve) => {
+    if (ws.readyState === WebSocket.OPEN) return resolve();
+    const timer = setTimeout(resolve, timeoutMs);
+    const done = () => {
+      clearTimeout(timer);
+      resolve();
+    };
+    ws.addEventListener('open', done, { once: true });
+    ws.addEventListener('error', done, { once: true });
+  });
+}
@@ -2,13 +2,22 @@
 Celery Application Configuration
 """
 from celery import Celery
+from celery.signals import celeryd_after_setup, worker_process_init
+from kombu.common import Broadcast
 from config import settings
+from utils.callback_outbox import host_queue_name
+
+# beat → 모든 워커 (각 호스트의 spool outbox replay)
+OUTBOX_REPLAY_QUEUE = Broadcast('callback_outbox_replay')
+
+# 이 워커가 구독하는 큐 (메인 프로세스에서 기록 → prefork 자식이 상속, MODEL_PRELOAD=auto 용)
+_worker_queues = []
 
 celery_app = Celery(
     'modai_tasks',
     broker=settings.CELERY_BROKER_URL or settings.REDIS_URL,
     backend=settings.CELERY_RESULT_BACKEND or settings.REDIS_URL,
-    include=['tasks.m1_tasks', 'tasks.mg_tasks', 'tasks.mm_tasks']
+    include=['tasks.m1_tasks', 'tasks.mg_tasks', 'tasks.mm_tasks', 'tasks.callback_tasks']
 )
 
 celery_app.conf.update(
@@ -23,7 +32,8 @@ celery_app.conf.update(
 
     # Worker settings
     worker_prefetch_multiplier=1,  # 메모리 최적화
-    worker_max_tasks_per_child=5,  # 메모리 누수 방지 (GPU 모델 로드 때문에 낮게 설정)
+    # 메모리 누수 방지 (재시작 시 모델 재로드 비용 발생, 0이면 재시작 안 함)
+    worker_max_tasks_per_child=settings.CELERY_MAX_TASKS_PER_CHILD or None,
     result_expires=3600,  # 1시간 후 결과 만료
 
     # Task settings
@@ -43,10 +53,40 @@ celery_app.conf.update(
         'tasks.m1_tasks.run_m1_inference': {'queue': 'm1_queue'},
         'tasks.mg_tasks.run_mg_inference': {'queue': 'mg_queue'},
         'tasks.mm_tasks.*': {'queue': 'mm_queue'},
+        'tasks.callback_tasks.replay_outbox': {'queue': OUTBOX_REPLAY_QUEUE},
+    },
+
+    # Beat - 콜백 outbox 주기 replay (celery -A celery_app beat)
+    beat_schedule={
+        'replay-callback-outbox': {
+            'task': 'tasks.callback_tasks.replay_outbox',
+            'schedule': settings.CALLBACK_REPLAY_INTERVAL_SECONDS,
+        },
     },
 )
 
 
+@celeryd_after_setup.connect
+def setup_worker_queues(sender, instance, **kwargs):
+    """
+    워커 큐 설정 (prefork 전 메인 프로세스)
+
+    - -Q 로 지정한 큐 기록 (MODEL_PRELOAD=auto)
+    - -Q 와 관계없이 이 호스트의 콜백 재시도 큐와 outbox replay broadcast 큐 구독
+    """
+    queues = instance.app.amqp.queues
+    _worker_queues[:] = list(queues.consume_from or queues)
+    queues.select_add(host_queue_name())
+    queues.select_add(OUTBOX_REPLAY_QUEUE)
+
+
+@worker_process_init.connect
+def init_model_registry(**kwargs):
+    """워커 프로세스 시작 시 이 워커 큐의 모델을 한 번만 로드 (MODEL_PRELOAD)"""
+    from services.model_registry import preload_models
+    preload_models(queues=_worker_queues)
+
+
 # Celery 실행 명령:
 # Windows: celery -A celery_app worker --loglevel=info --pool=solo
 # Linux/Mac: celery -A celery_app worker --loglevel=info
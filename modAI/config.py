@@ -3,6 +3,7 @@ modAI Configuration
 """
 import os
 import logging
+import socket
 from pathlib import Path
 from pydantic_settings import BaseSettings
 
@@ -44,6 +45,13 @@ class Settings(BaseSettings):
     ORTHANC_USER: str = "orthanc"
     ORTHANC_PASSWORD: str = "orthanc"
 
+    # Orthanc HTTP 연결 (프로세스 단위 connection pool)
+    ORTHANC_HTTP2: bool = True  # h2 패키지가 없으면 HTTP/1.1 로 동작
+    ORTHANC_MAX_CONNECTIONS: int = 16  # pool 최대 연결 수
+    ORTHANC_MAX_CONCURRENCY: int = 8  # 동시 요청 수 (Archive/Instance 다운로드)
+    ORTHANC_TIMEOUT_SECONDS: float = 120.0
+    ORTHANC_SPOOL_MAX_MB: int = 32  # Archive ZIP 을 메모리에 두는 최대 크기 (초과 시 임시 파일)
+
     # Redis (for Celery)
     REDIS_URL: str = "redis://localhost:6379/0"
     # Celery Broker/Backend (Docker에서 별도 DB 번호 사용 가능)
@@ -71,6 +79,29 @@ class Settings(BaseSettings):
         str(BASE_DIR.parent / "CDSS_STORAGE" / "AI")
     ))
 
+    # Callback 결과 파일 spool 경로 (Django로 multipart 전송 전 임시 저장)
+    CALLBACK_SPOOL_DIR: Path = Path(os.environ.get(
+        "CALLBACK_SPOOL_DIR",
+        str(Path(os.environ.get("STORAGE_DIR", str(BASE_DIR.parent / "CDSS_STORAGE" / "AI"))) / "_callback_spool")
+    ))
+
+    # 전처리 결과 캐시 (study 재추론 시 fetch/decode/resample 생략)
+    PREPROCESS_CACHE_DIR: Path = Path(os.environ.get(
+        "PREPROCESS_CACHE_DIR",
+        str(Path(os.environ.get("STORAGE_DIR", str(BASE_DIR.parent / "CDSS_STORAGE" / "AI"))) / "_preprocess_cache")
+    ))
+    PREPROCESS_CACHE_ENABLED: bool = True
+    PREPROCESS_CACHE_MAX_MB: int = 2048  # 초과 시 LRU eviction (entry 1개 ≈ 32MB)
+
+    # Callback outbox 재시도 (exponential backoff)
+    CALLBACK_MAX_ATTEMPTS: int = 10  # 초과 시 dead 상태로 보존 (replay CLI로 수동 재전송)
+    CALLBACK_BACKOFF_BASE_SECONDS: float = 10.0
+    CALLBACK_BACKOFF_MAX_SECONDS: float = 1800.0
+    # 콜백 재시도는 spool 이 있는 호스트의 큐 (callback.<CALLBACK_HOST_ID>) 로만 보냄
+    # (컨테이너 재생성 시 hostname 이 바뀌면 env 로 고정)
+    CALLBACK_HOST_ID: str = socket.gethostname()
+    CALLBACK_REPLAY_INTERVAL_SECONDS: float = 60.0  # beat 주기 outbox replay (모든 워커에 broadcast)
+
     # Model weights
     M1_WEIGHTS_PATH: Path = Path(os.environ.get(
         "M1_WEIGHTS_PATH",
@@ -84,6 +115,27 @@ class Settings(BaseSettings):
     # Device
     DEVICE: str = "auto"  # auto, cuda, cpu
 
+    # Model Registry (Celery worker 프로세스 단위 모델 캐시)
+    # worker_process_init 시 미리 로드할 모델
+    # auto = 워커가 구독하는 큐 (-Q m1_queue 등) 의 모델만, 빈 값 = 전부 lazy 로드, "m1,mg" = 지정 모델
+    MODEL_PRELOAD: str = "auto"
+    MODEL_MMAP_LOAD: bool = False  # checkpoint를 torch.load(mmap=True)로 로드
+    MODEL_REGISTRY_MAX_MODELS: int = 0  # 0 = 무제한, N = LRU로 최근 N개 모델만 유지
+    CELERY_MAX_TASKS_PER_CHILD: int = 5  # 0 = 워커 재시작 없음 (모델 재로드 방지)
+
+    # DICOM 디코딩 (헤더 정렬 후 슬라이스/모달리티 병렬 디코딩)
+    DICOM_DECODE_WORKERS: int = 0  # 0 = CPU 코어 수 기반 자동 (최대 8)
+
+    # M1 전처리 리샘플링 (1mm 리샘플 + crop + resize 를 grid_sample 1회로 수행)
+    M1_FUSED_RESAMPLE: bool = True  # False 이면 기존 scipy zoom + Resize 2단계 경로
+    M1_PREPROCESS_DEVICE: str = "auto"  # auto, cuda, cpu
+
+    # M1 Sliding-window segmentation (메모리 제한 워커용)
+    M1_SLIDING_WINDOW: bool = False  # True 이면 ROI 패치 단위로 세그멘테이션 (peak 메모리 제한)
+    M1_SW_ROI_SIZE: int = 96  # ROI 한 변 크기 (SwinUNETR 제약: 32의 배수)
+    M1_SW_OVERLAP: float = 0.5  # 인접 ROI 간 overlap 비율 (0 ~ 1)
+    M1_SW_BATCH_SIZE: int = 1  # 한 번에 추론할 ROI 패치 수
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -94,3 +146,4 @@ settings = Settings()
 
 # Ensure directories exist
 settings.STORAGE_DIR.mkdir(parents=True, exist_ok=True)
+settings.CALLBACK_SPOOL_DIR.mkdir(parents=True, exist_ok=True)
@@ -26,6 +26,7 @@ import sys
 import io
 import argparse
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Tuple, Union, List, Dict
 
@@ -104,6 +105,12 @@ except ImportError:
 TARGET_SIZE = (128, 128, 128)
 TARGET_SPACING = (1.0, 1.0, 1.0)
 
+# 전처리 로직 버전 - 출력이 달라지는 변경 시 올려야 전처리 캐시가 무효화됨
+PREPROCESS_VERSION = "dicom-2"
+
+# DICOM 디코딩 스레드 수 (0 = CPU 코어 수 기반 자동, 최대 8)
+DEFAULT_DECODE_WORKERS = min(8, os.cpu_count() or 1)
+
 
 # ============================================================
 # Preprocessing Functions
@@ -257,49 +264,165 @@ def load_dicom_series(dicom_files: List[str]) -> Tuple[np.ndarray, Tuple[float,
     return volume, spacing
 
 
-def load_dicom_from_bytes(dicom_bytes_list: List[bytes]) -> Tuple[np.ndarray, Tuple[float, float, float]]:
-    """
-    DICOM 바이트 데이터를 3D numpy 배열로 변환 (Orthanc에서 직접 받을 때 사용)
+def _read_dicom_header(dcm_bytes: bytes):
+    """픽셀 데이터 없이 헤더만 파싱 (정렬/shape 결정용)"""
+    return pydicom.dcmread(io.BytesIO(dcm_bytes), stop_before_pixels=True)
 
-    Args:
-        dicom_bytes_list: DICOM 바이트 데이터 리스트
 
-    Returns:
-        volume: 3D numpy array (H, W, D)
-        spacing: (row_spacing, col_spacing, slice_spacing)
+def _slice_position(ds) -> Optional[float]:
     """
-    if not PYDICOM_AVAILABLE:
-        raise ImportError("pydicom is required for DICOM processing")
+    슬라이스 법선 방향으로 투영한 ImagePositionPatient (mm)
 
-    # Load all slices from bytes
-    slices = []
-    for dcm_bytes in dicom_bytes_list:
-        ds = pydicom.dcmread(io.BytesIO(dcm_bytes))
-        slices.append(ds)
+    ImageOrientationPatient/ImagePositionPatient 가 없으면 SliceLocation 사용
+    """
+    iop = getattr(ds, 'ImageOrientationPatient', None)
+    ipp = getattr(ds, 'ImagePositionPatient', None)
+    if iop is not None and ipp is not None and len(iop) == 6 and len(ipp) == 3:
+        normal = np.cross(
+            np.asarray(iop[:3], dtype=np.float64),
+            np.asarray(iop[3:], dtype=np.float64),
+        )
+        return float(np.dot(normal, np.asarray(ipp, dtype=np.float64)))
+    if hasattr(ds, 'SliceLocation'):
+        return float(ds.SliceLocation)
+    return None
 
-    # Sort by SliceLocation or InstanceNumber
-    try:
-        slices.sort(key=lambda x: float(x.SliceLocation))
-    except AttributeError:
-        slices.sort(key=lambda x: int(x.InstanceNumber))
 
-    # Extract pixel arrays
-    pixel_arrays = [s.pixel_array.astype(np.float32) for s in slices]
-    volume = np.stack(pixel_arrays, axis=-1)  # (H, W, D)
+def _sort_dicom_headers(headers: list) -> Tuple[List[int], Tuple[float, float, float]]:
+    """
+    헤더 목록을 슬라이스 위치 순으로 정렬
 
-    # Get spacing
-    ds = slices[0]
+    Returns:
+        order: 정렬된 슬라이스 인덱스 (원래 리스트 기준)
+        spacing: (row_spacing, col_spacing, slice_spacing)
+    """
+    positions = [_slice_position(ds) for ds in headers]
+    if all(p is not None for p in positions):
+        order = sorted(range(len(headers)), key=lambda i: positions[i])
+    else:
+        positions = None
+        order = sorted(range(len(headers)), key=lambda i: int(getattr(headers[i], 'InstanceNumber', 0)))
+
+    ds = headers[order[0]]
     pixel_spacing = ds.PixelSpacing if hasattr(ds, 'PixelSpacing') else [1.0, 1.0]
     slice_thickness = ds.SliceThickness if hasattr(ds, 'SliceThickness') else 1.0
 
-    if len(slices) > 1 and hasattr(slices[0], 'SliceLocation'):
-        slice_spacing = abs(float(slices[1].SliceLocation) - float(slices[0].SliceLocation))
+    if positions is not None and len(order) > 1:
+        slice_spacing = abs(positions[order[1]] - positions[order[0]])
     else:
         slice_spacing = float(slice_thickness)
 
     spacing = (float(pixel_spacing[0]), float(pixel_spacing[1]), slice_spacing)
+    return order, spacing
 
-    return volume, spacing
+
+def _is_single_frame(headers: list) -> bool:
+    """모든 슬라이스가 같은 크기의 단일 프레임인지 확인 (preallocated 디코딩 가능 여부)"""
+    first = headers[0]
+    shape = (int(first.Rows), int(first.Columns))
+    for ds in headers:
+        if int(getattr(ds, 'NumberOfFrames', 1) or 1) > 1:
+            return False
+        if (int(ds.Rows), int(ds.Columns)) != shape:
+            return False
+    return True
+
+
+def _decode_slice_into(volume: np.ndarray, z: int, dcm_bytes: bytes) -> None:
+    """슬라이스 1장 디코딩 후 preallocated 볼륨의 z 위치에 직접 기록"""
+    ds = pydicom.dcmread(io.BytesIO(dcm_bytes))
+    volume[:, :, z] = ds.pixel_array
+
+
+def _decode_pixel_array(dcm_bytes: bytes) -> np.ndarray:
+    """슬라이스 1장 디코딩 (multi-frame 등 preallocation 불가 시)"""
+    return pydicom.dcmread(io.BytesIO(dcm_bytes)).pixel_array.astype(np.float32)
+
+
+def load_dicom_modalities_from_bytes(
+    modality_bytes: Dict[str, List[bytes]],
+    max_workers: int = 0,
+    timer: Optional[Timer] = None,
+) -> Dict[str, Tuple[np.ndarray, Tuple[float, float, float]]]:
+    """
+    여러 DICOM 시리즈를 하나의 스레드 풀에서 병렬 디코딩
+
+    1. 헤더 pass: stop_before_pixels 로 전체 슬라이스 헤더만 파싱 → ImagePositionPatient 순 정렬
+    2. 디코딩 pass: 시리즈별 (H, W, D) float32 볼륨을 미리 할당하고
+       슬라이스/모달리티 구분 없이 풀에 제출, 디코딩 결과를 해당 z 위치에 바로 기록
+
+    Args:
+        modality_bytes: {'T1': [bytes], 'T1CE': [bytes], ...}
+        max_workers: 디코딩 스레드 수 (0 = DEFAULT_DECODE_WORKERS)
+        timer: 지정 시 헤더 pass / 모달리티별 디코딩 완료 시점을 step 으로 기록
+
+    Returns:
+        {modality: (volume (H, W, D), spacing)}
+    """
+    if not PYDICOM_AVAILABLE:
+        raise ImportError("pydicom is required for DICOM processing")
+
+    workers = max_workers or DEFAULT_DECODE_WORKERS
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # 1. Header pass (모든 모달리티 슬라이스를 한 번에 제출)
+        header_futures = {
+            name: [pool.submit(_read_dicom_header, b) for b in bytes_list]
+            for name, bytes_list in modality_bytes.items()
+        }
+        headers = {name: [f.result() for f in futures] for name, futures in header_futures.items()}
+        if timer is not None:
+            total_slices = sum(len(h) for h in headers.values())
+            timer.step(f"Read DICOM headers ({total_slices} slices, {workers} workers)")
+
+        # 2. Decode pass (preallocated 볼륨에 직접 기록)
+        plans = {}
+        for name, bytes_list in modality_bytes.items():
+            order, spacing = _sort_dicom_headers(headers[name])
+            if _is_single_frame(headers[name]):
+                first = headers[name][order[0]]
+                volume = np.empty((int(first.Rows), int(first.Columns), len(order)), dtype=np.float32)
+                futures = [
+                    pool.submit(_decode_slice_into, volume, z, bytes_list[i])
+                    for z, i in enumerate(order)
+                ]
+            else:
+                volume = None
+                futures = [pool.submit(_decode_pixel_array, bytes_list[i]) for i in order]
+            plans[name] = (volume, spacing, futures)
+
+        # 제출 순서대로 완료 대기 → 모달리티별 누적 디코딩 시간 기록
+        results = {}
+        for name, (volume, spacing, futures) in plans.items():
+            arrays = [f.result() for f in futures]
+            if volume is None:
+                volume = np.stack(arrays, axis=-1)
+            results[name] = (volume, spacing)
+            if timer is not None:
+                timer.step(f"Decode {name} ({len(futures)} slices)")
+
+    return results
+
+
+def load_dicom_from_bytes(
+    dicom_bytes_list: List[bytes],
+    max_workers: int = 0,
+) -> Tuple[np.ndarray, Tuple[float, float, float]]:
+    """
+    DICOM 바이트 데이터를 3D numpy 배열로 변환 (Orthanc에서 직접 받을 때 사용)
+
+    Args:
+        dicom_bytes_list: DICOM 바이트 데이터 리스트
+        max_workers: 디코딩 스레드 수 (0 = DEFAULT_DECODE_WORKERS)
+
+    Returns:
+        volume: 3D numpy array (H, W, D)
+        spacing: (row_spacing, col_spacing, slice_spacing)
+    """
+    results = load_dicom_modalities_from_bytes(
+        {'series': dicom_bytes_list}, max_workers=max_workers
+    )
+    return results['series']
 
 
 def resample_volume(
@@ -332,6 +455,185 @@ def resample_volume(
     return resampled
 
 
+def resampled_shape(
+    shape: Tuple[int, int, int],
+    current_spacing: Tuple[float, float, float],
+    target_spacing: Tuple[float, float, float] = (1.0, 1.0, 1.0),
+) -> Tuple[int, int, int]:
+    """resample_volume 출력 shape (scipy.ndimage.zoom 과 동일한 반올림)"""
+    return tuple(
+        int(round(n * (cur / tgt)))
+        for n, cur, tgt in zip(shape, current_spacing, target_spacing)
+    )
+
+
+def two_stage_resample_crop_resize(
+    volumes: List[np.ndarray],
+    spacings: List[Tuple[float, float, float]],
+    target_spacing: Tuple[float, float, float] = TARGET_SPACING,
+    target_size: Tuple[int, int, int] = TARGET_SIZE,
+    timer: Optional[Timer] = None,
+) -> Tuple[torch.Tensor, Optional[Tuple], Tuple[int, int, int]]:
+    """
+    기존 2단계 경로: 모달리티별 zoom → RAS flip → bbox → crop & resize
+
+    모달리티 간 shape/spacing 이 다를 때 사용 (fused 경로 검증 기준이기도 함)
+    """
+    # Use first modality (T1) spacing as reference
+    spacing = spacings[0]
+
+    # Resample to 1mm isotropic if needed
+    if spacing != target_spacing:
+        volumes = [resample_volume(v, sp, target_spacing) for v, sp in zip(volumes, spacings)]
+        if timer is not None:
+            timer.step(f"Resample to 1mm isotropic (from {spacing})")
+    elif timer is not None:
+        timer.step("Spacing already 1mm (skip resample)")
+
+    # Apply RAS orientation (flip X and Y axes to match NIfTI preprocessing)
+    # Original NIfTI has affine with negative X, Y (LPS -> RAS requires flip)
+    # DICOM data needs same transformation for consistency
+    volumes = [np.flip(v, axis=(0, 1)).copy() for v in volumes]
+    if timer is not None:
+        timer.step("Apply RAS orientation (flip X, Y)")
+
+    # Stack to 4-channel tensor (C, H, W, D) - same as MONAI output format
+    # DICOM loads as (H, W, D), keep same order and add channel dim
+    image_4ch = torch.cat([torch.from_numpy(v).unsqueeze(0) for v in volumes], dim=0)
+    if timer is not None:
+        timer.step(f"Stack 4-channel tensor {tuple(image_4ch.shape)}")
+
+    # Get foreground bbox
+    bbox = get_foreground_bbox(image_4ch, margin=5)
+    if timer is not None:
+        timer.step(f"Calculate foreground bbox: {bbox}")
+
+    # Crop and resize
+    image_tensor = apply_crop_and_resize(image_4ch, bbox, target_size, mode='trilinear')
+    if timer is not None:
+        timer.step(f"Crop & resize to {target_size}")
+
+    return image_tensor, bbox, tuple(image_4ch.shape[1:])
+
+
+def _native_foreground_bbox(
+    native: torch.Tensor,
+    out_shape: Tuple[int, int, int],
+    margin: int = 5,
+) -> Optional[Tuple]:
+    """
+    원본 해상도에서 foreground 범위를 구한 뒤 1mm 리샘플 + RAS flip 좌표계 bbox 로 변환
+
+    get_foreground_bbox 와 같은 threshold (합산 강도 평균 × 0.1) 사용,
+    리샘플 좌표 변환 시 floor/ceil 로 1 voxel 이내 여유를 둠
+    """
+    combined = native.sum(dim=0)
+    threshold = combined.mean() * 0.1
+    fg_mask = combined > threshold
+    if not bool(fg_mask.any()):
+        return None
+
+    bbox = []
+    for axis in range(3):
+        other_dims = tuple(d for d in range(3) if d != axis)
+        idx = torch.nonzero(fg_mask.any(dim=other_dims[1]).any(dim=other_dims[0])).flatten()
+        lo, hi = idx.min().item(), idx.max().item()
+
+        in_len = native.shape[axis + 1]
+        out_len = out_shape[axis]
+        # RAS flip (H, W 축)
+        if axis < 2:
+            lo, hi = in_len - 1 - hi, in_len - 1 - lo
+
+        # native 좌표 → 리샘플 좌표 (zoom: native = out * (in - 1) / (out - 1))
+        if in_len > 1 and out_len > 1:
+            ratio = (out_len - 1) / (in_len - 1)
+            lo, hi = int(np.floor(lo * ratio)), int(np.ceil(hi * ratio))
+        else:
+            lo, hi = 0, out_len - 1
+
+        bbox.extend([max(0, lo - margin), min(out_len - 1, hi + margin) + 1])
+
+    return tuple(bbox)
+
+
+def _axis_source_coords(
+    target_len: int,
+    crop_start: int,
+    crop_len: int,
+    resampled_len: int,
+    native_len: int,
+    flip: bool,
+    device: str,
+) -> torch.Tensor:
+    """
+    target 축 index → grid_sample 정규화 좌표 (align_corners=True 기준, native 볼륨)
+
+    Resize(trilinear, align_corners=False) → crop offset → RAS flip → zoom(order=1) 역변환을 합성
+    """
+    o = torch.arange(target_len, dtype=torch.float64, device=device)
+    # Resize: target → crop 좌표 (F.interpolate align_corners=False 와 동일한 clamp)
+    c = ((o + 0.5) * (crop_len / target_len) - 0.5).clamp(min=0, max=crop_len - 1)
+    r = c + crop_start
+    # zoom(order=1, grid_mode=False): 리샘플 → native 좌표
+    if resampled_len > 1 and native_len > 1:
+        n = r * (native_len - 1) / (resampled_len - 1)
+        g = 2.0 * n / (native_len - 1) - 1.0
+    else:
+        g = torch.zeros_like(r)
+    return -g if flip else g
+
+
+def fused_resample_crop_resize(
+    volumes: List[np.ndarray],
+    spacing: Tuple[float, float, float],
+    target_spacing: Tuple[float, float, float] = TARGET_SPACING,
+    target_size: Tuple[int, int, int] = TARGET_SIZE,
+    margin: int = 5,
+    device: str = 'cpu',
+) -> Tuple[torch.Tensor, Optional[Tuple], Tuple[int, int, int]]:
+    """
+    1mm 리샘플 → RAS flip → foreground crop → resize 를 하나의 grid_sample 로 수행
+
+    - 원본 해상도 볼륨에서 target_size 좌표를 직접 샘플링 (전체 해상도 보간 2회 → 1회)
+    - 4채널을 한 번에 처리, CPU 는 torch intra-op 스레드 사용, CUDA 사용 가능 시 GPU
+    - bbox / original_shape 는 two_stage_resample_crop_resize 와 같은 좌표계
+
+    Args:
+        volumes: 모달리티별 원본 볼륨 (H, W, D), 모두 같은 shape
+        spacing: 원본 spacing (모든 모달리티 공통)
+
+    Returns:
+        (image_tensor (C, *target_size) float32 CPU, bbox, original_shape)
+    """
+    native = torch.from_numpy(np.stack(volumes, axis=0).astype(np.float32, copy=False))
+    native_shape = tuple(native.shape[1:])
+    out_shape = resampled_shape(native_shape, spacing, target_spacing)
+
+    bbox = _native_foreground_bbox(native, out_shape, margin=margin)
+    crop = bbox if bbox is not None else (0, out_shape[0], 0, out_shape[1], 0, out_shape[2])
+
+    native = native.to(device)
+    axes = [
+        _axis_source_coords(
+            target_size[axis], crop[2 * axis], crop[2 * axis + 1] - crop[2 * axis],
+            out_shape[axis], native_shape[axis], flip=axis < 2, device=device,
+        )
+        for axis in range(3)
+    ]
+    gx, gy, gz = torch.meshgrid(*axes, indexing='ij')
+    # grid 마지막 차원은 (z, y, x) = (D, W, H) 순서
+    grid = torch.stack([gz, gy, gx], dim=-1).unsqueeze(0).to(torch.float32)
+
+    with torch.no_grad():
+        image = torch.nn.functional.grid_sample(
+            native.unsqueeze(0), grid,
+            mode='bilinear', padding_mode='border', align_corners=True,
+        )
+
+    return image.squeeze(0).cpu(), bbox, out_shape
+
+
 # ============================================================
 # Main Preprocessing Classes
 # ============================================================
@@ -343,14 +645,67 @@ class M1Preprocessor:
         self,
         target_size: Tuple[int, int, int] = TARGET_SIZE,
         target_spacing: Tuple[float, float, float] = TARGET_SPACING,
+        decode_workers: int = 0,
+        fused_resample: bool = True,
+        device: Optional[str] = None,
     ):
         self.target_size = target_size
         self.target_spacing = target_spacing
+        self.decode_workers = decode_workers
+        self.fused_resample = fused_resample
+        # fused 리샘플링 device (None/'auto' = CUDA 사용 가능 시 CUDA)
+        if device in (None, 'auto'):
+            device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        self.device = device
         self.use_monai = MONAI_AVAILABLE
 
         if not self.use_monai:
             print("Warning: Using basic preprocessing (MONAI not available)")
 
+    def _resample_crop_resize(
+        self,
+        volumes: List[np.ndarray],
+        spacings: List[Tuple[float, float, float]],
+        timer: Timer,
+    ) -> Tuple[torch.Tensor, Optional[Tuple], Tuple[int, int, int]]:
+        """
+        모달리티 볼륨 (H, W, D) 리스트 → (C, *target_size) 텐서
+
+        모든 모달리티의 shape/spacing 이 같으면 fused 경로 (보간 1회),
+        다르면 기존 2단계 경로 (모달리티별 zoom 후 crop/resize) 사용
+
+        Returns:
+            (image_tensor, bbox, original_shape) - bbox/original_shape 는 1mm 리샘플 + RAS flip 좌표계
+        """
+        same_grid = (
+            all(v.shape == volumes[0].shape for v in volumes)
+            and all(sp == spacings[0] for sp in spacings)
+        )
+
+        if self.fused_resample and same_grid:
+            image_tensor, bbox, original_shape = fused_resample_crop_resize(
+                volumes, spacings[0], self.target_spacing, self.target_size,
+                margin=5, device=self.device,
+            )
+            timer.step(
+                f"Fused resample/crop/resize {tuple(volumes[0].shape)} -> {self.target_size} "
+                f"(spacing {spacings[0]}, bbox {bbox}, {self.device})"
+            )
+            return image_tensor, bbox, original_shape
+
+        return two_stage_resample_crop_resize(
+            volumes, spacings, self.target_spacing, self.target_size, timer=timer
+        )
+
+    def cache_signature(self) -> str:
+        """전처리 캐시 키에 포함되는 전처리 설정 해시"""
+        import hashlib
+        signature = (
+            f"{PREPROCESS_VERSION}|{tuple(self.target_size)}|{tuple(self.target_spacing)}"
+            f"|{self.use_monai}|fused={self.fused_resample}"
+        )
+        return hashlib.sha256(signature.encode('utf-8')).hexdigest()[:16]
+
     def load_modality(self, file_path: str, is_label: bool = False) -> torch.Tensor:
         """단일 모달리티 로드"""
         if self.use_monai:
@@ -529,47 +884,12 @@ class M1Preprocessor:
         flair_vol, flair_spacing = load_dicom_series(flair_files)
         timer.step(f"Load FLAIR ({len(flair_files)} slices)")
 
-        # Use T1 spacing as reference (all should be similar)
-        spacing = t1_spacing
-
-        # Resample to 1mm isotropic if needed
-        if spacing != self.target_spacing:
-            t1_vol = resample_volume(t1_vol, spacing, self.target_spacing)
-            t1ce_vol = resample_volume(t1ce_vol, t1ce_spacing, self.target_spacing)
-            t2_vol = resample_volume(t2_vol, t2_spacing, self.target_spacing)
-            flair_vol = resample_volume(flair_vol, flair_spacing, self.target_spacing)
-            timer.step(f"Resample to 1mm isotropic (from {spacing})")
-        else:
-            timer.step("Spacing already 1mm (skip resample)")
-
-        # Apply RAS orientation (flip X and Y axes to match NIfTI preprocessing)
-        # Original NIfTI has affine with negative X, Y (LPS -> RAS requires flip)
-        # DICOM data needs same transformation for consistency
-        t1_vol = np.flip(t1_vol, axis=(0, 1)).copy()
-        t1ce_vol = np.flip(t1ce_vol, axis=(0, 1)).copy()
-        t2_vol = np.flip(t2_vol, axis=(0, 1)).copy()
-        flair_vol = np.flip(flair_vol, axis=(0, 1)).copy()
-        timer.step("Apply RAS orientation (flip X, Y)")
-
-        # Stack to 4-channel tensor (C, H, W, D) - same as MONAI output format
-        # DICOM loads as (H, W, D), keep same order and add channel dim
-        t1_tensor = torch.from_numpy(t1_vol).unsqueeze(0)
-        t1ce_tensor = torch.from_numpy(t1ce_vol).unsqueeze(0)
-        t2_tensor = torch.from_numpy(t2_vol).unsqueeze(0)
-        flair_tensor = torch.from_numpy(flair_vol).unsqueeze(0)
-
-        image_4ch = torch.cat([t1_tensor, t1ce_tensor, t2_tensor, flair_tensor], dim=0)
-        timer.step(f"Stack 4-channel tensor {tuple(image_4ch.shape)}")
-
-        # Get foreground bbox
-        bbox = get_foreground_bbox(image_4ch, margin=5)
-        timer.step(f"Calculate foreground bbox: {bbox}")
-
-        # Crop and resize
-        image_tensor = apply_crop_and_resize(
-            image_4ch, bbox, self.target_size, mode='trilinear'
+        # Resample (1mm) → RAS flip → foreground crop → resize
+        image_tensor, bbox, original_shape = self._resample_crop_resize(
+            [t1_vol, t1ce_vol, t2_vol, flair_vol],
+            [t1_spacing, t1ce_spacing, t2_spacing, flair_spacing],
+            timer,
         )
-        timer.step(f"Crop & resize to {self.target_size}")
 
         # Normalize each channel separately (0-1)
         image_tensor = normalize_channels_separately(image_tensor)
@@ -616,60 +936,23 @@ class M1Preprocessor:
         timer = Timer(name="DICOM Preprocessing (bytes)", verbose=verbose)
         timer.start()
 
-        # Load each modality from bytes
-        t1_vol, t1_spacing = load_dicom_from_bytes(t1_bytes)
-        timer.step(f"Load T1 ({len(t1_bytes)} slices)")
-
-        t1ce_vol, t1ce_spacing = load_dicom_from_bytes(t1ce_bytes)
-        timer.step(f"Load T1CE ({len(t1ce_bytes)} slices)")
-
-        t2_vol, t2_spacing = load_dicom_from_bytes(t2_bytes)
-        timer.step(f"Load T2 ({len(t2_bytes)} slices)")
-
-        flair_vol, flair_spacing = load_dicom_from_bytes(flair_bytes)
-        timer.step(f"Load FLAIR ({len(flair_bytes)} slices)")
-
-        # Use T1 spacing as reference
-        spacing = t1_spacing
-
-        # Resample to 1mm isotropic if needed
-        if spacing != self.target_spacing:
-            t1_vol = resample_volume(t1_vol, spacing, self.target_spacing)
-            t1ce_vol = resample_volume(t1ce_vol, t1ce_spacing, self.target_spacing)
-            t2_vol = resample_volume(t2_vol, t2_spacing, self.target_spacing)
-            flair_vol = resample_volume(flair_vol, flair_spacing, self.target_spacing)
-            timer.step(f"Resample to 1mm isotropic (from {spacing})")
-        else:
-            timer.step("Spacing already 1mm (skip resample)")
-
-        # Apply RAS orientation (flip X and Y axes to match NIfTI preprocessing)
-        # Original NIfTI has affine with negative X, Y (LPS -> RAS requires flip)
-        # DICOM data needs same transformation for consistency
-        t1_vol = np.flip(t1_vol, axis=(0, 1)).copy()
-        t1ce_vol = np.flip(t1ce_vol, axis=(0, 1)).copy()
-        t2_vol = np.flip(t2_vol, axis=(0, 1)).copy()
-        flair_vol = np.flip(flair_vol, axis=(0, 1)).copy()
-        timer.step("Apply RAS orientation (flip X, Y)")
-
-        # Stack to 4-channel tensor (C, H, W, D) - same as MONAI output format
-        # DICOM loads as (H, W, D), keep same order and add channel dim
-        t1_tensor = torch.from_numpy(t1_vol).unsqueeze(0)
-        t1ce_tensor = torch.from_numpy(t1ce_vol).unsqueeze(0)
-        t2_tensor = torch.from_numpy(t2_vol).unsqueeze(0)
-        flair_tensor = torch.from_numpy(flair_vol).unsqueeze(0)
-
-        image_4ch = torch.cat([t1_tensor, t1ce_tensor, t2_tensor, flair_tensor], dim=0)
-        timer.step(f"Stack 4-channel tensor {tuple(image_4ch.shape)}")
-
-        # Get foreground bbox
-        bbox = get_foreground_bbox(image_4ch, margin=5)
-        timer.step(f"Calculate foreground bbox: {bbox}")
-
-        # Crop and resize
-        image_tensor = apply_crop_and_resize(
-            image_4ch, bbox, self.target_size, mode='trilinear'
+        # Load all modalities from bytes (헤더 정렬 후 슬라이스/모달리티 병렬 디코딩)
+        volumes = load_dicom_modalities_from_bytes(
+            {'T1': t1_bytes, 'T1CE': t1ce_bytes, 'T2': t2_bytes, 'FLAIR': flair_bytes},
+            max_workers=self.decode_workers,
+            timer=timer,
+        )
+        t1_vol, t1_spacing = volumes['T1']
+        t1ce_vol, t1ce_spacing = volumes['T1CE']
+        t2_vol, t2_spacing = volumes['T2']
+        flair_vol, flair_spacing = volumes['FLAIR']
+
+        # Resample (1mm) → RAS flip → foreground crop → resize
+        image_tensor, bbox, original_shape = self._resample_crop_resize(
+            [t1_vol, t1ce_vol, t2_vol, flair_vol],
+            [t1_spacing, t1ce_spacing, t2_spacing, flair_spacing],
+            timer,
         )
-        timer.step(f"Crop & resize to {self.target_size}")
 
         # Normalize each channel separately (0-1)
         image_tensor = normalize_channels_separately(image_tensor)
@@ -679,7 +962,7 @@ class M1Preprocessor:
         timing_summary = timer.summary()
 
         # Calculate slice mapping info for verification
-        original_shape = tuple(image_4ch.shape[1:])  # (H, W, D) after RAS flip
+        # original_shape: (H, W, D) after resample + RAS flip
         slice_mapping = self._calculate_slice_mapping(
             original_shape=original_shape,
             bbox=bbox,
@@ -839,7 +1122,7 @@ class M1Preprocessor:
 
         try:
             # Load segmentation from DICOM bytes
-            seg_vol, seg_spacing = load_dicom_from_bytes(seg_bytes)
+            seg_vol, seg_spacing = load_dicom_from_bytes(seg_bytes, max_workers=self.decode_workers)
             timer.step(f"Load SEG ({len(seg_bytes)} slices)")
 
             print(f"[GT Preprocess] Loaded GT shape: {seg_vol.shape}, spacing: {seg_spacing}")
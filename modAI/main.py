@@ -109,9 +109,14 @@ async def root():
 @app.get("/health")
 async def health_check():
     """헬스 체크"""
+    from utils.callback_outbox import CallbackOutbox
+    from utils.volume_cache import PreprocessedVolumeCache
+
     return {
         "status": "healthy",
         "device": models.get("device", "unknown"),
+        "callback_outbox": CallbackOutbox().stats(),
+        "preprocess_cache": PreprocessedVolumeCache().stats(),
     }
 
 
@@ -102,7 +102,7 @@ async def direct_test(request: DirectTestRequest):
     동기 테스트 엔드포인트 (Celery 없이 직접 실행)
     디버깅용으로 전체 파이프라인을 동기적으로 실행
     """
-    from services.m1_service import M1InferenceService
+    from services.model_registry import get_service
     from utils.orthanc_client import OrthancClient
 
     start_time = time.time()
@@ -145,7 +145,7 @@ async def direct_test(request: DirectTestRequest):
         # ============================================================
         log("Step 2: Preprocessing...")
 
-        service = M1InferenceService()
+        service = get_service('m1')
         preprocessed = service.preprocess(dicom_data, request.patient_id)
 
         image_shape = tuple(preprocessed['image'].shape)
@@ -207,6 +207,9 @@ async def direct_test(request: DirectTestRequest):
             # encoder_features는 너무 길어서 요약만 저장
             save_result = {k: v for k, v in result.items() if k != 'encoder_features'}
             save_result['encoder_features_shape'] = len(encoder_features)
+            # 디버그 출력용으로만 NumPy 배열 → list 변환
+            if 'segmentation' in save_result:
+                save_result['segmentation'] = service.visualization_to_lists(save_result['segmentation'])
             json.dump(save_result, f, ensure_ascii=False, indent=2, default=str)
 
         log(f"  Results saved to: {output_dir}")
@@ -100,7 +100,7 @@ async def direct_test(request: DirectTestRequest):
     동기 테스트 엔드포인트 (Celery 없이 직접 실행)
     디버깅용으로 전체 파이프라인을 동기적으로 실행
     """
-    from services.mg_service import MGInferenceService
+    from services.model_registry import get_service
 
     start_time = time.time()
     logs = []
@@ -124,7 +124,7 @@ async def direct_test(request: DirectTestRequest):
         log(f"  CSV file exists: {csv_path.stat().st_size} bytes")
 
         # MG 서비스 초기화
-        service = MGInferenceService()
+        service = get_service('mg')
 
         # CSV 로드 및 전처리
         log("Step 1: Loading CSV data...")
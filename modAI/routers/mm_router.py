@@ -166,7 +166,7 @@ async def direct_test(request: DirectTestRequest):
     동기 테스트 엔드포인트 (Celery 없이 직접 실행)
     디버깅용으로 전체 파이프라인을 동기적으로 실행
     """
-    from services.mm_service import MMInferenceService
+    from services.model_registry import get_service
 
     start_time = time.time()
     logs = []
@@ -185,7 +185,7 @@ async def direct_test(request: DirectTestRequest):
         log(f"Protein CSV: {len(request.protein_csv_content) if request.protein_csv_content else 0} chars")
 
         # MM 서비스 초기화
-        service = MMInferenceService()
+        service = get_service('mm')
 
         # Protein CSV 파싱
         protein_features = None
@@ -11,7 +11,7 @@ import torch.nn as nn
 import torch.nn.functional as F
 import numpy as np
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 import time
 import logging
 
@@ -19,6 +19,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config import settings
 from inference.m1_preprocess import M1Preprocessor
+from services.model_registry import load_checkpoint
+from utils.memory import MemoryTracker
 
 logger = logging.getLogger(__name__)
 
@@ -33,8 +35,15 @@ class M1InferenceService:
     # Model validation C-Index (from checkpoint metrics)
     MODEL_CINDEX = 0.6596
 
+    # 저장/전송용 MRI dtype (0-1 정규화 값이라 float16으로 충분, 크기 1/2)
+    MRI_STORAGE_DTYPE = np.float16
+
     def __init__(self):
-        self.preprocessor = M1Preprocessor()
+        self.preprocessor = M1Preprocessor(
+            decode_workers=settings.DICOM_DECODE_WORKERS,
+            fused_resample=settings.M1_FUSED_RESAMPLE,
+            device=settings.M1_PREPROCESS_DEVICE,
+        )
         self.model = None
         self.cls_heads = None
         self.encoder_dim = 768  # SwinUNETR default (48 * 16)
@@ -83,9 +92,7 @@ class M1InferenceService:
             seg_weights_path = settings.M1_SEG_WEIGHTS_PATH
             if Path(seg_weights_path).exists():
                 print(f"[M1Service] Loading backbone weights from {seg_weights_path}...")
-                checkpoint = torch.load(
-                    seg_weights_path, map_location=self.device, weights_only=False
-                )
+                checkpoint = load_checkpoint(seg_weights_path, map_location=self.device)
                 print(f"[M1Service] Checkpoint keys: {list(checkpoint.keys()) if isinstance(checkpoint, dict) else 'raw_state_dict'}")
 
                 if 'model_state_dict' in checkpoint:
@@ -214,7 +221,7 @@ class M1InferenceService:
 
         try:
             print(f"[M1Service] Loading classification weights from {cls_weights_path}...")
-            checkpoint = torch.load(cls_weights_path, map_location=self.device, weights_only=False)
+            checkpoint = load_checkpoint(cls_weights_path, map_location=self.device)
             print(f"[M1Service] Classification checkpoint keys: {list(checkpoint.keys()) if isinstance(checkpoint, dict) else 'raw_state_dict'}")
 
             state_dict = checkpoint.get('model_state_dict', checkpoint)
@@ -249,9 +256,19 @@ class M1InferenceService:
             print(f"[M1Service] ERROR: Failed to load classification weights: {e}")
             print(traceback.format_exc())
 
-    def _get_features(self, input_tensor: torch.Tensor) -> torch.Tensor:
-        """Extract features from model using swinViT"""
+    def _encode(
+        self, input_tensor: torch.Tensor
+    ) -> Tuple[Optional[List[torch.Tensor]], torch.Tensor]:
+        """
+        swinViT encoder 1회 실행
+
+        Returns:
+            (hidden_states, pooled features)
+            - hidden_states: SwinUNETR decoder 재사용용 (simple model이면 None)
+            - pooled: Classification heads / MM 모델용 (1, encoder_dim)
+        """
         print(f"[M1Service] Extracting features from input shape: {input_tensor.shape}")
+        hidden_states = None
 
         with torch.no_grad():
             if hasattr(self.model, 'swinViT'):
@@ -282,8 +299,79 @@ class M1InferenceService:
                 pooled = F.adaptive_avg_pool1d(pooled.unsqueeze(1), self.encoder_dim).squeeze(1)
 
         print(f"[M1Service] Final features shape: {pooled.shape}")
+        return hidden_states, pooled
+
+    def _get_features(self, input_tensor: torch.Tensor) -> torch.Tensor:
+        """Extract features from model using swinViT"""
+        _, pooled = self._encode(input_tensor)
         return pooled
 
+    def _decode(
+        self, input_tensor: torch.Tensor, hidden_states: List[torch.Tensor]
+    ) -> torch.Tensor:
+        """
+        캐시된 swinViT hidden states로 SwinUNETR decoder만 실행
+
+        MONAI SwinUNETR.forward와 동일한 연산에서 swinViT 호출만 제외
+        (encoder를 분류/세그멘테이션에서 두 번 실행하지 않기 위함)
+        """
+        model = self.model
+        with torch.no_grad():
+            enc0 = model.encoder1(input_tensor)
+            enc1 = model.encoder2(hidden_states[0])
+            enc2 = model.encoder3(hidden_states[1])
+            enc3 = model.encoder4(hidden_states[2])
+            dec4 = model.encoder10(hidden_states[4])
+            dec3 = model.decoder5(dec4, hidden_states[3])
+            dec2 = model.decoder4(dec3, enc3)
+            dec1 = model.decoder3(dec2, enc2)
+            dec0 = model.decoder2(dec1, enc1)
+            out = model.decoder1(dec0, enc0)
+            return model.out(out)
+
+    def _sliding_window_segment(self, input_tensor: torch.Tensor) -> torch.Tensor:
+        """
+        ROI 패치 단위 SwinUNETR 세그멘테이션 (Gaussian blending)
+
+        전체 볼륨 대신 M1_SW_ROI_SIZE³ 패치를 M1_SW_BATCH_SIZE개씩 추론하여
+        decoder activation peak 메모리를 제한. 결과 누적 버퍼는 CPU에 유지.
+        """
+        from monai.inferers import sliding_window_inference
+
+        roi = settings.M1_SW_ROI_SIZE
+        if roi <= 0 or roi % 32 != 0:
+            raise ValueError(f"M1_SW_ROI_SIZE must be a positive multiple of 32 (got {roi})")
+        if not 0 <= settings.M1_SW_OVERLAP < 1:
+            raise ValueError(f"M1_SW_OVERLAP must be in [0, 1) (got {settings.M1_SW_OVERLAP})")
+
+        print(f"[M1Service] Sliding-window segmentation: roi={roi}, "
+              f"overlap={settings.M1_SW_OVERLAP}, sw_batch_size={settings.M1_SW_BATCH_SIZE}")
+
+        with torch.no_grad():
+            return sliding_window_inference(
+                inputs=input_tensor,
+                roi_size=(roi, roi, roi),
+                sw_batch_size=max(1, settings.M1_SW_BATCH_SIZE),
+                predictor=self.model,
+                overlap=settings.M1_SW_OVERLAP,
+                mode='gaussian',
+                sw_device=self.device,
+                device='cpu',
+            )
+
+    def _to_input_tensor(self, preprocessed: dict) -> torch.Tensor:
+        """전처리 결과의 'image'를 (1, 4, D, H, W) 텐서로 변환 후 device 이동"""
+        image_tensor = preprocessed['image']
+        print(f"[M1Service] Input tensor shape: {image_tensor.shape}, dtype: {image_tensor.dtype}")
+
+        if image_tensor.ndim == 4:
+            image_tensor = image_tensor.unsqueeze(0)
+            print(f"[M1Service] Added batch dim: {image_tensor.shape}")
+
+        image_tensor = image_tensor.to(self.device)
+        print(f"[M1Service] Tensor moved to {self.device}")
+        return image_tensor
+
     def preprocess(
         self,
         dicom_data: Dict[str, List[bytes]],
@@ -324,21 +412,32 @@ class M1InferenceService:
         self.load_model()
         start_time = time.time()
 
-        # 이미지 텐서 추출 및 device 이동
-        image_tensor = preprocessed['image']
-        print(f"[M1Service] Input tensor shape: {image_tensor.shape}, dtype: {image_tensor.dtype}")
-
-        if image_tensor.ndim == 4:
-            image_tensor = image_tensor.unsqueeze(0)
-            print(f"[M1Service] Added batch dim: {image_tensor.shape}")
-
-        image_tensor = image_tensor.to(self.device)
-        print(f"[M1Service] Tensor moved to {self.device}")
+        image_tensor = self._to_input_tensor(preprocessed)
 
         # Extract features from encoder
         print("[M1Service] Extracting encoder features...")
         pooled = self._get_features(image_tensor)
 
+        results = self._classify(pooled)
+
+        processing_time = (time.time() - start_time) * 1000
+        results["processing_time_ms"] = processing_time
+
+        print(f"[M1Service] Prediction complete in {processing_time:.1f}ms")
+        print(f"[M1Service] Results: Grade={results['grade']['predicted_class']}, IDH={results['idh']['predicted_class']}, MGMT={results['mgmt']['predicted_class']}")
+
+        return results
+
+    def _classify(self, pooled: torch.Tensor) -> Dict[str, Any]:
+        """
+        Classification heads 실행 (Grade, IDH, MGMT, Survival)
+
+        Args:
+            pooled: encoder pooled features (1, encoder_dim)
+
+        Returns:
+            분류 결과 dict + 'encoder_features' (MM 모델용 768-dim)
+        """
         results = {}
 
         print("[M1Service] Running classification heads...")
@@ -428,93 +527,112 @@ class M1InferenceService:
         print(f"  - Encoder features stats: min={encoder_features.min():.4f}, max={encoder_features.max():.4f}, mean={encoder_features.mean():.4f}")
         results["encoder_features"] = encoder_features.tolist()
 
-        processing_time = (time.time() - start_time) * 1000
-        results["processing_time_ms"] = processing_time
-
-        print(f"[M1Service] Prediction complete in {processing_time:.1f}ms")
-        print(f"[M1Service] Results: Grade={results['grade']['predicted_class']}, IDH={results['idh']['predicted_class']}, MGMT={results['mgmt']['predicted_class']}")
-
         return results
 
-    def _run_segmentation(self, input_tensor: torch.Tensor) -> Dict[str, Any]:
+    def _run_segmentation(
+        self,
+        input_tensor: torch.Tensor,
+        hidden_states: Optional[List[torch.Tensor]] = None,
+    ) -> Dict[str, Any]:
         """
         Run segmentation and return mask + volumes + MRI for visualization
 
         Args:
             input_tensor: 전처리된 MRI 입력 (1, 4, 128, 128, 128)
+            hidden_states: _encode()에서 얻은 swinViT hidden states
+                           (있으면 encoder 재실행 없이 decoder만 실행)
 
         Returns:
-            세그멘테이션 결과 dict (volumes, mask, visualization)
+            세그멘테이션 결과 dict (volumes, mask, visualization, memory)
         """
         print("[M1Service] Running segmentation...")
 
-        with torch.no_grad():
+        sliding_window = settings.M1_SLIDING_WINDOW and hasattr(self.model, 'swinViT')
+        mem = MemoryTracker(name="M1 segmentation")
+
+        with torch.no_grad(), mem:
             # Run full model forward pass for segmentation
-            if hasattr(self.model, 'swinViT'):
-                # MONAI SwinUNETR - full forward pass
-                print("[M1Service] Running SwinUNETR forward pass for segmentation...")
-                seg_output = self.model(input_tensor)  # (1, 4, D, H, W)
+            if sliding_window:
+                seg_output = self._sliding_window_segment(input_tensor)
+                print(f"[M1Service] Segmentation output shape: {seg_output.shape}")
+
+                seg_mask = torch.argmax(seg_output, dim=1).squeeze().cpu().numpy()  # (D, H, W)
+                del seg_output
+                print(f"[M1Service] Segmentation mask shape: {seg_mask.shape}")
+            elif hasattr(self.model, 'swinViT'):
+                if hidden_states is not None:
+                    # 캐시된 encoder hidden states 재사용 - decoder만 실행
+                    print("[M1Service] Running SwinUNETR decoder on cached hidden states...")
+                    seg_output = self._decode(input_tensor, hidden_states)  # (1, 4, D, H, W)
+                else:
+                    # MONAI SwinUNETR - full forward pass
+                    print("[M1Service] Running SwinUNETR forward pass for segmentation...")
+                    seg_output = self.model(input_tensor)  # (1, 4, D, H, W)
                 print(f"[M1Service] Segmentation output shape: {seg_output.shape}")
 
                 seg_mask = torch.argmax(seg_output, dim=1).squeeze().cpu().numpy()  # (D, H, W)
+                del seg_output
                 print(f"[M1Service] Segmentation mask shape: {seg_mask.shape}")
             else:
                 # Simple model - create dummy segmentation
                 print("[M1Service] Using simple model - creating dummy segmentation")
                 seg_mask = np.zeros((128, 128, 128), dtype=np.uint8)
 
-            # Calculate tumor volumes (assuming 1mm isotropic voxels)
-            voxel_volume_ml = 0.001  # 1mm^3 = 0.001 cm^3
-
-            # BraTS labels: 0=background, 1=NCR(Necrotic Core), 2=ED(Edema), 3=ET(Enhancing Tumor)
-            ncr_volume = float((seg_mask == 1).sum() * voxel_volume_ml)
-            ed_volume = float((seg_mask == 2).sum() * voxel_volume_ml)
-            et_volume = float((seg_mask == 3).sum() * voxel_volume_ml)
-
-            # Whole Tumor (WT) = NCR + ED + ET
-            wt_volume = ncr_volume + ed_volume + et_volume
-            # Tumor Core (TC) = NCR + ET
-            tc_volume = ncr_volume + et_volume
-
-            print(f"[M1Service] Tumor volumes:")
-            print(f"  - Whole Tumor (WT): {wt_volume:.2f} ml")
-            print(f"  - Tumor Core (TC): {tc_volume:.2f} ml")
-            print(f"  - Enhancing Tumor (ET): {et_volume:.2f} ml")
-            print(f"  - Necrotic Core (NCR): {ncr_volume:.2f} ml")
-            print(f"  - Edema (ED): {ed_volume:.2f} ml")
-
-            # Get MRI data for visualization (T1CE channel, normalized 0-1)
-            mri_data = input_tensor[0, 1].cpu().numpy()  # T1CE channel (index 1)
-            mri_min, mri_max = mri_data.min(), mri_data.max()
-            if mri_max > mri_min:
-                mri_normalized = (mri_data - mri_min) / (mri_max - mri_min)
-            else:
-                mri_normalized = mri_data
-
-            # Full resolution for JSON response (128^3) - can be downsampled if needed
-            step = 1
-            mri_down = mri_normalized[::step, ::step, ::step]
-            seg_down = seg_mask[::step, ::step, ::step].astype(np.uint8)
-
-            # Count unique labels
-            unique_labels, label_counts = np.unique(seg_mask, return_counts=True)
-            label_info = {int(label): int(count) for label, count in zip(unique_labels, label_counts)}
-            print(f"[M1Service] Label distribution: {label_info}")
-
-            return {
-                "wt_volume": round(wt_volume, 2),
-                "tc_volume": round(tc_volume, 2),
-                "et_volume": round(et_volume, 2),
-                "ncr_volume": round(ncr_volume, 2),
-                "ed_volume": round(ed_volume, 2),
-                "mask_shape": list(seg_mask.shape),
-                "label_distribution": label_info,
-                "visualization": {
-                    "mri": mri_down.round(3).tolist(),  # 128x128x128 MRI
-                    "prediction": seg_down.tolist(),  # 128x128x128 segmentation
-                    "shape": list(seg_down.shape),
-                }
+        # Calculate tumor volumes (assuming 1mm isotropic voxels)
+        voxel_volume_ml = 0.001  # 1mm^3 = 0.001 cm^3
+
+        # BraTS labels: 0=background, 1=NCR(Necrotic Core), 2=ED(Edema), 3=ET(Enhancing Tumor)
+        ncr_volume = float((seg_mask == 1).sum() * voxel_volume_ml)
+        ed_volume = float((seg_mask == 2).sum() * voxel_volume_ml)
+        et_volume = float((seg_mask == 3).sum() * voxel_volume_ml)
+
+        # Whole Tumor (WT) = NCR + ED + ET
+        wt_volume = ncr_volume + ed_volume + et_volume
+        # Tumor Core (TC) = NCR + ET
+        tc_volume = ncr_volume + et_volume
+
+        print(f"[M1Service] Tumor volumes:")
+        print(f"  - Whole Tumor (WT): {wt_volume:.2f} ml")
+        print(f"  - Tumor Core (TC): {tc_volume:.2f} ml")
+        print(f"  - Enhancing Tumor (ET): {et_volume:.2f} ml")
+        print(f"  - Necrotic Core (NCR): {ncr_volume:.2f} ml")
+        print(f"  - Edema (ED): {ed_volume:.2f} ml")
+
+        # Get MRI data for visualization (T1CE channel, normalized 0-1)
+        mri_data = input_tensor[0, 1].cpu().numpy()  # T1CE channel (index 1)
+        mri_min, mri_max = mri_data.min(), mri_data.max()
+        if mri_max > mri_min:
+            mri_normalized = (mri_data - mri_min) / (mri_max - mri_min)
+        else:
+            mri_normalized = mri_data
+
+        # NumPy 배열 그대로 유지 (JSON list 변환 없음)
+        # - MRI: float16 (0-1 정규화 값, 기존 round(3) 정밀도와 동등)
+        # - Mask: uint8 (label 0-3)
+        mri_vis = mri_normalized.astype(self.MRI_STORAGE_DTYPE)
+        seg_vis = seg_mask.astype(np.uint8)
+
+        # Count unique labels
+        unique_labels, label_counts = np.unique(seg_mask, return_counts=True)
+        label_info = {int(label): int(count) for label, count in zip(unique_labels, label_counts)}
+        print(f"[M1Service] Label distribution: {label_info}")
+
+        return {
+            "wt_volume": round(wt_volume, 2),
+            "tc_volume": round(tc_volume, 2),
+            "et_volume": round(et_volume, 2),
+            "ncr_volume": round(ncr_volume, 2),
+            "ed_volume": round(ed_volume, 2),
+            "mask_shape": list(seg_mask.shape),
+            "label_distribution": label_info,
+            "inference_mode": "sliding_window" if sliding_window else "full_volume",
+            "memory": mem.summary(),
+            "visualization": {
+                "mri": mri_vis,  # (128, 128, 128) float16
+                "prediction": seg_vis,  # (128, 128, 128) uint8
+                "shape": list(seg_vis.shape),
             }
+        }
 
     def predict_with_segmentation(self, preprocessed: dict) -> Dict[str, Any]:
         """
@@ -527,18 +645,27 @@ class M1InferenceService:
             추론 결과 dict (분류 결과 + 세그멘테이션 결과 + 전처리된 MRI)
         """
         print("[M1Service] Starting prediction with segmentation...")
+        self.load_model()
+        start_time = time.time()
 
-        # 먼저 분류 결과 얻기
-        results = self.predict(preprocessed)
+        image_tensor = self._to_input_tensor(preprocessed)
 
-        # 세그멘테이션 실행
-        image_tensor = preprocessed['image']
-        if image_tensor.ndim == 4:
-            image_tensor = image_tensor.unsqueeze(0)
-        image_tensor = image_tensor.to(self.device)
+        # swinViT encoder 1회 실행 - hidden states를 분류/MM features/decoder에서 공유
+        hidden_states, pooled = self._encode(image_tensor)
+
+        # 분류 결과 (+ MM용 encoder features)
+        results = self._classify(pooled)
 
-        seg_result = self._run_segmentation(image_tensor)
+        # 세그멘테이션 (캐시된 hidden states로 decoder만 실행)
+        # sliding-window 모드는 패치 단위로 encoder를 다시 실행하므로 hidden states를 먼저 해제
+        if settings.M1_SLIDING_WINDOW:
+            del hidden_states
+            hidden_states = None
+        seg_result = self._run_segmentation(image_tensor, hidden_states=hidden_states)
         results["segmentation"] = seg_result
+        del hidden_states
+
+        results["processing_time_ms"] = (time.time() - start_time) * 1000
 
         # 전처리된 MRI 4채널 저장 (T1, T1CE, T2, FLAIR) - SegMRIViewer용
         # image_tensor shape: (1, 4, 128, 128, 128)
@@ -554,7 +681,7 @@ class M1InferenceService:
                 ch_normalized = (ch_data - ch_min) / (ch_max - ch_min)
             else:
                 ch_normalized = ch_data
-            preprocessed_mri[name] = ch_normalized.astype(np.float32)
+            preprocessed_mri[name] = ch_normalized.astype(self.MRI_STORAGE_DTYPE)
 
         preprocessed_mri['shape'] = list(mri_numpy.shape[1:])  # [128, 128, 128]
         results["preprocessed_mri"] = preprocessed_mri
@@ -575,11 +702,7 @@ class M1InferenceService:
         """
         self.load_model()
 
-        image_tensor = preprocessed['image']
-        if image_tensor.ndim == 4:
-            image_tensor = image_tensor.unsqueeze(0)
-        image_tensor = image_tensor.to(self.device)
-
+        image_tensor = self._to_input_tensor(preprocessed)
         pooled = self._get_features(image_tensor)
 
         # Ensure 768-dim output
@@ -652,7 +775,7 @@ class M1InferenceService:
         # 2. Encoder Features 저장 (NPZ)
         # ============================================================
         if "encoder_features" in result:
-            encoder_features = np.array(result["encoder_features"])
+            encoder_features = np.asarray(result["encoder_features"])
             feat_filename = "m1_encoder_features.npz"
             features_file = output_dir / feat_filename
             np.savez_compressed(
@@ -682,7 +805,7 @@ class M1InferenceService:
             # 세그멘테이션 마스크
             seg_mask = None
             if "visualization" in seg and "prediction" in seg["visualization"]:
-                seg_mask = np.array(seg["visualization"]["prediction"], dtype=np.uint8)
+                seg_mask = np.asarray(seg["visualization"]["prediction"], dtype=np.uint8)
 
             seg_filename = "m1_segmentation.npz"
             segmentation_file = output_dir / seg_filename
@@ -701,7 +824,7 @@ class M1InferenceService:
 
             # MRI 데이터도 함께 저장 (SegMRIViewer용)
             if "visualization" in seg and "mri" in seg["visualization"]:
-                mri_data = np.array(seg["visualization"]["mri"], dtype=np.float32)
+                mri_data = np.asarray(seg["visualization"]["mri"], dtype=self.MRI_STORAGE_DTYPE)
                 save_data["mri"] = mri_data
                 print(f"    MRI data saved: shape={mri_data.shape}")
 
@@ -778,7 +901,7 @@ class M1InferenceService:
         # 2. Encoder Features (NPZ -> base64)
         # ============================================================
         if "encoder_features" in result:
-            encoder_features = np.array(result["encoder_features"])
+            encoder_features = np.asarray(result["encoder_features"])
             buffer = BytesIO()
             np.savez_compressed(
                 buffer,
@@ -809,7 +932,7 @@ class M1InferenceService:
 
             seg_mask = None
             if "visualization" in seg and "prediction" in seg["visualization"]:
-                seg_mask = np.array(seg["visualization"]["prediction"], dtype=np.uint8)
+                seg_mask = np.asarray(seg["visualization"]["prediction"], dtype=np.uint8)
 
             save_data = {
                 "wt_volume": volumes["wt_volume"],
@@ -825,7 +948,7 @@ class M1InferenceService:
                 save_data["mask"] = seg_mask
 
             if "visualization" in seg and "mri" in seg["visualization"]:
-                mri_data = np.array(seg["visualization"]["mri"], dtype=np.float32)
+                mri_data = np.asarray(seg["visualization"]["mri"], dtype=self.MRI_STORAGE_DTYPE)
                 save_data["mri"] = mri_data
 
             buffer = BytesIO()
@@ -863,6 +986,23 @@ class M1InferenceService:
 
         return files_data
 
+    @staticmethod
+    def visualization_to_lists(seg: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        세그멘테이션 결과의 visualization 배열을 Python list로 변환
+
+        디버그용 /api/v1/m1/test JSON 저장 전용 (Celery 경로는 NumPy 배열 유지)
+        """
+        seg = dict(seg)
+        vis = seg.get("visualization")
+        if vis:
+            seg["visualization"] = {
+                "mri": np.asarray(vis["mri"], dtype=np.float32).round(3).tolist(),
+                "prediction": np.asarray(vis["prediction"]).tolist(),
+                "shape": vis.get("shape"),
+            }
+        return seg
+
     @staticmethod
     def get_result_file_path(storage_dir: Path, job_id: str, filename: str) -> Path:
         """
@@ -20,6 +20,7 @@ import base64
 from io import BytesIO
 
 from config import settings
+from services.model_registry import load_checkpoint
 
 
 class MGInferenceService:
@@ -117,11 +118,7 @@ class MGInferenceService:
             gene_embeddings = torch.randn(self.n_genes, self.emb_dim)
             self.model = self._create_model(gene_embeddings)
         else:
-            checkpoint = torch.load(
-                self.weights_path,
-                map_location=self.device,
-                weights_only=False
-            )
+            checkpoint = load_checkpoint(self.weights_path, map_location=self.device)
 
             # Gene embeddings
             if 'gene_embeddings' in checkpoint:
@@ -268,7 +265,8 @@ class MGInferenceService:
         gene_expression: List[float],
         gene_names: Optional[List[str]] = None,
         include_visualizations: bool = False,
-        include_xai: bool = True
+        include_xai: bool = True,
+        visualization_format: str = 'base64'
     ) -> Dict[str, Any]:
         """
         Gene expression 예측 수행
@@ -278,6 +276,7 @@ class MGInferenceService:
             gene_names: Gene name 리스트
             include_visualizations: 시각화 생성 여부
             include_xai: XAI 데이터 포함 여부
+            visualization_format: 'base64' (API 응답용 문자열) 또는 'png' (spool 기록용 PNG bytes)
 
         Returns:
             예측 결과 딕셔너리
@@ -353,7 +352,7 @@ class MGInferenceService:
 
         # Visualizations
         if include_visualizations:
-            results["visualizations"] = self._create_visualizations(results)
+            results["visualizations"] = self._create_visualizations(results, visualization_format)
 
         # Metadata
         results["processing_time_ms"] = (time.time() - start_time) * 1000
@@ -508,8 +507,8 @@ class MGInferenceService:
 
         return xai_data
 
-    def _create_visualizations(self, results: Dict[str, Any]) -> Dict[str, str]:
-        """시각화 생성 (base64 PNG)"""
+    def _create_visualizations(self, results: Dict[str, Any], visualization_format: str = 'base64') -> Dict[str, Any]:
+        """시각화 생성 (base64 PNG 문자열, visualization_format='png' 이면 PNG bytes)"""
         try:
             import matplotlib
             matplotlib.use('Agg')
@@ -517,6 +516,12 @@ class MGInferenceService:
 
             visualizations = {}
 
+            def _encode_png(buf: BytesIO):
+                png = buf.getvalue()
+                if visualization_format == 'png':
+                    return png
+                return base64.b64encode(png).decode('ascii')
+
             # 1. Grade Chart
             fig, ax = plt.subplots(figsize=(6, 4))
             grade = results.get('grade', {})
@@ -533,8 +538,7 @@ class MGInferenceService:
                     ax.text(v + 0.02, i, f'{v*100:.1f}%', va='center')
             buf = BytesIO()
             plt.savefig(buf, format='png', dpi=100, bbox_inches='tight')
-            buf.seek(0)
-            visualizations['grade_chart'] = base64.b64encode(buf.read()).decode('ascii')
+            visualizations['grade_chart'] = _encode_png(buf)
             plt.close(fig)
 
             # 2. Risk Gauge
@@ -553,8 +557,7 @@ class MGInferenceService:
             ax.set_title(f'Survival Risk: {risk.get("risk_category", "Unknown")}')
             buf = BytesIO()
             plt.savefig(buf, format='png', dpi=100, bbox_inches='tight')
-            buf.seek(0)
-            visualizations['risk_gauge'] = base64.b64encode(buf.read()).decode('ascii')
+            visualizations['risk_gauge'] = _encode_png(buf)
             plt.close(fig)
 
             # 3. Recurrence Chart
@@ -568,8 +571,7 @@ class MGInferenceService:
             ax.set_title('Recurrence Prediction')
             buf = BytesIO()
             plt.savefig(buf, format='png', dpi=100, bbox_inches='tight')
-            buf.seek(0)
-            visualizations['recurrence_chart'] = base64.b64encode(buf.read()).decode('ascii')
+            visualizations['recurrence_chart'] = _encode_png(buf)
             plt.close(fig)
 
             return visualizations
@@ -16,6 +16,8 @@ from pathlib import Path
 from typing import Dict, Any, Optional, List
 import time
 
+from services.model_registry import load_checkpoint
+
 
 class MMModel(nn.Module):
     """MM Multimodal Model (Clinical 제외) - 학습 스크립트와 동일 구조"""
@@ -227,9 +229,7 @@ class MMInferenceService:
         protein_dim = 203
 
         if Path(self.weights_path).exists():
-            checkpoint = torch.load(
-                self.weights_path, map_location=self.device, weights_only=False
-            )
+            checkpoint = load_checkpoint(self.weights_path, map_location=self.device)
 
             # Get protein dim from config if available
             if isinstance(checkpoint, dict) and 'config' in checkpoint:
@@ -0,0 +1,198 @@
+"""
+Model Registry
+
+Celery worker 프로세스 단위 모델 캐시
+- worker_process_init 시그널에서 한 번만 로드 (celery_app.py 참고)
+  MODEL_PRELOAD=auto 이면 워커가 구독하는 큐의 모델만 미리 로드, 나머지는 첫 요청 시 lazy 로드
+- M1 (SwinUNETR backbone + Classification heads), MG (Gene2Vec), MM (Fusion)
+- 태스크마다 Service를 새로 만들고 torch.load 하던 비용 제거
+- MODEL_REGISTRY_MAX_MODELS 초과 시 LRU 방식으로 eviction (메모리 제한 워커용)
+- MODEL_MMAP_LOAD=True 이면 checkpoint를 memory-mapped 로 로드
+
+Windows solo pool 등 worker_process_init 이 발생하지 않는 환경에서는
+첫 get() 호출 시 lazy 로드됩니다.
+"""
+import gc
+import time
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import torch
+
+from config import settings
+
+
+def load_checkpoint(path: Union[str, Path], map_location: str) -> Any:
+    """
+    torch.load 래퍼
+
+    settings.MODEL_MMAP_LOAD=True 이면 mmap=True 로 로드하여
+    checkpoint 전체를 RAM에 복사하지 않고 페이지 단위로 읽습니다.
+    (torch>=2.1 + zipfile 포맷 checkpoint 필요, 불가능하면 일반 로드로 fallback)
+    """
+    if settings.MODEL_MMAP_LOAD:
+        try:
+            return torch.load(
+                path, map_location=map_location, weights_only=False, mmap=True
+            )
+        except (TypeError, RuntimeError) as e:
+            print(f"[ModelRegistry] mmap load unavailable for {path}: {e}")
+            print("[ModelRegistry] Falling back to regular torch.load")
+
+    return torch.load(path, map_location=map_location, weights_only=False)
+
+
+# 큐 → 해당 큐 태스크가 쓰는 모델
+QUEUE_MODELS = {
+    'm1_queue': 'm1',
+    'mg_queue': 'mg',
+    'mm_queue': 'mm',
+}
+
+
+def _create_m1_service():
+    from services.m1_service import M1InferenceService
+    return M1InferenceService()
+
+
+def _create_mg_service():
+    from services.mg_service import MGInferenceService
+    return MGInferenceService()
+
+
+def _create_mm_service():
+    from services.mm_service import MMInferenceService
+    return MMInferenceService()
+
+
+class ModelRegistry:
+    """프로세스 단위 모델(Service) 레지스트리"""
+
+    FACTORIES: Dict[str, Callable[[], Any]] = {
+        'm1': _create_m1_service,
+        'mg': _create_mg_service,
+        'mm': _create_mm_service,
+    }
+
+    def __init__(self, max_models: int = 0):
+        # max_models: 0 = 무제한, N = 최근 사용한 N개 모델만 유지
+        self.max_models = max_models
+        self._services: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.load_times_ms: Dict[str, float] = {}
+
+    def get(self, name: str):
+        """
+        로드된 Service 반환 (없으면 로드)
+
+        Args:
+            name: 'm1' | 'mg' | 'mm'
+        """
+        with self._lock:
+            service = self._services.get(name)
+            if service is not None:
+                self._services.move_to_end(name)
+                return service
+            return self._load(name)
+
+    def _load(self, name: str):
+        if name not in self.FACTORIES:
+            raise KeyError(f"Unknown model: {name}")
+
+        print(f"[ModelRegistry] Loading '{name}' model...")
+        start = time.time()
+
+        service = self.FACTORIES[name]()
+        service.load_model()
+
+        self.load_times_ms[name] = (time.time() - start) * 1000
+        self._services[name] = service
+        print(f"[ModelRegistry] '{name}' loaded in {self.load_times_ms[name]:.1f}ms")
+
+        self._evict_lru()
+        return service
+
+    def _evict_lru(self) -> None:
+        if self.max_models <= 0:
+            return
+        while len(self._services) > self.max_models:
+            name, _ = self._services.popitem(last=False)
+            print(f"[ModelRegistry] Evicted '{name}' (LRU, max_models={self.max_models})")
+        self._release_memory()
+
+    def preload(self, names: List[str]) -> None:
+        """워커 시작 시 모델 미리 로드 (실패해도 워커는 계속 실행)"""
+        for name in names:
+            try:
+                self.get(name)
+            except Exception as e:
+                import traceback
+                print(f"[ModelRegistry] ERROR: Failed to preload '{name}': {e}")
+                print(traceback.format_exc())
+
+    def evict(self, name: str) -> bool:
+        """특정 모델 해제"""
+        with self._lock:
+            if self._services.pop(name, None) is None:
+                return False
+        self._release_memory()
+        print(f"[ModelRegistry] Evicted '{name}'")
+        return True
+
+    def clear(self) -> None:
+        """전체 모델 해제"""
+        with self._lock:
+            self._services.clear()
+        self._release_memory()
+
+    def loaded_models(self) -> List[str]:
+        """현재 로드된 모델 목록 (LRU 순서: 오래된 것 → 최근)"""
+        with self._lock:
+            return list(self._services.keys())
+
+    @staticmethod
+    def _release_memory() -> None:
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+
+registry = ModelRegistry(max_models=settings.MODEL_REGISTRY_MAX_MODELS)
+
+
+def get_service(name: str):
+    """프로세스 공유 Service 반환 ('m1' | 'mg' | 'mm')"""
+    return registry.get(name)
+
+
+def models_for_queues(queues: List[str]) -> List[str]:
+    """워커가 구독하는 큐에서 쓰는 모델 목록 (큐 순서 유지, 중복 제거)"""
+    names = [QUEUE_MODELS[q] for q in queues if q in QUEUE_MODELS]
+    return list(dict.fromkeys(names))
+
+
+def preload_models(names: Optional[List[str]] = None, queues: Optional[List[str]] = None) -> None:
+    """
+    settings.MODEL_PRELOAD 에 지정된 모델 미리 로드
+
+    Args:
+        names: 미리 로드할 모델 (None 이면 MODEL_PRELOAD 설정 사용)
+        queues: 워커가 구독하는 큐 (MODEL_PRELOAD=auto 일 때 사용)
+    """
+    if names is None:
+        value = settings.MODEL_PRELOAD.strip()
+        if value.lower() == 'auto':
+            names = models_for_queues(queues or [])
+        else:
+            names = [n.strip() for n in value.split(',') if n.strip()]
+    if registry.max_models > 0 and len(names) > registry.max_models:
+        # 어차피 LRU 로 바로 밀려나므로 앞쪽 max_models 개만 로드
+        print(f"[ModelRegistry] Preload limited to {registry.max_models} of {names} (MODEL_REGISTRY_MAX_MODELS)")
+        names = names[:registry.max_models]
+    if not names:
+        print("[ModelRegistry] No models to preload (lazy loading)")
+        return
+    print(f"[ModelRegistry] Preloading models: {names}")
+    registry.preload(names)
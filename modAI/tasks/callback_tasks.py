@@ -0,0 +1,97 @@
+"""
+Callback Celery Tasks
+
+Django 결과 콜백 전송/재시도
+- 결과는 CallbackOutbox(on-disk spool)에 먼저 기록한 뒤 전송
+- 전송 실패 시 exponential backoff countdown으로 deliver_callback 재예약
+- 재시도는 spool 이 있는 호스트의 큐 (callback.<host>) 로 보냄 - 다른 호스트 워커는 파일이 없음
+- replay_outbox: beat 가 주기적으로 모든 워커에 broadcast, 각 호스트가 자기 spool 의 pending 엔트리 재전송
+"""
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.callback_outbox import CallbackOutbox, DELIVERED, RETRY, LOCKED, host_queue_name
+
+logger = get_task_logger(__name__)
+
+
+def _schedule_retry(job_id: str, entry: Optional[Dict[str, Any]]) -> None:
+    """outbox 엔트리의 next_attempt_at에 맞춰 deliver_callback 예약"""
+    if entry is None:
+        return
+    countdown = max(0.0, (entry.get('next_attempt_at') or time.time()) - time.time())
+    queue = entry.get('host_queue') or host_queue_name()
+    deliver_callback.apply_async(args=[job_id], countdown=countdown, queue=queue)
+    logger.info(f"[Callback] {job_id}: retry scheduled in {countdown:.0f}s (queue={queue})")
+
+
+def send_callback(
+    task,
+    job_id: str,
+    callback_url: str,
+    payload: Dict[str, Any],
+    timeout: float = 60.0,
+) -> str:
+    """
+    결과 콜백을 outbox에 등록하고 1회 즉시 전송 (실패 시 재시도 예약)
+
+    결과 파일은 호출 전에 spool_dir_for(job_id)에 기록되어 있어야 합니다.
+
+    Args:
+        task: 호출한 bound Celery task (원래 큐 기록용)
+        job_id: 추론 Job ID (idempotency key)
+        callback_url: resolve_callback_url 적용된 Django 콜백 URL
+        payload: {job_id, status, result_data | error_message}
+        timeout: 요청 타임아웃 (초)
+
+    Returns:
+        'delivered' | 'retry' | 'dead' | 'locked'
+    """
+    delivery_info = getattr(task.request, 'delivery_info', None) or {}
+    queue = delivery_info.get('routing_key')
+
+    outbox = CallbackOutbox()
+    outbox.enqueue(job_id, callback_url, payload, timeout=timeout, queue=queue)
+    outcome = outbox.deliver(job_id)
+
+    if outcome == RETRY:
+        _schedule_retry(job_id, outbox.load(job_id))
+    elif outcome != DELIVERED:
+        logger.error(f"[Callback] {job_id}: delivery outcome={outcome}")
+
+    return outcome
+
+
+@shared_task(name='tasks.callback_tasks.deliver_callback')
+def deliver_callback(job_id: str):
+    """outbox 엔트리 재전송 (실패 시 다음 backoff로 재예약)"""
+    outbox = CallbackOutbox()
+    outcome = outbox.deliver(job_id)
+
+    if outcome == RETRY:
+        _schedule_retry(job_id, outbox.load(job_id))
+    elif outcome == LOCKED:
+        # 다른 프로세스(replay CLI 등)가 전송 중 - 잠시 후 상태 재확인
+        entry = outbox.load(job_id)
+        if entry is not None:
+            entry['next_attempt_at'] = time.time() + 30
+            _schedule_retry(job_id, entry)
+
+    logger.info(f"[Callback] {job_id}: {outcome}")
+    return {'job_id': job_id, 'outcome': outcome}
+
+
+@shared_task(name='tasks.callback_tasks.replay_outbox')
+def replay_outbox():
+    """이 호스트 outbox 의 재시도 시각이 된 pending 엔트리 재전송 (beat → 모든 워커 broadcast)"""
+    counts = CallbackOutbox().replay()
+    if counts:
+        logger.info(f"[Callback] outbox replay: {counts}")
+    return counts
@@ -8,7 +8,6 @@ M1 MRI 추론을 위한 비동기 Celery task
 import os
 import time
 import logging
-import httpx
 from pathlib import Path
 from celery import shared_task
 from celery.utils.log import get_task_logger
@@ -16,8 +15,13 @@ from celery.utils.log import get_task_logger
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from services.m1_service import M1InferenceService
+from config import settings
+from services.model_registry import get_service
 from utils.orthanc_client import OrthancClient
+from utils.volume_cache import PreprocessedVolumeCache
+from utils.callback_client import cleanup_spool, spool_dir_for
+from utils.previews import write_m1_previews
+from tasks.callback_tasks import send_callback
 
 logger = get_task_logger(__name__)
 
@@ -95,28 +99,57 @@ def run_m1_inference(
         })
 
         orthanc = OrthancClient()
-        # 최적화된 Archive API 사용 (620 요청 → 4 요청)
-        dicom_data = orthanc.fetch_study_dicom_bytes_fast(study_uid, series_ids)
+        series_plan = orthanc.resolve_study_series(study_uid, series_ids)
 
         # 모달리티 확인
+        found_modalities = {item['modality'] for item in series_plan}
         for mod in ['T1', 'T1CE', 'T2', 'FLAIR']:
-            count = len(dicom_data.get(mod, []))
-            logger.info(f"[M1] {mod}: {count} slices")
-            if count == 0:
+            if mod not in found_modalities:
                 raise ValueError(f"Missing modality: {mod}")
 
-        self.update_state(state='PROCESSING', meta={
-            'progress': 30,
-            'status': 'DICOM 데이터 로드 완료, 전처리 중...'
-        })
-
-        # ============================================================
-        # 2. 전처리
-        # ============================================================
-        service = M1InferenceService()
-        preprocessed = service.preprocess(dicom_data, patient_id)
-
-        logger.info(f"[M1] Preprocessing complete: shape={preprocessed['image'].shape}")
+        # 프로세스 공유 모델 사용 (worker_process_init 에서 로드됨)
+        service = get_service('m1')
+
+        # 동일 Series/Instance + 동일 전처리 설정이면 캐시된 전처리 결과 사용
+        preprocess_start = time.time()
+        volume_cache = PreprocessedVolumeCache()
+        cache_key = volume_cache.make_key(series_plan, service.preprocessor.cache_signature())
+        preprocessed = volume_cache.get(cache_key)
+
+        if preprocessed is not None:
+            logger.info(f"[M1] Preprocess cache hit: {cache_key[:12]} (skip fetch/decode/resample)")
+            preprocessed['patient_id'] = patient_id
+
+            self.update_state(state='PROCESSING', meta={
+                'progress': 30,
+                'status': '전처리 캐시 사용 (DICOM 로드/전처리 생략)...'
+            })
+        else:
+            logger.info(f"[M1] Preprocess cache miss: {cache_key[:12]}")
+
+            # 최적화된 Archive API 사용 (620 요청 → 4 요청)
+            dicom_data = orthanc.fetch_series_plan_bytes(series_plan)
+
+            for mod in ['T1', 'T1CE', 'T2', 'FLAIR']:
+                count = len(dicom_data.get(mod, []))
+                logger.info(f"[M1] {mod}: {count} slices")
+                if count == 0:
+                    raise ValueError(f"Missing modality: {mod}")
+
+            self.update_state(state='PROCESSING', meta={
+                'progress': 30,
+                'status': 'DICOM 데이터 로드 완료, 전처리 중...'
+            })
+
+            # ============================================================
+            # 2. 전처리
+            # ============================================================
+            preprocessed = service.preprocess(dicom_data, patient_id)
+            del dicom_data
+            volume_cache.put(cache_key, preprocessed)
+
+        preprocess_time_ms = (time.time() - preprocess_start) * 1000
+        logger.info(f"[M1] Preprocessing complete: shape={preprocessed['image'].shape}, time={preprocess_time_ms:.1f}ms")
 
         self.update_state(state='PROCESSING', meta={
             'progress': 50,
@@ -140,15 +173,24 @@ def run_m1_inference(
         })
 
         # ============================================================
-        # 4. 결과 파일 내용 준비 (로컬 저장 없음, callback으로 전송)
+        # 4. 결과 파일 spool (NPZ를 디스크에 기록, callback으로 스트리밍 전송)
         # ============================================================
         processing_time = (time.time() - start_time) * 1000
         result['processing_time_ms'] = processing_time
 
-        # 파일 내용을 callback용으로 준비
-        files_data = service.prepare_results_for_callback(result, job_id)
+        cleanup_spool(job_id)  # 이전 재시도에서 남은 파일 제거
+        saved_files = service.save_results(result, job_id, storage_dir=settings.CALLBACK_SPOOL_DIR)
 
-        logger.info(f"[M1] Files prepared for callback: {list(files_data.keys())}")
+        logger.info(f"[M1] Files spooled for callback: {[v for k, v in saved_files.items() if k != 'job_id']}")
+
+        # 썸네일 / key slice 미리보기도 워커에서 렌더링해 함께 전송 (Django 는 파일만 옮김)
+        # 실패해도 추론은 성공 - Django 가 첫 조회 시 생성
+        try:
+            previews = write_m1_previews(result, spool_dir_for(job_id))
+            if previews:
+                logger.info(f"[M1] Previews spooled: {list(previews.keys())}")
+        except Exception as e:
+            logger.warning(f"[M1] Preview rendering failed: {e}")
 
         self.update_state(state='PROCESSING', meta={
             'progress': 90,
@@ -156,7 +198,7 @@ def run_m1_inference(
         })
 
         # ============================================================
-        # 5. Django callback (파일 내용 포함)
+        # 5. Django callback (multipart 스트리밍 전송)
         # ============================================================
         # Callback용 결과 데이터
         callback_result = {
@@ -168,6 +210,8 @@ def run_m1_inference(
             'mgmt': result.get('mgmt'),
             'survival': result.get('survival'),
             'processing_time_ms': processing_time,
+            'preprocess_cache_hit': bool(preprocessed.get('cache', {}).get('hit')),
+            'preprocess_time_ms': preprocess_time_ms,
         }
 
         # 세그멘테이션 볼륨 정보만 포함 (마스크/MRI 데이터 제외)
@@ -181,27 +225,23 @@ def run_m1_inference(
                 'ed_volume': seg.get('ed_volume', 0),
                 'mask_shape': seg.get('mask_shape', []),
                 'label_distribution': seg.get('label_distribution', {}),
+                'inference_mode': seg.get('inference_mode'),
+                'memory': seg.get('memory'),
             }
 
-        callback_data = {
+        callback_payload = {
             'job_id': job_id,
             'status': 'completed',
             'result_data': callback_result,
-            'files': files_data,  # 파일 내용 포함
         }
 
-        try:
-            resolved_callback_url = resolve_callback_url(callback_url)
-            response = httpx.post(
-                resolved_callback_url,
-                json=callback_data,
-                timeout=120.0  # NPZ 파일이 크므로 타임아웃 증가
-            )
-            response.raise_for_status()
-            logger.info(f"[M1] Callback sent successfully with {len(files_data)} files")
-        except httpx.HTTPError as e:
-            logger.error(f"[M1] Callback failed: {str(e)}")
-            # 콜백 실패 시 재시도하거나 에러 처리
+        # outbox(디스크)에 등록 후 전송 - 실패 시 backoff 재시도, 결과 재계산 불필요
+        resolved_callback_url = resolve_callback_url(callback_url)
+        callback_outcome = send_callback(
+            self, job_id, resolved_callback_url, callback_payload,
+            timeout=120.0  # NPZ 파일이 크므로 타임아웃 증가
+        )
+        logger.info(f"[M1] Callback {callback_outcome} ({len(saved_files) - 1} files)")
 
         logger.info(f"[M1] Inference completed: job_id={job_id}, time={processing_time:.1f}ms")
 
@@ -209,17 +249,19 @@ def run_m1_inference(
             'status': 'completed',
             'job_id': job_id,
             'processing_time_ms': processing_time,
+            'callback': callback_outcome,
         }
 
     except Exception as e:
         logger.error(f"[M1] Inference failed: {str(e)}", exc_info=True)
 
-        # Django에 실패 callback
+        # Django에 실패 callback (outbox 경유, 재시도 포함)
         try:
+            cleanup_spool(job_id)
             resolved_callback_url = resolve_callback_url(callback_url)
-            httpx.post(
-                resolved_callback_url,
-                json={
+            send_callback(
+                self, job_id, resolved_callback_url,
+                {
                     'job_id': job_id,
                     'status': 'failed',
                     'error_message': str(e),
@@ -9,10 +9,12 @@ Gene Expression 기반 추론 태스크
 import os
 import json
 import base64
-import httpx
 import numpy as np
 from celery import shared_task
 
+from utils.callback_client import write_spool_files, cleanup_spool
+from tasks.callback_tasks import send_callback
+
 
 def resolve_callback_url(callback_url: str) -> str:
     """
@@ -58,7 +60,7 @@ def run_mg_inference(
     2. 전처리 및 추론
     3. 결과를 callback으로 Django에 전송 (Django에서 저장)
     """
-    from services.mg_service import MGInferenceService
+    from services.model_registry import get_service
 
     def update_progress(progress: int, status: str):
         """진행 상태 업데이트"""
@@ -81,7 +83,7 @@ def run_mg_inference(
 
         # 2. MG 서비스 초기화 및 CSV 파싱
         update_progress(20, "Initializing MG service...")
-        service = MGInferenceService()
+        service = get_service('mg')  # 프로세스 공유 모델 (worker_process_init 에서 로드됨)
 
         update_progress(30, "Parsing gene expression data...")
         gene_data = service.load_csv_content(csv_content)  # 내용으로 직접 파싱
@@ -92,7 +94,8 @@ def run_mg_inference(
         result = service.predict(
             gene_expression=gene_data['gene_expression'],
             gene_names=gene_data['gene_names'],
-            include_visualizations=True
+            include_visualizations=True,
+            visualization_format='png'  # spool 에 바로 기록 (base64 인코딩/디코딩 생략)
         )
         print(f"  Inference complete: {result.get('processing_time_ms', 0):.1f}ms")
 
@@ -137,35 +140,35 @@ def run_mg_inference(
                 'type': 'json'
             }
 
-        # 시각화 이미지 (base64로 전송)
+        # 시각화 이미지 (PNG bytes 그대로 spool 에 기록)
         if 'visualizations' in result and result['visualizations']:
-            for viz_name, viz_base64 in result['visualizations'].items():
-                if viz_base64:
+            for viz_name, viz_png in result['visualizations'].items():
+                if viz_png:
                     files_data[f'mg_{viz_name}.png'] = {
-                        'content': viz_base64,
+                        'content': viz_png,
                         'type': 'png'
                     }
             print(f"  Prepared {len(result['visualizations'])} visualizations")
 
-        # 6. Django 콜백 (파일 내용 포함)
+        # 6. Django 콜백 (multipart 파일 전송)
         update_progress(90, "Sending callback...")
 
         # Docker 환경에서 localhost를 host.docker.internal로 변환
         resolved_callback_url = resolve_callback_url(callback_url)
 
-        callback_data = {
+        callback_payload = {
             'job_id': job_id,
             'status': 'completed',
             'result_data': result_data,
-            'files': files_data,  # 파일 내용 포함
         }
 
-        try:
-            response = httpx.post(resolved_callback_url, json=callback_data, timeout=60.0)
-            response.raise_for_status()
-            print(f"  Callback sent successfully with {len(files_data)} files")
-        except Exception as e:
-            print(f"  Warning: Callback failed: {e}")
+        # 파일은 spool에 기록 후 outbox 경유 multipart 전송 (실패 시 backoff 재시도)
+        cleanup_spool(job_id)
+        write_spool_files(job_id, files_data)
+        callback_outcome = send_callback(
+            self, job_id, resolved_callback_url, callback_payload, timeout=60.0
+        )
+        print(f"  Callback {callback_outcome} ({len(files_data)} files)")
 
         update_progress(100, "Complete")
         print(f"\n{'='*60}")
@@ -176,6 +179,7 @@ def run_mg_inference(
             'job_id': job_id,
             'status': 'completed',
             'result': result_data,
+            'callback': callback_outcome,
         }
 
     except Exception as e:
@@ -189,15 +193,16 @@ def run_mg_inference(
         print(f"  Traceback:\n{error_trace}")
         print(f"{'='*60}\n")
 
-        # 에러 콜백
+        # 에러 콜백 (outbox 경유, 재시도 포함)
         try:
+            cleanup_spool(job_id)
             resolved_callback_url = resolve_callback_url(callback_url)
             callback_data = {
                 'job_id': job_id,
                 'status': 'failed',
                 'error_message': error_msg,
             }
-            httpx.post(resolved_callback_url, json=callback_data, timeout=10.0)
+            send_callback(self, job_id, resolved_callback_url, callback_data, timeout=10.0)
         except Exception:
             pass
 
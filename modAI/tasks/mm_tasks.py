@@ -8,11 +8,12 @@ Multimodal (MRI + Gene + Protein) 추론을 위한 비동기 Celery task
 import os
 import time
 import json
-import httpx
 from celery import shared_task
 from celery.utils.log import get_task_logger
 
-from services.mm_service import MMInferenceService
+from services.model_registry import get_service
+from utils.callback_client import write_spool_files, cleanup_spool
+from tasks.callback_tasks import send_callback
 
 logger = get_task_logger(__name__)
 
@@ -116,9 +117,11 @@ def run_mm_inference(
         # ============================================================
         # 2. Protein CSV 파싱
         # ============================================================
+        # 프로세스 공유 모델 사용 (worker_process_init 에서 로드됨)
+        service = get_service('mm')
+
         protein_features = None
         if protein_data:
-            service = MMInferenceService()
             protein_features = service.parse_protein_csv(protein_data)
             logger.info(f"[MM] Protein features parsed: {len(protein_features)}-dim")
 
@@ -130,7 +133,6 @@ def run_mm_inference(
         # ============================================================
         # 3. MM 모델 추론
         # ============================================================
-        service = MMInferenceService()
         result = service.predict(
             mri_features=mri_features,
             gene_features=gene_features,
@@ -180,24 +182,20 @@ def run_mm_inference(
             'modalities_used': result.get('modalities_used', []),
         }
 
-        callback_data = {
+        callback_payload = {
             'job_id': job_id,
             'status': 'completed',
             'result_data': callback_result,
-            'files': files_data,
         }
 
-        try:
-            resolved_callback_url = resolve_callback_url(callback_url)
-            response = httpx.post(
-                resolved_callback_url,
-                json=callback_data,
-                timeout=60.0
-            )
-            response.raise_for_status()
-            logger.info(f"[MM] Callback sent successfully with {len(files_data)} files")
-        except httpx.HTTPError as e:
-            logger.error(f"[MM] Callback failed: {str(e)}")
+        # outbox(디스크)에 등록 후 전송 - 실패 시 backoff 재시도
+        resolved_callback_url = resolve_callback_url(callback_url)
+        cleanup_spool(job_id)
+        write_spool_files(job_id, files_data)
+        callback_outcome = send_callback(
+            self, job_id, resolved_callback_url, callback_payload, timeout=60.0
+        )
+        logger.info(f"[MM] Callback {callback_outcome} ({len(files_data)} files)")
 
         logger.info(f"[MM] Inference completed: job_id={job_id}, time={processing_time:.1f}ms")
 
@@ -205,17 +203,19 @@ def run_mm_inference(
             'status': 'completed',
             'job_id': job_id,
             'processing_time_ms': processing_time,
+            'callback': callback_outcome,
         }
 
     except Exception as e:
         logger.error(f"[MM] Inference failed: {str(e)}", exc_info=True)
 
-        # Django에 실패 callback
+        # Django에 실패 callback (outbox 경유, 재시도 포함)
         try:
+            cleanup_spool(job_id)
             resolved_callback_url = resolve_callback_url(callback_url)
-            httpx.post(
-                resolved_callback_url,
-                json={
+            send_callback(
+                self, job_id, resolved_callback_url,
+                {
                     'job_id': job_id,
                     'status': 'failed',
                     'error_message': str(e),
@@ -0,0 +1,110 @@
+"""
+M1 전처리 fused 리샘플링 검증
+
+fused_resample_crop_resize (grid_sample 1회) 결과가
+기존 2단계 경로 (scipy zoom → RAS flip → bbox crop → Resize) 와 수치적으로 일치하는지 확인
+
+Usage:
+    python -m pytest test_m1_resample.py -q
+    python test_m1_resample.py
+"""
+import numpy as np
+import torch
+
+from inference.m1_preprocess import (
+    fused_resample_crop_resize,
+    normalize_channels_separately,
+    resampled_shape,
+    two_stage_resample_crop_resize,
+)
+
+TARGET_SIZE = (64, 64, 64)
+
+
+def _phantom(shape, seed=0):
+    """ellipsoid 뇌 영역 + 부드러운 강도 변화를 가진 4채널 합성 볼륨 (H, W, D)"""
+    rng = np.random.default_rng(seed)
+    grids = np.meshgrid(*[np.linspace(-1, 1, n) for n in shape], indexing='ij')
+    # 중심을 벗어난 ellipsoid (flip 방향 오류를 잡기 위해 비대칭)
+    radius = ((grids[0] - 0.1) / 0.7) ** 2 + ((grids[1] + 0.15) / 0.6) ** 2 + (grids[2] / 0.8) ** 2
+    brain = (radius < 1.0).astype(np.float32)
+
+    volumes = []
+    for c in range(4):
+        texture = 0.5 + 0.5 * np.sin(3 * grids[0] + c) * np.cos(2 * grids[1] - c) * np.sin(grids[2] + 0.5 * c)
+        noise = rng.normal(0, 0.02, size=shape)
+        volumes.append(((texture + noise) * brain * (200 + 50 * c)).astype(np.float32))
+    return volumes
+
+
+def _compare(shape, spacing):
+    volumes = _phantom(shape)
+    spacings = [spacing] * 4
+
+    ref, ref_bbox, ref_shape = two_stage_resample_crop_resize(
+        volumes, spacings, target_size=TARGET_SIZE
+    )
+    fused, fused_bbox, fused_shape = fused_resample_crop_resize(
+        volumes, spacing, target_size=TARGET_SIZE
+    )
+
+    assert fused_shape == ref_shape == resampled_shape(shape, spacing)
+    assert fused.shape == ref.shape == (4,) + TARGET_SIZE
+
+    # bbox: 리샘플 좌표 변환 여유 1 voxel + 보간 경계 차이 1 voxel 이내
+    assert max(abs(a - b) for a, b in zip(fused_bbox, ref_bbox)) <= 2, (fused_bbox, ref_bbox)
+
+    ref_n = normalize_channels_separately(ref.float())
+    fused_n = normalize_channels_separately(fused.float())
+    diff = (ref_n - fused_n).abs()
+    return diff.mean().item(), torch.quantile(diff.flatten()[::7], 0.99).item()
+
+
+def test_fused_is_exact_on_linear_volume():
+    """
+    선형 보간은 선형 함수에서 오차가 없으므로, 좌표 합성이 정확하면 두 경로 결과가 일치해야 함
+    (전 영역이 foreground 가 되도록 offset 을 더해 bbox 도 동일하게 맞춤)
+    """
+    shape, spacing = (80, 70, 40), (0.9375, 0.8, 2.5)
+    grids = np.meshgrid(*[np.arange(n) for n in shape], indexing='ij')
+    volumes = [
+        (1000 + 0.3 * grids[0] + 0.7 * grids[1] + 2.0 * grids[2] + 10 * c).astype(np.float32)
+        for c in range(4)
+    ]
+
+    ref, ref_bbox, _ = two_stage_resample_crop_resize(volumes, [spacing] * 4, target_size=TARGET_SIZE)
+    fused, fused_bbox, _ = fused_resample_crop_resize(volumes, spacing, target_size=TARGET_SIZE)
+
+    assert fused_bbox == ref_bbox
+    assert (ref - fused).abs().max().item() < 1e-3
+
+
+def test_fused_matches_two_stage_without_resample():
+    """spacing 이 이미 1mm 이면 보간 1회로 동일 → 부동소수점 오차 수준"""
+    mean_err, p99_err = _compare((60, 70, 50), (1.0, 1.0, 1.0))
+    assert mean_err < 1e-4
+    assert p99_err < 1e-3
+
+
+def test_fused_matches_two_stage_anisotropic():
+    """
+    비등방 spacing: 2단계 경로는 보간을 두 번 하므로 경계/노이즈가 더 흐려짐
+    → 정규화 강도 평균 오차 2.5% 이내
+    """
+    mean_err, _ = _compare((80, 80, 40), (0.9375, 0.9375, 2.5))
+    assert mean_err < 0.025
+
+
+def test_fused_matches_two_stage_downsample():
+    mean_err, _ = _compare((140, 140, 90), (0.5, 0.5, 1.2))
+    assert mean_err < 0.025
+
+
+if __name__ == "__main__":
+    for name, shape, spacing in [
+        ("1mm", (60, 70, 50), (1.0, 1.0, 1.0)),
+        ("anisotropic", (80, 80, 40), (0.9375, 0.9375, 2.5)),
+        ("downsample", (140, 140, 90), (0.5, 0.5, 1.2)),
+    ]:
+        mean_err, p99_err = _compare(shape, spacing)
+        print(f"{name}: mean abs err={mean_err:.5f}, p99={p99_err:.5f}")
@@ -0,0 +1,218 @@
+"""
+Orthanc fetch 검증 / 벤치마크
+
+로컬 Orthanc stand-in (ThreadingHTTPServer) 으로 OrthancClient / AsyncOrthancClient 의
+Study fetch 결과와 처리량 측정
+- /studies/{id}/series, /series/{id}, /series/{id}/archive, /instances/{id}/file 만 구현
+- 응답 지연 (--latency) 으로 네트워크 왕복 비용 흉내
+
+Usage:
+    python -m pytest test_orthanc_fetch.py -q
+    python test_orthanc_fetch.py --slices 155 --slice-kb 128 --latency 0.005
+"""
+import io
+import json
+import os
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils.async_orthanc_client import AsyncOrthancClient, run_sync
+from utils.orthanc_client import OrthancClient
+
+MODALITIES = {'T1': 't1', 'T1CE': 't1ce', 'T2': 't2', 'FLAIR': 'flair'}
+
+
+class OrthancStandIn:
+    """4개 모달리티 Series 를 가진 Study 1개를 제공하는 최소 Orthanc 대역"""
+
+    def __init__(self, slices: int = 20, slice_kb: int = 16, latency: float = 0.0):
+        self.latency = latency
+        self.study_id = 'study-0001'
+        self.series = {}
+        self.instances = {}
+        self.archives = {}
+        self.request_count = 0
+
+        for modality, desc in MODALITIES.items():
+            series_id = f'series-{desc}'
+            instance_ids = []
+            buffer = io.BytesIO()
+            with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as zf:
+                for i in range(slices):
+                    instance_id = f'{series_id}-{i:04d}'
+                    # 내용에 모달리티/슬라이스 번호를 넣어 결과 검증에 사용
+                    content = f'{modality}:{i:04d}:'.encode() + os.urandom(slice_kb * 1024)
+                    self.instances[instance_id] = content
+                    instance_ids.append(instance_id)
+                    zf.writestr(f'{series_id}/{instance_id}.dcm', content)
+            self.archives[series_id] = buffer.getvalue()
+            self.series[series_id] = {
+                'ID': series_id,
+                'MainDicomTags': {
+                    'SeriesDescription': desc,
+                    'SeriesInstanceUID': f'1.2.3.{len(self.series)}',
+                },
+                'Instances': instance_ids,
+                'LastUpdate': '20250101T000000',
+            }
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f'http://{host}:{port}'
+
+    def expected(self):
+        """{modality: [bytes]} (Series 내 Instance 순서)"""
+        return {
+            modality: [self.instances[iid] for iid in self.series[f'series-{desc}']['Instances']]
+            for modality, desc in MODALITIES.items()
+        }
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, body: bytes, content_type: str = 'application/json', status: int = 200):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                standin.request_count += 1
+                if standin.latency:
+                    time.sleep(standin.latency)
+
+                parts = self.path.strip('/').split('/')
+                if parts[:1] == ['system']:
+                    return self._send(b'{}')
+                if parts[:1] == ['studies'] and parts[2:] == ['series'] and parts[1] == standin.study_id:
+                    return self._send(json.dumps(list(standin.series.values())).encode())
+                if parts[:1] == ['series'] and parts[1] in standin.series:
+                    if parts[2:] == ['archive']:
+                        return self._send(standin.archives[parts[1]], 'application/zip')
+                    return self._send(json.dumps(standin.series[parts[1]]).encode())
+                if parts[:1] == ['instances'] and parts[2:] == ['file'] and parts[1] in standin.instances:
+                    return self._send(standin.instances[parts[1]], 'application/dicom')
+                return self._send(b'{}', status=404)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                self.rfile.read(length)
+                return self._send(b'[]')
+
+        return Handler
+
+
+@pytest.fixture
+def orthanc_standin():
+    standin = OrthancStandIn(slices=12, slice_kb=8).start()
+    yield standin
+    standin.stop()
+
+
+def _sorted(dicom_data):
+    return {mod: sorted(data) for mod, data in dicom_data.items()}
+
+
+def test_sync_fast_fetch_matches_standin(orthanc_standin):
+    client = OrthancClient(base_url=orthanc_standin.url)
+    dicom_data = client.fetch_study_dicom_bytes_fast(orthanc_standin.study_id)
+    assert _sorted(dicom_data) == _sorted(orthanc_standin.expected())
+
+
+def test_sync_instance_fetch_keeps_order(orthanc_standin):
+    client = OrthancClient(base_url=orthanc_standin.url)
+    dicom_data = client.fetch_study_dicom_bytes(orthanc_standin.study_id)
+    assert dicom_data == orthanc_standin.expected()
+
+
+def test_async_fetch_matches_standin(orthanc_standin):
+    client = AsyncOrthancClient(base_url=orthanc_standin.url, max_concurrency=4)
+    fast = run_sync(client.fetch_study_dicom_bytes_fast(orthanc_standin.study_id))
+    by_instance = run_sync(client.fetch_study_dicom_bytes(orthanc_standin.study_id))
+    assert _sorted(fast) == _sorted(orthanc_standin.expected())
+    assert by_instance == orthanc_standin.expected()
+
+
+def test_resolve_study_series_sync_async_agree(orthanc_standin):
+    sync_plan = OrthancClient(base_url=orthanc_standin.url).resolve_study_series(orthanc_standin.study_id)
+    async_plan = run_sync(
+        AsyncOrthancClient(base_url=orthanc_standin.url).resolve_study_series(orthanc_standin.study_id)
+    )
+    assert sync_plan == async_plan
+    assert {item['modality'] for item in sync_plan} == set(MODALITIES)
+
+
+def test_default_clients_share_concurrency_limit():
+    async def semaphores():
+        return AsyncOrthancClient().semaphore, AsyncOrthancClient().semaphore
+
+    first, second = run_sync(semaphores())
+    assert first is second
+
+
+def _bench(label, fn, total_bytes, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    best = min(times)
+    print(f"{label:<44} best {best * 1000:8.1f} ms  {total_bytes / best / (1024 * 1024):8.1f} MB/s")
+
+
+def _legacy_instance_fetch(standin):
+    """기존 방식: 요청마다 새 연결 + Instance 순차 다운로드"""
+    import httpx
+    auth = ('orthanc', 'orthanc')
+    for series in standin.series.values():
+        for iid in series['Instances']:
+            httpx.get(f"{standin.url}/instances/{iid}/file", auth=auth, timeout=60.0).content
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Orthanc fetch benchmark (local stand-in)')
+    parser.add_argument('--slices', type=int, default=155)
+    parser.add_argument('--slice-kb', type=int, default=128)
+    parser.add_argument('--latency', type=float, default=0.002, help='요청당 서버 지연 (초)')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    standin = OrthancStandIn(args.slices, args.slice_kb, args.latency).start()
+    total = sum(len(b) for b in standin.instances.values())
+    print(f"Stand-in: 4 series x {args.slices} slices x {args.slice_kb} KB "
+          f"({total / (1024 * 1024):.1f} MB), latency {args.latency * 1000:.1f} ms/request\n")
+
+    sync_client = OrthancClient(base_url=standin.url)
+    async_client = AsyncOrthancClient(base_url=standin.url)
+    try:
+        _bench("legacy instance fetch (new conn/request)", lambda: _legacy_instance_fetch(standin), total, args.repeat)
+        _bench("OrthancClient.fetch_study_dicom_bytes", lambda: sync_client.fetch_study_dicom_bytes(standin.study_id), total, args.repeat)
+        _bench("OrthancClient.fetch_study_dicom_bytes_fast", lambda: sync_client.fetch_study_dicom_bytes_fast(standin.study_id), total, args.repeat)
+        _bench("AsyncOrthancClient (archive)", lambda: run_sync(async_client.fetch_study_dicom_bytes_fast(standin.study_id)), total, args.repeat)
+    finally:
+        standin.stop()
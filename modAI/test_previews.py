@@ -0,0 +1,55 @@
+"""
+M1 미리보기 렌더링 규칙 검증
+
+Django apps/ai_inference/tests.py PreviewRenderTest 와 같은 입력/기대값
+(워커에서 렌더링한 미리보기와 Django fallback 이 같은 이미지여야 함)
+
+Usage:
+    python -m pytest test_previews.py -q
+"""
+import io
+import json
+
+import numpy as np
+from PIL import Image
+
+from utils.previews import PREVIEW_FORMAT, PREVIEWS_FILENAME, key_slice, render_overlay, write_m1_previews
+
+MRI = [[0, 0.5, 1], [1, 0.5, 0]]
+SEG = [[0, 1, 2], [3, 4, 0]]
+# 상하 반전, 1=NCR 빨강 / 2=ED 노랑 / 3=ET 초록, 4 는 M1 마스크에 없음 (칠하지 않음)
+EXPECTED = [
+    [[177, 255, 177], [127, 127, 127], [0, 0, 0]],
+    [[0, 0, 0], [191, 113, 113], [255, 255, 177]],
+]
+
+
+def test_overlay_pixels():
+    png = render_overlay(np.array(MRI), np.array(SEG))
+    np.testing.assert_array_equal(np.asarray(Image.open(io.BytesIO(png))), EXPECTED)
+
+
+def test_key_slice():
+    seg = np.zeros((4, 5, 6), dtype=np.uint8)
+    seg[1, :3, 2] = 3
+    seg[1:3, 4, 4] = 1
+    assert [key_slice(seg, axis) for axis in range(3)] == [1, 4, 2]
+    assert key_slice(np.zeros((4, 5, 6)), 2) == 3
+
+
+def test_write_m1_previews(tmp_path):
+    seg = np.zeros((4, 5, 6), dtype=np.uint8)
+    seg[1, :3, 2] = 3
+    result = {
+        'segmentation': {'visualization': {'prediction': seg}},
+        'preprocessed_mri': {'t1ce': np.random.default_rng(0).random(seg.shape).astype(np.float16)},
+    }
+    previews = write_m1_previews(result, tmp_path)
+
+    assert set(previews) == {'thumbnail', 'sagittal', 'coronal', 'axial'}
+    assert previews['thumbnail'] == {'file': 'm1_preview_thumbnail.png', 'axis': 'axial', 'index': 3}
+    assert previews['axial']['index'] == 2
+    with open(tmp_path / PREVIEWS_FILENAME, encoding='utf-8') as f:
+        assert json.load(f) == {'format': PREVIEW_FORMAT, 'previews': previews}
+    for info in previews.values():
+        assert (tmp_path / info['file']).read_bytes().startswith(b'\x89PNG')
@@ -0,0 +1,310 @@
+"""
+Async Orthanc DICOM Client
+
+프로세스 공유 httpx.AsyncClient 기반 Orthanc 클라이언트
+- keep-alive connection pool + HTTP/2 (h2 설치 시), ORTHANC_MAX_CONNECTIONS
+- 동시 요청 수 제한 (ORTHANC_MAX_CONCURRENCY, 공유 AsyncClient 와 함께 쓰는 프로세스 공유 asyncio.Semaphore)
+- Series Archive ZIP 은 SpooledTemporaryFile 로 스트리밍 (ORTHANC_SPOOL_MAX_MB 초과분은 디스크)
+
+Celery task 등 동기 코드에서는 run_sync() 로 호출:
+    client = AsyncOrthancClient()
+    dicom_data = run_sync(client.fetch_study_dicom_bytes_fast(study_uid))
+
+run_sync 는 프로세스당 하나의 백그라운드 이벤트 루프를 사용하므로
+connection pool 이 태스크 간에 재사용됩니다. (fork 후 자식 프로세스에서는 새로 생성)
+"""
+import asyncio
+import logging
+import os
+import tempfile
+import threading
+import time
+import weakref
+import zipfile
+from typing import Any, Coroutine, Dict, List, Optional
+
+import httpx
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import settings
+from utils.orthanc_client import OrthancClient
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+try:
+    import h2  # noqa: F401
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
+
+
+# ============================================================
+# Background event loop (동기 코드용)
+# ============================================================
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_pid: Optional[int] = None
+_loop_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """프로세스 단위 백그라운드 이벤트 루프 (prefork 자식에서는 새로 시작)"""
+    global _loop, _loop_pid
+    with _loop_lock:
+        if _loop is None or _loop_pid != os.getpid() or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            _loop_pid = os.getpid()
+            thread = threading.Thread(
+                target=_loop.run_forever, name='orthanc-async-loop', daemon=True
+            )
+            thread.start()
+        return _loop
+
+
+def run_sync(coro: Coroutine, timeout: Optional[float] = None) -> Any:
+    """코루틴을 백그라운드 루프에서 실행하고 결과 반환 (동기 코드용)"""
+    future = asyncio.run_coroutine_threadsafe(coro, _get_background_loop())
+    return future.result(timeout)
+
+
+# ============================================================
+# Shared AsyncClient
+# ============================================================
+
+# 이벤트 루프별 AsyncClient / Semaphore (connection pool 과 Semaphore 는 루프에 묶임)
+# 동기 코드는 모두 run_sync 의 프로세스당 루프 하나를 쓰므로 사실상 프로세스 단위 제한
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """현재 이벤트 루프의 공유 AsyncClient (없으면 생성)"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        http2 = settings.ORTHANC_HTTP2 and H2_AVAILABLE
+        if settings.ORTHANC_HTTP2 and not H2_AVAILABLE:
+            logger.warning("[AsyncOrthancClient] h2 not installed, using HTTP/1.1")
+        client = httpx.AsyncClient(
+            http2=http2,
+            timeout=settings.ORTHANC_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=settings.ORTHANC_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.ORTHANC_MAX_CONNECTIONS,
+            ),
+        )
+        _clients[loop] = client
+    return client
+
+
+def get_shared_semaphore() -> asyncio.Semaphore:
+    """공유 AsyncClient 요청 전체에 걸리는 동시 요청 제한 (ORTHANC_MAX_CONCURRENCY)"""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(settings.ORTHANC_MAX_CONCURRENCY)
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+class AsyncOrthancClient:
+    """Orthanc DICOM 서버 비동기 클라이언트"""
+
+    MODALITY_KEYWORDS = OrthancClient.MODALITY_KEYWORDS
+    SKIP_KEYWORDS = OrthancClient.SKIP_KEYWORDS
+    _identify_modality = OrthancClient._identify_modality
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.base_url = base_url or settings.ORTHANC_URL
+        self.auth = (
+            username or settings.ORTHANC_USER,
+            password or settings.ORTHANC_PASSWORD,
+        )
+        # max_concurrency / client 를 따로 지정한 경우만 인스턴스 전용 제한 (테스트 등)
+        self.max_concurrency = max_concurrency or settings.ORTHANC_MAX_CONCURRENCY
+        self._private_limit = max_concurrency is not None or client is not None
+        self._client = client
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client or get_async_http_client()
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # 기본은 공유 AsyncClient 와 같은 프로세스 공유 Semaphore (인스턴스가 여러 개여도 합산 제한)
+        if not self._private_limit:
+            return get_shared_semaphore()
+        # 실행 중인 루프에서 생성 (생성자 호출 시점에는 루프가 없을 수 있음)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _get(self, path: str) -> httpx.Response:
+        """GET 요청 (동시 요청 수 제한)"""
+        async with self.semaphore:
+            response = await self.client.get(f"{self.base_url}{path}", auth=self.auth)
+        response.raise_for_status()
+        return response
+
+    async def _post(self, path: str, data: str = None) -> httpx.Response:
+        """POST 요청"""
+        async with self.semaphore:
+            response = await self.client.post(f"{self.base_url}{path}", auth=self.auth, content=data)
+        response.raise_for_status()
+        return response
+
+    async def health_check(self) -> bool:
+        """Orthanc 서버 연결 확인"""
+        try:
+            response = await self._get("/system")
+            return response.status_code == 200
+        except Exception:
+            return False
+
+    async def fetch_study_series(self, study_uid: str) -> List[Dict]:
+        """Study의 모든 Series 정보 조회 (Orthanc Study ID 또는 Study UID)"""
+        try:
+            response = await self._get(f"/studies/{study_uid}/series")
+            return response.json()
+        except httpx.HTTPStatusError:
+            pass
+
+        response = await self._post("/tools/lookup", data=study_uid)
+        lookup_result = response.json()
+        if not lookup_result:
+            raise ValueError(f"Study not found: {study_uid}")
+
+        study_id = lookup_result[0]['ID']
+        response = await self._get(f"/studies/{study_id}/series")
+        return response.json()
+
+    async def resolve_study_series(
+        self,
+        study_uid: str,
+        series_ids: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        """
+        Study에서 모달리티별 Series 식별 (OrthancClient.resolve_study_series 와 동일한 결과)
+
+        Series 정보 조회는 동시에 수행하고, 모달리티 중복은 Series 순서대로 판정
+        """
+        if not series_ids:
+            series_list = await self.fetch_study_series(study_uid)
+            series_ids = [s if isinstance(s, str) else s.get('ID') for s in series_list]
+        series_ids = [s for s in series_ids if s]
+
+        infos = await asyncio.gather(*[self._get(f"/series/{sid}") for sid in series_ids])
+
+        series_plan = []
+        found = set()
+        for series_id, response in zip(series_ids, infos):
+            info = response.json()
+            main_tags = info.get("MainDicomTags", {})
+            modality = self._identify_modality(main_tags.get("SeriesDescription", ""))
+            if modality and modality not in found:
+                found.add(modality)
+                series_plan.append({
+                    'series_id': series_id,
+                    'modality': modality,
+                    'series_uid': main_tags.get("SeriesInstanceUID", ""),
+                    'instances': info.get("Instances", []),
+                    'last_update': info.get("LastUpdate", ""),
+                })
+        return series_plan
+
+    async def fetch_series_archive(self, series_id: str) -> List[bytes]:
+        """
+        Series Archive ZIP 을 SpooledTemporaryFile 로 스트리밍 후 DICOM bytes 추출
+
+        ZIP 전체를 response.content 로 버퍼링하지 않음
+        """
+        max_size = settings.ORTHANC_SPOOL_MAX_MB * 1024 * 1024
+        with tempfile.SpooledTemporaryFile(max_size=max_size) as spool:
+            async with self.semaphore:
+                async with self.client.stream(
+                    'GET', f"{self.base_url}/series/{series_id}/archive", auth=self.auth
+                ) as response:
+                    response.raise_for_status()
+                    async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                        spool.write(chunk)
+
+            spool.seek(0)
+            # ZIP 해제는 CPU 작업이므로 루프를 막지 않도록 스레드에서 수행
+            return await asyncio.to_thread(_extract_dicom_members, spool)
+
+    async def fetch_series_plan_bytes(self, series_plan: List[Dict]) -> Dict[str, List[bytes]]:
+        """resolve_study_series 결과의 Series Archive 동시 다운로드"""
+        dicom_data = {"T1": [], "T1CE": [], "T2": [], "FLAIR": []}
+
+        results = await asyncio.gather(
+            *[self.fetch_series_archive(item['series_id']) for item in series_plan],
+            return_exceptions=True,
+        )
+        for item, result in zip(series_plan, results):
+            modality = item['modality']
+            if isinstance(result, Exception):
+                print(f"    -> {modality}: ERROR - {str(result)}")
+                continue
+            dicom_data[modality] = result
+            print(f"    -> {modality}: {len(result)} slices fetched")
+
+        return dicom_data
+
+    async def fetch_study_dicom_bytes_fast(
+        self,
+        study_uid: str,
+        series_ids: Optional[List[str]] = None,
+    ) -> Dict[str, List[bytes]]:
+        """Study DICOM fetch (Series Archive 단위, 동시 다운로드)"""
+        start_time = time.time()
+        print(f"[AsyncOrthancClient] Fetching DICOM for study: {study_uid}")
+
+        series_plan = await self.resolve_study_series(study_uid, series_ids)
+        dicom_data = await self.fetch_series_plan_bytes(series_plan)
+
+        print(f"[AsyncOrthancClient] DICOM fetch completed in {time.time() - start_time:.2f}s")
+        return dicom_data
+
+    async def fetch_study_dicom_bytes(
+        self,
+        study_uid: str,
+        series_ids: Optional[List[str]] = None,
+    ) -> Dict[str, List[bytes]]:
+        """Study DICOM fetch (Instance 단위, 동시 다운로드 - Archive API 를 쓸 수 없을 때)"""
+        series_plan = await self.resolve_study_series(study_uid, series_ids)
+        dicom_data = {"T1": [], "T1CE": [], "T2": [], "FLAIR": []}
+
+        for item in series_plan:
+            dicom_data[item['modality']] = await self.fetch_instances(item['instances'])
+
+        return dicom_data
+
+    async def fetch_instances(self, instance_ids: List[str]) -> List[bytes]:
+        """Instance DICOM 파일 동시 다운로드 (순서 유지)"""
+        responses = await asyncio.gather(
+            *[self._get(f"/instances/{iid}/file") for iid in instance_ids]
+        )
+        return [r.content for r in responses]
+
+
+def _extract_dicom_members(fileobj) -> List[bytes]:
+    """Archive ZIP 에서 DICOM 파일만 추출 (OrthancClient._fetch_series_archive 와 같은 규칙)"""
+    dcm_bytes_list = []
+    with zipfile.ZipFile(fileobj) as zf:
+        for name in zf.namelist():
+            if name.endswith('.dcm') or '.' not in name.split('/')[-1]:
+                dcm_bytes_list.append(zf.read(name))
+    return dcm_bytes_list
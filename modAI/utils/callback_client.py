@@ -0,0 +1,131 @@
+"""
+Callback Client
+
+modAI → Django 결과 전송 (multipart/form-data 스트리밍)
+- 결과 파일은 먼저 디스크 spool (CALLBACK_SPOOL_DIR/<job_id>/)에 기록
+- 전송 시 파일 파트로 chunk 단위 스트리밍 (base64/JSON 내장 없음)
+- payload 필드: {job_id, status, result_data, files: {filename: {type, size, sha256}}}
+- Django는 CDSS_AI_STORAGE/<job_id>/ 에 기록하며 SHA-256으로 무결성 검증
+"""
+import hashlib
+import json
+import shutil
+from pathlib import Path
+from typing import Any, Dict
+
+import httpx
+
+from config import settings
+
+CHUNK_SIZE = 1024 * 1024
+
+CONTENT_TYPES = {
+    'json': 'application/json',
+    'npz': 'application/octet-stream',
+    'npy': 'application/octet-stream',
+    'png': 'image/png',
+}
+
+
+def spool_dir_for(job_id: str) -> Path:
+    """job_id별 spool 디렉토리"""
+    return Path(settings.CALLBACK_SPOOL_DIR) / job_id
+
+
+def write_spool_files(job_id: str, files_data: Dict[str, Dict[str, Any]]) -> Path:
+    """
+    메모리상의 결과 파일({filename: {content, type}})을 spool 디렉토리에 기록
+
+    - json: 문자열 (또는 dict/list 를 직렬화해서) 그대로 기록
+    - 그 외 (png/npz 등): bytes 그대로 기록 (base64 중간 복사본 없음)
+    """
+    spool_dir = spool_dir_for(job_id)
+    spool_dir.mkdir(parents=True, exist_ok=True)
+
+    for filename, file_info in files_data.items():
+        content = file_info.get('content')
+        file_path = spool_dir / Path(filename).name
+        if file_info.get('type') == 'json':
+            if not isinstance(content, str):
+                content = json.dumps(content, ensure_ascii=False, indent=2, default=str)
+            file_path.write_text(content, encoding='utf-8')
+        elif isinstance(content, (bytes, bytearray, memoryview)):
+            file_path.write_bytes(content)
+        else:
+            raise TypeError(f"{filename}: binary spool content must be bytes, got {type(content).__name__}")
+
+    return spool_dir
+
+
+def sha256_file(path: Path) -> str:
+    """파일 SHA-256 (chunk 단위)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_manifest(spool_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """spool 디렉토리의 파일 목록 → {filename: {type, size, sha256}}"""
+    manifest = {}
+    if not spool_dir.exists():
+        return manifest
+    for path in sorted(spool_dir.iterdir()):
+        # '_' 로 시작하는 파일은 outbox 메타데이터 (전송 대상 아님)
+        if not path.is_file() or path.name.startswith('_'):
+            continue
+        manifest[path.name] = {
+            'type': path.suffix.lstrip('.') or 'binary',
+            'size': path.stat().st_size,
+            'sha256': sha256_file(path),
+        }
+    return manifest
+
+
+def post_multipart_callback(
+    callback_url: str,
+    payload: Dict[str, Any],
+    spool_dir: Path,
+    timeout: float = 120.0,
+) -> httpx.Response:
+    """
+    결과 payload + spool 파일을 multipart/form-data로 전송
+
+    Args:
+        callback_url: Django 콜백 URL (resolve_callback_url 적용된 값)
+        payload: {job_id, status, result_data}
+        spool_dir: 전송할 파일이 있는 디렉토리
+        timeout: 요청 타임아웃 (초)
+
+    Raises:
+        httpx.HTTPError: 전송 실패 또는 Django가 4xx/5xx 응답 (무결성 실패 포함)
+    """
+    manifest = build_manifest(spool_dir)
+    payload = dict(payload, files=manifest)
+
+    handles = []
+    try:
+        multipart_files = []
+        for filename, info in manifest.items():
+            handle = open(spool_dir / filename, 'rb')
+            handles.append(handle)
+            content_type = CONTENT_TYPES.get(info['type'], 'application/octet-stream')
+            multipart_files.append(('files', (filename, handle, content_type)))
+
+        response = httpx.post(
+            callback_url,
+            data={'payload': json.dumps(payload, ensure_ascii=False, default=str)},
+            files=multipart_files,
+            timeout=timeout,
+        )
+        response.raise_for_status()
+        return response
+    finally:
+        for handle in handles:
+            handle.close()
+
+
+def cleanup_spool(job_id: str) -> None:
+    """전송 완료된 spool 디렉토리 삭제"""
+    shutil.rmtree(spool_dir_for(job_id), ignore_errors=True)
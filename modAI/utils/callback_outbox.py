@@ -0,0 +1,318 @@
+"""
+Callback Outbox
+
+modAI → Django 결과 전송의 durable outbox (on-disk spool)
+- 엔트리: CALLBACK_SPOOL_DIR/<job_id>/_outbox.json + 결과 파일들
+- job_id 당 하나의 엔트리 (idempotency_key = "<job_id>:<status>")
+- 전송 실패 시 exponential backoff 로 재시도, CALLBACK_MAX_ATTEMPTS 초과 시 dead 상태로 보존
+  (Django 가 4xx 로 거절하면 (408/429 제외) 재시도해도 같으므로 바로 dead)
+- Django 재시작 중에도 결과는 디스크에 남아 재계산 없이 재전송 가능
+- spool 은 워커 호스트 로컬 디스크 → 재시도는 host_queue_name() 큐로 보내 같은 호스트에서 처리
+- beat 가 CALLBACK_REPLAY_INTERVAL_SECONDS 마다 replay_outbox 를 모든 워커에 broadcast
+  (재시도 예약이 유실되어도 pending 엔트리는 주기적으로 재전송됨)
+
+CLI:
+    python -m utils.callback_outbox stats
+    python -m utils.callback_outbox replay            # 재시도 시각이 된 pending 엔트리 전송
+    python -m utils.callback_outbox replay --all      # dead 포함 전체 즉시 전송
+    python -m utils.callback_outbox replay --job ai_req_0001
+"""
+import json
+import os
+import random
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import settings
+from utils.callback_client import spool_dir_for, post_multipart_callback, cleanup_spool
+
+ENTRY_FILENAME = '_outbox.json'
+LOCK_FILENAME = '_outbox.lock'
+
+STATE_PENDING = 'pending'
+STATE_DEAD = 'dead'
+
+# deliver() 결과
+DELIVERED = 'delivered'
+RETRY = 'retry'
+DEAD = 'dead'
+MISSING = 'missing'
+LOCKED = 'locked'
+
+# 4xx 중 재시도하면 성공할 수 있는 응답 (Request Timeout / Too Many Requests)
+RETRYABLE_CLIENT_ERRORS = (408, 429)
+
+
+def host_queue_name(host_id: Optional[str] = None) -> str:
+    """이 호스트의 spool 을 처리하는 워커만 구독하는 Celery 큐 이름"""
+    return f"callback.{host_id or settings.CALLBACK_HOST_ID}"
+
+
+def backoff_seconds(attempts: int) -> float:
+    """attempts 회 실패 후 다음 재시도까지 대기 시간 (±20% jitter)"""
+    delay = min(
+        settings.CALLBACK_BACKOFF_MAX_SECONDS,
+        settings.CALLBACK_BACKOFF_BASE_SECONDS * (2 ** max(0, attempts - 1)),
+    )
+    return delay * random.uniform(0.8, 1.2)
+
+
+class CallbackOutbox:
+    """on-disk callback outbox"""
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root or settings.CALLBACK_SPOOL_DIR)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    # ------------------------------------------------------------
+    # Entry I/O
+    # ------------------------------------------------------------
+    def _entry_path(self, job_id: str) -> Path:
+        return self.root / job_id / ENTRY_FILENAME
+
+    def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        path = self._entry_path(job_id)
+        if not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        path = self._entry_path(entry['job_id'])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False, default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @contextmanager
+    def _lock(self, job_id: str):
+        """같은 job_id 동시 전송 방지 (fcntl 없는 환경에서는 no-op)"""
+        if fcntl is None:
+            yield True
+            return
+        lock_path = self.root / job_id / LOCK_FILENAME
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(lock_path, 'w') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    # ------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------
+    def enqueue(
+        self,
+        job_id: str,
+        callback_url: str,
+        payload: Dict[str, Any],
+        timeout: float = 60.0,
+        queue: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        콜백 엔트리 등록 (결과 파일은 spool_dir_for(job_id)에 미리 기록되어 있어야 함)
+
+        같은 job_id로 다시 등록하면 기존 엔트리를 덮어씀 (재시도 횟수 초기화)
+        """
+        idempotency_key = f"{job_id}:{payload.get('status')}"
+        entry = {
+            'job_id': job_id,
+            'idempotency_key': idempotency_key,
+            'callback_url': callback_url,
+            'payload': dict(payload, idempotency_key=idempotency_key),
+            'timeout': timeout,
+            'queue': queue,
+            'host_queue': host_queue_name(),
+            'state': STATE_PENDING,
+            'attempts': 0,
+            'created_at': time.time(),
+            'next_attempt_at': time.time(),
+            'last_error': None,
+        }
+        self._write(entry)
+        return entry
+
+    def deliver(self, job_id: str) -> str:
+        """
+        엔트리 1건 전송 시도
+
+        Returns:
+            'delivered' | 'retry' | 'dead' | 'missing' | 'locked'
+        """
+        # 이미 전송되어 spool 이 삭제된 job 에 lock 파일만 다시 만들지 않도록 먼저 확인
+        if not self._entry_path(job_id).exists():
+            return MISSING
+
+        with self._lock(job_id) as acquired:
+            if not acquired:
+                return LOCKED
+
+            entry = self.load(job_id)
+            outcome = MISSING if entry is None else self._attempt(entry)
+
+        if outcome == MISSING:
+            # lock 을 기다리는 사이 다른 프로세스가 전송 완료 → lock 파일만 남은 디렉토리 정리
+            self._remove_stale_lock(job_id)
+            return MISSING
+        if outcome == DELIVERED:
+            cleanup_spool(job_id)
+            print(f"[Outbox] {job_id}: delivered (attempt {entry['attempts'] + 1})")
+        return outcome
+
+    def _attempt(self, entry: Dict[str, Any]) -> str:
+        """전송 1회 (실패 시 엔트리 상태 갱신) - lock 안에서 호출"""
+        job_id = entry['job_id']
+        try:
+            post_multipart_callback(
+                entry['callback_url'],
+                entry['payload'],
+                spool_dir_for(job_id),
+                timeout=entry.get('timeout', 60.0),
+            )
+        except (httpx.HTTPError, OSError) as e:
+            entry['attempts'] += 1
+            entry['last_error'] = str(e)
+            status_code = e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
+            permanent = (
+                status_code is not None
+                and 400 <= status_code < 500
+                and status_code not in RETRYABLE_CLIENT_ERRORS
+            )
+            if permanent or entry['attempts'] >= settings.CALLBACK_MAX_ATTEMPTS:
+                entry['state'] = STATE_DEAD
+                entry['next_attempt_at'] = None
+                if permanent:
+                    print(f"[Outbox] {job_id}: rejected with HTTP {status_code}, not retrying ({e})")
+                else:
+                    print(f"[Outbox] {job_id}: giving up after {entry['attempts']} attempts ({e})")
+            else:
+                entry['state'] = STATE_PENDING
+                entry['next_attempt_at'] = time.time() + backoff_seconds(entry['attempts'])
+                print(f"[Outbox] {job_id}: attempt {entry['attempts']} failed ({e}), "
+                      f"retry in {entry['next_attempt_at'] - time.time():.0f}s")
+            self._write(entry)
+            return DEAD if entry['state'] == STATE_DEAD else RETRY
+        return DELIVERED
+
+    def _remove_stale_lock(self, job_id: str) -> None:
+        """엔트리 없이 lock 파일만 남은 job 디렉토리 제거 (결과 파일이 있으면 그대로 둠)"""
+        job_dir = self.root / job_id
+        try:
+            (job_dir / LOCK_FILENAME).unlink()
+            job_dir.rmdir()
+        except OSError:
+            pass
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """등록된 모든 엔트리"""
+        result = []
+        for job_dir in sorted(self.root.iterdir()):
+            if not job_dir.is_dir():
+                continue
+            try:
+                entry = self.load(job_dir.name)
+            except (OSError, ValueError) as e:
+                print(f"[Outbox] Skipping unreadable entry {job_dir.name}: {e}")
+                continue
+            if entry is not None:
+                result.append(entry)
+        return result
+
+    def replay(self, include_dead: bool = False, force: bool = False,
+               job_ids: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        재시도 시각이 된 엔트리 전송
+
+        Args:
+            include_dead: dead 엔트리도 전송 (재시도 횟수 초기화)
+            force: next_attempt_at 무시하고 즉시 전송
+            job_ids: 특정 job_id만 전송
+        """
+        counts: Dict[str, int] = {}
+        now = time.time()
+        for entry in self.entries():
+            job_id = entry['job_id']
+            if job_ids and job_id not in job_ids:
+                continue
+            if entry['state'] == STATE_DEAD:
+                if not include_dead:
+                    continue
+                entry['state'] = STATE_PENDING
+                entry['attempts'] = 0
+                self._write(entry)
+            elif not force and (entry.get('next_attempt_at') or 0) > now:
+                continue
+            outcome = self.deliver(job_id)
+            counts[outcome] = counts.get(outcome, 0) + 1
+        return counts
+
+    def stats(self) -> Dict[str, Any]:
+        """queue depth metrics"""
+        entries = self.entries()
+        now = time.time()
+        pending = [e for e in entries if e['state'] == STATE_PENDING]
+        dead = [e for e in entries if e['state'] == STATE_DEAD]
+        oldest = min((e['created_at'] for e in entries), default=None)
+        return {
+            'depth': len(entries),
+            'pending': len(pending),
+            'dead': len(dead),
+            'due': sum(1 for e in pending if (e.get('next_attempt_at') or 0) <= now),
+            'oldest_age_seconds': round(now - oldest, 1) if oldest else 0,
+            'max_attempts_seen': max((e['attempts'] for e in entries), default=0),
+        }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='modAI callback outbox')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    sub.add_parser('stats', help='queue depth 출력')
+    sub.add_parser('list', help='엔트리 목록 출력')
+
+    replay_parser = sub.add_parser('replay', help='pending 엔트리 재전송')
+    replay_parser.add_argument('--all', action='store_true', help='dead 포함, 대기 시간 무시')
+    replay_parser.add_argument('--job', action='append', help='특정 job_id (여러 번 지정 가능)')
+
+    args = parser.parse_args()
+    outbox = CallbackOutbox()
+
+    if args.command == 'stats':
+        print(json.dumps(outbox.stats(), indent=2))
+    elif args.command == 'list':
+        for entry in outbox.entries():
+            print(f"{entry['job_id']}\t{entry['state']}\tattempts={entry['attempts']}\t"
+                  f"last_error={entry.get('last_error')}")
+    elif args.command == 'replay':
+        counts = outbox.replay(
+            include_dead=args.all or bool(args.job),
+            force=args.all or bool(args.job),
+            job_ids=args.job,
+        )
+        print(json.dumps(counts, indent=2))
+
+
+if __name__ == "__main__":
+    main()
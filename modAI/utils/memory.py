@@ -0,0 +1,127 @@
+"""
+Memory Accounting Utility
+
+Celery child 프로세스의 RSS / peak RSS 측정
+- Linux: /proc/self/status (VmRSS, VmHWM), /proc/self/clear_refs 로 peak 리셋
+- 그 외: resource.getrusage (프로세스 시작 이후 최대값만 제공)
+"""
+import sys
+import time
+from typing import Any, Dict, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _read_proc_status_kb(field: str) -> Optional[int]:
+    """/proc/self/status 에서 'VmRSS:   12345 kB' 형식 값 읽기"""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def current_rss_mb() -> Optional[float]:
+    """현재 RSS (MB)"""
+    kb = _read_proc_status_kb('VmRSS')
+    return round(kb / 1024, 1) if kb is not None else None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """peak RSS (MB) - Linux는 마지막 reset_peak_rss() 이후, 그 외는 프로세스 전체"""
+    kb = _read_proc_status_kb('VmHWM')
+    if kb is not None:
+        return round(kb / 1024, 1)
+    if resource is not None:
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS: bytes, Linux: KB
+        divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+        return round(maxrss / divisor, 1)
+    return None
+
+
+def reset_peak_rss() -> bool:
+    """peak RSS(VmHWM) 리셋 (Linux 4.0+ 에서만 가능)"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+class MemoryTracker:
+    """
+    구간별 메모리 측정 컨텍스트
+
+    Usage:
+        with MemoryTracker("segmentation") as mem:
+            ...
+        print(mem.summary())
+    """
+
+    def __init__(self, name: str = "Process", verbose: bool = True):
+        self.name = name
+        self.verbose = verbose
+        self.rss_before_mb = None
+        self.rss_after_mb = None
+        self.peak_rss_mb = None
+        self.peak_reset = False
+        self.cuda_peak_mb = None
+        self.elapsed = 0.0
+        self._start = None
+
+    def __enter__(self):
+        self.peak_reset = reset_peak_rss()
+        self.rss_before_mb = current_rss_mb()
+        self._cuda_reset()
+        self._start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.elapsed = time.time() - self._start
+        self.rss_after_mb = current_rss_mb()
+        self.peak_rss_mb = peak_rss_mb()
+        self.cuda_peak_mb = self._cuda_peak()
+        if self.verbose:
+            print(f"[Memory] {self.name}: rss {self.rss_before_mb} -> {self.rss_after_mb} MB, "
+                  f"peak {self.peak_rss_mb} MB"
+                  + (f", cuda peak {self.cuda_peak_mb} MB" if self.cuda_peak_mb is not None else ""))
+        return False
+
+    @staticmethod
+    def _cuda_reset() -> None:
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.reset_peak_memory_stats()
+        except ImportError:
+            pass
+
+    @staticmethod
+    def _cuda_peak() -> Optional[float]:
+        try:
+            import torch
+            if torch.cuda.is_available():
+                return round(torch.cuda.max_memory_allocated() / (1024 * 1024), 1)
+        except ImportError:
+            pass
+        return None
+
+    def summary(self) -> Dict[str, Any]:
+        """측정 결과 요약"""
+        return {
+            'rss_before_mb': self.rss_before_mb,
+            'rss_after_mb': self.rss_after_mb,
+            'peak_rss_mb': self.peak_rss_mb,
+            # False 이면 peak 값은 프로세스 시작 이후 최대값
+            'peak_is_scoped': self.peak_reset,
+            'cuda_peak_mb': self.cuda_peak_mb,
+            'elapsed_seconds': round(self.elapsed, 3),
+        }
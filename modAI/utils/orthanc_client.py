@@ -4,11 +4,10 @@ Orthanc DICOM Client
 Orthanc 서버에서 DICOM 데이터를 fetch하는 클라이언트
 """
 import logging
-import zipfile
-import io
+import os
+import threading
 import asyncio
 from typing import Dict, List, Optional
-from concurrent.futures import ThreadPoolExecutor
 import httpx
 
 import sys
@@ -19,6 +18,27 @@ from config import settings
 
 logger = logging.getLogger(__name__)
 
+# 프로세스 공유 httpx.Client (keep-alive connection pool, fork 후에는 새로 생성)
+_http_client: Optional[httpx.Client] = None
+_http_client_pid: Optional[int] = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """프로세스 공유 동기 httpx.Client"""
+    global _http_client, _http_client_pid
+    with _http_client_lock:
+        if _http_client is None or _http_client_pid != os.getpid() or _http_client.is_closed:
+            _http_client = httpx.Client(
+                timeout=settings.ORTHANC_TIMEOUT_SECONDS,
+                limits=httpx.Limits(
+                    max_connections=settings.ORTHANC_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.ORTHANC_MAX_CONNECTIONS,
+                ),
+            )
+            _http_client_pid = os.getpid()
+        return _http_client
+
 
 class OrthancClient:
     """Orthanc DICOM 서버 클라이언트"""
@@ -49,14 +69,14 @@ class OrthancClient:
     def _get(self, path: str) -> httpx.Response:
         """GET 요청"""
         url = f"{self.base_url}{path}"
-        response = httpx.get(url, auth=self.auth, timeout=60.0)
+        response = get_http_client().get(url, auth=self.auth, timeout=60.0)
         response.raise_for_status()
         return response
 
     def _post(self, path: str, data: str = None, json_data: dict = None) -> httpx.Response:
         """POST 요청"""
         url = f"{self.base_url}{path}"
-        response = httpx.post(url, auth=self.auth, content=data, json=json_data, timeout=60.0)
+        response = get_http_client().post(url, auth=self.auth, content=data, json=json_data, timeout=60.0)
         response.raise_for_status()
         return response
 
@@ -199,15 +219,22 @@ class OrthancClient:
             instances = series_info.get("Instances", [])
             print(f"    -> Identified as {modality}, fetching {len(instances)} instances...")
 
-            for instance_id in instances:
-                dcm_response = self._get(f"/instances/{instance_id}/file")
-                dicom_data[modality].append(dcm_response.content)
+            dicom_data[modality].extend(self._fetch_instances(instances))
 
             print(f"    -> Fetched {len(instances)} slices for {modality}")
 
         except httpx.HTTPStatusError as e:
             print(f"    -> ERROR: Failed to fetch series {series_id}: {str(e)}")
 
+    def _fetch_instances(self, instance_ids: List[str]) -> List[bytes]:
+        """Instance DICOM 파일 동시 다운로드 (ORTHANC_MAX_CONCURRENCY, 순서 유지)"""
+        from utils.async_orthanc_client import AsyncOrthancClient, run_sync
+
+        async_client = AsyncOrthancClient(
+            base_url=self.base_url, username=self.auth[0], password=self.auth[1]
+        )
+        return run_sync(async_client.fetch_instances(instance_ids))
+
     def get_series_info(self, series_id: str) -> Dict:
         """Series 상세 정보 조회"""
         response = self._get(f"/series/{series_id}")
@@ -276,10 +303,7 @@ class OrthancClient:
                         continue
 
                     # Instance들의 DICOM 데이터 fetch
-                    seg_bytes = []
-                    for instance_id in instances:
-                        dcm_response = self._get(f"/instances/{instance_id}/file")
-                        seg_bytes.append(dcm_response.content)
+                    seg_bytes = self._fetch_instances(instances)
 
                     print(f"    -> Fetched {len(seg_bytes)} segmentation slices")
                     return seg_bytes
@@ -295,6 +319,81 @@ class OrthancClient:
     # 최적화된 DICOM Fetch 메서드 (Archive API 사용)
     # ========================================================================
 
+    def resolve_study_series(
+        self,
+        study_uid: str,
+        series_ids: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        """
+        Study에서 모달리티별 Series 식별 (DICOM 바이트는 받지 않음)
+
+        전처리 캐시 키 계산 및 Archive 다운로드 대상 결정에 사용
+
+        Args:
+            study_uid: DICOM Study UID 또는 Orthanc Study ID
+            series_ids: 특정 Series ID 목록 (없으면 모든 Series에서 자동 식별)
+
+        Returns:
+            [{series_id, modality, series_uid, instances, last_update}]
+            (instances: Orthanc Instance ID 목록 = DICOM UID 기반 SHA-1 해시)
+        """
+        series_plan = []
+        found = set()
+
+        if series_ids:
+            print(f"[OrthancClient] Using provided series IDs: {series_ids}")
+        else:
+            print("[OrthancClient] Auto-detecting series from study...")
+            series_list = self.fetch_study_series(study_uid)
+            print(f"[OrthancClient] Found {len(series_list)} series in study")
+            series_ids = [
+                s if isinstance(s, str) else s.get('ID')
+                for s in series_list
+            ]
+
+        for series_id in series_ids:
+            if not series_id:
+                continue
+
+            info = self._get(f"/series/{series_id}").json()
+            main_tags = info.get("MainDicomTags", {})
+            desc = main_tags.get("SeriesDescription", "")
+            print(f"    Series {series_id}: '{desc}'")
+
+            modality = self._identify_modality(desc)
+            if modality and modality not in found:
+                found.add(modality)
+                instances = info.get("Instances", [])
+                series_plan.append({
+                    'series_id': series_id,
+                    'modality': modality,
+                    'series_uid': main_tags.get("SeriesInstanceUID", ""),
+                    'instances': instances,
+                    'last_update': info.get("LastUpdate", ""),
+                })
+                print(f"    -> Will fetch as {modality} ({len(instances)} instances)")
+            else:
+                print(f"    -> Skipped")
+
+        return series_plan
+
+    def fetch_series_plan_bytes(self, series_plan: List[Dict]) -> Dict[str, List[bytes]]:
+        """
+        resolve_study_series 결과의 Series들을 Archive API로 병렬 다운로드
+
+        Returns:
+            {'T1': [bytes], 'T1CE': [bytes], 'T2': [bytes], 'FLAIR': [bytes]}
+        """
+        from utils.async_orthanc_client import AsyncOrthancClient, run_sync
+
+        print(f"\n[OrthancClient] Downloading {len(series_plan)} series using Archive API...")
+
+        # 공유 AsyncClient 로 동시 다운로드 (ZIP 은 임시 파일로 스트리밍)
+        async_client = AsyncOrthancClient(
+            base_url=self.base_url, username=self.auth[0], password=self.auth[1]
+        )
+        return run_sync(async_client.fetch_series_plan_bytes(series_plan))
+
     def fetch_study_dicom_bytes_fast(
         self,
         study_uid: str,
@@ -319,60 +418,8 @@ class OrthancClient:
         print(f"[OrthancClient] Fetching DICOM (FAST mode) for study: {study_uid}")
         print(f"[OrthancClient] Orthanc URL: {self.base_url}")
 
-        dicom_data = {"T1": [], "T1CE": [], "T2": [], "FLAIR": []}
-        series_to_fetch = []  # (series_id, modality) 튜플 리스트
-
-        if series_ids:
-            print(f"[OrthancClient] Using provided series IDs: {series_ids}")
-            for series_id in series_ids:
-                series_info = self._get(f"/series/{series_id}").json()
-                main_tags = series_info.get("MainDicomTags", {})
-                desc = main_tags.get("SeriesDescription", "")
-                modality = self._identify_modality(desc)
-                if modality and not dicom_data[modality]:
-                    series_to_fetch.append((series_id, modality))
-        else:
-            print("[OrthancClient] Auto-detecting series from study...")
-            series_list = self.fetch_study_series(study_uid)
-            print(f"[OrthancClient] Found {len(series_list)} series in study")
-
-            for series_info in series_list:
-                series_id = series_info if isinstance(series_info, str) else series_info.get('ID')
-                if not series_id:
-                    continue
-
-                info = self._get(f"/series/{series_id}").json()
-                main_tags = info.get("MainDicomTags", {})
-                desc = main_tags.get("SeriesDescription", "")
-                print(f"    Series {series_id}: '{desc}'")
-
-                modality = self._identify_modality(desc)
-                if modality and not dicom_data[modality]:
-                    instance_count = len(info.get("Instances", []))
-                    series_to_fetch.append((series_id, modality, instance_count))
-                    print(f"    -> Will fetch as {modality} ({instance_count} instances)")
-                else:
-                    print(f"    -> Skipped")
-
-        # 병렬로 Series Archive 다운로드
-        print(f"\n[OrthancClient] Downloading {len(series_to_fetch)} series using Archive API...")
-
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            futures = {}
-            for item in series_to_fetch:
-                series_id = item[0]
-                modality = item[1]
-                future = executor.submit(self._fetch_series_archive, series_id)
-                futures[future] = modality
-
-            for future in futures:
-                modality = futures[future]
-                try:
-                    dcm_bytes_list = future.result()
-                    dicom_data[modality] = dcm_bytes_list
-                    print(f"    -> {modality}: {len(dcm_bytes_list)} slices fetched")
-                except Exception as e:
-                    print(f"    -> {modality}: ERROR - {str(e)}")
+        series_plan = self.resolve_study_series(study_uid, series_ids)
+        dicom_data = self.fetch_series_plan_bytes(series_plan)
 
         elapsed = time.time() - start_time
         print(f"\n[OrthancClient] DICOM fetch completed in {elapsed:.2f}s")
@@ -391,16 +438,9 @@ class OrthancClient:
         Returns:
             DICOM 파일 bytes 리스트
         """
-        # Archive 다운로드 (ZIP)
-        url = f"{self.base_url}/series/{series_id}/archive"
-        response = httpx.get(url, auth=self.auth, timeout=120.0)
-        response.raise_for_status()
-
-        # ZIP에서 DICOM 파일 추출
-        dcm_bytes_list = []
-        with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
-            for name in zf.namelist():
-                if name.endswith('.dcm') or not '.' in name.split('/')[-1]:
-                    dcm_bytes_list.append(zf.read(name))
+        from utils.async_orthanc_client import AsyncOrthancClient, run_sync
 
-        return dcm_bytes_list
+        async_client = AsyncOrthancClient(
+            base_url=self.base_url, username=self.auth[0], password=self.auth[1]
+        )
+        return run_sync(async_client.fetch_series_archive(series_id))
@@ -0,0 +1,113 @@
+"""
+M1 결과 미리보기 이미지 (썸네일 + key slice)
+
+Celery 워커에서 추론 직후 렌더링해 callback spool 에 함께 기록
+(Django 웹 프로세스는 받은 PNG 를 previews/ 로 옮기고 manifest 만 작성)
+
+    CALLBACK_SPOOL_DIR/<job_id>/
+        m1_previews.json                 # {format, previews: {name: {file, axis, index}}}
+        m1_preview_thumbnail.png         # T1CE 중간 axial 슬라이스 + 세그멘테이션 오버레이
+        m1_preview_axial.png / _coronal / _sagittal   # 종양 면적이 가장 큰 슬라이스
+
+렌더링 방식은 Django apps/ai_inference/previews.py 와 동일 (이전 결과 fallback 과 같은 이미지)
+"""
+import io
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+PREVIEWS_FILENAME = 'm1_previews.json'
+PREVIEW_FILE_PATTERN = 'm1_preview_{}.png'
+# 렌더링 규칙 버전 (Django previews.PREVIEW_FORMAT 과 같아야 설치됨)
+PREVIEW_FORMAT = 2
+
+# 볼륨 축 [X, Y, Z] (Django volumes.AXES 와 동일)
+AXES = {'sagittal': 0, 'coronal': 1, 'axial': 2}
+
+# M1 마스크 레이블: 1=NCR/NET (빨강), 2=ED (노랑), 3=ET (초록) - BraTS 4 는 전처리에서 3 으로 변환됨
+OVERLAY_COLORS = {
+    1: [255, 100, 100],
+    2: [255, 255, 100],
+    3: [100, 255, 100],
+}
+OVERLAY_ALPHA = 0.5
+
+
+def render_overlay(mri_slice: np.ndarray, seg_slice: np.ndarray) -> bytes:
+    """MRI 슬라이스에 세그멘테이션 마스크를 오버레이한 PNG 이미지 생성"""
+    from PIL import Image
+
+    mri_slice = np.asarray(mri_slice, dtype=np.float32)
+    seg_slice = np.asarray(seg_slice)
+
+    # MRI 정규화 (0-255)
+    lo, hi = float(mri_slice.min()), float(mri_slice.max())
+    if hi > lo:
+        mri_norm = ((mri_slice - lo) / (hi - lo) * 255).astype(np.uint8)
+    else:
+        mri_norm = np.zeros(mri_slice.shape, dtype=np.uint8)
+
+    # 그레이스케일 → RGB
+    rgb = np.stack([mri_norm] * 3, axis=-1)
+
+    for label, color in OVERLAY_COLORS.items():
+        mask = seg_slice == label
+        if np.any(mask):
+            rgb[mask] = (rgb[mask] * (1 - OVERLAY_ALPHA) + np.array(color) * OVERLAY_ALPHA).astype(np.uint8)
+
+    # 이미지 회전 (상하 반전하여 정상 방향으로)
+    rgb = np.flipud(rgb)
+
+    img = Image.fromarray(np.ascontiguousarray(rgb))
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def key_slice(seg_mask: np.ndarray, axis: int) -> int:
+    """종양 voxel 이 가장 많은 슬라이스 (종양이 없으면 중간)"""
+    other_axes = tuple(a for a in range(seg_mask.ndim) if a != axis)
+    counts = np.count_nonzero(seg_mask, axis=other_axes)
+    if counts.max() == 0:
+        return seg_mask.shape[axis] // 2
+    return int(np.argmax(counts))
+
+
+def write_m1_previews(result: Dict[str, Any], output_dir: Path) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    predict_with_segmentation 결과로 미리보기 PNG + 목록(json) 기록
+
+    Returns:
+        {name: {file, axis, index}} (세그멘테이션 마스크가 없으면 None)
+    """
+    visualization = (result.get('segmentation') or {}).get('visualization') or {}
+    if visualization.get('prediction') is None:
+        return None
+
+    seg_mask = np.asarray(visualization['prediction'])
+    mri_data = (result.get('preprocessed_mri') or {}).get('t1ce')
+    if mri_data is None:
+        mri_data = visualization.get('mri')
+
+    images = {'thumbnail': ('axial', seg_mask.shape[AXES['axial']] // 2)}
+    for axis_name, axis in AXES.items():
+        images[axis_name] = (axis_name, key_slice(seg_mask, axis))
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    previews = {}
+    for name, (axis_name, index) in images.items():
+        axis = AXES[axis_name]
+        seg_slice = np.take(seg_mask, index, axis=axis)
+        mri_slice = np.take(mri_data, index, axis=axis) if mri_data is not None else np.zeros(seg_slice.shape)
+
+        filename = PREVIEW_FILE_PATTERN.format(name)
+        with open(output_dir / filename, 'wb') as f:
+            f.write(render_overlay(mri_slice, seg_slice))
+        previews[name] = {'file': filename, 'axis': axis_name, 'index': index}
+
+    with open(output_dir / PREVIEWS_FILENAME, 'w', encoding='utf-8') as f:
+        json.dump({'format': PREVIEW_FORMAT, 'previews': previews}, f, ensure_ascii=False, indent=2)
+    return previews
@@ -0,0 +1,266 @@
+"""
+Preprocessed Volume Cache
+
+M1 전처리 결과 on-disk 캐시 (content-addressed)
+- 키: Series UID + Orthanc Instance ID(UID 기반 해시) + Series LastUpdate + 전처리 설정 해시
+- 엔트리: PREPROCESS_CACHE_DIR/<key>/image.npy (4, 128, 128, 128) float32 + meta.json
+- image.npy 는 memory-mapped (copy-on-write) 로 로드
+- PREPROCESS_CACHE_MAX_MB 초과 시 마지막 사용 시각 기준 LRU eviction
+- hit/miss 카운터는 _stats.json 에 누적 (워커 프로세스 간 공유)
+
+같은 study 재추론 (리뷰 후 재실행, MM 등) 시 Orthanc fetch / DICOM decode / resample 생략
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import torch
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import settings
+
+IMAGE_FILENAME = 'image.npy'
+META_FILENAME = 'meta.json'
+STATS_FILENAME = '_stats.json'
+LOCK_FILENAME = '_stats.lock'
+
+# meta.json 에 보존하는 전처리 결과 필드 ('image' 제외)
+META_FIELDS = (
+    'patient_id', 'dataset', 'normalization', 'timing',
+    'bbox', 'original_shape', 'slice_mapping',
+)
+
+
+def _json_default(value):
+    """numpy scalar / tuple 등 JSON 직렬화"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+class PreprocessedVolumeCache:
+    """M1 전처리 결과 on-disk LRU 캐시"""
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        max_mb: Optional[int] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self.root = Path(root or settings.PREPROCESS_CACHE_DIR)
+        self.max_bytes = (max_mb if max_mb is not None else settings.PREPROCESS_CACHE_MAX_MB) * 1024 * 1024
+        self.enabled = settings.PREPROCESS_CACHE_ENABLED if enabled is None else enabled
+        if self.enabled:
+            self.root.mkdir(parents=True, exist_ok=True)
+
+    # ------------------------------------------------------------
+    # Key
+    # ------------------------------------------------------------
+    @staticmethod
+    def make_key(series_plan: List[Dict], preprocess_signature: str) -> str:
+        """
+        캐시 키 계산
+
+        Args:
+            series_plan: OrthancClient.resolve_study_series 결과
+            preprocess_signature: M1Preprocessor.cache_signature()
+        """
+        digest = hashlib.sha256()
+        digest.update(preprocess_signature.encode('utf-8'))
+        for item in sorted(series_plan, key=lambda x: x['modality']):
+            digest.update(f"|{item['modality']}|{item.get('series_uid', '')}|{item.get('last_update', '')}".encode('utf-8'))
+            for instance_id in sorted(item.get('instances', [])):
+                digest.update(instance_id.encode('utf-8'))
+        return digest.hexdigest()
+
+    # ------------------------------------------------------------
+    # Get / Put
+    # ------------------------------------------------------------
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        캐시된 전처리 결과 반환 (없으면 None)
+
+        'image' 는 memory-mapped npy 위의 torch tensor (copy-on-write)
+        'timing' 은 캐시 로드 시간 (저장 당시 전처리 시간은 'cache'['cached_timing'])
+        """
+        if not self.enabled:
+            return None
+
+        started = time.perf_counter()
+        entry_dir = self.root / key
+        try:
+            with open(entry_dir / META_FILENAME, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            image = np.load(entry_dir / IMAGE_FILENAME, mmap_mode='c')
+        except (OSError, ValueError):
+            self._count('misses')
+            return None
+
+        # LRU: 마지막 사용 시각 갱신
+        try:
+            os.utime(entry_dir / META_FILENAME)
+        except OSError:
+            pass
+        self._count('hits')
+
+        preprocessed = {field: meta.get(field) for field in META_FIELDS}
+        if preprocessed.get('bbox') is not None:
+            preprocessed['bbox'] = tuple(preprocessed['bbox'])
+        if preprocessed.get('original_shape') is not None:
+            preprocessed['original_shape'] = tuple(preprocessed['original_shape'])
+        preprocessed['image'] = torch.from_numpy(image)
+        preprocessed['label'] = None
+
+        elapsed = time.perf_counter() - started
+        preprocessed['timing'] = {
+            'total_seconds': elapsed,
+            'steps': {'Preprocess cache hit (mmap load)': round(elapsed, 4)},
+        }
+        preprocessed['cache'] = {'hit': True, 'key': key, 'cached_timing': meta.get('timing')}
+        return preprocessed
+
+    def put(self, key: str, preprocessed: Dict[str, Any]) -> bool:
+        """전처리 결과 저장 (tmp 디렉토리에 기록 후 rename 으로 원자적 게시)"""
+        if not self.enabled:
+            return False
+
+        entry_dir = self.root / key
+        if entry_dir.exists():
+            return True
+
+        tmp_dir = self.root / f".tmp-{key}-{uuid.uuid4().hex[:8]}"
+        try:
+            tmp_dir.mkdir(parents=True)
+            image = preprocessed['image']
+            if isinstance(image, torch.Tensor):
+                image = image.detach().cpu().numpy()
+            np.save(tmp_dir / IMAGE_FILENAME, np.ascontiguousarray(image, dtype=np.float32))
+
+            meta = {field: preprocessed.get(field) for field in META_FIELDS}
+            meta['key'] = key
+            meta['created_at'] = time.time()
+            with open(tmp_dir / META_FILENAME, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False, default=_json_default)
+
+            try:
+                os.rename(tmp_dir, entry_dir)
+            except OSError:
+                # 다른 워커가 먼저 저장함
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        except OSError as e:
+            print(f"[VolumeCache] Failed to store {key[:12]}: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return False
+
+        self.evict()
+        return True
+
+    # ------------------------------------------------------------
+    # Eviction / Stats
+    # ------------------------------------------------------------
+    def _entries(self) -> List[Dict[str, Any]]:
+        """[{key, size, last_used}] (완성된 엔트리만)"""
+        entries = []
+        if not self.root.exists():
+            return entries
+        for entry_dir in self.root.iterdir():
+            if not entry_dir.is_dir() or entry_dir.name.startswith(('.', '_')):
+                continue
+            meta_path = entry_dir / META_FILENAME
+            try:
+                size = sum(p.stat().st_size for p in entry_dir.iterdir() if p.is_file())
+                last_used = meta_path.stat().st_mtime
+            except OSError:
+                continue
+            entries.append({'key': entry_dir.name, 'size': size, 'last_used': last_used})
+        return entries
+
+    def evict(self) -> int:
+        """총 크기가 max_bytes 이하가 될 때까지 오래된 엔트리 삭제"""
+        if self.max_bytes <= 0:
+            return 0
+        entries = sorted(self._entries(), key=lambda e: e['last_used'])
+        total = sum(e['size'] for e in entries)
+        evicted = 0
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(self.root / entry['key'], ignore_errors=True)
+            total -= entry['size']
+            evicted += 1
+        if evicted:
+            self._count('evictions', evicted)
+            print(f"[VolumeCache] Evicted {evicted} entries (LRU, max={self.max_bytes // (1024 * 1024)}MB)")
+        return evicted
+
+    def clear(self) -> None:
+        """전체 엔트리 삭제 (카운터 유지)"""
+        for entry in self._entries():
+            shutil.rmtree(self.root / entry['key'], ignore_errors=True)
+
+    @contextmanager
+    def _stats_lock(self):
+        if fcntl is None:
+            yield
+            return
+        with open(self.root / LOCK_FILENAME, 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_counters(self) -> Dict[str, int]:
+        try:
+            with open(self.root / STATS_FILENAME, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        """hits / misses / evictions 누적 (실패해도 무시)"""
+        try:
+            with self._stats_lock():
+                counters = self._read_counters()
+                counters[name] = counters.get(name, 0) + amount
+                tmp_path = self.root / f"{STATS_FILENAME}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(counters, f)
+                os.replace(tmp_path, self.root / STATS_FILENAME)
+        except OSError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 사용량 및 hit/miss 카운터"""
+        if not self.enabled:
+            return {'enabled': False}
+        entries = self._entries()
+        counters = self._read_counters()
+        hits = counters.get('hits', 0)
+        misses = counters.get('misses', 0)
+        return {
+            'enabled': True,
+            'entries': len(entries),
+            'size_mb': round(sum(e['size'] for e in entries) / (1024 * 1024), 1),
+            'max_mb': self.max_bytes // (1024 * 1024),
+            'hits': hits,
+            'misses': misses,
+            'evictions': counters.get('evictions', 0),
+            'hit_rate': round(hits / (hits + misses), 3) if hits + misses else None,
+        }